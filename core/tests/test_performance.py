@@ -35,7 +35,6 @@ from leagues.models import (
 #
 # Known N+1 issues (tracked for future optimization):
 #   - standings view runs ~3 queries per team (tiebreaker checks via Python loop)
-#   - goalie_status_board runs additional queries per matchup for roster goalie lookups
 # ---------------------------------------------------------------------------
 STANDINGS_QUERY_CEILING = (
     35  # select_related('team') eliminated per-row FK hits; tiebreaker N+1 remains
@@ -47,7 +46,7 @@ SCORES_ONE_DIVISION_QUERY_CEILING = (
     20  # batch stat loading + select_related reduced from 25
 )
 PLAYER_STATS_QUERY_CEILING = 25
-GOALIE_BOARD_QUERY_CEILING = 40  # roster goalie lookup per matchup; see N+1 note
+GOALIE_BOARD_QUERY_CEILING = 10  # matchups + roster goalies batched; was 40
 DRAFT_BOARD_QUERY_CEILING = 20  # batch stats: reduced from ~414 (3 queries per player)
 # Max additional queries allowed per extra team added to standings
 STANDINGS_QUERIES_PER_TEAM_BUDGET = 5
@@ -308,6 +307,24 @@ class GoalieBoardQueryCountTest(TestCase):
             ),
         )
 
+    def test_goalie_board_query_count_constant_in_games(self):
+        def board_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(reverse("goalie_status_board"))
+            return len(ctx.captured_queries)
+
+        baseline = board_queries()
+        week = Week.objects.get()
+        for i in range(4):
+            home = _make_team(f"Extra Home {i}", week.division, week.season)
+            away = _make_team(f"Extra Away {i}", week.division, week.season)
+            goalie = Player.objects.create(first_name=f"Extra{i}", last_name="Goalie")
+            Roster.objects.create(player=goalie, team=home, position1=4)
+            MatchUp.objects.create(
+                week=week, time=datetime.time(12, 0), hometeam=home, awayteam=away
+            )
+        self.assertEqual(board_queries(), baseline)
+
 
 class DraftBoardQueryCountTest(TestCase):
     """
@@ -1,4 +1,5 @@
 import unittest
+from django.core.cache import cache
 from django.test import TestCase
 from django.db.models import (
     Sum,
@@ -776,6 +777,38 @@ class DivisionLeaderStatsTestCase(TestCase):
         with self.assertNumQueries(2):
             self.get_division_leader_stats(self.div1, self.season.id, scope="regular")
 
+    def test_all_divisions_in_two_queries(self):
+        from core.views.players import get_leader_stats_by_division
+
+        with self.assertNumQueries(2):
+            by_division = get_leader_stats_by_division(self.season.id, scope="regular")
+        for division in (self.div1, self.div2):
+            self.assertEqual(
+                by_division.get(division.pk, []),
+                self.get_division_leader_stats(
+                    division, self.season.id, scope="regular"
+                ),
+            )
+
+    def test_cached_leaders_invalidated_on_stat_change(self):
+        from core.views.players import get_cached_leader_stats_by_division
+
+        cache.clear()
+        first = get_cached_leader_stats_by_division(self.season.id, "regular")
+        with self.assertNumQueries(0):
+            get_cached_leader_stats_by_division(self.season.id, "regular")
+
+        Stat.objects.create(
+            player=self.d2_player,
+            team=self.team_d2,
+            matchup=self.reg_match2,
+            goals=1,
+            assists=0,
+        )
+        refreshed = get_cached_leader_stats_by_division(self.season.id, "regular")
+        self.assertEqual(first[self.div2.pk][0]["sum_goals"], 7)
+        self.assertEqual(refreshed[self.div2.pk][0]["sum_goals"], 8)
+
     def test_matches_legacy_get_player_stats_output(self):
         """Regression: new function must equal the old get_player_stats path."""
         compare_keys = [
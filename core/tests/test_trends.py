@@ -0,0 +1,143 @@
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core import trends
+from leagues.models import Division, Player, Roster, Season, Stat, Team
+from leagues.signals import get_stats_version
+
+
+class BatchFitTest(SimpleTestCase):
+    """batch_fit must reproduce the per-player np.polyfit it replaced."""
+
+    def test_matches_polyfit_per_group(self):
+        series = [[3, 5, 4, 9], [7], [2, 2, 8], [1, 6]]
+        group_ids = [g for g, values in enumerate(series) for _ in values]
+        values = [v for values in series for v in values]
+
+        fitted = trends.batch_fit(group_ids, values)
+
+        offset = 0
+        for values_for_group in series:
+            end = offset + len(values_for_group)
+            x = np.arange(len(values_for_group))
+            if len(values_for_group) > 1:
+                expected = np.polyval(np.polyfit(x, values_for_group, 1), x)
+            else:
+                expected = np.array(values_for_group, dtype=float)
+            np.testing.assert_allclose(fitted["trend"][offset:end], expected)
+            offset = end
+
+    def test_rolling_average_and_deltas_stay_within_group(self):
+        fitted = trends.batch_fit([0, 0, 0, 0, 1, 1], [1, 2, 3, 6, 10, 4], window=3)
+        np.testing.assert_allclose(fitted["rolling"], [1, 1.5, 2, 11 / 3, 10, 7])
+        deltas = trends._deltas_to_list(fitted["delta"])
+        self.assertEqual(deltas, [None, 1.0, 1.0, 3.0, None, -6.0])
+
+    def test_empty_input(self):
+        self.assertEqual(trends.fit_series([])["trend"], [])
+
+
+class PlayerTrendsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.division = Division.objects.create(division=1)
+        self.seasons = [
+            Season.objects.create(year=2020 + i, season_type=1) for i in range(3)
+        ]
+        self.teams = [
+            Team.objects.create(
+                team_name=f"Team {i}",
+                division=self.division,
+                season=season,
+                is_active=i == 2,
+            )
+            for i, season in enumerate(self.seasons)
+        ]
+        self.forward = Player.objects.create(first_name="Sam", last_name="Forward")
+        self.hybrid = Player.objects.create(first_name="Hal", last_name="Hybrid")
+
+        for team, goals in zip(self.teams, (1, 3, 8)):
+            Roster.objects.create(player=self.forward, team=team, position1=1)
+            Stat.objects.create(player=self.forward, team=team, goals=goals, assists=1)
+
+        # Hybrid plays out in the first two seasons (one pointless) and tends goal
+        # in the third.
+        Roster.objects.create(player=self.hybrid, team=self.teams[0], position1=3)
+        Stat.objects.create(player=self.hybrid, team=self.teams[0], goals=0)
+        Roster.objects.create(player=self.hybrid, team=self.teams[1], position1=2)
+        Stat.objects.create(player=self.hybrid, team=self.teams[1], goals=2)
+        Roster.objects.create(player=self.hybrid, team=self.teams[2], position1=4)
+        Stat.objects.create(
+            player=self.hybrid, team=self.teams[2], goals_against=4, empty_net=1
+        )
+        Stat.objects.create(player=self.hybrid, team=self.teams[2], goals_against=2)
+
+    def test_offense_series_skips_goalie_teams_and_pointless_seasons(self):
+        entry = trends.get_player_trend(self.hybrid.pk)
+        self.assertEqual(entry["offense"]["player_points"], [2])
+        self.assertEqual(
+            [r["team_id"] for r in entry["rows"]], [t.pk for t in self.teams[:2]]
+        )
+        self.assertEqual(entry["goalie"]["goalie_gaas"], [2.5])
+        self.assertEqual(entry["goalie"]["goalie_team_ids"], [self.teams[2].pk])
+
+    def test_trends_page_series_keeps_pointless_defense_seasons(self):
+        entry = trends.get_player_trend(self.hybrid.pk)
+        series = trends.offensive_trend(entry)
+        self.assertEqual(series["player_points"], [0, 2])
+        self.assertEqual(
+            trends.offensive_trend(entry, timespan=1)["player_points"], [2]
+        )
+
+    def test_goalie_trend_filtered_by_division(self):
+        entry = trends.get_player_trend(self.hybrid.pk)
+        self.assertIsNone(trends.goalie_trend(entry, division="2"))
+        self.assertEqual(
+            trends.goalie_trend(entry, division=str(self.division.pk))["avg_gaa"], 2.5
+        )
+
+    def test_precomputed_series_served_from_cache(self):
+        trends.get_player_trends()
+        with self.assertNumQueries(0):
+            trends.get_player_trend(self.forward.pk)
+
+    def test_cached_per_player(self):
+        version = get_stats_version()
+        entry = trends.get_player_trend(self.forward.pk)
+        self.assertEqual(cache.get(trends._cache_key(version, self.forward.pk)), entry)
+        # A miss builds and caches only the player asked for.
+        self.assertIsNone(cache.get(trends._cache_key(version, self.hybrid.pk)))
+        self.assertEqual(entry, trends.get_player_trends()[self.forward.pk])
+
+    def test_cache_invalidated_by_stat_change(self):
+        self.assertEqual(
+            trends.get_player_trend(self.forward.pk)["offense"]["player_goals"],
+            [1, 3, 8],
+        )
+        Stat.objects.create(player=self.forward, team=self.teams[2], goals=2)
+        self.assertEqual(
+            trends.get_player_trend(self.forward.pk)["offense"]["player_goals"],
+            [1, 3, 10],
+        )
+
+    def test_most_improved_ranks_latest_season_jump(self):
+        improved = trends.most_improved_players()
+        self.assertEqual([row["player_id"] for row in improved], [self.forward.pk])
+        self.assertEqual(improved[0]["delta"], 5)
+        self.assertEqual(improved[0]["previous_points"], 4)
+
+    def test_trends_page_lists_most_improved_without_player(self):
+        response = self.client.get(reverse("player_trends"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Most Improved")
+        self.assertContains(response, "Sam Forward")
+
+    def test_trends_page_renders_player_series(self):
+        response = self.client.get(
+            reverse("player_trends"), {"player_id": self.hybrid.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["player_points"], [0, 2])
+        self.assertEqual(response.context["goalie_trend"]["goalie_gaas"], [2.5])
@@ -0,0 +1,434 @@
+"""
+Season-over-season trend analytics for every player at once.
+
+The player and player-trends pages used to rebuild a single player's season
+series and call ``np.polyfit`` on every request.  This module instead builds
+the series for *all* players from one grouped Stat aggregate and one Roster
+query, then computes the derived series in a single vectorized pass:
+
+  * least-squares trend line (same fit as ``np.polyfit(x, y, 1)``)
+  * rolling average over the last ROLLING_WINDOW seasons
+  * season-over-season delta
+
+Entries are cached one key per player under the stats data version (see
+``leagues.signals``), so any stat or roster edit invalidates them and a page
+reads only its own player's entry.  A cache miss builds just that player;
+a league-wide build (most improved) caches every player it built with one
+``set_many``.  Pages slice the precomputed series; only a division/timespan-
+filtered view refits, and that refit runs over a handful of in-memory points.
+"""
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from leagues.models import Roster, Season, Stat
+
+# ---------------------------------------------------------------------------
+# Tuning constants
+# ---------------------------------------------------------------------------
+
+ROLLING_WINDOW = 3  # seasons in the rolling average
+MOST_IMPROVED_MIN_SEASONS = 2  # need a previous season to measure improvement
+PLAYER_TRENDS_TTL = 60 * 60  # 1 hour; stat edits invalidate via version key
+
+GOALIE_POSITION = 4
+SEASON_NAMES = dict(Season.SEASON_TYPE)
+
+
+# ---------------------------------------------------------------------------
+# Vectorized math
+# ---------------------------------------------------------------------------
+
+
+def batch_fit(group_ids, values, window=ROLLING_WINDOW):
+    """
+    Fit every group's series in one pass.
+
+    ``group_ids`` must be sorted so each group's points are contiguous and in
+    chronological order.  Returns per-point arrays (trend, rolling, delta) and
+    per-group arrays (slope) -- the fit for a single-point group is the point
+    itself, matching the old ``len(x) > 1`` guard around ``np.polyfit``.
+    """
+    group_ids = np.asarray(group_ids)
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if n == 0:
+        empty = np.array([], dtype=float)
+        return {"trend": empty, "rolling": empty, "delta": empty, "slope": empty}
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(group_ids)) + 1))
+    sizes = np.diff(np.append(starts, n))
+    group_of_point = np.repeat(np.arange(len(starts)), sizes)
+    x = np.arange(n) - np.repeat(starts, sizes)
+
+    sum_x = np.add.reduceat(x, starts).astype(float)
+    sum_y = np.add.reduceat(y, starts)
+    sum_xx = np.add.reduceat(x * x, starts).astype(float)
+    sum_xy = np.add.reduceat(x * y, starts)
+    denom = sizes * sum_xx - sum_x**2
+    safe_denom = np.where(denom == 0, 1.0, denom)
+    slope = np.where(denom == 0, 0.0, (sizes * sum_xy - sum_x * sum_y) / safe_denom)
+    intercept = (sum_y - slope * sum_x) / sizes
+    trend = slope[group_of_point] * x + intercept[group_of_point]
+
+    # Rolling mean over at most `window` points, never crossing a group start.
+    prefix = np.concatenate(([0.0], np.cumsum(y)))
+    index = np.arange(n)
+    low = np.maximum(index - window + 1, np.repeat(starts, sizes))
+    rolling = (prefix[index + 1] - prefix[low]) / (index + 1 - low)
+
+    delta = np.concatenate(([np.nan], np.diff(y)))
+    delta[starts] = np.nan
+
+    return {"trend": trend, "rolling": rolling, "delta": delta, "slope": slope}
+
+
+def fit_series(values, window=ROLLING_WINDOW):
+    """``batch_fit`` for one series; returns plain lists for templates/JSON."""
+    fitted = batch_fit(np.zeros(len(values), dtype=int), values, window=window)
+    return {
+        "trend": fitted["trend"].tolist(),
+        "rolling": fitted["rolling"].tolist(),
+        "delta": _deltas_to_list(fitted["delta"]),
+        "slope": float(fitted["slope"][0]) if len(values) else 0.0,
+    }
+
+
+def _deltas_to_list(deltas):
+    return [None if np.isnan(d) else float(d) for d in deltas]
+
+
+# ---------------------------------------------------------------------------
+# Batch build
+# ---------------------------------------------------------------------------
+
+
+def _season_label(row):
+    season_name = SEASON_NAMES.get(row["team__season__season_type"], "Unknown")
+    return f"{row['team__season__year']} {season_name} ({row['team__team_name']})"
+
+
+def _empty_entry():
+    return {
+        "rows": [],
+        "offense": _offense_series([]),
+        "goalie_rows": [],
+        "goalie_teams": [],
+        "goalie": None,
+    }
+
+
+def _offense_series(rows, fitted=None):
+    if fitted is None:
+        fitted = fit_series([r["points"] for r in rows])
+    return {
+        "player_seasons": [r["label"] for r in rows],
+        "player_goals": [r["goals"] for r in rows],
+        "player_assists": [r["assists"] for r in rows],
+        "player_points": [r["points"] for r in rows],
+        "trend_line": fitted["trend"],
+        "rolling_points": fitted["rolling"],
+        "point_deltas": fitted["delta"],
+        "slope": fitted["slope"],
+    }
+
+
+def _goalie_series(rows, goalie_team_ids, fitted=None):
+    if not rows:
+        return None
+    gaas = [r["gaa"] for r in rows]
+    if fitted is None:
+        fitted = fit_series(gaas)
+    return {
+        "goalie_seasons": [r["label"] for r in rows],
+        "goalie_gaas": gaas,
+        "avg_gaa": round(sum(gaas) / len(gaas), 2),
+        "gaa_trend_line": fitted["trend"],
+        "rolling_gaas": fitted["rolling"],
+        "gaa_deltas": fitted["delta"],
+        "slope": fitted["slope"],
+        "goalie_team_ids": goalie_team_ids,
+    }
+
+
+def _split_fit(fitted, sizes):
+    """Slice batch_fit output back into one plain-list dict per group."""
+    results = []
+    offset = 0
+    for group_index, size in enumerate(sizes):
+        end = offset + size
+        results.append(
+            {
+                "trend": fitted["trend"][offset:end].tolist(),
+                "rolling": fitted["rolling"][offset:end].tolist(),
+                "delta": _deltas_to_list(fitted["delta"][offset:end]),
+                "slope": float(fitted["slope"][group_index]),
+            }
+        )
+        offset = end
+    return results
+
+
+def _batch_series(series_by_player, value_key):
+    """Fit every player's series together; returns {player_id: fit dict}."""
+    player_ids = [pid for pid, rows in series_by_player.items() if rows]
+    group_ids = []
+    values = []
+    for group_index, pid in enumerate(player_ids):
+        rows = series_by_player[pid]
+        group_ids.extend([group_index] * len(rows))
+        values.extend(r[value_key] for r in rows)
+    fitted = batch_fit(group_ids, values)
+    sizes = [len(series_by_player[pid]) for pid in player_ids]
+    return dict(zip(player_ids, _split_fit(fitted, sizes)))
+
+
+def build_player_trends(player_ids=None):
+    """
+    Build trend entries for every player (or just ``player_ids``) from the
+    season-aggregate data.
+
+    Each entry holds:
+      rows         chronological (player, team) seasons on non-goalie teams,
+                   including 0/0 seasons, with the player's roster position
+      offense      snapshot series: rows with at least one point, fitted
+      goalie_rows  chronological GAA seasons on teams rostered as goalie
+      goalie_teams (team_id, division) for every goalie-position roster row
+      goalie       fitted goalie series, or None
+    """
+    rosters = Roster.objects.filter(
+        is_substitute=False, player__isnull=False, team__isnull=False
+    )
+    stats = Stat.objects.filter(team__isnull=False)
+    if player_ids is not None:
+        rosters = rosters.filter(player__in=player_ids)
+        stats = stats.filter(player__in=player_ids)
+
+    positions = {}
+    goalie_teams = {}
+    for row in rosters.values("player", "team", "team__division", "position1"):
+        positions.setdefault((row["player"], row["team"]), row["position1"])
+        if row["position1"] == GOALIE_POSITION:
+            goalie_teams.setdefault(row["player"], {})[row["team"]] = row[
+                "team__division"
+            ]
+
+    stat_rows = (
+        stats.values(
+            "player",
+            "team",
+            "team__team_name",
+            "team__division",
+            "team__season__year",
+            "team__season__season_type",
+        )
+        .annotate(
+            sum_goals=Sum("goals"),
+            sum_assists=Sum("assists"),
+            sum_goals_against=Sum(
+                Coalesce("goals_against", 0) - Coalesce("empty_net", 0)
+            ),
+            sum_games_played=Count("id"),
+        )
+        .order_by("player", "team__season__year", "team__season__season_type", "team")
+    )
+
+    rows_by_player = {}
+    offense_by_player = {}
+    goalie_by_player = {}
+    for row in stat_rows:
+        pid = row["player"]
+        team_id = row["team"]
+        season = {
+            "team_id": team_id,
+            "division": row["team__division"],
+            "year": row["team__season__year"],
+            "season_type": row["team__season__season_type"],
+            "label": _season_label(row),
+        }
+        if team_id in goalie_teams.get(pid, {}):
+            games = row["sum_games_played"] or 0
+            if games:
+                season["gaa"] = round((row["sum_goals_against"] or 0) / games, 2)
+                goalie_by_player.setdefault(pid, []).append(season)
+            continue
+        goals = row["sum_goals"] or 0
+        assists = row["sum_assists"] or 0
+        season.update(
+            goals=goals,
+            assists=assists,
+            points=goals + assists,
+            position=positions.get((pid, team_id)),
+        )
+        rows_by_player.setdefault(pid, []).append(season)
+        if goals or assists:
+            offense_by_player.setdefault(pid, []).append(season)
+
+    offense_fits = _batch_series(offense_by_player, "points")
+    goalie_fits = _batch_series(goalie_by_player, "gaa")
+
+    trends = {}
+    for pid in set(rows_by_player) | set(goalie_by_player) | set(goalie_teams):
+        entry = _empty_entry()
+        entry["rows"] = rows_by_player.get(pid, [])
+        offense_rows = offense_by_player.get(pid, [])
+        if offense_rows:
+            entry["offense"] = _offense_series(offense_rows, offense_fits[pid])
+        entry["goalie_rows"] = goalie_by_player.get(pid, [])
+        entry["goalie_teams"] = list(goalie_teams.get(pid, {}).items())
+        if entry["goalie_rows"]:
+            entry["goalie"] = _goalie_series(
+                entry["goalie_rows"],
+                [team_id for team_id, _ in entry["goalie_teams"]],
+                goalie_fits[pid],
+            )
+        trends[pid] = entry
+    return trends
+
+
+def _cache_key(version, player_id):
+    return f"player_trends:{version}:{player_id}"
+
+
+def get_player_trends():
+    """
+    Build the ``{player_id: entry}`` map for every player and cache each
+    entry under its own key.
+    """
+    from leagues.signals import get_stats_version
+
+    version = get_stats_version()
+    trends = build_player_trends()
+    cache.set_many(
+        {_cache_key(version, pid): entry for pid, entry in trends.items()},
+        PLAYER_TRENDS_TTL,
+    )
+    return trends
+
+
+def get_player_trend(player_id):
+    """Return one player's precomputed entry (empty if they have no stats)."""
+    from leagues.signals import get_stats_version
+
+    player_id = int(player_id)
+    cache_key = _cache_key(get_stats_version(), player_id)
+    entry = cache.get(cache_key)
+    if entry is None:
+        entry = build_player_trends([player_id]).get(player_id) or _empty_entry()
+        cache.set(cache_key, entry, PLAYER_TRENDS_TTL)
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# Views over a precomputed entry
+# ---------------------------------------------------------------------------
+
+
+def _last(items, timespan):
+    if timespan and timespan != "all":
+        return items[-int(timespan) :]
+    return items
+
+
+def goalie_trend(entry, division=None, timespan=None):
+    """
+    GAA series restricted to a division and/or the most recent seasons.
+
+    Same shape as the old ``get_goalie_trend_data``: None when the player has
+    no goalie-position roster entry (in that division) or no GAA seasons.
+    """
+    filtered = division and division != "all"
+    team_ids = [
+        team_id
+        for team_id, team_division in entry["goalie_teams"]
+        if not filtered or str(team_division) == str(division)
+    ]
+    if not team_ids:
+        return None
+    if not filtered and not (timespan and timespan != "all"):
+        return entry["goalie"]
+    rows = [
+        r
+        for r in entry["goalie_rows"]
+        if not filtered or str(r["division"]) == str(division)
+    ]
+    return _goalie_series(_last(rows, timespan), team_ids)
+
+
+def offensive_snapshot(entry, limit=None):
+    """The player-page snapshot: seasons with points, most recent `limit`."""
+    series = entry["offense"]
+    if not limit or len(series["player_seasons"]) <= limit:
+        return dict(series)
+    return {
+        key: value[-limit:] if isinstance(value, list) else value
+        for key, value in series.items()
+    }
+
+
+def offensive_trend(entry, division=None, timespan=None):
+    """
+    The trends-page series: most recent `timespan` seasons in `division`,
+    then 0/0 seasons dropped unless the player was a defenseman or goalie.
+    """
+    rows = entry["rows"]
+    if division and division != "all":
+        rows = [r for r in rows if str(r["division"]) == str(division)]
+    rows = [
+        r for r in _last(rows, timespan) if r["points"] > 0 or r["position"] in (3, 4)
+    ]
+    return _offense_series(rows)
+
+
+# ---------------------------------------------------------------------------
+# League-wide
+# ---------------------------------------------------------------------------
+
+
+def most_improved_players(limit=10):
+    """
+    Players with the biggest points jump into the latest season on record.
+
+    Reads only the precomputed deltas, so it costs no per-player queries;
+    the result is cached under the stats data version.  Returns dicts with
+    player_id, label, points, previous_points and delta.
+    """
+    from leagues.signals import get_stats_version
+
+    cache_key = f"most_improved:{get_stats_version()}:{limit}"
+    improved = cache.get(cache_key)
+    if improved is None:
+        improved = _most_improved(get_player_trends(), limit)
+        cache.set(cache_key, improved, PLAYER_TRENDS_TTL)
+    return improved
+
+
+def _most_improved(trends, limit):
+    latest = None
+    candidates = []
+    for pid, entry in trends.items():
+        rows = [r for r in entry["rows"] if r["points"] > 0]
+        if len(rows) < MOST_IMPROVED_MIN_SEASONS:
+            continue
+        season_key = (rows[-1]["year"], rows[-1]["season_type"] or 0)
+        latest = max(latest, season_key) if latest else season_key
+        delta = entry["offense"]["point_deltas"][-1]
+        if delta is None:
+            continue
+        candidates.append(
+            (
+                season_key,
+                {
+                    "player_id": pid,
+                    "label": rows[-1]["label"],
+                    "points": rows[-1]["points"],
+                    "previous_points": rows[-2]["points"],
+                    "delta": int(delta),
+                },
+            )
+        )
+    improved = [row for key, row in candidates if key == latest and row["delta"] > 0]
+    improved.sort(key=lambda row: (-row["delta"], -row["points"]))
+    return improved[:limit]
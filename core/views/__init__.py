@@ -3,10 +3,11 @@ from .players import (
     PlayerAllTimeStats_list,
     PlayerAutocomplete,
     PlayerStatDetailView,
-    calculate_player_stats,
     filter_stats_by_scope,
     get_average_stats_for_player,
+    get_cached_leader_stats_by_division,
     get_division_leader_stats,
+    get_leader_stats_by_division,
     get_player_stats,
     normalize_stat_scope,
     player_trends_view,
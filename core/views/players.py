@@ -1,8 +1,8 @@
 from collections import OrderedDict, namedtuple
 from decimal import ROUND_HALF_UP, Decimal
 
-import numpy as np
 from dal import autocomplete
+from django.core.cache import cache
 from django.db import connection
 from django.db.models import (
     Case,
@@ -24,6 +24,7 @@ from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404, render
 from django.views.generic.list import ListView
 
+from core import trends
 from leagues.models import (
     Division,
     Player,
@@ -33,6 +34,9 @@ from leagues.models import (
     Team,
     Team_Stat,
 )
+from leagues.name_matching import search_players
+
+_LEADER_STATS_TTL = 60 * 10  # 10 minutes; stat edits invalidate via version key
 
 
 def normalize_stat_scope(scope, default="regular"):
@@ -187,10 +191,47 @@ def get_division_leader_stats(division, season, scope="regular"):
     The output dicts use the same keys the old view produced (``roster__*``
     prefixes included) so ``partials/stats.html`` renders unchanged.
     """
+    division_id = getattr(division, "pk", division)
+    by_division = _build_leader_stats(season, scope, division=division_id)
+    return by_division.get(division_id, [])
+
+
+def get_leader_stats_by_division(season, scope="regular"):
+    """Return ``{division_id: leader rows}`` for every division at once.
+
+    Same rows as calling ``get_division_leader_stats`` per division, but all
+    divisions share one grouped Stat aggregate and one Roster query and are
+    partitioned in memory, so the page cost no longer scales with the number
+    of divisions.
+    """
+    return _build_leader_stats(season, scope)
+
+
+def get_cached_leader_stats_by_division(season, scope="regular"):
+    """``get_leader_stats_by_division`` cached per (season, scope).
+
+    The key embeds the stats data version, which is bumped whenever a Stat,
+    Roster, MatchUp or Team changes, so a cached page is never stale.
+    """
+    from leagues.signals import get_stats_version
+
     scope_value = normalize_stat_scope(scope, default="regular")
+    cache_key = f"division_leaders:{get_stats_version()}:{int(season)}:{scope_value}"
+    result = cache.get(cache_key)
+    if result is None:
+        result = get_leader_stats_by_division(season, scope=scope_value)
+        cache.set(cache_key, result, _LEADER_STATS_TTL)
+    return result
+
 
-    roster_qs = Roster.objects.filter(team__division=division)
-    stat_qs = Stat.objects.filter(team__division=division)
+def _build_leader_stats(season, scope, division=None):
+    scope_value = normalize_stat_scope(scope, default="regular")
+
+    roster_qs = Roster.objects.filter(team__division__isnull=False)
+    stat_qs = Stat.objects.filter(team__division__isnull=False)
+    if division is not None:
+        roster_qs = roster_qs.filter(team__division=division)
+        stat_qs = stat_qs.filter(team__division=division)
     if season == 0:
         # season 0 == "current": old code only counted stats on active teams.
         roster_qs = roster_qs.filter(team__is_active=True)
@@ -201,7 +242,8 @@ def get_division_leader_stats(division, season, scope="regular"):
 
     stat_qs = filter_stats_by_scope(stat_qs, scope_value)
 
-    # One grouped aggregate per (player, team) -- no cartesian product.
+    # One grouped aggregate per (player, team) -- no cartesian product. A team
+    # belongs to exactly one division, so this grain partitions cleanly.
     stat_totals = {
         (row["player"], row["team"]): row
         for row in stat_qs.values("player", "team").annotate(
@@ -219,12 +261,13 @@ def get_division_leader_stats(division, season, scope="regular"):
         "player__last_name",
         "team",
         "team__team_name",
+        "team__division",
         "position1",
         "position2",
         "is_captain",
     )
 
-    results = []
+    results = {}
     for roster_row in roster_rows:
         totals = stat_totals.get((roster_row["player"], roster_row["team"]))
         if totals is None:
@@ -237,7 +280,7 @@ def get_division_leader_stats(division, season, scope="regular"):
             )
         else:
             average_goals_against = Decimal("0.00")
-        results.append(
+        results.setdefault(roster_row["team__division"], []).append(
             {
                 "id": roster_row["player"],
                 "first_name": roster_row["player__first_name"],
@@ -257,14 +300,15 @@ def get_division_leader_stats(division, season, scope="regular"):
         )
 
     # Mirror the old ordering: best (lowest) GAA first, then most points/goals/assists.
-    results.sort(
-        key=lambda row: (
-            row["rounded_average_goals_against"],
-            -row["total_points"],
-            -row["sum_goals"],
-            -row["sum_assists"],
+    for rows in results.values():
+        rows.sort(
+            key=lambda row: (
+                row["rounded_average_goals_against"],
+                -row["total_points"],
+                -row["sum_goals"],
+                -row["sum_assists"],
+            )
         )
-    )
     return results
 
 
@@ -572,79 +616,6 @@ def is_primarily_goalie_player(player_id):
     return goalie_count > non_goalie_count
 
 
-def get_goalie_trend_data(player, season_mapping, division=None, timespan=None):
-    """
-    Return GAA-per-season data for teams where this player's primary position was Goalie.
-    Returns None if the player has no goalie-position roster entries.
-    Optional filters: division (int) and timespan (int, most-recent N seasons).
-    """
-    goalie_roster_qs = Roster.objects.filter(
-        player=player, position1=4, is_substitute=False
-    )
-    if division and division != "all":
-        goalie_roster_qs = goalie_roster_qs.filter(team__division=division)
-    goalie_team_ids = list(goalie_roster_qs.values_list("team_id", flat=True))
-
-    if not goalie_team_ids:
-        return None
-
-    stats = (
-        Stat.objects.filter(player=player, team_id__in=goalie_team_ids)
-        .values(
-            "team__id",
-            "team__team_name",
-            "team__season__year",
-            "team__season__season_type",
-        )
-        .annotate(
-            sum_goals_against=Sum(
-                Coalesce("goals_against", 0) - Coalesce("empty_net", 0)
-            ),
-            sum_games_played=Count("id"),
-        )
-        .order_by("team__season__year", "team__season__season_type")
-    )
-
-    seasons = []
-    gaas = []
-    for stat in stats:
-        gp = stat["sum_games_played"] or 0
-        if gp > 0:
-            gaa = round((stat["sum_goals_against"] or 0) / gp, 2)
-            label = (
-                f"{stat['team__season__year']} "
-                f"{season_mapping.get(stat['team__season__season_type'], 'Unknown')} "
-                f"({stat['team__team_name']})"
-            )
-            seasons.append(label)
-            gaas.append(gaa)
-
-    if timespan and timespan != "all":
-        seasons = seasons[-int(timespan) :]
-        gaas = gaas[-int(timespan) :]
-
-    if not seasons:
-        return None
-
-    avg_gaa = round(sum(gaas) / len(gaas), 2)
-
-    x = np.arange(len(gaas))
-    y = np.array(gaas)
-    if len(x) > 1:
-        trend = np.polyfit(x, y, 1)
-        gaa_trend_line = (trend[0] * x + trend[1]).tolist()
-    else:
-        gaa_trend_line = y.tolist()
-
-    return {
-        "goalie_seasons": seasons,
-        "goalie_gaas": gaas,
-        "avg_gaa": avg_gaa,
-        "gaa_trend_line": gaa_trend_line,
-        "goalie_team_ids": goalie_team_ids,
-    }
-
-
 def get_average_stats_for_player(player_id, scope="combined"):
     stats = filter_stats_by_scope(Stat.objects.filter(player_id=player_id), scope)
     totals = stats.aggregate(
@@ -685,97 +656,12 @@ def get_stats_for_past_team(team):
     )
 
 
-def calculate_player_stats(
-    player, season_mapping, scope="combined", exclude_team_ids=None
-):
-    base_qs = filter_stats_by_scope(Stat.objects.filter(player=player), scope)
-    if exclude_team_ids:
-        base_qs = base_qs.exclude(team_id__in=exclude_team_ids)
-    offensive_stats = (
-        base_qs.select_related("team__season", "team__division")
-        .values(
-            "team__season__year",
-            "team__season__season_type",
-            "team__team_name",
-            "team__division",
-            "team__id",
-        )
-        .annotate(
-            sum_goals=Sum("goals"),
-            sum_assists=Sum("assists"),
-            team_wins=Max("team__team_stat__win"),
-            team_losses=Max("team__team_stat__loss"),
-            team_ties=Max("team__team_stat__tie"),
-            team_otw=Max("team__team_stat__otw"),
-            team_otl=Max("team__team_stat__otl"),
-        )
-        .order_by("team__season__year", "team__season__season_type")
-    )  # Earliest to most recent for trend chart
-
-    # Filter out seasons where both goals and assists are zero
-    offensive_stats = [
-        stat
-        for stat in offensive_stats
-        if (stat["sum_goals"] or 0) > 0 or (stat["sum_assists"] or 0) > 0
-    ]
-
-    # Create a separate list for the table with most recent seasons on top
-    offensive_stats_table = list(offensive_stats)[::-1]
-
-    player_seasons = [
-        f"{stat['team__season__year']} {season_mapping.get(stat['team__season__season_type'], 'Unknown')} ({stat['team__team_name']})"
-        for stat in offensive_stats
-    ]
-    player_goals = [
-        stat["sum_goals"] if stat["sum_goals"] is not None else 0
-        for stat in offensive_stats
-    ]
-    player_assists = [
-        stat["sum_assists"] if stat["sum_assists"] is not None else 0
-        for stat in offensive_stats
-    ]
-    player_points = [
-        goals + assists for goals, assists in zip(player_goals, player_assists)
-    ]
-
-    # Calculate trend line for total points
-    if player_points:
-        x = np.arange(len(player_points))
-        y = np.array(player_points)
-        if len(x) > 1:  # Ensure there are enough points to calculate a trend line
-            trend = np.polyfit(x, y, 1)
-            trend_line = trend[0] * x + trend[1]
-        else:
-            trend_line = y  # Not enough points to calculate a trend line
-        trend_line = (
-            trend_line.tolist()
-        )  # Convert numpy array to list for JSON serialization
-    else:
-        trend_line = []
-
-    return {
-        "offensive_stats": offensive_stats_table,  # Most recent to earliest for table
-        "player_seasons": player_seasons,
-        "player_goals": player_goals,
-        "player_assists": player_assists,
-        "player_points": player_points,
-        "trend_line": trend_line,
-    }
-
-
 class PlayerAutocomplete(autocomplete.Select2QuerySetView):
     def get_queryset(self):
         if not self.request.user.is_authenticated:
             return Player.objects.none()
 
-        qs = Player.objects.all()
-
-        if self.q:
-            qs = qs.filter(
-                Q(first_name__icontains=self.q) | Q(last_name__icontains=self.q)
-            )
-
-        return qs
+        return search_players(Player.objects.all(), self.q)
 
 
 class PlayerStatDetailView(ListView):
@@ -801,11 +687,11 @@ class PlayerStatDetailView(ListView):
         }[stat_scope]
         context["player_stat_list"] = OrderedDict()
 
-        divisions = Division.objects.all()
-        for div in divisions:
-            context["player_stat_list"][str(div)] = get_division_leader_stats(
-                div, context["active_season"], scope=stat_scope
-            )
+        leaders = get_cached_leader_stats_by_division(
+            context["active_season"], scope=stat_scope
+        )
+        for div in Division.objects.all():
+            context["player_stat_list"][str(div)] = leaders.get(div.pk, [])
 
         return context
 
@@ -885,21 +771,13 @@ def PlayerAllTimeStats_list(request):
 
 def player_view(request, player_id):
     player = get_object_or_404(Player, id=player_id)
-    season_mapping = {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}
     primarily_goalie = is_primarily_goalie_player(player_id)
     snapshot_limit = 15
-    goalie_trend = get_goalie_trend_data(
-        player, season_mapping, timespan=snapshot_limit
-    )
-    # Exclude primary-goalie teams from the offensive snapshot
-    goalie_team_ids = goalie_trend["goalie_team_ids"] if goalie_trend else []
-    stats = calculate_player_stats(
-        player, season_mapping, scope="combined", exclude_team_ids=goalie_team_ids
-    )
-    # Limit offensive snapshot to the most recent seasons
-    for key in ("player_seasons", "player_goals", "player_assists", "trend_line"):
-        if len(stats.get(key, [])) > snapshot_limit:
-            stats[key] = stats[key][-snapshot_limit:]
+    # Season series and trend fits come precomputed for every player; the
+    # offensive snapshot already excludes teams the player was rostered as goalie.
+    player_trend = trends.get_player_trend(player.pk)
+    goalie_trend = trends.goalie_trend(player_trend, timespan=snapshot_limit)
+    stats = trends.offensive_snapshot(player_trend, limit=snapshot_limit)
     career_stats = get_career_stats_for_player(player_id)
 
     def build_stat_section(key, label, scope):
@@ -968,62 +846,22 @@ def player_trends_view(request):
     if player_id:
         try:
             player = get_object_or_404(Player, id=player_id)
-            season_mapping = {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}
             primarily_goalie = is_primarily_goalie_player(int(player_id))
+            if timespan != "all":
+                timespan = int(timespan)
 
-            # Goalie trend (filtered by division/timespan)
-            goalie_trend = get_goalie_trend_data(
-                player, season_mapping, division=division, timespan=timespan
+            player_trend = trends.get_player_trend(player.pk)
+            goalie_trend = trends.goalie_trend(
+                player_trend, division=division, timespan=timespan
             )
-            goalie_team_ids = goalie_trend["goalie_team_ids"] if goalie_trend else []
-
-            # Offensive stats — exclude teams where the player was the primary goalie
-            offensive_stats = (
-                Stat.objects.filter(player=player)
-                .exclude(team_id__in=goalie_team_ids)
-                .select_related("team__season", "team__division")
-                .values(
-                    "team__season__year",
-                    "team__season__season_type",
-                    "team__team_name",
-                    "team__division",
-                    "team__id",
-                )
-                .annotate(sum_goals=Sum("goals"), sum_assists=Sum("assists"))
-                .order_by("-team__season__year", "-team__season__season_type")
+            # Offensive series excludes teams where the player was the
+            # primary goalie; 0/0 seasons are kept only for D and G.
+            series = trends.offensive_trend(
+                player_trend, division=division, timespan=timespan
             )
-
-            if division != "all":
-                offensive_stats = offensive_stats.filter(team__division=division)
-
-            if timespan != "all":
-                timespan = int(timespan)
-                offensive_stats = offensive_stats[:timespan]
-
-            offensive_stats = list(offensive_stats)[::-1]
-
-            # Filter out 0/0 seasons for non-defense/non-goalie players
-            filtered_stats = []
-            for stat in offensive_stats:
-                roster_entry = Roster.objects.filter(
-                    player=player, is_substitute=False, team_id=stat["team__id"]
-                ).first()
-                primary_position = roster_entry.position1 if roster_entry else None
-                sum_goals = stat["sum_goals"] or 0
-                sum_assists = stat["sum_assists"] or 0
-                if primary_position not in [3, 4]:
-                    if sum_goals > 0 or sum_assists > 0:
-                        filtered_stats.append(stat)
-                else:
-                    filtered_stats.append(stat)
-
-            player_seasons = [
-                f"{stat['team__season__year']} {season_mapping.get(stat['team__season__season_type'], 'Unknown')} ({stat['team__team_name']})"
-                for stat in filtered_stats
-            ]
-            player_goals = [stat["sum_goals"] or 0 for stat in filtered_stats]
-            player_assists = [stat["sum_assists"] or 0 for stat in filtered_stats]
-            player_points = [g + a for g, a in zip(player_goals, player_assists)]
+            player_goals = series["player_goals"]
+            player_assists = series["player_assists"]
+            player_points = series["player_points"]
 
             average_goals = sum(player_goals) / len(player_goals) if player_goals else 0
             average_assists = (
@@ -1033,25 +871,14 @@ def player_trends_view(request):
                 sum(player_points) / len(player_points) if player_points else 0
             )
 
-            if player_points:
-                x = np.arange(len(player_points))
-                y = np.array(player_points)
-                trend_line = (
-                    (np.polyfit(x, y, 1)[0] * x + np.polyfit(x, y, 1)[1]).tolist()
-                    if len(x) > 1
-                    else y.tolist()
-                )
-            else:
-                trend_line = []
-
             context.update(
                 {
                     "player": player,
-                    "player_seasons": player_seasons,
+                    "player_seasons": series["player_seasons"],
                     "player_goals": player_goals,
                     "player_assists": player_assists,
                     "player_points": player_points,
-                    "trend_line": trend_line,
+                    "trend_line": series["trend_line"],
                     "timespan": timespan,
                     "player_id": player_id,
                     "division": division,
@@ -1065,5 +892,15 @@ def player_trends_view(request):
 
         except Exception as e:
             print(f"Error: {e}")
+    else:
+        most_improved = trends.most_improved_players()
+        players_by_id = Player.objects.in_bulk(
+            [row["player_id"] for row in most_improved]
+        )
+        context["most_improved"] = [
+            {**row, "player": players_by_id[row["player_id"]]}
+            for row in most_improved
+            if row["player_id"] in players_by_id
+        ]
 
     return render(request, "leagues/player_trends.html", context=context)
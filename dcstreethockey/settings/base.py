@@ -113,11 +113,13 @@ TEMPLATES = [
 # WSGI_APPLICATION = 'dcstreethockey.wsgi.application'
 ASGI_APPLICATION = "dcstreethockey.asgi.application"
 
-# Channel layer — in-memory is fine for single-server Render deployments.
-# Swap for channels_redis.core.RedisChannelLayer if you ever run multiple workers.
+# Channel layer — in-memory queues per worker, with group messages relayed
+# between workers over PostgreSQL LISTEN/NOTIFY so the draft board works with
+# several uvicorn workers.  On SQLite (tests) it's plain in-memory.
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
+        "BACKEND": "leagues.channel_layers.PostgresChannelLayer",
+        "CONFIG": {"channel": "dcsh_channel_layer"},
     }
 }
 
@@ -15,6 +15,8 @@ from django.core.exceptions import PermissionDenied
 
 from dal import autocomplete
 from .forms import MatchUpForm, TeamStatForm
+from .goalie_eligibility import eligible_goalies
+from .views import GOALIE_STATUS_FIELDS, broadcast_goalie_status
 from .fields import TwelveHourTimeField
 from .widgets import Time12HourWidget
 from leagues.models import (
@@ -1206,6 +1208,11 @@ class MatchUpGoalieStatusAdmin(admin.ModelAdmin):
         ),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if set(form.changed_data) & set(GOALIE_STATUS_FIELDS):
+            broadcast_goalie_status(obj)
+
     def get_readonly_fields(self, request, obj=None):
         # Make match info read-only since this admin is just for goalie status
         return ["week", "time", "awayteam", "hometeam"]
@@ -1272,22 +1279,7 @@ class MatchUpGoalieStatusAdmin(admin.ModelAdmin):
 
     def _get_goalie_queryset(self):
         """Get the filtered queryset of goalies for dropdown fields."""
-        from datetime import date
-
-        current_year = date.today().year
-        recent_years = [current_year, current_year - 1, current_year - 2]
-
-        # Use a subquery approach for better performance
-        goalie_player_ids = Roster.objects.filter(
-            Q(position1=4) | Q(position2=4)
-        ).values_list("player_id", flat=True)
-
-        return (
-            Player.objects.filter(Q(id__in=goalie_player_ids) | Q(can_play_goalie=True))
-            .filter(Q(is_active=True) | Q(roster__team__season__year__in=recent_years))
-            .distinct()
-            .order_by("last_name", "first_name")
-        )
+        return eligible_goalies()
 
     def get_changelist_form(self, request, **kwargs):
         # Cache goalie choices on the request to avoid re-querying
@@ -2494,6 +2486,15 @@ class DraftSessionAdmin(admin.ModelAdmin):
         ),
     )
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Draft positions, rounds or num_rounds may have changed; keep an
+        # already-built pick order table in step with them.
+        session = form.instance
+        session.refresh_from_db(fields=["pick_order"])
+        if session.pick_order:
+            session.rebuild_pick_order()
+
     def signup_count(self, obj):
         return obj.season.signups.count()
 
@@ -0,0 +1,215 @@
+"""
+Channel layer for running the draft board on several web workers without Redis.
+
+InMemoryChannelLayer keeps groups and queues inside one process, so a pick
+made on one uvicorn worker never reaches spectators connected to another.
+PostgresChannelLayer keeps the in-memory queues for local delivery and relays
+group_send (and sends to a channel owned by another worker) through
+PostgreSQL LISTEN/NOTIFY on the database we already run.  Every worker
+LISTENs on one notification channel and hands relayed messages to its own
+group members, so group_add and group_discard stay local bookkeeping.
+
+When the database isn't PostgreSQL (the test suite runs on SQLite) the layer
+never opens a connection and behaves exactly like InMemoryChannelLayer.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+import string
+import uuid
+import weakref
+
+from channels.exceptions import ChannelFull
+from channels.layers import InMemoryChannelLayer
+from django.db import connections
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are capped at 8000 bytes; larger messages are split into
+# pieces sent in one transaction, which PostgreSQL delivers together.
+MAX_PIECE = 7000
+
+_OWNED_CHANNEL = re.compile(r"\.pg([0-9a-f]{12})!")
+
+
+class _Publisher:
+    """One NOTIFY connection per event loop, reopened after errors."""
+
+    def __init__(self, connect):
+        self._connect = connect
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    async def notify(self, channel, pieces):
+        async with self._lock:
+            if self._conn is None or self._conn.closed:
+                self._conn = await self._connect()
+            try:
+                async with self._conn.transaction():
+                    for piece in pieces:
+                        await self._conn.execute(
+                            "SELECT pg_notify(%s, %s)", (channel, piece)
+                        )
+            except Exception:
+                await self.close()
+                raise
+
+    async def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+class PostgresChannelLayer(InMemoryChannelLayer):
+    """
+    InMemoryChannelLayer that relays across processes over LISTEN/NOTIFY.
+
+    CONFIG options, besides InMemoryChannelLayer's: ``channel`` (the NOTIFY
+    channel every worker listens on) and ``database`` (the DATABASES alias
+    whose connection settings are used).
+    """
+
+    def __init__(self, channel="channel_layer", database="default", **kwargs):
+        super().__init__(**kwargs)
+        self.notify_channel = channel
+        self.database = database
+        self.process_id = uuid.uuid4().hex[:12]
+        self._listener = None
+        self._publishers = weakref.WeakKeyDictionary()
+        self._partial = {}
+        self._msg_ids = itertools.count()
+
+    @cached_property
+    def relay_enabled(self):
+        return connections[self.database].vendor == "postgresql"
+
+    # Channel layer API
+
+    async def new_channel(self, prefix="specific."):
+        """Channel names carry our process id so other workers can route to us."""
+        self._ensure_listener()
+        return "%s.pg%s!%s" % (
+            prefix,
+            self.process_id,
+            "".join(random.choice(string.ascii_letters) for i in range(12)),
+        )
+
+    async def send(self, channel, message):
+        if self._is_local(channel):
+            await super().send(channel, message)
+        else:
+            assert isinstance(message, dict), "message is not a dict"
+            assert self.valid_channel_name(channel), "Channel name not valid"
+            await self._publish({"c": channel, "m": message})
+
+    async def group_add(self, group, channel):
+        await super().group_add(group, channel)
+        self._ensure_listener()
+
+    async def group_send(self, group, message):
+        await super().group_send(group, message)
+        if self.relay_enabled:
+            await self._publish({"g": group, "m": message})
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        publisher = self._publishers.pop(asyncio.get_running_loop(), None)
+        if publisher is not None:
+            await publisher.close()
+
+    # Relay
+
+    def _is_local(self, channel):
+        owner = _OWNED_CHANNEL.search(channel)
+        return not self.relay_enabled or owner is None or owner[1] == self.process_id
+
+    def encode(self, envelope):
+        """Split an envelope into NOTIFY payloads: ``origin id index count body``."""
+        body = json.dumps(envelope, separators=(",", ":"))
+        pieces = [body[i : i + MAX_PIECE] for i in range(0, len(body), MAX_PIECE)]
+        msg_id = next(self._msg_ids)
+        return [
+            f"{self.process_id} {msg_id} {index} {len(pieces)} {piece}"
+            for index, piece in enumerate(pieces)
+        ]
+
+    async def receive_notify(self, payload):
+        """Deliver one NOTIFY payload from another worker to our local channels."""
+        origin, msg_id, index, count, piece = payload.split(" ", 4)
+        if origin == self.process_id:
+            return  # Already delivered locally when it was sent.
+        if count != "1":
+            parts = self._partial.setdefault((origin, msg_id), {})
+            parts[int(index)] = piece
+            if len(parts) < int(count):
+                return
+            del self._partial[(origin, msg_id)]
+            piece = "".join(parts[i] for i in range(int(count)))
+
+        envelope = json.loads(piece)
+        if "g" in envelope:
+            await InMemoryChannelLayer.group_send(self, envelope["g"], envelope["m"])
+        elif self._is_local(envelope["c"]):
+            try:
+                await InMemoryChannelLayer.send(self, envelope["c"], envelope["m"])
+            except ChannelFull:
+                pass
+
+    async def _publish(self, envelope):
+        loop = asyncio.get_running_loop()
+        publisher = self._publishers.get(loop)
+        if publisher is None:
+            publisher = self._publishers[loop] = _Publisher(self._connect)
+        try:
+            await publisher.notify(self.notify_channel, self.encode(envelope))
+        except Exception:
+            # Local members already have the message; don't fail the sender
+            # because the other workers couldn't be reached.
+            logger.exception("Channel layer could not relay to other workers")
+
+    def _ensure_listener(self):
+        if not self.relay_enabled:
+            return
+        if self._listener is not None and not (
+            self._listener.done() or self._listener.get_loop().is_closed()
+        ):
+            return
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        from psycopg import sql
+
+        delay = 1
+        while True:
+            try:
+                async with await self._connect() as conn:
+                    await conn.execute(
+                        sql.SQL("LISTEN {}").format(sql.Identifier(self.notify_channel))
+                    )
+                    self._partial = {}
+                    delay = 1
+                    async for notify in conn.notifies():
+                        await self.receive_notify(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Channel layer listener disconnected; retrying in %ss", delay
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def _connect(self):
+        import psycopg
+
+        params = connections[self.database].get_connection_params()
+        params.pop("cursor_factory", None)
+        params.pop("context", None)
+        return await psycopg.AsyncConnection.connect(autocommit=True, **params)
@@ -0,0 +1,243 @@
+"""
+In-process ring buffer of recent draft chat messages, one per session.
+
+Every WebSocket connect sends the latest chat history, so a reconnect storm
+on draft night used to mean one messages query plus one reactions query per
+client.  Instead the first consumer in a worker loads the latest
+``BUFFER_SIZE`` messages (with reactions aggregated into
+``{emoji: [sender_name, ...]}``) and the worker's consumers keep that copy
+current from the same group events they forward to their clients: new
+messages are appended, reaction maps are updated in place, deletions drop
+the message.  Events that reshape the board (swaps, late signups, reset)
+invalidate the buffer and the next connect reloads it.
+
+A buffer is registered before its messages are loaded: chat events that
+arrive during the load are queued on it and replayed over the loaded
+messages, so none is lost between the query and the buffer going live.
+
+The buffer is dropped when the last consumer for the session in this worker
+disconnects, since nothing would keep it current after that.
+"""
+
+import threading
+from collections import Counter, OrderedDict
+
+from .models import DraftChatMessage, DraftChatReaction
+
+# Messages kept per session; "load older" past this goes to the database.
+BUFFER_SIZE = 200
+
+_buffers = {}
+_subscribers = Counter()
+_lock = threading.Lock()
+
+
+def serialize_message(msg, reactions=None):
+    """A DraftChatMessage as a JSON-safe dict, with aggregated reactions."""
+    return {
+        "id": msg.pk,
+        "sender_name": msg.sender_name,
+        "sender_type": msg.sender_type,
+        "body": msg.body,
+        "sent_at": msg.sent_at.isoformat(),
+        "reactions": reactions if reactions is not None else {},
+    }
+
+
+def reaction_map(reactions):
+    """Aggregate DraftChatReaction rows (or dicts) into {emoji: [names]}."""
+    aggregated = {}
+    for r in reactions:
+        if isinstance(r, dict):
+            aggregated.setdefault(r["emoji"], []).append(r["sender_name"])
+        else:
+            aggregated.setdefault(r.emoji, []).append(r.sender_name)
+    return aggregated
+
+
+def load_messages(session_pk, limit, before_id=None):
+    """
+    Latest ``limit`` visible messages (older than ``before_id`` if given),
+    oldest first, and whether there are more before them.  Two queries.
+    """
+    qs = DraftChatMessage.objects.filter(session_id=session_pk, deleted=False)
+    if before_id is not None:
+        qs = qs.filter(pk__lt=before_id)
+    msgs = list(qs.order_by("-pk")[: limit + 1])
+    has_more = len(msgs) > limit
+    msgs = msgs[:limit][::-1]
+
+    reactions = {}
+    for r in DraftChatReaction.objects.filter(message__in=msgs).values(
+        "message_id", "emoji", "sender_name"
+    ):
+        reactions.setdefault(r["message_id"], []).append(r)
+    return [
+        serialize_message(m, reaction_map(reactions.get(m.pk, []))) for m in msgs
+    ], has_more
+
+
+class ChatBuffer:
+    """
+    Recent messages for one session, keyed by id in ascending order.
+
+    Created empty and loading; ``fill`` installs the loaded messages and
+    replays the events queued meanwhile.  A loading buffer has no history
+    (``latest`` returns None, ``contains`` False).
+    """
+
+    def __init__(self):
+        self._messages = OrderedDict()
+        # True while the buffer holds every visible message of the session.
+        self.complete = False
+        self._lock = threading.RLock()
+        # Events received while loading, as (method, args); None once filled.
+        self._pending = []
+        self._loaded = threading.Event()
+        self.failed = False
+
+    def fill(self, messages, complete):
+        """Install the loaded messages and replay the queued events."""
+        with self._lock:
+            self._messages = OrderedDict((m["id"], m) for m in messages)
+            self.complete = complete
+            pending, self._pending = self._pending, None
+            # Under the (reentrant) lock, so no live event overtakes them.
+            for method, args in pending:
+                method(*args)
+        self._loaded.set()
+
+    def fail(self):
+        """The load failed: release the threads waiting for it."""
+        self.failed = True
+        self._loaded.set()
+
+    def wait_loaded(self):
+        self._loaded.wait()
+
+    def _queue(self, method, *args):
+        """Queue the event while loading; True if it was queued."""
+        if self._pending is None:
+            return False
+        self._pending.append((method, args))
+        return True
+
+    def latest(self, limit, before_id=None):
+        """
+        ``(messages, has_more)`` from the buffer, or None when it doesn't
+        reach far enough back (or is still loading) and the caller has to
+        ask the database.
+        """
+        with self._lock:
+            if self._pending is not None:
+                return None
+            ids = list(self._messages)
+            if before_id is not None:
+                ids = [pk for pk in ids if pk < before_id]
+            if len(ids) < limit and not self.complete:
+                return None
+            has_more = len(ids) > limit or not self.complete
+            return [self._copy(self._messages[pk]) for pk in ids[-limit:]], has_more
+
+    def contains(self, message_id):
+        with self._lock:
+            return message_id in self._messages
+
+    def add(self, message):
+        with self._lock:
+            if self._queue(self.add, message):
+                return
+            self._messages[message["id"]] = self._copy(message)
+            if len(self._messages) > 1 and message["id"] < next(
+                reversed(self._messages)
+            ):
+                self._messages = OrderedDict(sorted(self._messages.items()))
+            while len(self._messages) > BUFFER_SIZE:
+                self._messages.popitem(last=False)
+                self.complete = False
+
+    def remove(self, message_id):
+        with self._lock:
+            if self._queue(self.remove, message_id):
+                return
+            self._messages.pop(message_id, None)
+
+    def toggle_reaction(self, message_id, emoji, sender_name, added):
+        """Update one message's reaction map in place; return a copy of it."""
+        with self._lock:
+            message = self._messages.get(message_id)
+            if message is None:
+                return None
+            reactions = message["reactions"]
+            names = reactions.setdefault(emoji, [])
+            if added and sender_name not in names:
+                names.append(sender_name)
+            elif not added and sender_name in names:
+                names.remove(sender_name)
+            if not names:
+                del reactions[emoji]
+            return {e: list(n) for e, n in reactions.items()}
+
+    def set_reactions(self, message_id, reactions):
+        with self._lock:
+            if self._queue(self.set_reactions, message_id, reactions):
+                return
+            message = self._messages.get(message_id)
+            if message is not None:
+                message["reactions"] = {e: list(n) for e, n in reactions.items()}
+
+    @staticmethod
+    def _copy(message):
+        return {
+            **message,
+            "reactions": {e: list(n) for e, n in message["reactions"].items()},
+        }
+
+
+def get_buffer(session_pk):
+    """This worker's buffer for the session, loading it if needed."""
+    session_pk = int(session_pk)
+    with _lock:
+        buffer = _buffers.get(session_pk)
+        loading = buffer is None
+        if loading:
+            # Registered before the query so events during it are queued.
+            buffer = _buffers[session_pk] = ChatBuffer()
+    if not loading:
+        buffer.wait_loaded()
+        return get_buffer(session_pk) if buffer.failed else buffer
+    try:
+        messages, has_more = load_messages(session_pk, BUFFER_SIZE)
+    except BaseException:
+        with _lock:
+            if _buffers.get(session_pk) is buffer:
+                del _buffers[session_pk]
+        buffer.fail()
+        raise
+    buffer.fill(messages, not has_more)
+    return buffer
+
+
+def cached_buffer(session_pk):
+    """The buffer if this worker has one loaded, else None (no queries)."""
+    with _lock:
+        return _buffers.get(int(session_pk))
+
+
+def invalidate(session_pk):
+    with _lock:
+        _buffers.pop(int(session_pk), None)
+
+
+def subscribe(session_pk):
+    with _lock:
+        _subscribers[int(session_pk)] += 1
+
+
+def unsubscribe(session_pk):
+    session_pk = int(session_pk)
+    with _lock:
+        _subscribers[session_pk] -= 1
+        if _subscribers[session_pk] <= 0:
+            del _subscribers[session_pk]
+            _buffers.pop(session_pk, None)
@@ -1,14 +1,28 @@
 """
-Django Channels WebSocket consumer for the real-time draft board and chat.
+Django Channels WebSocket consumers for the real-time draft board and chat,
+and for the live goalie status board.
 
 Clients connect to:
   ws://.../ws/draft/<session_pk>/[?role=commissioner&token=...
                                    |?role=captain&token=...
                                    |?display_name=...]
 
-They receive all state updates, position-draw reveals, and chat events.
-Picks are submitted via HTTP POST (standard auth/CSRF flow); chat messages
-and reactions are sent through the WebSocket.
+They receive board deltas (picks, undos, pauses), full state snapshots,
+position-draw reveals, and chat events.  Every delta and snapshot carries a
+sequence number; a client that sees a gap sends {"type": "request_snapshot"}
+and gets a fresh snapshot back on its own connection.
+
+Captains and the commissioner submit picks ("make_pick"), and the
+commissioner undoes ("undo_pick") and pauses/resumes ("advance_state"),
+over the same socket.  These run the same code as the HTTP endpoints, which
+remain as a fallback; the requester gets an "action_result" echoing its
+request_id and everyone gets the resulting delta.  Chat messages and
+reactions are sent through the WebSocket too; history comes from a per-worker
+ring buffer (leagues.chat_buffer), and {"type": "load_older", "before_id": N}
+pages further back.
+
+The goalie status board connects to ws://.../ws/goalie-status/ and receives a
+per-matchup delta whenever a captain or admin changes a goalie or status.
 """
 
 import json
@@ -18,6 +32,8 @@ from urllib.parse import parse_qs
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from leagues import chat_buffer
+
 # Emoji reactions allowed on messages.  Keep this small and fun.
 ALLOWED_REACTIONS = {"👍", "👎", "😂", "🔥", "😤", "🎯", "👏", "🤙"}
 
@@ -27,9 +43,23 @@ MAX_BODY_LENGTH = 500
 # Minimum seconds between chat messages per connection (rate limit).
 MIN_MSG_INTERVAL = 1.0
 
-# Number of historical messages sent to a client on connect.
+# Number of historical messages sent to a client on connect, and per
+# "load older" page.
 HISTORY_COUNT = 50
 
+# Minimum seconds between snapshot requests per connection.
+MIN_SNAPSHOT_INTERVAL = 2.0
+
+# Draft actions accepted over the socket, and who may send them.
+DRAFT_ACTIONS = {
+    "make_pick": ("captain", "commissioner"),
+    "undo_pick": ("commissioner",),
+    "advance_state": ("commissioner",),
+}
+
+# Channel group every goalie board client joins.
+GOALIE_STATUS_GROUP = "goalie_status"
+
 
 class DraftConsumer(AsyncWebsocketConsumer):
     # ------------------------------------------------------------------
@@ -49,6 +79,8 @@ class DraftConsumer(AsyncWebsocketConsumer):
         self.sender_type = "spectator"
         self.sender_name = raw_name or "Spectator"
         self.can_delete = False
+        # Verified token, passed to the draft actions like the HTTP views do.
+        self.token = None
 
         if role == "commissioner" and token:
             resolved = await self._resolve_commissioner(token)
@@ -56,17 +88,22 @@ class DraftConsumer(AsyncWebsocketConsumer):
                 self.sender_type = "commissioner"
                 self.sender_name = "Commissioner"
                 self.can_delete = True
+                self.token = token
 
         elif role == "captain" and token:
             team_name = await self._resolve_captain(token)
             if team_name:
                 self.sender_type = "captain"
                 self.sender_name = team_name
+                self.token = token
 
-        # Rate-limit state — track the last time this connection sent a message.
+        # Rate-limit state — track the last time this connection sent a message
+        # or asked for a snapshot.
         self._last_msg_at = 0.0
+        self._last_snapshot_at = 0.0
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
+        chat_buffer.subscribe(self.session_pk)
         await self.accept()
 
         # Send chat history so the client sees messages posted before joining.
@@ -74,6 +111,7 @@ class DraftConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        chat_buffer.unsubscribe(self.session_pk)
 
     # ------------------------------------------------------------------
     # Incoming messages from the client
@@ -95,6 +133,12 @@ class DraftConsumer(AsyncWebsocketConsumer):
             await self._handle_reaction(msg)
         elif msg_type == "delete_message":
             await self._handle_delete(msg)
+        elif msg_type == "request_snapshot":
+            await self._handle_snapshot_request()
+        elif msg_type == "load_older":
+            await self._handle_load_older(msg)
+        elif msg_type in DRAFT_ACTIONS:
+            await self._handle_draft_action(msg)
 
     # ------------------------------------------------------------------
     # Handlers for each incoming message type
@@ -123,7 +167,7 @@ class DraftConsumer(AsyncWebsocketConsumer):
         )
 
     async def _handle_reaction(self, msg):
-        message_id = msg.get("message_id")
+        message_id = _message_id(msg)
         emoji = msg.get("emoji")
         if not message_id or emoji not in ALLOWED_REACTIONS:
             return
@@ -145,7 +189,7 @@ class DraftConsumer(AsyncWebsocketConsumer):
     async def _handle_delete(self, msg):
         if not self.can_delete:
             return
-        message_id = msg.get("message_id")
+        message_id = _message_id(msg)
         if not message_id:
             return
 
@@ -161,12 +205,70 @@ class DraftConsumer(AsyncWebsocketConsumer):
             },
         )
 
+    async def _handle_snapshot_request(self):
+        now = time.monotonic()
+        if now - self._last_snapshot_at < MIN_SNAPSHOT_INTERVAL:
+            return
+        self._last_snapshot_at = now
+
+        state = await self._load_snapshot()
+        if state is None:
+            return
+        await self.send(text_data=json.dumps({"type": "state_update", "state": state}))
+
+    async def _handle_load_older(self, msg):
+        before_id = _message_id(msg, "before_id")
+        if not before_id:
+            return
+        # Shares the snapshot rate limit: both can fall through to the DB.
+        now = time.monotonic()
+        if now - self._last_snapshot_at < MIN_SNAPSHOT_INTERVAL:
+            return
+        self._last_snapshot_at = now
+        await self._send_chat_history(before_id)
+
+    async def _handle_draft_action(self, msg):
+        action = msg["type"]
+        if self.sender_type not in DRAFT_ACTIONS[action]:
+            body, status, event = {"error": "Not allowed."}, 403, None
+        else:
+            body, status, event = await self._run_draft_action(action, msg)
+
+        # One group message carries the whole change (board delta, reveal,
+        # pick chat line) to every client, this one included.
+        if event:
+            await self.channel_layer.group_send(self.group_name, event)
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "action_result",
+                    "action": action,
+                    "request_id": msg.get("request_id"),
+                    "status": status,
+                    **body,
+                }
+            )
+        )
+
     # ------------------------------------------------------------------
     # Group message handlers — called by channel layer group_send
     # ------------------------------------------------------------------
 
+    async def draft_delta(self, event):
+        """Sequenced board changes — sent after every pick, undo, or pause."""
+        for message in event.get("chat_messages", ()):
+            self._buffer_message(message)
+        await self.send(
+            text_data=json.dumps(
+                {"type": "delta", **{k: v for k, v in event.items() if k != "type"}}
+            )
+        )
+
     async def draft_state_update(self, event):
-        """Full state snapshot — sent after every pick, undo, or pause."""
+        """Full state snapshot — sent when the board is reshaped."""
+        # Reshapes can add or clear chat rows without a chat event (swaps,
+        # late signups, reset); reload the history on the next request.
+        chat_buffer.invalidate(self.session_pk)
         await self.send(
             text_data=json.dumps(
                 {
@@ -190,6 +292,7 @@ class DraftConsumer(AsyncWebsocketConsumer):
 
     async def draft_chat_message(self, event):
         """A new chat message — broadcast to all clients."""
+        self._buffer_message(event["message"])
         await self.send(
             text_data=json.dumps(
                 {
@@ -201,6 +304,9 @@ class DraftConsumer(AsyncWebsocketConsumer):
 
     async def draft_chat_reaction(self, event):
         """Updated reaction counts for a message."""
+        buffer = chat_buffer.cached_buffer(self.session_pk)
+        if buffer is not None:
+            buffer.set_reactions(event["message_id"], event["reactions"])
         await self.send(
             text_data=json.dumps(
                 {
@@ -214,6 +320,9 @@ class DraftConsumer(AsyncWebsocketConsumer):
 
     async def draft_chat_delete(self, event):
         """Commissioner deleted a message."""
+        buffer = chat_buffer.cached_buffer(self.session_pk)
+        if buffer is not None:
+            buffer.remove(event["message_id"])
         await self.send(
             text_data=json.dumps(
                 {
@@ -223,6 +332,11 @@ class DraftConsumer(AsyncWebsocketConsumer):
             )
         )
 
+    def _buffer_message(self, message):
+        buffer = chat_buffer.cached_buffer(self.session_pk)
+        if buffer is not None:
+            buffer.add(message)
+
     # ------------------------------------------------------------------
     # Database helpers (sync wrapped for async context)
     # ------------------------------------------------------------------
@@ -254,6 +368,39 @@ class DraftConsumer(AsyncWebsocketConsumer):
         except Exception:
             return None
 
+    @database_sync_to_async
+    def _run_draft_action(self, action, msg):
+        from leagues import draft_views
+        from leagues.models import DraftSession
+
+        if not DraftSession.objects.filter(pk=self.session_pk).exists():
+            return {"error": "Draft not found."}, 404, None
+
+        if action == "make_pick":
+            data = {
+                "signup_pk": msg.get("signup_pk"),
+                "idempotency_key": msg.get("idempotency_key"),
+                "expected_pick": msg.get("expected_pick"),
+                f"{self.sender_type}_token": self.token,
+            }
+            result = draft_views._submit_pick(self.session_pk, data)
+        elif action == "undo_pick":
+            result = draft_views._submit_undo(self.session_pk)
+        else:
+            result = draft_views._submit_advance(self.session_pk)
+
+        body, status, broadcast = result
+        event = draft_views._delta_event(**broadcast) if broadcast else None
+        return body, status, event
+
+    @database_sync_to_async
+    def _load_snapshot(self):
+        from leagues.draft_views import _session_state_payload
+        from leagues.models import DraftSession
+
+        session = DraftSession.objects.filter(pk=self.session_pk).first()
+        return _session_state_payload(session) if session else None
+
     @database_sync_to_async
     def _save_chat_message(self, body):
         from leagues.models import DraftChatMessage
@@ -264,37 +411,46 @@ class DraftConsumer(AsyncWebsocketConsumer):
             sender_type=self.sender_type,
             body=body,
         )
-        # Serialize here (sync context) so the caller never touches the ORM
-        # from async code.  New messages have no reactions so reactions={}.
-        return _serialize_message(msg)
+        # New messages have no reactions, so no need to look any up.
+        return chat_buffer.serialize_message(msg)
 
     @database_sync_to_async
     def _toggle_reaction(self, message_id, emoji):
         from leagues.models import DraftChatMessage, DraftChatReaction
-        from django.db.models import Count
 
-        try:
-            msg = DraftChatMessage.objects.get(
+        # A buffered message is known to be visible and in this session;
+        # older ones are checked against the database.
+        buffer = chat_buffer.cached_buffer(self.session_pk)
+        buffered = buffer is not None and buffer.contains(message_id)
+        if (
+            not buffered
+            and not DraftChatMessage.objects.filter(
                 pk=message_id, session_id=self.session_pk, deleted=False
-            )
-        except DraftChatMessage.DoesNotExist:
+            ).exists()
+        ):
             return None
 
-        obj, created = DraftChatReaction.objects.get_or_create(
-            message=msg,
-            emoji=emoji,
-            sender_name=self.sender_name,
+        mine = DraftChatReaction.objects.filter(
+            message_id=message_id, emoji=emoji, sender_name=self.sender_name
         )
-        if not created:
-            obj.delete()
+        removed, _ = mine.delete()
+        if not removed:
+            DraftChatReaction.objects.get_or_create(
+                message_id=message_id, emoji=emoji, sender_name=self.sender_name
+            )
 
         # Return current reaction summary: {emoji: [sender_name, ...], ...}
-        reactions = {}
-        for r in DraftChatReaction.objects.filter(message=msg).values(
-            "emoji", "sender_name"
-        ):
-            reactions.setdefault(r["emoji"], []).append(r["sender_name"])
-        return reactions
+        if buffered:
+            reactions = buffer.toggle_reaction(
+                message_id, emoji, self.sender_name, added=not removed
+            )
+            if reactions is not None:
+                return reactions
+        return chat_buffer.reaction_map(
+            DraftChatReaction.objects.filter(message_id=message_id).values(
+                "emoji", "sender_name"
+            )
+        )
 
     @database_sync_to_async
     def _soft_delete_message(self, message_id):
@@ -305,33 +461,47 @@ class DraftConsumer(AsyncWebsocketConsumer):
         ).update(deleted=True)
         return updated > 0
 
+    async def _send_chat_history(self, before_id=None):
+        """Send the latest messages (or the page before ``before_id``)."""
+        buffer = chat_buffer.cached_buffer(self.session_pk)
+        page = buffer.latest(HISTORY_COUNT, before_id) if buffer else None
+        if page is None:
+            page = await self._load_chat_history(before_id)
+        messages, has_more = page
+        event = {"type": "chat_history", "messages": messages, "has_more": has_more}
+        if before_id is not None:
+            event["before_id"] = before_id
+        await self.send(text_data=json.dumps(event))
+
     @database_sync_to_async
-    def _send_chat_history(self):
-        """Fetch recent messages and send them as a chat_history event."""
-        pass  # called below as a normal async method
+    def _load_chat_history(self, before_id):
+        if before_id is None:
+            return chat_buffer.get_buffer(self.session_pk).latest(HISTORY_COUNT)
+        return chat_buffer.load_messages(self.session_pk, HISTORY_COUNT, before_id)
 
-    async def _send_chat_history(self):
-        history = await self._load_chat_history()
+
+class GoalieStatusConsumer(AsyncWebsocketConsumer):
+    """Read-only feed of goalie status changes for the public goalie board."""
+
+    async def connect(self):
+        self.group_name = GOALIE_STATUS_GROUP
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def goalie_status(self, event):
+        """One matchup's goalie names and statuses, both sides."""
         await self.send(
             text_data=json.dumps(
                 {
-                    "type": "chat_history",
-                    "messages": history,
+                    "type": "goalie_status",
+                    "matchup": event["matchup"],
                 }
             )
         )
 
-    @database_sync_to_async
-    def _load_chat_history(self):
-        from leagues.models import DraftChatMessage
-
-        msgs = list(
-            DraftChatMessage.objects.filter(session_id=self.session_pk, deleted=False)
-            .prefetch_related("reactions")
-            .order_by("sent_at")[:HISTORY_COUNT]
-        )
-        return [_serialize_message(m) for m in msgs]
-
 
 # ------------------------------------------------------------------
 # Serialization helper
@@ -340,15 +510,16 @@ class DraftConsumer(AsyncWebsocketConsumer):
 
 def _serialize_message(msg):
     """Convert a DraftChatMessage instance to a JSON-safe dict."""
-    reactions = {}
     # reactions may be prefetched or freshly loaded
-    for r in msg.reactions.all():
-        reactions.setdefault(r.emoji, []).append(r.sender_name)
-    return {
-        "id": msg.pk,
-        "sender_name": msg.sender_name,
-        "sender_type": msg.sender_type,
-        "body": msg.body,
-        "sent_at": msg.sent_at.isoformat(),
-        "reactions": reactions,
-    }
+    return chat_buffer.serialize_message(
+        msg, chat_buffer.reaction_map(msg.reactions.all())
+    )
+
+
+def _message_id(msg, key="message_id"):
+    """A positive message id from a client message, or None."""
+    try:
+        value = int(msg.get(key))
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
@@ -0,0 +1,218 @@
+"""
+Champion and playoff records for completed draft sessions.
+
+The draft archive and every board header show the season's champion: the
+winner of the Wednesday Draft League championship game with its captain,
+regular-season record and playoff record.  Working that out aggregates goals
+over the championship and playoff matchups, so instead the result is stored
+on ``DraftSession.champion`` and refreshed whenever a playoff result, team
+record or draft-team link for the season changes (see leagues.signals).
+Pages only read the stored value.  The ``backfill_draft_champions`` command
+recomputes every session.
+"""
+
+from django.db.models import Q, Sum
+
+from .models import DraftSession, DraftTeam, MatchUp, Stat, Team_Stat
+
+DRAFT_DIVISION = 3  # Wednesday Draft League
+
+# Team_Stat columns shown as the champion's regular-season record.
+_RECORD_FIELDS = ("win", "otw", "loss", "otl", "tie")
+
+
+def compute_champions(sessions):
+    """
+    Batch-fetch championship info for all provided DraftSession objects.
+
+    Returns a dict keyed by session.pk:
+        {
+            'team': Team,
+            'draft_team': DraftTeam | None,
+            'team_stat': Team_Stat | None,
+            'playoff_wins': int,
+            'playoff_losses': int,
+        }
+
+    Only completed sessions that have a finalized championship matchup with a
+    clear winner (non-tied goal count) are included in the result.
+    Runs at most 6 queries regardless of how many sessions are provided.
+    """
+    complete = [s for s in sessions if s.state == DraftSession.STATE_COMPLETE]
+    if not complete:
+        return {}
+
+    season_ids = [s.season_id for s in complete]
+    session_by_season_id = {s.season_id: s for s in complete}
+
+    # 1. Championship matchup for each draft season
+    champ_matchups = list(
+        MatchUp.objects.filter(
+            is_championship=True,
+            hometeam__division__division=DRAFT_DIVISION,
+            hometeam__season_id__in=season_ids,
+        ).select_related("hometeam", "awayteam")
+    )
+    if not champ_matchups:
+        return {}
+
+    champ_ids = [m.id for m in champ_matchups]
+
+    # 2. Goal counts per team per championship matchup
+    goal_rows = (
+        Stat.objects.filter(matchup_id__in=champ_ids)
+        .values("matchup_id", "team_id")
+        .annotate(goals=Sum("goals"))
+    )
+    goals = {}  # (matchup_id, team_id) -> goals
+    for row in goal_rows:
+        goals[(row["matchup_id"], row["team_id"])] = row["goals"]
+
+    # 3. Determine winner per session
+    winner_by_session_pk = {}  # session.pk -> Team
+    for m in champ_matchups:
+        season_id = m.hometeam.season_id
+        session = session_by_season_id.get(season_id)
+        if not session:
+            continue
+        home_g = goals.get((m.id, m.hometeam_id), 0)
+        away_g = goals.get((m.id, m.awayteam_id), 0)
+        if home_g > away_g:
+            winner_by_session_pk[session.pk] = m.hometeam
+        elif away_g > home_g:
+            winner_by_session_pk[session.pk] = m.awayteam
+        # tied championship → skip (won't happen in a real league)
+
+    if not winner_by_session_pk:
+        return {}
+
+    winner_team_ids = [t.id for t in winner_by_session_pk.values()]
+
+    # 4. DraftTeam records for the winners (links captain name + draft team name)
+    draft_teams = {
+        dt.league_team_id: dt
+        for dt in DraftTeam.objects.filter(
+            league_team_id__in=winner_team_ids
+        ).select_related("captain")
+    }
+
+    # 5. Regular-season Team_Stat records
+    team_stats = {
+        ts.team_id: ts for ts in Team_Stat.objects.filter(team_id__in=winner_team_ids)
+    }
+
+    # 6. Playoff records — all postseason matchups for winning teams
+    playoff_matchup_rows = list(
+        MatchUp.objects.filter(
+            Q(hometeam_id__in=winner_team_ids) | Q(awayteam_id__in=winner_team_ids),
+            is_postseason=True,
+        ).values("id", "hometeam_id", "awayteam_id")
+    )
+
+    playoff_records = {}  # team_id -> {'wins': int, 'losses': int}
+    if playoff_matchup_rows:
+        playoff_ids = [r["id"] for r in playoff_matchup_rows]
+        po_goals = {}
+        for row in (
+            Stat.objects.filter(matchup_id__in=playoff_ids)
+            .values("matchup_id", "team_id")
+            .annotate(goals=Sum("goals"))
+        ):
+            po_goals[(row["matchup_id"], row["team_id"])] = row["goals"]
+
+        for m in playoff_matchup_rows:
+            for team_id in winner_team_ids:
+                if team_id not in (m["hometeam_id"], m["awayteam_id"]):
+                    continue
+                opp_id = (
+                    m["awayteam_id"]
+                    if m["hometeam_id"] == team_id
+                    else m["hometeam_id"]
+                )
+                mine = po_goals.get((m["id"], team_id), 0)
+                theirs = po_goals.get((m["id"], opp_id), 0)
+                rec = playoff_records.setdefault(team_id, {"wins": 0, "losses": 0})
+                if mine > theirs:
+                    rec["wins"] += 1
+                elif theirs > mine:
+                    rec["losses"] += 1
+
+    # Assemble final result
+    result = {}
+    for session_pk, champion_team in winner_by_session_pk.items():
+        po = playoff_records.get(champion_team.id, {"wins": 0, "losses": 0})
+        result[session_pk] = {
+            "team": champion_team,
+            "draft_team": draft_teams.get(champion_team.id),
+            "team_stat": team_stats.get(champion_team.id),
+            "playoff_wins": po["wins"],
+            "playoff_losses": po["losses"],
+        }
+    return result
+
+
+def champion_snapshot(data):
+    """
+    The JSON-safe form of one ``compute_champions`` entry, shaped so the
+    templates can read it exactly like the model-backed original.
+    """
+    if data is None:
+        return None
+    team, draft_team, team_stat = data["team"], data["draft_team"], data["team_stat"]
+    return {
+        "team": {"id": team.id, "team_name": team.team_name},
+        "draft_team": (
+            {
+                "id": draft_team.pk,
+                "captain": {"full_name": draft_team.captain.full_name},
+            }
+            if draft_team is not None
+            else None
+        ),
+        "team_stat": (
+            {field: getattr(team_stat, field) for field in _RECORD_FIELDS}
+            if team_stat is not None
+            else None
+        ),
+        "playoff_wins": data["playoff_wins"],
+        "playoff_losses": data["playoff_losses"],
+    }
+
+
+def refresh_draft_champions(season_ids=None, decided_only=False):
+    """
+    Recompute the stored champion of completed sessions in ``season_ids``
+    (or every season) and write the ones that changed.
+
+    ``decided_only`` limits the refresh to sessions that already have a
+    champion, for changes (team records, names) that can't decide one.
+    Returns the number of sessions updated.
+    """
+    sessions = DraftSession.objects.filter(state=DraftSession.STATE_COMPLETE)
+    if season_ids is not None:
+        season_ids = [pk for pk in season_ids if pk is not None]
+        if not season_ids:
+            return 0
+        sessions = sessions.filter(season_id__in=season_ids)
+    if decided_only:
+        sessions = sessions.filter(champion__isnull=False)
+    sessions = list(sessions.only("pk", "season_id", "state", "champion"))
+    if not sessions:
+        return 0
+
+    data = compute_champions(sessions)
+    changed = []
+    for session in sessions:
+        snapshot = champion_snapshot(data.get(session.pk))
+        if snapshot != session.champion:
+            session.champion = snapshot
+            changed.append(session)
+    DraftSession.objects.bulk_update(changed, ["champion"])
+    return len(changed)
+
+
+def session_champion(session):
+    """The stored champion of a completed session, or None."""
+    if session.state != DraftSession.STATE_COMPLETE:
+        return None
+    return session.champion
@@ -0,0 +1,659 @@
+"""
+Batch import of draft signups and draft history from Google Sheets exports.
+
+An import runs in three stages:
+
+  parse  Read the CSV exports into plain values; nothing here touches the
+         database.
+  plan   Resolve every name and email against the database in a handful of
+         bulk queries (PlayerIdentityIndex) and work out each row to write.
+         A plan prints as a dry-run diff.
+  apply  Write the plan with bulk_create in one transaction.
+
+Planning and writing run in the calling process: new players are shared
+between seasons, and parallel writers would race each other creating them.
+The import_draft_signups and import_draft_results commands are thin
+wrappers around this module.
+"""
+
+import csv
+import re
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    DraftPick,
+    DraftRound,
+    DraftSession,
+    DraftTeam,
+    Player,
+    PlayerNameToken,
+    Season,
+    SeasonSignup,
+)
+from .name_matching import PlayerIdentityIndex, name_keys, player_name_tokens
+
+DEFAULT_RANDOM_ROUND = 11
+
+# Registration CSV column headers (same across all seasons)
+COL_TIMESTAMP = "Timestamp"
+COL_EMAIL = "Email Address"
+COL_FIRST = "What's your FIRST name?"
+COL_LAST = "What's your Last name?"
+COL_PRIMARY = "Primary Position"
+COL_SECONDARY = "Secondary Position"
+COL_CAPTAIN = "Do you want to captain this Season? "
+COL_NOTES = "Notes for the season such as out for travel, etc beyond a random week or 2 that most miss. "
+
+PRIMARY_POS = {
+    "Center": SeasonSignup.POSITION_CENTER,
+    "Wing": SeasonSignup.POSITION_WING,
+    "Defense": SeasonSignup.POSITION_DEFENSE,
+    "Goalie": SeasonSignup.POSITION_GOALIE,
+}
+
+SECONDARY_POS = {
+    **PRIMARY_POS,
+    "I only do one thing, period!": SeasonSignup.POSITION_ONE_THING,
+}
+
+CAPTAIN_INTEREST = {
+    "Yes for sure please so I control who I play with": SeasonSignup.CAPTAIN_YES,
+    "I can as I'm overdue to captain/help out": SeasonSignup.CAPTAIN_OVERDUE,
+    "Only if you can't find 8": SeasonSignup.CAPTAIN_LAST_RESORT,
+    "Nope, lazy or don't know enough": SeasonSignup.CAPTAIN_NO,
+    "": SeasonSignup.CAPTAIN_NO,
+}
+
+TIMESTAMP_FMT = "%m/%d/%Y %H:%M:%S"
+
+
+class DraftImportError(Exception):
+    """An export or season that can't be imported; the message says why."""
+
+
+# ---------------------------------------------------------------------------
+# Parsing (no database access)
+# ---------------------------------------------------------------------------
+
+
+def _read_csv(path, what, dict_rows=False):
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f) if dict_rows else csv.reader(f))
+    except FileNotFoundError:
+        raise DraftImportError(f"{what} not found: {path}")
+
+
+def clean_name(first, last):
+    """
+    Fix submissions where the registrant put their full name in the first
+    name field (e.g. first='David Gerber', last='Gerber' → first='David').
+    """
+    first = first.strip()
+    last = last.strip()
+    if first.lower().endswith(last.lower()) and first.lower() != last.lower():
+        first = first[: -len(last)].strip()
+    return first, last
+
+
+def parse_signup_row(row):
+    """One registration form row as SeasonSignup field values."""
+    first, last = clean_name(row[COL_FIRST], row[COL_LAST])
+    primary_str = row[COL_PRIMARY].strip()
+    secondary_str = row[COL_SECONDARY].strip()
+    captain_str = row[COL_CAPTAIN].strip()
+
+    primary = PRIMARY_POS.get(primary_str)
+    if primary is None:
+        raise DraftImportError(
+            f"Unknown primary position '{primary_str}' for {first} {last}"
+        )
+    secondary = SECONDARY_POS.get(secondary_str)
+    if secondary is None:
+        raise DraftImportError(
+            f"Unknown secondary position '{secondary_str}' for {first} {last}"
+        )
+    captain_interest = CAPTAIN_INTEREST.get(captain_str)
+    if captain_interest is None:
+        raise DraftImportError(
+            f"Unknown captain interest '{captain_str}' for {first} {last}"
+        )
+
+    try:
+        submitted_at = datetime.strptime(row[COL_TIMESTAMP].strip(), TIMESTAMP_FMT)
+    except ValueError:
+        submitted_at = None
+
+    return {
+        "first_name": first,
+        "last_name": last,
+        "email": row[COL_EMAIL].strip().lower(),
+        "primary_position": primary,
+        "secondary_position": secondary,
+        "captain_interest": captain_interest,
+        "notes": row[COL_NOTES].strip(),
+        "submitted_at": submitted_at,
+    }
+
+
+def parse_signups_csv(path):
+    """Every non-blank registration form row, parsed (see parse_signup_row)."""
+    return [
+        parse_signup_row(row)
+        for row in _read_csv(path, "CSV file", dict_rows=True)
+        if row.get(COL_EMAIL, "").strip() or row.get(COL_FIRST, "").strip()
+    ]
+
+
+def parse_registration_csv(path):
+    """
+    Parse a registration form CSV for email-first matching.
+    Returns {(first_lower, last_lower): email} for all rows.
+    """
+    roster_map = {}
+    for row in _read_csv(path, "Roster CSV", dict_rows=True):
+        first = row.get(COL_FIRST, "").strip()
+        last = row.get(COL_LAST, "").strip()
+        email = row.get(COL_EMAIL, "").strip().lower()
+        if not first or not last or not email:
+            continue
+        # If a player submitted multiple times keep the most recent (last row wins)
+        roster_map[first.lower(), last.lower()] = email
+    return roster_map
+
+
+def parse_name_cell(cell):
+    """
+    Parse "LastName, FirstName" → (first, last).
+    Returns None for blank or unparseable cells.
+    Strips excess whitespace; preserves original casing for roster lookup.
+    """
+    cell = cell.strip()
+    if not cell or "," not in cell:
+        return None
+    last, first = (part.strip() for part in cell.split(",", 1))
+    if not first or not last:
+        return None
+    return first, last
+
+
+def parse_board_csv(path):
+    """
+    Parse the draft board grid CSV.
+
+    Returns (captain_names, num_rounds, picks) with captain names from the
+    header row and picks as (round_num, captain_name, first, last) for every
+    filled cell, ordered by round and captain name.
+    """
+    rows = _read_csv(path, "Draft board CSV")
+    if not rows:
+        raise DraftImportError(f"{path} is empty.")
+
+    # Row 0: blank col, then captain names/nicknames
+    captain_names = [h.strip() for h in rows[0][1:] if h.strip()]
+    if not captain_names:
+        raise DraftImportError(
+            f"Could not find captain names in the first row of {path}."
+        )
+    repeated = [name for name, n in Counter(captain_names).items() if n > 1]
+    if repeated:
+        raise DraftImportError(
+            f"Captain names repeat in {path}: {', '.join(repeated)}."
+        )
+
+    # Pick rows: col 0 must be an integer (the round number)
+    num_rounds = 0
+    picks = []
+    for row in rows[1:]:
+        if not row or not re.match(r"^\d+$", row[0].strip()):
+            continue  # skip header, metadata, and schedule rows
+        num_rounds += 1
+        round_num = int(row[0].strip())
+        for col, cap_name in enumerate(captain_names, start=1):
+            parsed = parse_name_cell(row[col]) if col < len(row) else None
+            if parsed:
+                picks.append((round_num, cap_name, *parsed))
+
+    if not num_rounds:
+        raise DraftImportError(f"No pick rows found in {path} — check the format.")
+    picks.sort(key=lambda pick: pick[:2])
+    return captain_names, num_rounds, picks
+
+
+# One season's draft history to import: its board CSV, the optional
+# registration CSV for email matching, and the re-randomized round.
+ResultsJob = namedtuple("ResultsJob", "season_id board_path roster_path random_round")
+
+# A parsed ResultsJob.
+BoardExport = namedtuple(
+    "BoardExport", "season_id captain_names num_rounds picks roster_map random_round"
+)
+
+
+def parse_results_job(job):
+    """Parse the files of one ResultsJob into a BoardExport."""
+    captain_names, num_rounds, picks = parse_board_csv(job.board_path)
+    roster_map = parse_registration_csv(job.roster_path) if job.roster_path else {}
+    return BoardExport(
+        job.season_id, captain_names, num_rounds, picks, roster_map, job.random_round
+    )
+
+
+def read_manifest(path):
+    """
+    ResultsJobs from a manifest CSV with the columns season_id, board_csv
+    and optionally roster_csv and random_round.
+    """
+    jobs = []
+    for line, row in enumerate(_read_csv(path, "Manifest", dict_rows=True), 2):
+        try:
+            season_id = int(row["season_id"])
+            board_path = row["board_csv"].strip()
+            random_round = int(
+                (row.get("random_round") or "").strip() or DEFAULT_RANDOM_ROUND
+            )
+        except (KeyError, AttributeError, ValueError):
+            raise DraftImportError(
+                f"{path} line {line}: need season_id and board_csv "
+                "(and a numeric random_round if given)."
+            )
+        roster_path = (row.get("roster_csv") or "").strip() or None
+        jobs.append(ResultsJob(season_id, board_path, roster_path, random_round))
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# Planning and writing
+# ---------------------------------------------------------------------------
+
+
+def _load_import_seasons(season_ids):
+    """The seasons to import into, which must exist and have no draft yet."""
+    repeated = [pk for pk, n in Counter(season_ids).items() if n > 1]
+    if repeated:
+        raise DraftImportError(
+            f"Season {', '.join(str(pk) for pk in repeated)} is listed twice."
+        )
+    seasons = Season.objects.in_bulk(season_ids)
+    missing = [pk for pk in season_ids if pk not in seasons]
+    if missing:
+        raise DraftImportError(
+            f"Season {', '.join(str(pk) for pk in missing)} not found."
+        )
+    drafted = DraftSession.objects.filter(season_id__in=season_ids).values_list(
+        "season_id", flat=True
+    )
+    if drafted:
+        raise DraftImportError(
+            "A DraftSession already exists for "
+            f"{', '.join(str(seasons[pk]) for pk in sorted(drafted))}.  "
+            "Delete it first or import a different season."
+        )
+    return seasons
+
+
+def _draft_rounds(num_rounds, random_round):
+    return [
+        DraftRound(
+            round_number=r,
+            order_type=(
+                DraftRound.ORDER_RANDOMIZED
+                if r == random_round
+                else DraftRound.ORDER_SNAKE
+            ),
+        )
+        for r in range(1, num_rounds + 1)
+    ]
+
+
+def _attach(session, *row_lists):
+    """Point the planned rows of a draft at its (saved) session."""
+    for rows in row_lists:
+        for row in rows:
+            row.session = session
+
+
+class SignupsImport:
+    """
+    The planned import of one season's registration form: new signups
+    (existing emails are skipped) linked to the Player with their name, else
+    their email, and a draft session in setup with its rounds and a team
+    for each of the first ``num_teams`` willing captains.
+    """
+
+    def __init__(self, season, rows, num_teams, num_rounds, random_round):
+        self.season = season
+        self.num_teams = num_teams
+        self.random_round = random_round
+        existing = list(SeasonSignup.objects.filter(season=season))
+        seen = {signup.email.lower() for signup in existing}
+
+        self.skipped = []
+        self.signups = []
+        self._form_times = []  # (signup, form timestamp)
+        for data in rows:
+            if data["email"] in seen:
+                self.skipped.append(data)
+                continue
+            seen.add(data["email"])
+            submitted_at = data["submitted_at"]
+            if submitted_at is not None and timezone.is_naive(submitted_at):
+                submitted_at = timezone.make_aware(submitted_at)
+            fields = {k: v for k, v in data.items() if k != "submitted_at"}
+            signup = SeasonSignup(season=season, submitted_at=submitted_at, **fields)
+            self.signups.append(signup)
+            if submitted_at is not None:
+                self._form_times.append((signup, submitted_at))
+
+        index = PlayerIdentityIndex.load(
+            [(s.first_name, s.last_name, s.email) for s in self.signups]
+        )
+        for signup in self.signups:
+            signup.linked_player = index.match(
+                signup.first_name, signup.last_name, signup.email, ("name", "email")
+            ).player
+
+        self.rounds = _draft_rounds(num_rounds, random_round)
+        # Captains: YES first, then OVERDUE, then LAST_RESORT, by submission
+        # date within each tier.
+        now = timezone.now()
+        willing = sorted(
+            (
+                s
+                for s in existing + self.signups
+                if s.captain_interest not in (None, SeasonSignup.CAPTAIN_NO)
+            ),
+            key=lambda s: (s.captain_interest, s.submitted_at or now),
+        )
+        self.teams = [
+            DraftTeam(captain=signup, team_name=f"{signup.first_name}'s Team")
+            for signup in willing[:num_teams]
+        ]
+        self.session = DraftSession(
+            season=season,
+            num_teams=num_teams,
+            num_rounds=num_rounds,
+            state=DraftSession.STATE_SETUP,
+            signups_open=False,
+        )
+
+    def diff_lines(self):
+        """The import as a diff: "+" rows to create, "=" rows kept as they are."""
+        lines = [f"+ DraftSession for {self.season} (setup)"]
+        lines.append(
+            f"+ {len(self.rounds)} rounds "
+            f"(round {self.random_round} randomized, rest snake)"
+        )
+        for signup in self.signups:
+            linked = signup.linked_player
+            lines.append(
+                f"+ signup {signup.first_name} {signup.last_name} <{signup.email}>"
+                + (f" → player pk={linked.pk}" if linked else "")
+            )
+        for data in self.skipped:
+            lines.append(
+                f"= signup {data['first_name']} {data['last_name']} "
+                f"<{data['email']}> (email already signed up)"
+            )
+        for team in self.teams:
+            captain = team.captain
+            lines.append(
+                f"+ team {team.team_name} (captain {captain.first_name} "
+                f"{captain.last_name}, {captain.get_captain_interest_display()})"
+            )
+        if len(self.teams) < self.num_teams:
+            lines.append(
+                f"! only {len(self.teams)} willing captains for {self.num_teams} teams"
+            )
+        return lines
+
+    def apply(self):
+        """Write the import in one transaction and return the session."""
+        with transaction.atomic():
+            self.session.save()
+            SeasonSignup.objects.bulk_create(self.signups)
+            # auto_now_add stamped every row; restore the form timestamps.
+            for signup, submitted_at in self._form_times:
+                signup.submitted_at = submitted_at
+            SeasonSignup.objects.bulk_update(
+                [signup for signup, _ in self._form_times], ["submitted_at"]
+            )
+            _attach(self.session, self.rounds, self.teams)
+            DraftRound.objects.bulk_create(self.rounds)
+            DraftTeam.objects.bulk_create(self.teams)
+        return self.session
+
+
+class ResultsImport:
+    """
+    The planned import of completed draft boards (BoardExports) as finished
+    draft sessions, for ADP on the live board.
+
+    Every pick is matched to a Player by the registration email, else the
+    normalized name; captains by first name only.  Unmatched picks are
+    skipped unless ``create_players`` is set, in which case one Player is
+    created per new name across all the boards.
+    """
+
+    def __init__(self, exports, create_players=False):
+        self.exports = list(exports)
+        self.seasons = _load_import_seasons([e.season_id for e in self.exports])
+        self.index = PlayerIdentityIndex.load(
+            [
+                (first, last, export.roster_map.get((first.lower(), last.lower())))
+                for export in self.exports
+                for _, _, first, last in export.picks
+            ],
+            first_names=[n for e in self.exports for n in e.captain_names],
+        )
+        self.existing_signups = {}
+        for signup in SeasonSignup.objects.filter(
+            season_id__in=self.seasons, linked_player__isnull=False
+        ).order_by("pk"):
+            key = (signup.season_id, signup.linked_player_id)
+            self.existing_signups.setdefault(key, signup)
+
+        self.new_players = []
+        self.drafts = [self._plan_draft(e, create_players) for e in self.exports]
+
+    def _match_player(self, first, last, email, create_players):
+        match = self.index.match(first, last, email, order=("email", "name"))
+        if match.how != "new" or not create_players:
+            return match.player, match.how
+        player = Player(first_name=first, last_name=last, email=email or "")
+        player.first_name_key, player.last_name_key = name_keys(first, last)
+        self.index.add(player)
+        self.new_players.append(player)
+        return player, "create"
+
+    def _plan_draft(self, export, create_players):
+        season = self.seasons[export.season_id]
+        draft = _PlannedDraft(season, export)
+        signups = {}  # id(player) → signup
+
+        def signup_for(player, first, last, email=None):
+            if player is None:
+                return draft.add_signup(first, last, email, None)
+            if id(player) not in signups:
+                existing = (
+                    self.existing_signups.get((season.pk, player.pk))
+                    if player.pk
+                    else None
+                )
+                signups[id(player)] = existing or draft.add_signup(
+                    player.first_name, player.last_name, email or player.email, player
+                )
+            return signups[id(player)]
+
+        for position, cap_name in enumerate(export.captain_names, start=1):
+            # Captains are often listed by nickname/first name only; a name
+            # shared by several players is left unlinked.
+            found = self.index.lookup("first_name", cap_name)
+            player = found[0] if len(found) == 1 else None
+            draft.captains[cap_name] = (player, len(found))
+            draft.teams[cap_name] = DraftTeam(
+                captain=signup_for(player, cap_name, ""),
+                team_name=f"{cap_name}'s Team",
+                draft_position=position,
+            )
+
+        picked = set()
+        for round_num, cap_name, first, last in export.picks:
+            email = export.roster_map.get((first.lower(), last.lower()))
+            player, how = self._match_player(first, last, email, create_players)
+            draft.matches[how].append((round_num, cap_name, first, last, player))
+            if player is None:
+                draft.skipped.append((round_num, cap_name, first, last, how))
+                continue
+            signup = signup_for(player, first, last, email)
+            if id(signup) in picked:
+                draft.skipped.append((round_num, cap_name, first, last, "repeat"))
+                continue
+            picked.add(id(signup))
+            draft.picks.append(
+                DraftPick(
+                    team=draft.teams[cap_name],
+                    signup=signup,
+                    round_number=round_num,
+                    pick_number=export.captain_names.index(cap_name),
+                    is_auto_captain=_is_captain_pick(
+                        cap_name, draft.captains[cap_name][0], player
+                    ),
+                )
+            )
+        return draft
+
+    def diff_lines(self):
+        """
+        The import as a diff: "+" rows to create, "=" existing rows reused,
+        "-" picks that will be skipped and why.
+        """
+        lines = [f"+ player {p.first_name} {p.last_name}" for p in self.new_players]
+        for draft in self.drafts:
+            lines.extend(draft.diff_lines())
+        return lines
+
+    def apply(self):
+        """Write every planned draft in one transaction; returns the sessions."""
+        from .draft_champions import refresh_draft_champions
+
+        now = timezone.now()
+        sessions = [
+            DraftSession(
+                season=draft.season,
+                num_teams=len(draft.teams),
+                num_rounds=draft.export.num_rounds,
+                state=DraftSession.STATE_COMPLETE,
+                signups_open=False,
+                finalized_at=now,
+                # bulk_create skips the signal that moves the cursor per pick.
+                next_pick_index=len(draft.picks),
+            )
+            for draft in self.drafts
+        ]
+        with transaction.atomic():
+            Player.objects.bulk_create(self.new_players)
+            PlayerNameToken.objects.bulk_create(player_name_tokens(self.new_players))
+            DraftSession.objects.bulk_create(sessions)
+            SeasonSignup.objects.bulk_create(
+                [s for draft in self.drafts for s in draft.new_signups]
+            )
+            rounds, teams, picks = [], [], []
+            for session, draft in zip(sessions, self.drafts):
+                draft_rounds = _draft_rounds(
+                    draft.export.num_rounds, draft.export.random_round
+                )
+                draft_teams = list(draft.teams.values())
+                _attach(session, draft_rounds, draft_teams, draft.picks)
+                rounds += draft_rounds
+                teams += draft_teams
+                picks += draft.picks
+            DraftRound.objects.bulk_create(rounds)
+            DraftTeam.objects.bulk_create(teams)
+            DraftPick.objects.bulk_create(picks)
+            refresh_draft_champions(list(self.seasons))
+        return sessions
+
+
+class _PlannedDraft:
+    """One board of a ResultsImport: the rows it will write and its report."""
+
+    def __init__(self, season, export):
+        self.season = season
+        self.export = export
+        self.captains = {}  # cap_name → (Player | None, players found)
+        self.teams = {}  # cap_name → DraftTeam
+        self.new_signups = []
+        self.picks = []
+        self.skipped = []  # (round, cap_name, first, last, reason)
+        self.matches = {
+            "email": [],
+            "name": [],
+            "create": [],
+            "ambiguous": [],
+            "new": [],
+        }
+
+    def add_signup(self, first, last, email, player):
+        signup = SeasonSignup(
+            season=self.season,
+            first_name=first,
+            last_name=last,
+            email=email or f"{first.lower()}.{last.lower()}@import.local",
+            primary_position=SeasonSignup.POSITION_CENTER,
+            secondary_position=SeasonSignup.POSITION_ONE_THING,
+            captain_interest=SeasonSignup.CAPTAIN_NO,
+            is_returning=player is not None,
+            linked_player=player,
+        )
+        self.new_signups.append(signup)
+        return signup
+
+    def diff_lines(self):
+        export = self.export
+        lines = [
+            f"+ DraftSession for {self.season} (complete, "
+            f"{len(self.teams)} teams × {export.num_rounds} rounds)"
+        ]
+        for cap_name, (player, found) in self.captains.items():
+            if player:
+                linked = f"{player.first_name} {player.last_name} (pk={player.pk})"
+            elif found:
+                linked = f"AMBIGUOUS ({found} players share this first name)"
+            else:
+                linked = "NOT FOUND (link manually in admin)"
+            lines.append(f"+ team {cap_name}'s Team, captain → {linked}")
+        reused = {id(pick.signup) for pick in self.picks} - {
+            id(s) for s in self.new_signups
+        }
+        lines.append(
+            f"+ {len(self.new_signups)} signups, = {len(reused)} existing signups"
+        )
+        for how in ("email", "name", "create"):
+            lines.append(f"+ {len(self.matches[how])} picks matched by {how}")
+        reasons = {
+            "ambiguous": "several players share this name — link manually",
+            "new": "not found — use --create-players to create",
+            "repeat": "player already picked in this draft",
+        }
+        for round_num, cap_name, first, last, reason in self.skipped:
+            lines.append(
+                f"- R{round_num} / {cap_name}: {first} {last} ({reasons[reason]})"
+            )
+        return lines
+
+
+def _is_captain_pick(cap_name, captain, player):
+    if captain is not None:
+        return player is captain
+    # Captain header wasn't resolved to a Player (ambiguous or first-name-only
+    # like "Jesse", "Mike E", "Kenny").  Fall back: check whether the player's
+    # first name is a case-insensitive prefix match against the header
+    # token — catches "Kenny"→"Ken", "Mike E"→"Mike", "Jesse"→"Jesse".
+    cap_prefix = cap_name.strip().split()[0].lower()
+    p_first = player.first_name.strip().lower()
+    return cap_prefix.startswith(p_first) or p_first.startswith(cap_prefix)
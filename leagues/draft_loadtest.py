@@ -0,0 +1,501 @@
+"""
+In-process load test for the live draft board.
+
+Boots the ASGI application (dcstreethockey.asgi) inside this process and
+talks to it through asgiref's ApplicationCommunicator, so no server or
+sockets are involved: N spectators and M captains connect to DraftConsumer,
+then a throwaway draft is run to completion one pick at a time, either over
+the captains' sockets ("make_pick" action) or through the HTTP make_pick
+endpoint.  Teams without a connected captain pick through the commissioner.
+
+For every pick it records how long the resulting delta took to reach each
+spectator, how many SQL statements the process ran until the last one had
+it, and the bytes each client received.  ``build_report`` condenses that
+into the numbers worth comparing across changes; the loadtest_draft
+command prints it and can save it as JSON.
+
+Runs against whatever database the settings point at (SQLite or a local
+PostgreSQL).  ``create_loadtest_draft`` makes the draft in a season of its
+own and ``delete_loadtest_draft`` removes it again.
+"""
+
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from asgiref.testing import ApplicationCommunicator
+from channels.db import database_sync_to_async
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+
+from .models import DraftRound, DraftSession, DraftTeam, Season, SeasonSignup
+
+# Season year the throwaway draft is created in, clear of real seasons and
+# of seed_draft_test's history (2097/2098).
+LOADTEST_YEAR = 2090
+
+_HEADERS = [(b"host", b"localhost"), (b"origin", b"http://localhost")]
+
+_POSITIONS = (
+    SeasonSignup.POSITION_CENTER,
+    SeasonSignup.POSITION_WING,
+    SeasonSignup.POSITION_DEFENSE,
+)
+
+
+class LoadTestError(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Fixture
+# ---------------------------------------------------------------------------
+
+
+def create_loadtest_draft(num_teams, num_rounds):
+    """
+    An active draft with drawn positions, captain rounds spread over the
+    draft, the second-to-last round re-randomized, and exactly enough
+    signups (one goalie per team) to fill every slot.
+    """
+    from .draft_views import _process_auto_captain_picks
+
+    season = Season.objects.create(
+        year=LOADTEST_YEAR, season_type=1, is_current_season=False
+    )
+    session = DraftSession.objects.create(
+        season=season,
+        num_teams=num_teams,
+        num_rounds=num_rounds,
+        state=DraftSession.STATE_SETUP,
+        signups_open=False,
+    )
+    if num_rounds > 2:
+        DraftRound.objects.create(
+            session=session,
+            round_number=num_rounds - 1,
+            order_type=DraftRound.ORDER_RANDOMIZED,
+        )
+
+    def signup(name, position):
+        return SeasonSignup(
+            season=season,
+            first_name=name,
+            last_name="Loadtest",
+            email=f"{name.lower()}@loadtest.invalid",
+            primary_position=position,
+            secondary_position=SeasonSignup.POSITION_ONE_THING,
+            captain_interest=SeasonSignup.CAPTAIN_NO,
+        )
+
+    captains = SeasonSignup.objects.bulk_create(
+        [signup(f"Captain{i}", _POSITIONS[i % 3]) for i in range(num_teams)]
+    )
+    players = [
+        signup(f"Goalie{i}", SeasonSignup.POSITION_GOALIE) for i in range(num_teams)
+    ]
+    players += [
+        signup(f"Player{i}", _POSITIONS[i % 3])
+        for i in range(num_teams * (num_rounds - 2))
+    ]
+    SeasonSignup.objects.bulk_create(players)
+
+    for i, captain in enumerate(captains):
+        DraftTeam.objects.create(
+            session=session,
+            captain=captain,
+            team_name=f"Loadtest {i + 1}",
+            draft_position=i + 1,
+            captain_draft_round=i % num_rounds + 1,
+        )
+    session.rebuild_pick_order()
+    session.state = DraftSession.STATE_ACTIVE
+    session.save(update_fields=["state"])
+    _process_auto_captain_picks(session)
+    return session
+
+
+def delete_loadtest_draft(session):
+    season = session.season
+    session.delete()
+    season.signups.all().delete()
+    season.delete()
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+
+class QueryCounter:
+    """
+    Counts SQL statements on every database connection in the process:
+    the caller's, the thread that runs sync views and consumer database
+    calls, and any connection opened while it is installed.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    async def install(self):
+        connection_created.connect(self._on_connection, weak=False)
+        self._attach_current()
+        await database_sync_to_async(self._attach_current)()
+
+    def uninstall(self):
+        connection_created.disconnect(self._on_connection)
+        for conn in connections.all():
+            if self in conn.execute_wrappers:
+                conn.execute_wrappers.remove(self)
+
+    def _attach_current(self):
+        for conn in connections.all():
+            self._attach(conn)
+
+    def _on_connection(self, sender, connection, **kwargs):
+        self._attach(connection)
+
+    def _attach(self, conn):
+        if self not in conn.execute_wrappers:
+            conn.execute_wrappers.append(self)
+
+
+class _Socket:
+    """One WebSocket connection to DraftConsumer, read in the background."""
+
+    def __init__(self, application, session_pk, query):
+        path = f"/ws/draft/{session_pk}/"
+        self.comm = ApplicationCommunicator(
+            application,
+            {
+                "type": "websocket",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": urlencode(query).encode(),
+                "headers": _HEADERS,
+                "subprotocols": [],
+            },
+        )
+        self.bytes_received = 0
+        self.delta_arrivals = {}  # seq -> perf_counter() on arrival
+        self.results = asyncio.Queue()
+        self._reader = None
+
+    async def connect(self, timeout):
+        await self.comm.send_input({"type": "websocket.connect"})
+        message = await self.comm.receive_output(timeout)
+        if message["type"] != "websocket.accept":
+            raise LoadTestError(f"WebSocket connection refused: {message}")
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        while True:
+            message = await self.comm.output_queue.get()
+            if message["type"] != "websocket.send":
+                return
+            text = message["text"]
+            self.bytes_received += len(text.encode())
+            data = json.loads(text)
+            if data["type"] == "delta":
+                self.delta_arrivals[data["seq"]] = time.perf_counter()
+            elif data["type"] == "action_result":
+                self.results.put_nowait(data)
+
+    async def send(self, data):
+        await self.comm.send_input(
+            {"type": "websocket.receive", "text": json.dumps(data)}
+        )
+
+    async def close(self):
+        await self.comm.send_input({"type": "websocket.disconnect", "code": 1000})
+        try:
+            await self.comm.wait(1)
+        except asyncio.TimeoutError:
+            pass
+        if self._reader is not None:
+            self._reader.cancel()
+
+
+async def _http(application, method, path, body=b"", headers=()):
+    """One HTTP request through the ASGI app; returns (status, headers, body)."""
+    comm = ApplicationCommunicator(
+        application,
+        {
+            "type": "http",
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [(b"host", b"localhost"), *headers],
+            "server": ("localhost", 80),
+        },
+    )
+    await comm.send_input({"type": "http.request", "body": body})
+    start = await comm.receive_output(30)
+    chunks = []
+    while True:
+        message = await comm.receive_output(30)
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return start["status"], start.get("headers", []), b"".join(chunks)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+class DraftLoadTest:
+    """
+    Run a whole draft against ``application`` and collect per-pick samples.
+
+    ``via`` is "ws" (picks over the captain and commissioner sockets) or
+    "http" (POSTs to make_pick).
+    """
+
+    def __init__(
+        self, application, session, spectators, captains, via="ws", timeout=10
+    ):
+        if via not in ("ws", "http"):
+            raise LoadTestError(f"Unknown pick transport {via!r}.")
+        self.application = application
+        self.session_pk = session.pk
+        self.commissioner_token = str(session.commissioner_token)
+        self.num_spectators = spectators
+        self.num_captains = captains
+        self.via = via
+        self.timeout = timeout
+        self.samples = []
+        self.duration = None
+
+    @database_sync_to_async
+    def _load_draft(self):
+        session = DraftSession.objects.get(pk=self.session_pk)
+        teams = list(session.teams.select_related("captain"))
+        has_goalie = {team.pk: team.captain.is_goalie for team in teams}
+        drafted = {team.captain_id for team in teams}
+        for pick in session.picks.select_related("signup"):
+            drafted.add(pick.signup_id)
+            has_goalie[pick.team_id] |= pick.signup.is_goalie
+        pool = [
+            (signup.pk, signup.is_goalie)
+            for signup in session.season.signups.order_by("pk")
+            if signup.pk not in drafted
+        ]
+        return teams, pool, has_goalie, session.active_team_pk, session.next_pick_index
+
+    async def run(self):
+        teams, pool, has_goalie, active_team_pk, pick_index = await self._load_draft()
+
+        spectators = [
+            _Socket(
+                self.application, self.session_pk, {"display_name": f"Spectator{i}"}
+            )
+            for i in range(self.num_spectators)
+        ]
+        captain_sockets = {
+            team.pk: _Socket(
+                self.application,
+                self.session_pk,
+                {"role": "captain", "token": str(team.captain_token)},
+            )
+            for team in teams[: self.num_captains]
+        }
+        commissioner = _Socket(
+            self.application,
+            self.session_pk,
+            {"role": "commissioner", "token": self.commissioner_token},
+        )
+        sockets = spectators + list(captain_sockets.values()) + [commissioner]
+        tokens = {team.pk: str(team.captain_token) for team in teams}
+
+        counter = QueryCounter()
+        await counter.install()
+        try:
+            for socket in sockets:
+                await socket.connect(self.timeout)
+            csrf = await self._csrf_token() if self.via == "http" else None
+            # Only bytes received while the draft runs count.
+            for socket in sockets:
+                socket.bytes_received = 0
+
+            started = time.perf_counter()
+            while active_team_pk is not None:
+                player_pk = self._choose(pool, has_goalie[active_team_pk])
+                if player_pk is None:
+                    raise LoadTestError("Ran out of players before the draft ended.")
+
+                queries_before = counter.count
+                sent = time.perf_counter()
+                if self.via == "ws":
+                    body = await self._pick_ws(
+                        captain_sockets.get(active_team_pk, commissioner),
+                        player_pk,
+                        pick_index,
+                    )
+                else:
+                    token = (
+                        ("captain_token", tokens[active_team_pk])
+                        if active_team_pk in captain_sockets
+                        else ("commissioner_token", self.commissioner_token)
+                    )
+                    body = await self._pick_http(csrf, token, player_pk, pick_index)
+
+                seq = body["seq"]
+                await self._wait_for_delta(sockets, seq)
+                self.samples.append(
+                    {
+                        "pick_index": pick_index,
+                        "picks_in_delta": len(body["events"]) - 1,
+                        "latencies_ms": [
+                            (s.delta_arrivals[seq] - sent) * 1000 for s in spectators
+                        ],
+                        "queries": counter.count - queries_before,
+                    }
+                )
+
+                for event in body["events"]:
+                    if event["op"] == "pick_added":
+                        if event["player"]["is_goalie"]:
+                            has_goalie[event["team_id"]] = True
+                turn = body["events"][-1]
+                active_team_pk = turn["active_team_pk"]
+                pick_index += len(body["events"]) - 1
+            self.duration = time.perf_counter() - started
+        finally:
+            counter.uninstall()
+            for socket in sockets:
+                await socket.close()
+
+        self.spectator_bytes = [s.bytes_received for s in spectators]
+        self.captain_bytes = [s.bytes_received for s in captain_sockets.values()]
+        return self.samples
+
+    @staticmethod
+    def _choose(pool, team_has_goalie):
+        """First remaining player the team may take (one goalie per team)."""
+        for i, (pk, is_goalie) in enumerate(pool):
+            if not (is_goalie and team_has_goalie):
+                del pool[i]
+                return pk
+        return None
+
+    async def _pick_ws(self, socket, player_pk, pick_index):
+        await socket.send(
+            {
+                "type": "make_pick",
+                "request_id": pick_index,
+                "signup_pk": player_pk,
+                "expected_pick": pick_index,
+            }
+        )
+        result = await asyncio.wait_for(socket.results.get(), self.timeout)
+        if result["status"] != 200:
+            raise LoadTestError(f"Pick {pick_index} failed: {result}")
+        return result
+
+    async def _csrf_token(self):
+        status, headers, _ = await _http(
+            self.application,
+            "GET",
+            reverse("draft_board_spectator", args=[self.session_pk]),
+        )
+        for name, value in headers:
+            if name.lower() == b"set-cookie":
+                cookie = SimpleCookie(value.decode())
+                if "csrftoken" in cookie:
+                    return cookie["csrftoken"].value
+        raise LoadTestError(f"No CSRF cookie from the board page ({status}).")
+
+    async def _pick_http(self, csrf, token, player_pk, pick_index):
+        body = urlencode(
+            {"signup_pk": player_pk, "expected_pick": pick_index, token[0]: token[1]}
+        ).encode()
+        status, _, content = await _http(
+            self.application,
+            "POST",
+            reverse("draft_make_pick", args=[self.session_pk]),
+            body,
+            [
+                (b"content-type", b"application/x-www-form-urlencoded"),
+                (b"cookie", f"csrftoken={csrf}".encode()),
+                (b"x-csrftoken", csrf.encode()),
+            ],
+        )
+        if status != 200:
+            raise LoadTestError(f"Pick {pick_index} failed ({status}): {content[:200]}")
+        return json.loads(content)
+
+    async def _wait_for_delta(self, sockets, seq):
+        deadline = time.perf_counter() + self.timeout
+        while not all(seq in s.delta_arrivals for s in sockets):
+            if time.perf_counter() > deadline:
+                raise LoadTestError(f"Delta {seq} didn't reach every client.")
+            await asyncio.sleep(0.001)
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+
+def _summary(values):
+    values = sorted(values)
+    if not values:
+        return {"p50": 0, "p95": 0, "max": 0}
+    return {
+        "p50": round(statistics.median(values), 2),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 2),
+        "max": round(values[-1], 2),
+    }
+
+
+def build_report(load_test):
+    """JSON-safe summary of a finished DraftLoadTest."""
+    samples = load_test.samples
+    picks = sum(s["picks_in_delta"] for s in samples)
+    deliveries = [ms for s in samples for ms in s["latencies_ms"]]
+    queries = [s["queries"] for s in samples]
+    return {
+        "database": connections["default"].vendor,
+        "via": load_test.via,
+        "spectators": load_test.num_spectators,
+        "captains": load_test.num_captains,
+        "submissions": len(samples),
+        "picks": picks,
+        "duration_s": round(load_test.duration, 3),
+        "delivery_ms": _summary(deliveries),
+        "fanout_ms": _summary(
+            [max(s["latencies_ms"]) for s in samples if s["latencies_ms"]]
+        ),
+        "queries_per_submission": {
+            "mean": round(statistics.mean(queries), 1) if queries else 0,
+            "max": max(queries, default=0),
+        },
+        "spectator_bytes": {
+            "total_mean": (
+                round(statistics.mean(load_test.spectator_bytes))
+                if load_test.spectator_bytes
+                else 0
+            ),
+            "per_pick": (
+                round(statistics.mean(load_test.spectator_bytes) / max(picks, 1))
+                if load_test.spectator_bytes
+                else 0
+            ),
+        },
+    }
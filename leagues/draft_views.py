@@ -3,24 +3,41 @@ Views for the Wednesday Draft League signup and real-time draft board.
 """
 
 import csv
-import io
+import gzip
+import hashlib
 import json
 import random
-
-from django.db.models import Case, Count, Exists, OuterRef, Q, Sum, Value, When
-from django.http import HttpResponse, JsonResponse, Http404
+import re
+import tempfile
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Sum, Value, When
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
 from django.views.decorators.http import require_POST
 
+from .draft_champions import session_champion
 from .models import (
     DraftPick,
-    DraftRound,
     DraftSession,
     DraftTeam,
     Division,
-    MatchUp,
     Player,
+    PlayerNameToken,
     Roster,
     Season,
     SeasonSignup,
@@ -28,6 +45,7 @@ from .models import (
     Team,
     Team_Stat,
 )
+from .name_matching import PlayerIdentityIndex, name_keys, player_name_tokens
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -233,6 +251,45 @@ def _batch_wednesday_stats(player_ids):
     return result
 
 
+def _session_stats(session, signups=None):
+    """
+    {player_id: stats_dict} for the session's linked signups (or just
+    ``signups``).
+
+    Reads the snapshot stored on the session by _refresh_session_stats once
+    the draft has reached the draw phase.  Before that the stats are computed
+    on the fly; players linked after the snapshot was taken are computed and
+    added to it.
+    """
+    if signups is None:
+        signups = session.season.signups.exclude(linked_player=None)
+    player_ids = [s.linked_player_id for s in signups if s.linked_player_id]
+
+    if session.player_stats is None:
+        return _batch_wednesday_stats(player_ids)
+
+    stats = {int(pid): data for pid, data in session.player_stats.items()}
+    missing = [pid for pid in player_ids if pid not in stats]
+    if missing:
+        stats.update(_batch_wednesday_stats(missing))
+        _store_session_stats(session, stats)
+    return stats
+
+
+def _refresh_session_stats(session):
+    """Re-snapshot stats for every linked signup in the session's season."""
+    player_ids = session.season.signups.exclude(linked_player=None).values_list(
+        "linked_player_id", flat=True
+    )
+    _store_session_stats(session, _batch_wednesday_stats(list(player_ids)))
+
+
+def _store_session_stats(session, stats):
+    # Keys as strings, exactly as they come back from the JSON column.
+    session.player_stats = {str(pid): data for pid, data in stats.items()}
+    DraftSession.objects.filter(pk=session.pk).update(player_stats=session.player_stats)
+
+
 def _draft_advisory(session):
     """
     Compute roster-balance advisory for the commissioner.
@@ -393,8 +450,8 @@ def _session_state_payload(session, stats_cache=None):
     """
     Full snapshot of the current draft state for broadcasting / page load.
 
-    Pass a pre-built stats_cache (from _batch_wednesday_stats) to avoid
-    recomputing it when the caller already has one (e.g. the commissioner view).
+    Pass a pre-built stats_cache (from _session_stats) to avoid looking it
+    up again when the caller already has one (e.g. the commissioner view).
     """
     teams = list(
         session.teams.select_related("captain", "league_team")
@@ -413,8 +470,7 @@ def _session_state_payload(session, stats_cache=None):
     )
 
     if stats_cache is None:
-        player_ids = [s.linked_player_id for s in all_signups if s.linked_player_id]
-        stats_cache = _batch_wednesday_stats(player_ids)
+        stats_cache = _session_stats(session, all_signups)
 
     available = [
         _signup_payload(s, stats_cache)
@@ -476,8 +532,7 @@ def _session_state_payload(session, stats_cache=None):
     current = session.current_pick
     if current:
         cur_round, cur_pick_idx = current
-        order = session.pick_order_for_round(cur_round)
-        active_team_pk = order[cur_pick_idx] if cur_pick_idx < len(order) else None
+        active_team_pk = session.active_team_pk
     else:
         cur_round, cur_pick_idx, active_team_pk = None, None, None
 
@@ -488,6 +543,7 @@ def _session_state_payload(session, stats_cache=None):
     )
 
     return {
+        "seq": session.broadcast_seq,
         "state": session.state,
         "num_teams": session.num_teams,
         "num_rounds": session.num_rounds,
@@ -501,6 +557,103 @@ def _session_state_payload(session, stats_cache=None):
     }
 
 
+def _turn_event(session):
+    """Delta event: draft state and whose turn it is.  Ends every delta."""
+    current = session.current_pick
+    cur_round, cur_pick_idx = current if current else (None, None)
+    return {
+        "op": "turn",
+        "state": session.state,
+        "current_round": cur_round,
+        "current_pick_index": cur_pick_idx,
+        "active_team_pk": session.active_team_pk,
+        "completion_warnings": (
+            _draft_completion_warnings(session)
+            if session.state == DraftSession.STATE_COMPLETE
+            else []
+        ),
+    }
+
+
+def _team_has_goalie(team):
+    """Same rule as the has_goalie flag in _session_state_payload."""
+    return (
+        team.captain.is_goalie
+        or DraftPick.objects.filter(
+            team=team, signup__primary_position=SeasonSignup.POSITION_GOALIE
+        ).exists()
+    )
+
+
+def _pick_added_events(session, picks):
+    """
+    Delta events for newly created picks.  Each carries the drafted player's
+    board payload; clients drop that player from the pool and set the team's
+    goalie flag from player.is_goalie.
+    """
+    stats_cache = _session_stats(session, [p.signup for p in picks])
+    events = []
+    for pick in picks:
+        player = _signup_payload(pick.signup, stats_cache)
+        player["is_captain_pick"] = pick.is_auto_captain
+        player["pick_id"] = pick.pk
+        events.append(
+            {
+                "op": "pick_added",
+                "team_id": pick.team_id,
+                "round": pick.round_number,
+                "player": player,
+            }
+        )
+    return events
+
+
+def _pick_removed_events(session, picks):
+    """
+    Delta events for picks that were just deleted (undo).  Call after the
+    delete so team_has_goalie reflects what is left on each roster.
+    Captains never go back into the pool.
+    """
+    captain_signup_ids = set(session.teams.values_list("captain_id", flat=True))
+    stats_cache = _session_stats(session, [p.signup for p in picks])
+    has_goalie = {}
+    events = []
+    for pick in picks:
+        if pick.team_id not in has_goalie:
+            has_goalie[pick.team_id] = _team_has_goalie(pick.team)
+        events.append(
+            {
+                "op": "pick_removed",
+                "team_id": pick.team_id,
+                "round": pick.round_number,
+                "pick_id": pick.pk,
+                "player": _signup_payload(pick.signup, stats_cache),
+                "return_to_pool": pick.signup_id not in captain_signup_ids,
+                "team_has_goalie": has_goalie[pick.team_id],
+            }
+        )
+    return events
+
+
+def _draft_delta(session, events):
+    """
+    Stamp delta events with the next broadcast sequence number.  The same
+    dict is broadcast to the board and returned to the HTTP caller, so the
+    client applies whichever copy arrives first and ignores the other.
+    """
+    return {"seq": session.next_broadcast_seq(), "events": events}
+
+
+def _match_signup_player(first_name, last_name, email):
+    """
+    The existing Player a new signup should be linked to, or None: the one
+    with this name, else the one with this email.  A name or email shared by
+    several players is left for the commissioner to link in the admin.
+    """
+    index = PlayerIdentityIndex.load([(first_name, last_name, email)])
+    return index.match(first_name, last_name, email, order=("name", "email")).player
+
+
 # ---------------------------------------------------------------------------
 # Public signup form
 # ---------------------------------------------------------------------------
@@ -570,12 +723,7 @@ def draft_signup(request, season_pk):
         if not error:
             # Try to link to an existing Player record — first by name, then by
             # email as a fallback (handles nicknames like Mike vs. Michael).
-            linked_player = Player.objects.filter(
-                first_name__iexact=first_name,
-                last_name__iexact=last_name,
-            ).first()
-            if linked_player is None and email:
-                linked_player = Player.objects.filter(email__iexact=email).first()
+            linked_player = _match_signup_player(first_name, last_name, email)
 
             existing_email = SeasonSignup.objects.filter(
                 season=season,
@@ -617,24 +765,138 @@ def draft_signup(request, season_pk):
 def draft_board_spectator(request, session_pk):
     """
     Public read-only view of a draft session.
-    Receives live updates via WebSocket — this view just renders the shell.
+
+    Just the shell: the board itself is fetched from draft_state_json and
+    kept current over the WebSocket, so the page is cheap to render and
+    browsers may reuse it for a short while.
     """
     session = get_object_or_404(DraftSession, pk=session_pk)
 
     rounds = list(session.rounds.order_by("round_number"))
-    initial_state = json.dumps(_session_state_payload(session))
 
-    champion = _get_session_champion(session)
+    champion = session_champion(session)
     context = {
         "session": session,
         "rounds": rounds,
-        "initial_state": initial_state,
+        "initial_state": json.dumps(_placeholder_state(session)),
+        "state_deferred": True,
         "is_captain": False,
         "is_commissioner": False,
         "champion": champion,
-        "champion_league_team_id": champion["team"].id if champion else None,
+        "champion_league_team_id": champion["team"]["id"] if champion else None,
     }
-    return render(request, "leagues/draft_board.html", context)
+    response = render(request, "leagues/draft_board.html", context)
+    patch_cache_control(response, private=True, max_age=_SHELL_MAX_AGE)
+    return response
+
+
+def _placeholder_state(session):
+    """
+    An empty board for the spectator shell to start from.  seq -1 sorts
+    before every real snapshot, and any delta that arrives first is treated
+    as a gap.
+    """
+    return {
+        "seq": -1,
+        "state": session.state,
+        "num_teams": session.num_teams,
+        "num_rounds": session.num_rounds,
+        "teams": [],
+        "available_players": [],
+        "current_round": None,
+        "current_pick_index": None,
+        "active_team_pk": None,
+        "finalized": session.finalized_at is not None,
+        "completion_warnings": [],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Board snapshot (state.json)
+# ---------------------------------------------------------------------------
+
+# Board states in which broadcast_seq alone identifies the snapshot: every
+# change goes out as a sequenced broadcast, and admin edits to draft teams
+# and signups bump the seq (leagues.signals).
+_LIVE_STATES = DraftSession.LIVE_STATES
+_SNAPSHOT_TTL = 60 * 60
+# Before and after the draft, signups and league records change without a
+# broadcast, so cached snapshots expire quickly.
+_IDLE_SNAPSHOT_TTL = 60
+# How long browsers and proxies may reuse state.json?v=<seq> for the
+# current seq of a live board.
+_VERSIONED_SNAPSHOT_MAX_AGE = 60 * 60
+# How long browsers may reuse the spectator shell.
+_SHELL_MAX_AGE = 60
+
+_accepts_gzip = re.compile(r"\bgzip\b")
+
+
+def _snapshot_cache_key(session_pk, seq):
+    return f"draft_state:{session_pk}:{seq}"
+
+
+def _cache_state_snapshot(session, payload):
+    """
+    Serialize, gzip and cache the session's _session_state_payload under
+    its current broadcast_seq.
+
+    The ETag is weak (the gzipped and plain bodies share it) and carries the
+    seq plus a content hash, so it also changes when an idle board is
+    edited without a broadcast.
+    """
+    seq = session.broadcast_seq
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    digest = hashlib.sha1(body).hexdigest()[:16]
+    entry = {
+        "seq": seq,
+        "etag": f'W/"{seq}-{digest}"',
+        "body": body,
+        "gzip": gzip.compress(body),
+    }
+    cache.set(
+        _snapshot_cache_key(session.pk, seq),
+        entry,
+        _SNAPSHOT_TTL if session.state in _LIVE_STATES else _IDLE_SNAPSHOT_TTL,
+    )
+    return entry
+
+
+def _state_snapshot(session):
+    """The cached snapshot entry for the session's current seq."""
+    entry = cache.get(_snapshot_cache_key(session.pk, session.broadcast_seq))
+    if entry is None:
+        entry = _cache_state_snapshot(session, _session_state_payload(session))
+    return entry
+
+
+def draft_state_json(request, session_pk):
+    """
+    The board snapshot as JSON: the spectator page loads it, and clients
+    that missed a delta fetch it as ?v=<seq of that delta>.
+
+    The payload is built once per broadcast_seq and served pre-serialized
+    (gzipped when the client accepts it) from the cache.  Its ETag carries
+    the seq, so reloads between picks are 304s; ?v= for the current seq of
+    a live board may be cached outright.
+    """
+    session = get_object_or_404(DraftSession, pk=session_pk)
+    entry = _state_snapshot(session)
+
+    response = get_conditional_response(request, etag=entry["etag"])
+    if response is None:
+        if _accepts_gzip.search(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(entry["gzip"], content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(entry["body"], content_type="application/json")
+    response["ETag"] = entry["etag"]
+    patch_vary_headers(response, ["Accept-Encoding"])
+    if request.GET.get("v") == str(entry["seq"]) and session.state in _LIVE_STATES:
+        patch_cache_control(response, public=True, max_age=_VERSIONED_SNAPSHOT_MAX_AGE)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -650,15 +912,13 @@ def draft_board_commissioner(request, session_pk, token):
     session = get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
     rounds = list(session.rounds.order_by("round_number"))
 
-    # Build stats cache once; share across state payload and all_players_json
+    # Look up stats once; share across state payload and all_players_json
     all_signups = list(
         session.season.signups.select_related("linked_player").order_by(
             "last_name", "first_name"
         )
     )
-    stats_cache = _batch_wednesday_stats(
-        [s.linked_player_id for s in all_signups if s.linked_player_id]
-    )
+    stats_cache = _session_stats(session, all_signups)
 
     initial_state = json.dumps(_session_state_payload(session, stats_cache=stats_cache))
     all_players_json = json.dumps(
@@ -666,7 +926,7 @@ def draft_board_commissioner(request, session_pk, token):
     )
     advisory_json = json.dumps(_draft_advisory(session))
 
-    champion = _get_session_champion(session)
+    champion = session_champion(session)
     context = {
         "session": session,
         "rounds": rounds,
@@ -677,7 +937,7 @@ def draft_board_commissioner(request, session_pk, token):
         "all_players_json": all_players_json,
         "advisory_json": advisory_json,
         "champion": champion,
-        "champion_league_team_id": champion["team"].id if champion else None,
+        "champion_league_team_id": champion["team"]["id"] if champion else None,
     }
     return render(request, "leagues/draft_board.html", context)
 
@@ -698,7 +958,7 @@ def draft_board_captain(request, session_pk, token):
     rounds = list(session.rounds.order_by("round_number"))
     initial_state = json.dumps(_session_state_payload(session))
 
-    champion = _get_session_champion(session)
+    champion = session_champion(session)
     context = {
         "session": session,
         "rounds": rounds,
@@ -709,7 +969,7 @@ def draft_board_captain(request, session_pk, token):
         "captain_token": str(token),
         "captain_name": team.captain.full_name,
         "champion": champion,
-        "champion_league_team_id": champion["team"].id if champion else None,
+        "champion_league_team_id": champion["team"]["id"] if champion else None,
     }
     return render(request, "leagues/draft_board.html", context)
 
@@ -783,6 +1043,14 @@ def draw_positions(request, session_pk, token):
     # Sort so clients can animate in position order
     reveal_order.sort(key=lambda x: x["position"])
 
+    # Positions are final: build the pick order table for every round now so
+    # whose-turn lookups during the draft never recompute it.
+    session.rebuild_pick_order()
+
+    # Signups are closing, so historical stats are fixed for the rest of the
+    # draft: snapshot them once instead of re-aggregating on every broadcast.
+    _refresh_session_stats(session)
+
     # Close signups now that the draw has happened
     if session.signups_open:
         session.signups_open = False
@@ -820,8 +1088,17 @@ def draw_positions(request, session_pk, token):
 @require_POST
 def advance_state(request, session_pk, token):
     """Move the session to the next logical state."""
-    session = get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
+    get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
+    return _run_draft_action(_submit_advance, session_pk)
+
+
+def _submit_advance(session_pk):
+    with transaction.atomic():
+        session = _lock_draft_session(session_pk)
+        return _advance_state_locked(session)
+
 
+def _advance_state_locked(session):
     transitions = {
         DraftSession.STATE_SETUP: DraftSession.STATE_DRAW,
         DraftSession.STATE_DRAW: DraftSession.STATE_ACTIVE,
@@ -829,9 +1106,10 @@ def advance_state(request, session_pk, token):
         DraftSession.STATE_PAUSED: DraftSession.STATE_ACTIVE,
     }
 
-    next_state = transitions.get(session.state)
+    prev_state = session.state
+    next_state = transitions.get(prev_state)
     if not next_state:
-        return JsonResponse({"error": "No transition available."}, status=400)
+        return {"error": "No transition available."}, 400, None
 
     update_fields = ["state"]
 
@@ -848,12 +1126,13 @@ def advance_state(request, session_pk, token):
         )
         if missing.exists():
             names = ", ".join(t.captain.full_name for t in missing)
-            return JsonResponse(
+            return (
                 {
                     "error": f"Captain round not set for: {names}. "
                     "Set a draft round for every captain before starting."
                 },
-                status=400,
+                400,
+                None,
             )
 
     # Close signups when the draft first goes active from the draw phase
@@ -864,17 +1143,33 @@ def advance_state(request, session_pk, token):
         session.signups_open = False
         update_fields.append("signups_open")
 
+    if (
+        next_state == DraftSession.STATE_ACTIVE
+        and session.state == DraftSession.STATE_DRAW
+    ):
+        session.rebuild_pick_order()
+
     session.state = next_state
     session.save(update_fields=update_fields)
 
+    if prev_state in (DraftSession.STATE_SETUP, DraftSession.STATE_DRAW):
+        _refresh_session_stats(session)
+
     # If the draft just went active (from draw or resume), process any captain
     # auto-picks that fall on the very first slot(s).
+    auto_picks = []
     if next_state == DraftSession.STATE_ACTIVE:
-        _process_auto_captain_picks(session)
+        auto_picks = _process_auto_captain_picks(session)
 
-    _broadcast_state_change(session)
-
-    return JsonResponse({"state": _session_state_payload(session)})
+    delta = _draft_delta(
+        session, _pick_added_events(session, auto_picks) + [_turn_event(session)]
+    )
+    broadcast = {
+        "session": session,
+        "delta": delta,
+        "chat_messages": _record_system_chat(session, _auto_captain_chat(auto_picks)),
+    }
+    return delta, 200, broadcast
 
 
 # ---------------------------------------------------------------------------
@@ -885,12 +1180,26 @@ def advance_state(request, session_pk, token):
 @require_POST
 def undo_last_pick(request, session_pk, token):
     """Remove the most recently made pick."""
-    session = get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
+    get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
+    return _run_draft_action(_submit_undo, session_pk)
+
+
+def _submit_undo(session_pk):
+    with transaction.atomic():
+        session = _lock_draft_session(session_pk)
+        return _undo_last_pick_locked(session)
 
-    last_pick = DraftPick.objects.filter(session=session).order_by("-picked_at").first()
+
+def _undo_last_pick_locked(session):
+    last_pick = (
+        DraftPick.objects.filter(session=session)
+        .select_related("team__captain", "signup")
+        .order_by("-picked_at")
+        .first()
+    )
 
     if not last_pick:
-        return JsonResponse({"error": "No picks to undo."}, status=400)
+        return {"error": "No picks to undo."}, 400, None
 
     was_auto_captain = last_pick.is_auto_captain
     undone = {
@@ -900,6 +1209,7 @@ def undo_last_pick(request, session_pk, token):
         "pick": last_pick.pick_number + 1,
         "was_auto_captain": was_auto_captain,
     }
+    removed = [last_pick]
     last_pick.delete()
 
     # If we just undid an auto-captain pick, keep undoing until we reach a
@@ -908,16 +1218,24 @@ def undo_last_pick(request, session_pk, token):
     if was_auto_captain:
         while True:
             prev = (
-                DraftPick.objects.filter(session=session).order_by("-picked_at").first()
+                DraftPick.objects.filter(session=session)
+                .select_related("team__captain", "signup")
+                .order_by("-picked_at")
+                .first()
             )
             if prev and prev.is_auto_captain:
+                removed.append(prev)
                 prev.delete()
             else:
                 break
 
-    _broadcast_state_change(session, extra={"undone_pick": undone})
+    session.refresh_from_db(fields=["next_pick_index"])
 
-    return JsonResponse({"undone": undone, "state": _session_state_payload(session)})
+    delta = _draft_delta(
+        session, _pick_removed_events(session, removed) + [_turn_event(session)]
+    )
+    broadcast = {"session": session, "delta": delta, "extra": {"undone_pick": undone}}
+    return {"undone": undone, **delta}, 200, broadcast
 
 
 # ---------------------------------------------------------------------------
@@ -935,6 +1253,7 @@ def _process_auto_captain_picks(session):
     Returns a list of the auto-picks created (may be empty).
     """
     auto_picks = []
+    rebuilt = False
 
     while True:
         current = session.current_pick
@@ -942,11 +1261,10 @@ def _process_auto_captain_picks(session):
             break
 
         cur_round, cur_pick_idx = current
-        order = session.pick_order_for_round(cur_round)
-        if cur_pick_idx >= len(order):
+        active_team_pk = session.active_team_pk
+        if active_team_pk is None:
             break
 
-        active_team_pk = order[cur_pick_idx]
         try:
             active_team = DraftTeam.objects.select_related("captain").get(
                 pk=active_team_pk
@@ -954,8 +1272,18 @@ def _process_auto_captain_picks(session):
         except DraftTeam.DoesNotExist:
             break
 
+        # The team is authoritative.  A stored plan that disagrees with it
+        # went stale through a queryset update (captain round, draft
+        # position): rebuild it once and look at the slot again.
+        captain_round = active_team.captain_draft_round == cur_round
+        planned = session.is_captain_slot(session.next_pick_index)
+        if planned is not None and planned != captain_round and not rebuilt:
+            session.rebuild_pick_order()
+            rebuilt = True
+            continue
+
         # Only auto-pick if this round is designated as this team's captain round
-        if active_team.captain_draft_round != cur_round:
+        if not captain_round:
             break
 
         captain_signup = active_team.captain
@@ -975,30 +1303,107 @@ def _process_auto_captain_picks(session):
         auto_picks.append(pick)
 
     # If any auto-picks were made, check for draft completion
-    if auto_picks:
-        total_picks = session.picks.count()
-        expected = session.num_teams * session.num_rounds
-        if total_picks >= expected:
-            session.state = DraftSession.STATE_COMPLETE
-            session.save(update_fields=["state"])
+    if auto_picks and session.current_pick is None:
+        session.state = DraftSession.STATE_COMPLETE
+        session.save(update_fields=["state"])
 
     return auto_picks
 
 
+def _lock_draft_session(session_pk):
+    """
+    Load a session inside the current transaction, holding its row lock until
+    commit so picks and undos for one draft run one at a time.
+    """
+    if connection.features.has_select_for_update:
+        return DraftSession.objects.select_for_update().get(pk=session_pk)
+    # SQLite has no row locks; a no-op write takes the database write lock up
+    # front so a concurrent pick waits here instead of failing later.
+    DraftSession.objects.filter(pk=session_pk).update(
+        next_pick_index=F("next_pick_index")
+    )
+    return DraftSession.objects.get(pk=session_pk)
+
+
+def _pick_conflict(session, message):
+    """409 with a fresh snapshot so the client can resync its board."""
+    body = {
+        "error": message,
+        "conflict": True,
+        "state": _session_state_payload(session),
+    }
+    return body, 409, None
+
+
 @require_POST
 def make_pick(request, session_pk):
     """
     Submit a draft pick.
     Either captain_token or commissioner_token must be in POST data.
+
+    Optional POST fields:
+      idempotency_key — client-generated UUID.  Retrying a request with the
+                        same key returns the current board instead of
+                        drafting twice.
+      expected_pick   — the overall pick index the client saw on the clock.
+                        If another pick landed first the request is rejected
+                        with 409 rather than applied to the next slot.
+
+    The turn check and insert run in one transaction holding the session
+    lock, so racing submissions are serialised and the loser gets a 409.
+    Captains and the commissioner can also pick over the board WebSocket
+    (see DraftConsumer), which goes through the same _submit_pick.
     """
-    session = get_object_or_404(DraftSession, pk=session_pk)
+    get_object_or_404(DraftSession, pk=session_pk)
+    return _run_draft_action(_submit_pick, session_pk, request.POST)
+
+
+def _submit_pick(session_pk, data):
+    """
+    Draft data["signup_pk"] for the team on the clock.  data holds the
+    make_pick fields (a QueryDict from the view, a dict from the consumer).
+    """
+    idempotency_key = data.get("idempotency_key") or None
+    if idempotency_key is not None:
+        try:
+            idempotency_key = uuid.UUID(str(idempotency_key))
+        except ValueError:
+            return {"error": "Invalid idempotency key."}, 400, None
+
+    try:
+        with transaction.atomic():
+            session = _lock_draft_session(session_pk)
+            return _make_pick_locked(session, data, idempotency_key)
+    except IntegrityError:
+        # Only reachable if a pick bypassed the lock (e.g. made in the admin).
+        session = DraftSession.objects.get(pk=session_pk)
+        return _pick_conflict(session, "That pick conflicts with another one.")
+
+
+def _make_pick_locked(session, data, idempotency_key):
+    if (
+        idempotency_key is not None
+        and session.picks.filter(idempotency_key=idempotency_key).exists()
+    ):
+        body = {
+            "success": True,
+            "replayed": True,
+            "state": _session_state_payload(session),
+        }
+        return body, 200, None
 
     if session.state != DraftSession.STATE_ACTIVE:
-        return JsonResponse({"error": "Draft is not active."}, status=400)
+        return {"error": "Draft is not active."}, 400, None
 
-    captain_token = request.POST.get("captain_token")
-    commissioner_token = request.POST.get("commissioner_token")
-    signup_pk = request.POST.get("signup_pk")
+    expected_pick = data.get("expected_pick")
+    if expected_pick not in (None, "") and str(expected_pick) != str(
+        session.next_pick_index
+    ):
+        return _pick_conflict(session, "Another pick was just made.")
+
+    captain_token = data.get("captain_token")
+    commissioner_token = data.get("commissioner_token")
+    signup_pk = data.get("signup_pk")
 
     # Determine who is picking
     is_commissioner = (
@@ -1013,21 +1418,20 @@ def make_pick(request, session_pk):
             .first()
         )
         if not picking_team:
-            return JsonResponse({"error": "Invalid captain token."}, status=403)
+            return {"error": "Invalid captain token."}, 403, None
     elif not is_commissioner:
-        return JsonResponse({"error": "Authentication required."}, status=403)
+        return {"error": "Authentication required."}, 403, None
 
     # Determine whose turn it is
     current = session.current_pick
     if not current:
-        return JsonResponse({"error": "Draft is complete."}, status=400)
+        return {"error": "Draft is complete."}, 400, None
 
     cur_round, cur_pick_idx = current
-    order = session.pick_order_for_round(cur_round)
-    active_team_pk = order[cur_pick_idx]
+    active_team_pk = session.active_team_pk
 
     if picking_team and picking_team.pk != active_team_pk:
-        return JsonResponse({"error": "It is not your turn."}, status=400)
+        return {"error": "It is not your turn."}, 400, None
 
     if not picking_team:
         picking_team = DraftTeam.objects.select_related("captain").get(
@@ -1044,27 +1448,38 @@ def make_pick(request, session_pk):
             session=session, signup=picking_team.captain
         ).exists()
     ):
-        _process_auto_captain_picks(session)
-        _broadcast_state_change(session, prev_round=cur_round)
-        return JsonResponse({"success": True, "state": _session_state_payload(session)})
+        auto_picks = _process_auto_captain_picks(session)
+        delta = _draft_delta(
+            session, _pick_added_events(session, auto_picks) + [_turn_event(session)]
+        )
+        broadcast = {
+            "session": session,
+            "delta": delta,
+            "chat_messages": _record_system_chat(
+                session, _auto_captain_chat(auto_picks)
+            ),
+            "prev_round": cur_round,
+        }
+        return {"success": True, **delta}, 200, broadcast
 
     # Validate the signup
     try:
         signup = SeasonSignup.objects.get(pk=signup_pk, season=session.season)
     except SeasonSignup.DoesNotExist:
-        return JsonResponse({"error": "Player not found."}, status=400)
+        return {"error": "Player not found."}, 400, None
 
     if DraftPick.objects.filter(session=session, signup=signup).exists():
-        return JsonResponse({"error": "Player already drafted."}, status=400)
+        return {"error": "Player already drafted."}, 400, None
 
     # Captains may only be drafted by their own team
     captain_team = session.teams.filter(captain=signup).first()
     if captain_team and captain_team.pk != picking_team.pk:
-        return JsonResponse(
+        return (
             {
                 "error": f"{signup.full_name} is the captain of {captain_team.team_name} and can only be on their own team."
             },
-            status=400,
+            400,
+            None,
         )
 
     if signup.primary_position == SeasonSignup.POSITION_GOALIE:
@@ -1082,9 +1497,10 @@ def make_pick(request, session_pk):
             ).exists()
         )
         if team_already_has_goalie:
-            return JsonResponse(
+            return (
                 {"error": f"{picking_team.team_name} already has a goalie."},
-                status=400,
+                400,
+                None,
             )
 
     pick = DraftPick.objects.create(
@@ -1093,33 +1509,39 @@ def make_pick(request, session_pk):
         signup=signup,
         round_number=cur_round,
         pick_number=cur_pick_idx,
+        idempotency_key=idempotency_key,
     )
 
     # Check if draft is now complete
-    total_picks = session.picks.count()
-    expected = session.num_teams * session.num_rounds
-    if total_picks >= expected:
+    new_picks = [pick]
+    if session.current_pick is None:
         session.state = DraftSession.STATE_COMPLETE
         session.save(update_fields=["state"])
     else:
         # Advance through any consecutive captain auto-pick slots
-        _process_auto_captain_picks(session)
+        new_picks += _process_auto_captain_picks(session)
 
-    _broadcast_state_change(
-        session,
-        extra={
-            "pick": {
-                "team_pk": picking_team.pk,
-                "team_name": picking_team.team_name,
-                "player": _signup_payload(signup),
-                "round": cur_round,
-                "pick_number": cur_pick_idx + 1,
-            }
-        },
-        prev_round=cur_round,
+    delta = _draft_delta(
+        session, _pick_added_events(session, new_picks) + [_turn_event(session)]
     )
-
-    return JsonResponse({"success": True, "state": _session_state_payload(session)})
+    extra = {
+        "pick": {
+            "team_pk": picking_team.pk,
+            "team_name": picking_team.team_name,
+            "player": delta["events"][0]["player"],
+            "round": cur_round,
+            "pick_number": cur_pick_idx + 1,
+        }
+    }
+    chat = [_pick_chat_body(extra["pick"])] + _auto_captain_chat(new_picks[1:])
+    broadcast = {
+        "session": session,
+        "delta": delta,
+        "extra": extra,
+        "chat_messages": _record_system_chat(session, chat),
+        "prev_round": cur_round,
+    }
+    return {"success": True, **delta}, 200, broadcast
 
 
 # ---------------------------------------------------------------------------
@@ -1127,91 +1549,195 @@ def make_pick(request, session_pk):
 # ---------------------------------------------------------------------------
 
 
-def _broadcast_state_change(session, extra=None, prev_round=None):
-    """Push a full state refresh to all connected WebSocket clients.
+def _run_draft_action(action, *args):
+    """
+    Run one of the _submit_* draft actions for an HTTP view.
+
+    Actions return (body, status, broadcast): the response body, its status
+    and the _broadcast_delta kwargs (None if nothing changed).  They commit
+    before returning, so the broadcast never announces a rolled-back pick.
+    DraftConsumer runs the same actions for WebSocket requests.
+    """
+    body, status, broadcast = action(*args)
+    if broadcast:
+        _broadcast_delta(**broadcast)
+    return JsonResponse(body, status=status)
+
+
+def _broadcast_state_change(session, extra=None, prev_round=None, chat_messages=None):
+    """Push a full state snapshot to all connected WebSocket clients.
+
+    Used for changes that reshape the board (draw, reset, swaps, late
+    signups, captain rounds).  Picks, undos and pauses go out as deltas via
+    _broadcast_delta instead.
+
+    chat_messages: system chat lines already recorded for the change (see
+    _record_system_chat); they travel in the same message.
 
     prev_round: the round number that was active *before* the triggering pick
     (including any auto-captain picks processed afterwards).  When provided,
     a round-boundary crossing can be detected even if auto-captain picks
     consumed slot 0 of the new round before the broadcast ran.
     """
-    from asgiref.sync import async_to_sync
-    from channels.layers import get_channel_layer
-
+    session.next_broadcast_seq()
     state_payload = _session_state_payload(session)
+    # Page loads after the change are served without rebuilding it.
+    _cache_state_snapshot(session, state_payload)
     payload = {"type": "draft.state_update", "state": state_payload}
 
-    cur_round = state_payload["current_round"]
-
-    # Detect whether we just crossed into a new round.  Prefer the explicit
-    # prev_round signal (handles auto-captain picks at slot 0); fall back to
-    # the pick-index check for callers that don't supply it (advance_state,
-    # undo, etc.).
-    just_entered_new_round = (
-        prev_round is not None and cur_round is not None and prev_round != cur_round
+    reveal = _randomized_round_reveal(
+        session,
+        state_payload["state"],
+        state_payload["current_round"],
+        state_payload["current_pick_index"],
+        prev_round,
     )
-    at_round_start = state_payload["current_pick_index"] == 0
+    if reveal:
+        payload["randomized_round_reveal"] = reveal
+
+    if extra:
+        payload.update(extra)
+    chat_messages = _broadcast_chat(session, extra, chat_messages)
+    if chat_messages:
+        payload["chat_messages"] = chat_messages
+
+    _send_to_board(session.pk, payload)
 
-    if (
-        state_payload["state"] == DraftSession.STATE_ACTIVE
-        and cur_round is not None
-        and (just_entered_new_round or at_round_start)
-    ):
-        cur_round = state_payload["current_round"]
-        try:
-            round_obj = session.rounds.get(round_number=cur_round)
-            if round_obj.order_type == DraftRound.ORDER_RANDOMIZED:
-                order_pks = session.pick_order_for_round(cur_round)
-                teams_by_pk = {
-                    t.pk: t for t in session.teams.select_related("captain").all()
-                }
-                payload["randomized_round_reveal"] = {
-                    "round": cur_round,
-                    "order": [
-                        {
-                            "position": i + 1,
-                            "team_name": teams_by_pk[pk].team_name,
-                            "captain_name": teams_by_pk[pk].captain.full_name,
-                        }
-                        for i, pk in enumerate(order_pks)
-                        if pk in teams_by_pk
-                    ],
-                }
-        except DraftRound.DoesNotExist:
-            pass
+
+def _delta_event(session, delta, extra=None, prev_round=None, chat_messages=None):
+    """
+    Channel-layer event for a delta (from _draft_delta).
+
+    Everything clients need for the change — board events, any randomized
+    round reveal and the system chat lines for the picks — travels in this
+    one message.  Needs the database, so async callers build it in a sync
+    wrapper and send it themselves.
+    """
+    payload = {"type": "draft.delta", **delta}
+
+    turn = delta["events"][-1]
+    reveal = _randomized_round_reveal(
+        session,
+        turn["state"],
+        turn["current_round"],
+        turn["current_pick_index"],
+        prev_round,
+    )
+    if reveal:
+        payload["randomized_round_reveal"] = reveal
 
     if extra:
         payload.update(extra)
+    chat_messages = _broadcast_chat(session, extra, chat_messages)
+    if chat_messages:
+        payload["chat_messages"] = chat_messages
+    return payload
 
-    channel_layer = get_channel_layer()
-    group_name = f"draft_{session.pk}"
-    async_to_sync(channel_layer.group_send)(group_name, payload)
-
-    # Broadcast a system chat message for each pick so the chat log
-    # automatically records every selection without commissioner effort.
-    if extra and "pick" in extra:
-        pick = extra["pick"]
-        from leagues.models import DraftChatMessage
-        from leagues.consumers import _serialize_message
-
-        body = (
-            f"\U0001f3d2 {pick['team_name']} drafted "
-            f"{pick['player']['full_name']} — "
-            f"Round {pick['round']}, Pick {pick['pick_number']}"
-        )
-        chat_msg = DraftChatMessage.objects.create(
-            session=session,
-            sender_name="Draft",
-            sender_type=DraftChatMessage.SENDER_SYSTEM,
-            body=body,
-        )
-        async_to_sync(channel_layer.group_send)(
-            group_name,
+
+def _broadcast_delta(session, delta, extra=None, prev_round=None, chat_messages=None):
+    """Push a sequenced delta (from _draft_delta) to all connected clients.
+
+    A pick costs a couple of small queries for the picked players instead of
+    a full board rebuild, no matter how many signups or spectators there are.
+    Clients that see a gap in seq ask for a snapshot over the WebSocket.
+    """
+    _send_to_board(
+        session.pk, _delta_event(session, delta, extra, prev_round, chat_messages)
+    )
+
+
+def _send_to_board(session_pk, payload):
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    async_to_sync(get_channel_layer().group_send)(f"draft_{session_pk}", payload)
+
+
+def _randomized_round_reveal(session, state, cur_round, cur_pick_idx, prev_round):
+    """
+    Order reveal for a randomized round the draft has just entered, or None.
+
+    Prefer the explicit prev_round signal (handles auto-captain picks at
+    slot 0); fall back to the pick-index check for callers that don't supply
+    it (advance_state, undo, etc.).
+    """
+    if state != DraftSession.STATE_ACTIVE or cur_round is None:
+        return None
+    just_entered_new_round = prev_round is not None and prev_round != cur_round
+    if not (just_entered_new_round or cur_pick_idx == 0):
+        return None
+
+    if not session.is_randomized_round(cur_round):
+        return None
+
+    order_pks = session.pick_order_for_round(cur_round)
+    teams_by_pk = {t.pk: t for t in session.teams.select_related("captain").all()}
+    return {
+        "round": cur_round,
+        "order": [
             {
-                "type": "draft.chat_message",
-                "message": _serialize_message(chat_msg),
-            },
-        )
+                "position": i + 1,
+                "team_name": teams_by_pk[pk].team_name,
+                "captain_name": teams_by_pk[pk].captain.full_name,
+            }
+            for i, pk in enumerate(order_pks)
+            if pk in teams_by_pk
+        ],
+    }
+
+
+def _record_system_chat(session, bodies):
+    """
+    Insert system chat lines with one bulk_create and return them serialized,
+    oldest first, to travel with the board message announcing the change.
+    Call inside the change's transaction so the lines commit with it.
+    """
+    from leagues.chat_buffer import serialize_message
+    from leagues.models import DraftChatMessage
+
+    if not bodies:
+        return []
+    messages = DraftChatMessage.objects.bulk_create(
+        [
+            DraftChatMessage(
+                session=session,
+                sender_name="Draft",
+                sender_type=DraftChatMessage.SENDER_SYSTEM,
+                body=body,
+            )
+            for body in bodies
+        ]
+    )
+    return [serialize_message(m) for m in messages]
+
+
+def _broadcast_chat(session, extra, chat_messages):
+    """
+    The chat lines for a broadcast.  Callers that didn't record them still
+    get the pick's line, so the chat log records every selection without
+    commissioner effort.
+    """
+    if chat_messages is None and extra and "pick" in extra:
+        return _record_system_chat(session, [_pick_chat_body(extra["pick"])])
+    return chat_messages
+
+
+def _pick_chat_body(pick):
+    return (
+        f"\U0001f3d2 {pick['team_name']} drafted "
+        f"{pick['player']['full_name']} — "
+        f"Round {pick['round']}, Pick {pick['pick_number']}"
+    )
+
+
+def _auto_captain_chat(picks):
+    """System chat lines for captains the draft just auto-picked."""
+    return [
+        f"\U0001f3d2 {pick.team.team_name} auto-drafted captain "
+        f"{pick.signup.full_name} — "
+        f"Round {pick.round_number}, Pick {pick.pick_number + 1}"
+        for pick in picks
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -1227,8 +1753,11 @@ def finalize_draft(request, session_pk, token):
     First call:  creates Team objects and builds Roster from picks.
     Re-finalize: keeps existing Teams, wipes their Rosters and rebuilds from
                  current picks — so edits made via swap_pick are reflected.
+
+    Set-based throughout: teams, players and rosters are bulk-created, so the
+    query count doesn't grow with the number of teams or rounds.
     """
-    from django.db import transaction
+    from leagues.signals import batched_roster_changes
 
     session = get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
 
@@ -1239,20 +1768,36 @@ def finalize_draft(request, session_pk, token):
 
     wed_division, _ = Division.objects.get_or_create(division=3)
 
-    draft_teams = list(
-        session.teams.select_related("captain").order_by("draft_position", "pk")
+    draft_teams = list(session.teams.order_by("draft_position", "pk"))
+    picks = list(
+        DraftPick.objects.filter(session=session)
+        .select_related("signup")
+        .order_by("round_number", "pick_number")
     )
 
-    created_teams = 0
-    created_rosters = 0
+    # Primary-goalie uniqueness (Roster.clean) checked up front, in memory.
+    goalies_by_team = {}
+    for pick in picks:
+        if pick.signup.is_goalie:
+            goalies_by_team.setdefault(pick.team_id, []).append(pick.signup)
+    for draft_team in draft_teams:
+        goalies = goalies_by_team.get(draft_team.pk, [])
+        if len(goalies) > 1:
+            return JsonResponse(
+                {
+                    "error": f"{draft_team.team_name} has more than one goalie "
+                    f"({', '.join(g.full_name for g in goalies)}). "
+                    "Swap one out before finalizing."
+                },
+                status=400,
+            )
 
-    with transaction.atomic():
-        for draft_team in draft_teams:
-            # Create the real Team once; keep it on re-finalize
-            if draft_team.league_team_id is not None:
-                league_team = draft_team.league_team
-            else:
-                league_team = Team.objects.create(
+    with batched_roster_changes() as touched_players, transaction.atomic():
+        # Create the real Team once; keep it on re-finalize
+        new_teams = [t for t in draft_teams if t.league_team_id is None]
+        created = Team.objects.bulk_create(
+            [
+                Team(
                     team_name=draft_team.team_name,
                     season=session.season,
                     division=wed_division,
@@ -1260,69 +1805,102 @@ def finalize_draft(request, session_pk, token):
                     is_active=True,
                     team_photo=None,
                 )
-                draft_team.league_team = league_team
-                draft_team.save(update_fields=["league_team"])
-                created_teams += 1
-
-            # Always wipe and rebuild rosters so edits are reflected
-            Roster.objects.filter(team=league_team).delete()
-
-            for pick in draft_team.draft_picks.select_related(
-                "signup", "signup__linked_player"
-            ).all():
-                signup = pick.signup
-
-                # Resolve or create the Player record
-                if signup.linked_player:
-                    player = signup.linked_player
-                else:
-                    # Try email before falling back to get_or_create by name,
-                    # so a nickname mismatch (Mike vs. Michael) doesn't create
-                    # a duplicate Player record.
-                    player = None
-                    if signup.email:
-                        player = Player.objects.filter(
-                            email__iexact=signup.email
-                        ).first()
-                    if player is None:
-                        player, _ = Player.objects.get_or_create(
-                            first_name=signup.first_name,
-                            last_name=signup.last_name,
-                        )
-                    signup.linked_player = player
-                    signup.save(update_fields=["linked_player"])
-
-                pos2 = (
-                    signup.secondary_position
-                    if signup.secondary_position != SeasonSignup.POSITION_ONE_THING
-                    else None
-                )
-
-                Roster.objects.create(
-                    player=player,
-                    team=league_team,
+                for draft_team in new_teams
+            ]
+        )
+        for draft_team, league_team in zip(new_teams, created):
+            draft_team.league_team = league_team
+        DraftTeam.objects.bulk_update(new_teams, ["league_team"])
+
+        # Always wipe and rebuild rosters so edits are reflected
+        league_team_ids = {t.pk: t.league_team_id for t in draft_teams}
+        Roster.objects.filter(team_id__in=league_team_ids.values()).delete()
+
+        players = _resolve_signup_players([pick.signup for pick in picks])
+        captain_ids = {t.pk: t.captain_id for t in draft_teams}
+        rosters = []
+        for pick in picks:
+            signup = pick.signup
+            pos2 = (
+                signup.secondary_position
+                if signup.secondary_position != SeasonSignup.POSITION_ONE_THING
+                else None
+            )
+            rosters.append(
+                Roster(
+                    player_id=players[signup.pk],
+                    team_id=league_team_ids[pick.team_id],
                     position1=signup.primary_position,
                     position2=pos2,
-                    is_captain=(signup.pk == draft_team.captain_id),
+                    is_captain=(signup.pk == captain_ids[pick.team_id]),
                     is_primary_goalie=signup.is_goalie,
                 )
-                created_rosters += 1
+            )
+        Roster.objects.bulk_create(rosters)
+        touched_players.update(r.player_id for r in rosters)
 
         session.finalized_at = timezone.now()
         session.save(update_fields=["finalized_at"])
 
+    # League team names replace the draft names on every board.
+    _broadcast_state_change(session)
     warnings = _draft_completion_warnings(session)
     return JsonResponse(
         {
             "success": True,
-            "created_teams": created_teams,
-            "created_rosters": created_rosters,
+            "created_teams": len(created),
+            "created_rosters": len(rosters),
             "warnings": warnings,
             "state": _session_state_payload(session),
         }
     )
 
 
+def _resolve_signup_players(signups):
+    """
+    Map each signup's pk to its Player, linking unlinked signups.
+
+    Unlinked signups match by email first (case-insensitive) so a nickname
+    mismatch (Mike vs. Michael) doesn't create a duplicate Player, then by
+    name key; anyone left gets a new Player.  One lookup, one bulk insert
+    for new players and one bulk update of the signups, however many there
+    are.
+    """
+    players = {s.pk: s.linked_player_id for s in signups if s.linked_player_id}
+    unlinked = [s for s in signups if not s.linked_player_id]
+    if not unlinked:
+        return players
+
+    index = PlayerIdentityIndex.load(
+        (s.first_name, s.last_name, s.email) for s in unlinked
+    )
+    matched = {}
+    new_players = {}
+    for signup in unlinked:
+        match = index.match(signup.first_name, signup.last_name, signup.email)
+        if match.candidates:
+            # Several players share the email or name: take the oldest.
+            matched[signup.pk] = match.player or match.candidates[0]
+            continue
+        key = name_keys(signup.first_name, signup.last_name)
+        if key not in new_players:
+            new_players[key] = Player(
+                first_name=signup.first_name,
+                last_name=signup.last_name,
+                first_name_key=key[0],
+                last_name_key=key[1],
+            )
+        matched[signup.pk] = new_players[key]
+    Player.objects.bulk_create(list(new_players.values()))
+    PlayerNameToken.objects.bulk_create(player_name_tokens(new_players.values()))
+
+    for signup in unlinked:
+        signup.linked_player = matched[signup.pk]
+        players[signup.pk] = signup.linked_player.pk
+    SeasonSignup.objects.bulk_update(unlinked, ["linked_player"])
+    return players
+
+
 @require_POST
 def swap_pick(request, session_pk, token):
     """
@@ -1411,8 +1989,6 @@ def swap_pick(request, session_pk, token):
             pick_a.save(update_fields=["signup", "is_auto_captain"])
 
     # Audit trail: log swap as a system chat message
-    from leagues.models import DraftChatMessage
-
     if pick_b_team_name:
         audit_body = (
             f"Swap: {old_signup.full_name} ({pick_a_team_name}) "
@@ -1423,14 +1999,9 @@ def swap_pick(request, session_pk, token):
             f"{new_signup.full_name} replaced {old_signup.full_name} "
             f"on {pick_a_team_name}"
         )
-    DraftChatMessage.objects.create(
-        session=session,
-        sender_name="Draft",
-        sender_type=DraftChatMessage.SENDER_SYSTEM,
-        body=audit_body,
+    _broadcast_state_change(
+        session, chat_messages=_record_system_chat(session, [audit_body])
     )
-
-    _broadcast_state_change(session)
     return JsonResponse({"success": True, "state": _session_state_payload(session)})
 
 
@@ -1553,8 +2124,6 @@ def add_late_signup(request, session_pk, token):
     Allowed states: draw, active, paused.
     The new signup is immediately visible to all connected clients via WebSocket.
     """
-    from leagues.models import DraftChatMessage
-
     session = get_object_or_404(DraftSession, pk=session_pk, commissioner_token=token)
 
     if session.state not in (
@@ -1602,12 +2171,7 @@ def add_late_signup(request, session_pk, token):
         )
 
     # Auto-link to existing Player record (same logic as public signup form)
-    linked_player = Player.objects.filter(
-        first_name__iexact=first_name,
-        last_name__iexact=last_name,
-    ).first()
-    if linked_player is None:
-        linked_player = Player.objects.filter(email__iexact=email).first()
+    linked_player = _match_signup_player(first_name, last_name, email)
 
     signup = SeasonSignup.objects.create(
         season=session.season,
@@ -1620,18 +2184,16 @@ def add_late_signup(request, session_pk, token):
         linked_player=linked_player,
     )
 
-    DraftChatMessage.objects.create(
-        session=session,
-        sender_name="Draft",
-        sender_type=DraftChatMessage.SENDER_SYSTEM,
-        body=f"Commissioner added {signup.full_name} as a late signup.",
+    chat_messages = _record_system_chat(
+        session, [f"Commissioner added {signup.full_name} as a late signup."]
     )
+    _refresh_session_stats(session)
 
-    _broadcast_state_change(session)
+    _broadcast_state_change(session, chat_messages=chat_messages)
     return JsonResponse(
         {
             "success": True,
-            "signup": _signup_payload(signup),
+            "signup": _signup_payload(signup, _session_stats(session, [signup])),
             "state": _session_state_payload(session),
         }
     )
@@ -1670,7 +2232,21 @@ def reset_draft(request, session_pk, token):
         session.state = DraftSession.STATE_SETUP
         session.signups_open = True
         session.finalized_at = None
-        session.save(update_fields=["state", "signups_open", "finalized_at"])
+        session.next_pick_index = 0
+        session.pick_order = []
+        session.pick_plan = None
+        session.player_stats = None
+        session.save(
+            update_fields=[
+                "state",
+                "signups_open",
+                "finalized_at",
+                "next_pick_index",
+                "pick_order",
+                "pick_plan",
+                "player_stats",
+            ]
+        )
 
     _broadcast_state_change(session)
     return JsonResponse({"success": True, "state": _session_state_payload(session)})
@@ -1695,48 +2271,149 @@ _DOWNLOAD_HEADERS = [
 ]
 
 
+# Excel column widths, matching _DOWNLOAD_HEADERS.
+_DOWNLOAD_COLUMN_WIDTHS = [7, 7, 22, 20, 22, 12, 13, 15, 14, 8, 8]
+
+_XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
 def _draft_results_rows(session):
     """
-    Return list of rows for the draft results table.
-    One row per pick, ordered by round then pick number.
+    Yield the rows of the draft results table, one per pick, ordered by
+    round then pick number.  Stats come from one batched lookup.
     """
-    picks = (
+    picks = list(
         DraftPick.objects.filter(session=session)
-        .select_related("team__captain", "signup__linked_player")
+        .select_related("team__captain", "signup")
         .order_by("round_number", "pick_number")
     )
+    stats_cache = _session_stats(session, [p.signup for p in picks])
 
-    rows = []
     for pick in picks:
-        stats = _get_wednesday_stats(pick.signup.linked_player)
-        rows.append(
-            [
-                pick.round_number,
-                pick.pick_number,
-                pick.team.team_name,
-                pick.team.captain.full_name,
-                pick.signup.full_name,
-                pick.signup.get_primary_position_display(),
-                (
-                    stats["goals_per_season"]
-                    if stats and not pick.signup.is_goalie
-                    else ""
-                ),
-                (
-                    stats["assists_per_season"]
-                    if stats and not pick.signup.is_goalie
-                    else ""
-                ),
-                (
-                    stats["points_per_season"]
-                    if stats and not pick.signup.is_goalie
-                    else ""
-                ),
-                stats["gaa"] if stats and pick.signup.is_goalie else "",
-                stats["adp"] if stats else "",
-            ]
+        stats = stats_cache.get(pick.signup.linked_player_id)
+        scoring_stats = stats if stats and not pick.signup.is_goalie else None
+        yield [
+            pick.round_number,
+            pick.pick_number,
+            pick.team.team_name,
+            pick.team.captain.full_name,
+            pick.signup.full_name,
+            pick.signup.get_primary_position_display(),
+            scoring_stats["goals_per_season"] if scoring_stats else "",
+            scoring_stats["assists_per_season"] if scoring_stats else "",
+            scoring_stats["points_per_season"] if scoring_stats else "",
+            stats["gaa"] if stats and pick.signup.is_goalie else "",
+            stats["adp"] if stats else "",
+        ]
+
+
+def _all_draft_results_rows(sessions):
+    """Rows for every session in turn, prefixed with the season."""
+    for session in sessions:
+        season_label = str(session.season)
+        for row in _draft_results_rows(session):
+            yield [season_label] + row
+
+
+async def _draft_results_rows_async(sessions, with_season=False):
+    """
+    The download rows of ``sessions`` (a queryset or list) as an async
+    iterator, reading the sessions and then each session's picks in a
+    worker thread, so the ASGI server streams the file session by session
+    instead of collecting a sync iterator into a list first.
+    """
+    read_rows = _all_draft_results_rows if with_season else _draft_results_rows
+    for session in await sync_to_async(list)(sessions):
+        batch = [session] if with_season else session
+        for row in await sync_to_async(lambda: list(read_rows(batch)))():
+            yield row
+
+
+class _Echo:
+    """File-like object whose write() hands back the line csv.writer built."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_download(filename, headers, rows):
+    """Stream the rows (an async iterator) as CSV, one line at a time."""
+    writer = csv.writer(_Echo())
+
+    async def lines():
+        yield writer.writerow(headers)
+        async for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+async def _file_chunks(file, chunk_size=64 * 1024):
+    """Read ``file`` in a worker thread, chunk by chunk, then close it."""
+    try:
+        while chunk := await sync_to_async(file.read)(chunk_size):
+            yield chunk
+    finally:
+        await sync_to_async(file.close)()
+
+
+def _xlsx_download(filename, headers, rows, widths, team_column):
+    """
+    Write the rows with openpyxl's write-only mode, which flushes each row
+    to disk instead of keeping cell objects around.  Rows are shaded in
+    alternating blocks per team (the value in ``team_column``).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Draft Results")
+    wb.add_named_style(
+        NamedStyle(
+            "draft_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill("solid", fgColor="2B6CB0"),
+            alignment=Alignment(horizontal="center"),
         )
-    return rows
+    )
+    band_styles = ["draft_band_shaded", "draft_band_plain"]
+    for name, color in zip(band_styles, ["EBF4FF", "FFFFFF"]):
+        wb.add_named_style(NamedStyle(name, fill=PatternFill("solid", fgColor=color)))
+
+    for col_idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    def styled(values, style):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value)
+            cell.style = style
+            cells.append(cell)
+        return cells
+
+    ws.append(styled(headers, "draft_header"))
+    prev_team = None
+    shade = False
+    for row in rows:
+        if row[team_column] != prev_team:
+            shade = not shade
+            prev_team = row[team_column]
+        ws.append(styled(row, band_styles[0] if shade else band_styles[1]))
+
+    output = tempfile.TemporaryFile()
+    wb.save(output)
+    size = output.tell()
+    output.seek(0)
+    response = StreamingHttpResponse(
+        _file_chunks(output), content_type=_XLSX_CONTENT_TYPE
+    )
+    response["Content-Length"] = size
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 def draft_results_download(request, session_pk):
@@ -1751,215 +2428,59 @@ def draft_results_download(request, session_pk):
         return HttpResponse("No picks have been made yet.", status=404)
 
     fmt = request.GET.get("format", "csv").lower()
-    rows = _draft_results_rows(session)
     season_label = str(session.season).replace(" ", "_")
     filename_base = f"draft_results_{season_label}"
 
     if fmt == "xlsx":
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Draft Results"
-
-        # Header row
-        ws.append(_DOWNLOAD_HEADERS)
-        header_fill = PatternFill("solid", fgColor="2B6CB0")
-        header_font = Font(bold=True, color="FFFFFF")
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center")
-
-        # Data rows — alternate shading by team block
-        prev_team = None
-        shade = False
-        shading_fills = [
-            PatternFill("solid", fgColor="EBF4FF"),
-            PatternFill("solid", fgColor="FFFFFF"),
-        ]
-        for row in rows:
-            ws.append(row)
-            team_name = row[2]
-            if team_name != prev_team:
-                shade = not shade
-                prev_team = team_name
-            fill = shading_fills[0] if shade else shading_fills[1]
-            for cell in ws[ws.max_row]:
-                cell.fill = fill
-
-        # Column widths
-        col_widths = [7, 7, 22, 20, 22, 12, 13, 15, 14, 8, 8]
-        for col_idx, width in enumerate(col_widths, start=1):
-            ws.column_dimensions[
-                ws.cell(row=1, column=col_idx).column_letter
-            ].width = width
-
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        return _xlsx_download(
+            f"{filename_base}.xlsx",
+            _DOWNLOAD_HEADERS,
+            _draft_results_rows(session),
+            _DOWNLOAD_COLUMN_WIDTHS,
+            team_column=2,
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename_base}.xlsx"'
-        return response
-
-    # Default: CSV
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="{filename_base}.csv"'
-    writer = csv.writer(response)
-    writer.writerow(_DOWNLOAD_HEADERS)
-    writer.writerows(rows)
-    return response
-
-
-# ---------------------------------------------------------------------------
-# Public draft archive (listing of all past/current draft sessions)
-# ---------------------------------------------------------------------------
-
-
-_DRAFT_DIVISION = 3  # Wednesday Draft League
+    return _csv_download(
+        f"{filename_base}.csv",
+        _DOWNLOAD_HEADERS,
+        _draft_results_rows_async([session]),
+    )
 
 
-def _get_champion_data_for_sessions(sessions):
+def draft_results_download_all(request):
     """
-    Batch-fetch championship info for all provided DraftSession objects.
-
-    Returns a dict keyed by session.pk:
-        {
-            'team': Team,
-            'draft_team': DraftTeam | None,
-            'team_stat': Team_Stat | None,
-            'playoff_wins': int,
-            'playoff_losses': int,
-        }
-
-    Only completed sessions that have a finalized championship matchup with a
-    clear winner (non-tied goal count) are included in the result.
-    Runs at most 6 queries regardless of how many sessions are provided.
+    Public download of every draft with picks, oldest season first, as one
+    CSV or XLSX with a leading Season column.  Sessions are read one at a
+    time while the file is written (the CSV while it is sent).
     """
-    complete = [s for s in sessions if s.state == DraftSession.STATE_COMPLETE]
-    if not complete:
-        return {}
-
-    season_ids = [s.season_id for s in complete]
-    session_by_season_id = {s.season_id: s for s in complete}
-
-    # 1. Championship matchup for each draft season
-    champ_matchups = list(
-        MatchUp.objects.filter(
-            is_championship=True,
-            hometeam__division__division=_DRAFT_DIVISION,
-            hometeam__season_id__in=season_ids,
-        ).select_related("hometeam", "awayteam")
-    )
-    if not champ_matchups:
-        return {}
-
-    champ_ids = [m.id for m in champ_matchups]
-
-    # 2. Goal counts per team per championship matchup
-    goal_rows = (
-        Stat.objects.filter(matchup_id__in=champ_ids)
-        .values("matchup_id", "team_id")
-        .annotate(goals=Sum("goals"))
+    sessions = (
+        DraftSession.objects.select_related("season")
+        .filter(Exists(DraftPick.objects.filter(session=OuterRef("pk"))))
+        .order_by("season__year", "season__season_type")
     )
-    goals = {}  # (matchup_id, team_id) -> goals
-    for row in goal_rows:
-        goals[(row["matchup_id"], row["team_id"])] = row["goals"]
-
-    # 3. Determine winner per session
-    winner_by_session_pk = {}  # session.pk -> Team
-    for m in champ_matchups:
-        season_id = m.hometeam.season_id
-        session = session_by_season_id.get(season_id)
-        if not session:
-            continue
-        home_g = goals.get((m.id, m.hometeam_id), 0)
-        away_g = goals.get((m.id, m.awayteam_id), 0)
-        if home_g > away_g:
-            winner_by_session_pk[session.pk] = m.hometeam
-        elif away_g > home_g:
-            winner_by_session_pk[session.pk] = m.awayteam
-        # tied championship → skip (won't happen in a real league)
-
-    if not winner_by_session_pk:
-        return {}
-
-    winner_team_ids = [t.id for t in winner_by_session_pk.values()]
-
-    # 4. DraftTeam records for the winners (links captain name + draft team name)
-    draft_teams = {
-        dt.league_team_id: dt
-        for dt in DraftTeam.objects.filter(
-            league_team_id__in=winner_team_ids
-        ).select_related("captain")
-    }
+    if not sessions.exists():
+        return HttpResponse("No picks have been made yet.", status=404)
 
-    # 5. Regular-season Team_Stat records
-    team_stats = {
-        ts.team_id: ts for ts in Team_Stat.objects.filter(team_id__in=winner_team_ids)
-    }
+    fmt = request.GET.get("format", "csv").lower()
+    headers = ["Season"] + _DOWNLOAD_HEADERS
 
-    # 6. Playoff records — all postseason matchups for winning teams
-    playoff_matchup_rows = list(
-        MatchUp.objects.filter(
-            Q(hometeam_id__in=winner_team_ids) | Q(awayteam_id__in=winner_team_ids),
-            is_postseason=True,
-        ).values("id", "hometeam_id", "awayteam_id")
+    if fmt == "xlsx":
+        return _xlsx_download(
+            "draft_results_all.xlsx",
+            headers,
+            _all_draft_results_rows(sessions.iterator()),
+            [18] + _DOWNLOAD_COLUMN_WIDTHS,
+            team_column=3,
+        )
+    return _csv_download(
+        "draft_results_all.csv",
+        headers,
+        _draft_results_rows_async(sessions, with_season=True),
     )
 
-    playoff_records = {}  # team_id -> {'wins': int, 'losses': int}
-    if playoff_matchup_rows:
-        playoff_ids = [r["id"] for r in playoff_matchup_rows]
-        po_goals = {}
-        for row in (
-            Stat.objects.filter(matchup_id__in=playoff_ids)
-            .values("matchup_id", "team_id")
-            .annotate(goals=Sum("goals"))
-        ):
-            po_goals[(row["matchup_id"], row["team_id"])] = row["goals"]
-
-        for m in playoff_matchup_rows:
-            for team_id in winner_team_ids:
-                if team_id not in (m["hometeam_id"], m["awayteam_id"]):
-                    continue
-                opp_id = (
-                    m["awayteam_id"]
-                    if m["hometeam_id"] == team_id
-                    else m["hometeam_id"]
-                )
-                mine = po_goals.get((m["id"], team_id), 0)
-                theirs = po_goals.get((m["id"], opp_id), 0)
-                rec = playoff_records.setdefault(team_id, {"wins": 0, "losses": 0})
-                if mine > theirs:
-                    rec["wins"] += 1
-                elif theirs > mine:
-                    rec["losses"] += 1
-
-    # Assemble final result
-    result = {}
-    for session_pk, champion_team in winner_by_session_pk.items():
-        po = playoff_records.get(champion_team.id, {"wins": 0, "losses": 0})
-        result[session_pk] = {
-            "team": champion_team,
-            "draft_team": draft_teams.get(champion_team.id),
-            "team_stat": team_stats.get(champion_team.id),
-            "playoff_wins": po["wins"],
-            "playoff_losses": po["losses"],
-        }
-    return result
-
 
-def _get_session_champion(session):
-    """
-    Return champion data for a single DraftSession, or None if not available.
-    Thin wrapper around the batch helper for single-session use.
-    """
-    data = _get_champion_data_for_sessions([session])
-    return data.get(session.pk)
+# ---------------------------------------------------------------------------
+# Public draft archive (listing of all past/current draft sessions)
+# ---------------------------------------------------------------------------
 
 
 def draft_sessions_list(request):
@@ -1971,13 +2492,16 @@ def draft_sessions_list(request):
     sessions = list(
         DraftSession.objects.select_related("season")
         .exclude(state=DraftSession.STATE_SETUP)
+        .defer("pick_order", "player_stats")
         .annotate(pick_count=Count("picks"))
         .order_by("-season__year", "-season__season_type")
     )
-    champion_data = _get_champion_data_for_sessions(sessions)
-    sessions_with_champ = [(s, champion_data.get(s.pk)) for s in sessions]
+    sessions_with_champ = [(s, session_champion(s)) for s in sessions]
     return render(
         request,
         "leagues/draft_archive.html",
-        {"sessions_with_champ": sessions_with_champ},
+        {
+            "sessions_with_champ": sessions_with_champ,
+            "any_picks": any(s.pick_count for s in sessions),
+        },
     )
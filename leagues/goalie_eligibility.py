@@ -0,0 +1,100 @@
+"""
+Maintained index of players eligible to play goalie.
+
+A player is eligible when they have been rostered at goalie (position1 or
+position2) or are flagged ``can_play_goalie``.  Working that out on the fly
+means a DISTINCT join over the whole roster history, and the captain page,
+the goalie autocomplete and the goalie-status admin each did it slightly
+differently.  Instead, ``GoalieEligibility`` keeps one row per eligible
+player (last season at goalie, last season on any roster, active flag),
+refreshed for the affected player whenever a Roster or Player is saved (see
+leagues.signals), so every dropdown reads the same small table.
+"""
+
+from datetime import date
+
+from django.db.models import Max, Q
+
+from .models import GoalieEligibility, Player
+
+# Inactive players who were on a roster this recently still show up in the
+# admin and autocomplete dropdowns (e.g. a goalie deactivated mid-season).
+RECENT_SEASONS = 3
+
+_GOALIE_ROSTER = Q(roster__position1=4) | Q(roster__position2=4)
+
+
+def refresh_goalie_eligibility(player_ids=None):
+    """
+    Recompute eligibility rows for ``player_ids`` (or every player).
+
+    One aggregate query over the players' rosters, one upsert and one delete
+    for players who are no longer eligible.
+    """
+    players = Player.objects.all()
+    if player_ids is not None:
+        player_ids = [pk for pk in player_ids if pk is not None]
+        if not player_ids:
+            return
+        players = players.filter(pk__in=player_ids)
+
+    rows = players.annotate(
+        goalie_rosters=Max("roster__position1", filter=_GOALIE_ROSTER),
+        last_goalie_year=Max("roster__team__season__year", filter=_GOALIE_ROSTER),
+        last_played_year=Max("roster__team__season__year"),
+    ).values_list(
+        "pk",
+        "is_active",
+        "can_play_goalie",
+        "goalie_rosters",
+        "last_goalie_year",
+        "last_played_year",
+    )
+
+    eligible = [
+        GoalieEligibility(
+            player_id=pk,
+            is_active=is_active,
+            last_goalie_year=last_goalie_year,
+            last_played_year=last_played_year,
+        )
+        for (
+            pk,
+            is_active,
+            can_play_goalie,
+            goalie_rosters,
+            last_goalie_year,
+            last_played_year,
+        ) in rows
+        if can_play_goalie or goalie_rosters is not None
+    ]
+
+    stale = GoalieEligibility.objects.exclude(
+        player_id__in=[row.player_id for row in eligible]
+    )
+    if player_ids is not None:
+        stale = stale.filter(player_id__in=player_ids)
+    stale.delete()
+
+    GoalieEligibility.objects.bulk_create(
+        eligible,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["player"],
+        update_fields=["is_active", "last_goalie_year", "last_played_year"],
+    )
+
+
+def eligible_goalies(include_recent=True):
+    """
+    Players eligible to play goalie, ordered by name.
+
+    Active players always qualify.  With ``include_recent`` inactive players
+    who were on a roster in the last ``RECENT_SEASONS`` seasons qualify too;
+    the public captain page passes False so it only offers active players.
+    """
+    qualifies = Q(goalie_eligibility__is_active=True)
+    if include_recent:
+        cutoff = date.today().year - (RECENT_SEASONS - 1)
+        qualifies |= Q(goalie_eligibility__last_played_year__gte=cutoff)
+    return Player.objects.filter(qualifies).order_by("last_name", "first_name")
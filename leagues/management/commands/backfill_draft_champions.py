@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from leagues.draft_champions import refresh_draft_champions
+from leagues.models import DraftSession
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored champion of every completed draft session. "
+        "Run once after deploying the champion field, and after bulk changes "
+        "that bypass model save() (queryset.update(), raw SQL, fixtures)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--season",
+            type=int,
+            action="append",
+            dest="season_ids",
+            help="Only this season id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        updated = refresh_draft_champions(options["season_ids"])
+        decided = DraftSession.objects.filter(
+            state=DraftSession.STATE_COMPLETE, champion__isnull=False
+        ).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Draft champions refreshed: {updated} updated, "
+                f"{decided} completed sessions with a champion."
+            )
+        )
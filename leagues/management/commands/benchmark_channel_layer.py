@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from channels.layers import DEFAULT_CHANNEL_LAYER, channel_layers
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure draft board fan-out latency through the configured channel "
+        "layer: one group_send reaching every spectator. With --workers > 1 "
+        "spectators are spread over separate layer instances, each with its "
+        "own LISTEN connection, to exercise the cross-process relay."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--spectators", type=int, default=300)
+        parser.add_argument("--messages", type=int, default=20)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Layer instances to spread spectators over (simulated workers)",
+        )
+        parser.add_argument(
+            "--payload-bytes",
+            type=int,
+            default=1024,
+            help="Padding added to each message, roughly a pick delta",
+        )
+
+    def handle(self, *args, **options):
+        if options["spectators"] < 1 or options["messages"] < 1:
+            raise CommandError("--spectators and --messages must be positive.")
+        layers = [
+            channel_layers.make_backend(DEFAULT_CHANNEL_LAYER)
+            for _ in range(max(options["workers"], 1))
+        ]
+        if len(layers) > 1 and not getattr(layers[0], "relay_enabled", False):
+            raise CommandError(
+                "--workers > 1 needs a layer that relays between processes "
+                "(PostgresChannelLayer on a PostgreSQL database)."
+            )
+
+        fanouts, deliveries = asyncio.run(self._run(layers, options))
+
+        self.stdout.write(
+            f"{type(layers[0]).__name__}: {options['spectators']} spectators, "
+            f"{len(layers)} worker(s), {options['messages']} messages"
+        )
+        self._report("Per delivery", deliveries)
+        self._report("Whole fan-out", fanouts)
+
+    async def _run(self, layers, options):
+        group = "draft_benchmark"
+        members = []
+        for i in range(options["spectators"]):
+            layer = layers[i % len(layers)]
+            channel = await layer.new_channel()
+            await layer.group_add(group, channel)
+            members.append((layer, channel))
+        if len(layers) > 1:
+            await asyncio.sleep(1)  # Let every listener finish its LISTEN.
+
+        async def receive(layer, channel):
+            await layer.receive(channel)
+            return time.perf_counter()
+
+        padding = "x" * options["payload_bytes"]
+        fanouts, deliveries = [], []
+        try:
+            for seq in range(options["messages"]):
+                waiting = [
+                    asyncio.ensure_future(receive(layer, channel))
+                    for layer, channel in members
+                ]
+                started = time.perf_counter()
+                await layers[0].group_send(
+                    group, {"type": "draft.delta", "seq": seq, "padding": padding}
+                )
+                try:
+                    arrived = await asyncio.wait_for(asyncio.gather(*waiting), 10)
+                except asyncio.TimeoutError:
+                    raise CommandError(
+                        f"Message {seq} didn't reach every spectator in 10s."
+                    )
+                latencies = [(t - started) * 1000 for t in arrived]
+                deliveries.extend(latencies)
+                fanouts.append(max(latencies))
+        finally:
+            for layer in layers:
+                await layer.close()
+        return fanouts, deliveries
+
+    def _report(self, label, samples_ms):
+        samples = sorted(samples_ms)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: p50 {statistics.median(samples):.2f} ms, "
+                f"p95 {p95:.2f} ms, max {samples[-1]:.2f} ms"
+            )
+        )
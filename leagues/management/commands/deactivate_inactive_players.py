@@ -1,11 +1,55 @@
 from __future__ import annotations
 
+import time
+from collections import Counter
 from datetime import date
 
 from django.core.management.base import BaseCommand
-from django.db.models import Max, Q
-
-from leagues.models import Player, Roster, Season
+from django.db import transaction
+from django.db.models import Case, Exists, Max, OuterRef, Q, Value, When
+
+from leagues.models import Player, Roster
+from leagues.signals import batched_roster_changes
+
+# Why each active player is deactivated or kept, in report order.
+NEVER_ROSTERED = "never rostered"
+LAPSED = "no roster since the cutoff"
+EXCLUDED = "excluded from auto-deactivation"
+CURRENT_ROSTER = "on a current season roster"
+NOT_A_GOALIE = "never rostered as a goalie"
+RECENT = "rostered since the cutoff"
+
+DEACTIVATE_REASONS = (NEVER_ROSTERED, LAPSED)
+KEEP_REASONS = (EXCLUDED, CURRENT_ROSTER, NOT_A_GOALIE, RECENT)
+
+_GOALIE_ROSTER = Q(position1=4) | Q(position2=4)
+
+
+def classify_active_players(cutoff_year, goalies_only=True):
+    """
+    Every active player annotated with their last roster season year and
+    the ``reason`` they are deactivated or kept (one query).  Players on a
+    current season roster or excluded from auto-deactivation are protected;
+    with ``goalies_only`` so is everyone never rostered as a goalie.
+    """
+    rosters = Roster.objects.filter(player=OuterRef("pk"))
+    keep = [
+        When(exclude_from_auto_deactivation=True, then=Value(EXCLUDED)),
+        When(on_current_roster=True, then=Value(CURRENT_ROSTER)),
+    ]
+    if goalies_only:
+        keep.append(When(played_goalie=False, then=Value(NOT_A_GOALIE)))
+    return Player.objects.filter(is_active=True).annotate(
+        last_season_year=Max("roster__team__season__year"),
+        on_current_roster=Exists(rosters.filter(team__season__is_current_season=True)),
+        played_goalie=Exists(rosters.filter(_GOALIE_ROSTER)),
+        reason=Case(
+            *keep,
+            When(last_season_year__isnull=True, then=Value(NEVER_ROSTERED)),
+            When(last_season_year__lt=cutoff_year, then=Value(LAPSED)),
+            default=Value(RECENT),
+        ),
+    )
 
 
 class Command(BaseCommand):
@@ -27,6 +71,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be deactivated without making changes",
         )
+        parser.add_argument(
+            "--report",
+            action="store_true",
+            help="Only print how many active players each reason covers; "
+            "no changes are made",
+        )
         parser.add_argument(
             "--include-non-goalies",
             action="store_true",
@@ -35,8 +85,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         years = options["years"]
-        dry_run = options["dry_run"]
-        include_non_goalies = options["include_non_goalies"]
+        dry_run = options["dry_run"] or options["report"]
         cutoff_year = date.today().year - years
 
         self.stdout.write(
@@ -45,84 +94,65 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING("DRY RUN - no changes will be made"))
 
-        # Get players on current season rosters (these should never be deactivated)
-        current_season_players = set(
-            Roster.objects.filter(team__season__is_current_season=True).values_list(
-                "player_id", flat=True
-            )
-        )
-        self.stdout.write(
-            f"Found {len(current_season_players)} players on current season rosters (protected)"
+        started = time.perf_counter()
+        classified = classify_active_players(
+            cutoff_year, goalies_only=not options["include_non_goalies"]
         )
-
-        # Get all active players who are NOT excluded from auto-deactivation
-        players_query = Player.objects.filter(
-            is_active=True,
-            exclude_from_auto_deactivation=False,
-        )
-
-        # Optionally filter to only goalies (players who have ever played goalie)
-        if not include_non_goalies:
-            players_query = players_query.filter(
-                Q(roster__position1=4) | Q(roster__position2=4)
-            ).distinct()
-
-        deactivated_count = 0
-        skipped_count = 0
-
-        for player in players_query:
-            # Skip players on current season rosters
-            if player.id in current_season_players:
-                skipped_count += 1
-                continue
-
-            # Find the most recent season year this player was on a roster
-            most_recent = Roster.objects.filter(player=player).aggregate(
-                max_year=Max("team__season__year")
+        rows = list(
+            classified.order_by("last_name", "first_name").values_list(
+                "pk", "first_name", "last_name", "reason", "last_season_year"
             )
-            most_recent_year = most_recent.get("max_year")
-
-            if most_recent_year is None or most_recent_year < cutoff_year:
-                # Player hasn't been on a roster in N+ years (or never)
-                years_inactive = (
-                    "never rostered"
-                    if most_recent_year is None
-                    else f"last active {most_recent_year}"
+        )
+        counts = Counter(row[3] for row in rows)
+        to_deactivate = [row for row in rows if row[3] in DEACTIVATE_REASONS]
+        scanned = time.perf_counter()
+
+        if options["report"]:
+            self._print_report(counts)
+            self._print_timing(len(rows), started, scanned)
+            return
+
+        verb = "Would deactivate" if dry_run else "Deactivated"
+        for _, first_name, last_name, reason, last_year in to_deactivate:
+            why = f"last active {last_year}" if last_year else reason
+            self.stdout.write(f"  {verb}: {last_name}, {first_name} ({why})")
+
+        updated = len(to_deactivate)
+        if not dry_run and to_deactivate:
+            # The classifying query selects the rows to update in the
+            # database.  A queryset update sends no signals: refresh the
+            # goalie eligibility of the listed players and bump the stats
+            # version once, on leaving the batch.
+            with transaction.atomic(), batched_roster_changes() as player_ids:
+                updated = classified.filter(reason__in=DEACTIVATE_REASONS).update(
+                    is_active=False
                 )
+                player_ids.update(row[0] for row in to_deactivate)
 
-                if dry_run:
-                    self.stdout.write(
-                        f"  Would deactivate: {player} ({years_inactive})"
-                    )
-                else:
-                    player.is_active = False
-                    player.save(update_fields=["is_active"])
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"  Deactivated: {player} ({years_inactive})"
-                        )
-                    )
-                deactivated_count += 1
-            else:
-                skipped_count += 1
-
-        action = "Would deactivate" if dry_run else "Deactivated"
         self.stdout.write(
             self.style.SUCCESS(
-                f"\n{action} {deactivated_count} players. "
-                f"Skipped {skipped_count} active players."
+                f"\n{verb} {updated} players. "
+                f"Skipped {len(rows) - len(to_deactivate)} active players."
             )
         )
-
-        # Show players protected from auto-deactivation
-        protected = Player.objects.filter(
-            is_active=True, exclude_from_auto_deactivation=True
+        self._print_report(counts)
+        self._print_timing(len(rows), started, scanned, None if dry_run else updated)
+
+    def _print_report(self, counts):
+        self.stdout.write("\nActive players by reason:")
+        for heading, reasons in (
+            ("deactivate", DEACTIVATE_REASONS),
+            ("keep", KEEP_REASONS),
+        ):
+            for reason in reasons:
+                self.stdout.write(f"  {heading:10} {reason + ':':34} {counts[reason]}")
+
+    def _print_timing(self, scanned_count, started, scanned, updated=None):
+        finished = time.perf_counter()
+        line = (
+            f"\nClassified {scanned_count} active players in "
+            f"{(scanned - started) * 1000:.0f}ms"
         )
-        if protected.exists():
-            self.stdout.write(
-                f"\n{protected.count()} players are protected from auto-deactivation:"
-            )
-            for p in protected[:10]:  # Show first 10
-                self.stdout.write(f"  - {p}")
-            if protected.count() > 10:
-                self.stdout.write(f"  ... and {protected.count() - 10} more")
+        if updated is not None:
+            line += f", updated {updated} in {(finished - scanned) * 1000:.0f}ms"
+        self.stdout.write(f"{line}; {(finished - started) * 1000:.0f}ms total.")
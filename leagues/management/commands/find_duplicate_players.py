@@ -1,104 +1,12 @@
 from __future__ import annotations
 
+from django.core.management.base import BaseCommand
 from collections import defaultdict
 
-from django.core.management.base import BaseCommand
 from django.db.models import Count
 
 from leagues.models import Player, Roster
-
-
-# Common nickname mappings
-NICKNAME_MAP = {
-    "richard": ["rich", "rick", "ricky", "dick"],
-    "michael": ["mike", "mikey", "mick"],
-    "william": ["will", "bill", "billy", "willy"],
-    "robert": ["rob", "bob", "bobby", "robbie"],
-    "james": ["jim", "jimmy", "jamie"],
-    "joseph": ["joe", "joey"],
-    "thomas": ["tom", "tommy"],
-    "christopher": ["chris", "cj"],
-    "matthew": ["matt", "matty"],
-    "anthony": ["tony", "ant"],
-    "daniel": ["dan", "danny"],
-    "david": ["dave", "davey"],
-    "edward": ["ed", "eddie", "ted", "teddy"],
-    "patrick": ["pat", "patty", "paddy"],
-    "stephen": ["steve", "stevie"],
-    "steven": ["steve", "stevie"],
-    "andrew": ["andy", "drew"],
-    "nicholas": ["nick", "nicky"],
-    "jonathan": ["jon", "jonny", "john"],
-    "john": ["jon", "johnny", "jack"],
-    "benjamin": ["ben", "benny"],
-    "alexander": ["alex", "al"],
-    "timothy": ["tim", "timmy"],
-    "charles": ["charlie", "chuck", "chas"],
-    "kenneth": ["ken", "kenny"],
-    "gregory": ["greg", "gregg"],
-    "jeffrey": ["jeff", "geoff"],
-    "ronald": ["ron", "ronnie"],
-    "donald": ["don", "donnie"],
-    "raymond": ["ray"],
-    "lawrence": ["larry", "lars"],
-    "gerald": ["gerry", "jerry"],
-    "samuel": ["sam", "sammy"],
-    "peter": ["pete", "petey"],
-    "henry": ["hank", "harry"],
-    "douglas": ["doug", "dougie"],
-    "dennis": ["denny"],
-    "harold": ["hal", "harry"],
-    "eugene": ["gene"],
-    "phillip": ["phil"],
-    "vincent": ["vince", "vinny"],
-    "walter": ["walt", "wally"],
-    "frederick": ["fred", "freddy", "freddie"],
-    "albert": ["al", "bert", "bertie"],
-    "arthur": ["art", "artie"],
-    "nathan": ["nate", "nat"],
-    "zachary": ["zach", "zack"],
-    "jacob": ["jake"],
-    "joshua": ["josh"],
-    "brian": ["bri"],
-    "kevin": ["kev"],
-    "jason": ["jay"],
-    "justin": ["just"],
-    "brandon": ["brand"],
-    "jessica": ["jess", "jessie"],
-    "jennifer": ["jen", "jenny"],
-    "elizabeth": ["liz", "lizzy", "beth", "betty", "eliza"],
-    "katherine": ["kate", "kathy", "katie", "kat"],
-    "catherine": ["kate", "cathy", "katie", "cat"],
-    "margaret": ["maggie", "meg", "peggy", "marge"],
-    "patricia": ["pat", "patty", "trish"],
-    "rebecca": ["becky", "becca"],
-    "christine": ["chris", "chrissy", "tina"],
-    "christina": ["chris", "chrissy", "tina"],
-    "stephanie": ["steph", "stephie"],
-    "samantha": ["sam", "sammy"],
-    "alexandra": ["alex", "lexi"],
-    "victoria": ["vicky", "tori"],
-    "natalie": ["nat"],
-    "nicholas": ["nick", "nicky", "nico"],
-}
-
-
-def get_name_variants(first_name):
-    """Get all possible variants of a first name."""
-    name_lower = first_name.lower().strip()
-    variants = {name_lower}
-
-    # Check if this name is a full name with nicknames
-    if name_lower in NICKNAME_MAP:
-        variants.update(NICKNAME_MAP[name_lower])
-
-    # Check if this name is a nickname of a full name
-    for full_name, nicknames in NICKNAME_MAP.items():
-        if name_lower in nicknames:
-            variants.add(full_name)
-            variants.update(nicknames)
-
-    return variants
+from leagues.name_matching import PlayerIdentityIndex, normalize_name
 
 
 class Command(BaseCommand):
@@ -120,56 +28,14 @@ class Command(BaseCommand):
         last_name_filter = options.get("last_name")
         show_rosters = options["show_rosters"]
 
-        players = Player.objects.all().order_by("last_name", "first_name")
+        players = Player.objects.annotate(roster_count=Count("roster")).order_by(
+            "last_name", "first_name"
+        )
         if last_name_filter:
-            players = players.filter(last_name__iexact=last_name_filter)
-
-        # Group players by last name
-        by_last_name = defaultdict(list)
-        for player in players:
-            by_last_name[player.last_name.lower().strip()].append(player)
-
-        # Find potential duplicates
-        duplicate_groups = []
-
-        for last_name, group in by_last_name.items():
-            if len(group) < 2:
-                continue
-
-            # Check for exact first name matches
-            first_names = defaultdict(list)
-            for player in group:
-                first_names[player.first_name.lower().strip()].append(player)
-
-            for first_name, exact_matches in first_names.items():
-                if len(exact_matches) > 1:
-                    duplicate_groups.append(("EXACT MATCH", last_name, exact_matches))
-
-            # Check for nickname matches
-            processed = set()
-            for i, player1 in enumerate(group):
-                if player1.id in processed:
-                    continue
-
-                variants1 = get_name_variants(player1.first_name)
-                matches = [player1]
-
-                for player2 in group[i + 1 :]:
-                    if player2.id in processed:
-                        continue
-
-                    name2_lower = player2.first_name.lower().strip()
-                    if name2_lower in variants1 or any(
-                        v in get_name_variants(player2.first_name) for v in variants1
-                    ):
-                        # Don't double-count exact matches
-                        if player1.first_name.lower() != player2.first_name.lower():
-                            matches.append(player2)
-                            processed.add(player2.id)
-
-                if len(matches) > 1:
-                    processed.add(player1.id)
-                    duplicate_groups.append(("NICKNAME MATCH", last_name, matches))
+            players = players.filter(last_name_key=normalize_name(last_name_filter))
+
+        # One pass over the players, blocked by normalized last name.
+        duplicate_groups = PlayerIdentityIndex(players).duplicate_groups()
 
         # Output results
         if not duplicate_groups:
@@ -182,37 +48,47 @@ class Command(BaseCommand):
             )
         )
 
-        for match_type, last_name, players in duplicate_groups:
+        rosters_by_player = (
+            self._rosters_by_player(duplicate_groups) if show_rosters else {}
+        )
+        for match_type, _, players in duplicate_groups:
             self.stdout.write(
-                self.style.HTTP_INFO(f"\n[{match_type}] {last_name.title()}:")
+                self.style.HTTP_INFO(f"\n[{match_type}] {players[0].last_name}:")
             )
 
             for player in players:
-                roster_count = Roster.objects.filter(player=player).count()
                 status = "ACTIVE" if player.is_active else "inactive"
                 self.stdout.write(
                     f"  • ID {player.id}: {player.first_name} {player.last_name} "
-                    f"({roster_count} roster entries, {status})"
+                    f"({player.roster_count} roster entries, {status})"
                 )
 
                 if show_rosters:
-                    rosters = (
-                        Roster.objects.filter(player=player)
-                        .select_related("team", "team__season")
-                        .order_by("-team__season__year")
-                    )
+                    rosters = rosters_by_player[player.id]
                     for roster in rosters[:5]:  # Show last 5
                         season = roster.team.season
                         self.stdout.write(
                             f"      - {season.year} {season.get_season_type_display()}: "
                             f"{roster.team.team_name}"
                         )
-                    if rosters.count() > 5:
-                        self.stdout.write(f"      ... and {rosters.count() - 5} more")
+                    if len(rosters) > 5:
+                        self.stdout.write(f"      ... and {len(rosters) - 5} more")
 
         self.stdout.write(
             self.style.WARNING(
-                f"\n\nTo merge duplicates, update Roster/Stat records to point to "
-                f"the correct player ID, then delete the duplicate Player record."
+                "\n\nTo merge duplicates run: manage.py merge_players KEEP_ID "
+                "DUPLICATE_ID [...]  (or --exact-matches; add --dry-run to preview)"
             )
         )
+
+    def _rosters_by_player(self, duplicate_groups):
+        """Team rosters of every listed player, newest season first (one query)."""
+        player_ids = {p.id for _, _, players in duplicate_groups for p in players}
+        rosters_by_player = defaultdict(list)
+        for roster in (
+            Roster.objects.filter(player_id__in=player_ids, team__isnull=False)
+            .select_related("team", "team__season")
+            .order_by("-team__season__year", "pk")
+        ):
+            rosters_by_player[roster.player_id].append(roster)
+        return rosters_by_player
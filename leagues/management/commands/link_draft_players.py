@@ -2,11 +2,14 @@
 Management command to link SeasonSignup records to existing Player records and
 set is_returning based on Wednesday Draft League roster history.
 
-Matching strategy (in priority order):
+Matching strategy (in priority order, via leagues.name_matching's
+PlayerIdentityIndex):
   1. Exact email match against Player.email
-  2. Exact name match (case-insensitive first + last) when only one Player
+  2. Exact name match (normalized first + last) when only one Player
      matches — covers players whose email has changed over the years
-  3. No match — genuinely new players, left unlinked
+  3. No match — genuinely new players, left unlinked.  Those whose first
+     name is a nickname of an existing player's (Mike / Michael Smith) are
+     listed as possible matches to link by hand.
 
 The command is idempotent: already-linked signups are skipped unless --force
 is passed. Safe to re-run locally and push results to the hosted DB.
@@ -21,7 +24,8 @@ Usage:
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
-from leagues.models import Division, DraftSession, Player, Season, SeasonSignup
+from leagues.models import Division, DraftSession, Player, Roster, Season, SeasonSignup
+from leagues.name_matching import PlayerIdentityIndex
 
 
 class Command(BaseCommand):
@@ -70,38 +74,49 @@ class Command(BaseCommand):
             self.stdout.write("Nothing to do.")
             return
 
-        # Pre-build a lookup of all Player emails for fast matching
-        player_by_email = {
-            p.email.lower(): p
-            for p in Player.objects.exclude(email="").exclude(email=None)
-        }
+        index = PlayerIdentityIndex.load(
+            (s.first_name, s.last_name, s.email) for s in signups
+        )
 
         wednesday_div = Division.objects.get(division=3)
 
-        results = {"email": [], "name": [], "ambiguous": [], "new": []}
+        results = {"email": [], "name": [], "ambiguous": [], "new": [], "nickname": []}
+        matches = []
 
         for signup in signups:
-            player, match_type = self._find_player(signup, player_by_email)
-            if match_type == "ambiguous":
+            match = index.match(signup.first_name, signup.last_name, signup.email)
+            if match.how == "ambiguous":
                 results["ambiguous"].append((signup, None))
                 continue
-            if player is None:
+            if match.player is None:
                 results["new"].append(signup)
+                nicknames = index.lookup(
+                    "nickname", signup.first_name, signup.last_name
+                )
+                if nicknames:
+                    results["nickname"].append((signup, nicknames))
                 continue
+            matches.append((signup, match))
 
-            is_returning = self._has_wednesday_history(player, wednesday_div)
-            results[match_type].append((signup, player, is_returning))
+        returning = self._wednesday_player_ids(
+            [match.player.pk for _, match in matches], wednesday_div
+        )
+        for signup, match in matches:
+            is_returning = match.player.pk in returning
+            results[match.how].append((signup, match.player, is_returning))
 
         self._print_report(results)
 
         if dry_run:
             return
 
+        linked = []
+        for signup, player, is_returning in results["email"] + results["name"]:
+            signup.linked_player = player
+            signup.is_returning = is_returning
+            linked.append(signup)
         with transaction.atomic():
-            for signup, player, is_returning in results["email"] + results["name"]:
-                signup.linked_player = player
-                signup.is_returning = is_returning
-                signup.save(update_fields=["linked_player", "is_returning"])
+            SeasonSignup.objects.bulk_update(linked, ["linked_player", "is_returning"])
 
         total_linked = len(results["email"]) + len(results["name"])
         self.stdout.write(
@@ -140,32 +155,13 @@ class Command(BaseCommand):
             )
         return season
 
-    def _find_player(self, signup, player_by_email):
-        """
-        Return (Player, match_type) or (None, 'new') or (None, 'ambiguous').
-        match_type is 'email' or 'name'.
-        """
-        # 1. Email match
-        player = player_by_email.get(signup.email.lower())
-        if player:
-            return player, "email"
-
-        # 2. Name match — only safe when exactly one Player has that name
-        name_hits = Player.objects.filter(
-            first_name__iexact=signup.first_name,
-            last_name__iexact=signup.last_name,
+    def _wednesday_player_ids(self, player_ids, wednesday_div):
+        """The players among player_ids with any Wednesday Draft League roster."""
+        return set(
+            Roster.objects.filter(
+                player_id__in=player_ids, team__division=wednesday_div
+            ).values_list("player_id", flat=True)
         )
-        count = name_hits.count()
-        if count == 1:
-            return name_hits.first(), "name"
-        if count > 1:
-            return None, "ambiguous"
-
-        return None, "new"
-
-    def _has_wednesday_history(self, player, wednesday_div):
-        """True if the player has any Roster record in the Wednesday Draft League."""
-        return player.roster_set.filter(team__division=wednesday_div).exists()
 
     def _create_and_link_players(self, new_signups, dry_run):
         """Create Player records for brand-new signups and link them."""
@@ -239,3 +235,15 @@ class Command(BaseCommand):
                 self.stdout.write(
                     f"  {signup.first_name} {signup.last_name} <{signup.email}>"
                 )
+
+        if results["nickname"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"\nPossible nickname matches — check and link manually:"
+                )
+            )
+            for signup, players in results["nickname"]:
+                names = ", ".join(
+                    f"{p.first_name} {p.last_name} (pk={p.pk})" for p in players
+                )
+                self.stdout.write(f"  {signup.first_name} {signup.last_name} → {names}")
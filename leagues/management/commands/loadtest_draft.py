@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from leagues.draft_loadtest import (
+    DraftLoadTest,
+    LoadTestError,
+    build_report,
+    create_loadtest_draft,
+    delete_loadtest_draft,
+)
+
+# Report lines: (label, path into the report, unit).
+_REPORT_LINES = (
+    ("Per delivery p50", ("delivery_ms", "p50"), "ms"),
+    ("Per delivery p95", ("delivery_ms", "p95"), "ms"),
+    ("Per delivery max", ("delivery_ms", "max"), "ms"),
+    ("Whole fan-out p50", ("fanout_ms", "p50"), "ms"),
+    ("Whole fan-out p95", ("fanout_ms", "p95"), "ms"),
+    ("Queries per submission", ("queries_per_submission", "mean"), ""),
+    ("Queries per submission max", ("queries_per_submission", "max"), ""),
+    ("Bytes per spectator", ("spectator_bytes", "total_mean"), "B"),
+    ("Bytes per spectator per pick", ("spectator_bytes", "per_pick"), "B"),
+    ("Draft duration", ("duration_s",), "s"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the live draft board in-process: boot the ASGI app, "
+        "connect spectators and captains to DraftConsumer, run a throwaway "
+        "draft to completion and report per-pick broadcast latency, queries "
+        "and message bytes. Uses the configured database (SQLite or a local "
+        "PostgreSQL); the draft is deleted afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--spectators", type=int, default=100)
+        parser.add_argument(
+            "--captains",
+            type=int,
+            default=None,
+            help="Captain connections (default: one per team); other teams "
+            "pick through the commissioner",
+        )
+        parser.add_argument("--teams", type=int, default=8)
+        parser.add_argument("--rounds", type=int, default=12)
+        parser.add_argument(
+            "--via",
+            choices=("ws", "http"),
+            default="ws",
+            help="Submit picks over the WebSocket or through HTTP make_pick",
+        )
+        parser.add_argument(
+            "--json", dest="json_path", help="Write the report to this file"
+        )
+        parser.add_argument(
+            "--compare", help="A previous --json report to show changes against"
+        )
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["teams"] < 2 or options["rounds"] < 2:
+            raise CommandError("--teams and --rounds must be at least 2.")
+        captains = options["captains"]
+        if captains is None:
+            captains = options["teams"]
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+
+        from dcstreethockey.asgi import application
+
+        session = create_loadtest_draft(options["teams"], options["rounds"])
+        load_test = DraftLoadTest(
+            application,
+            session,
+            spectators=options["spectators"],
+            captains=min(captains, options["teams"]),
+            via=options["via"],
+        )
+        try:
+            asyncio.run(load_test.run())
+        except LoadTestError as e:
+            raise CommandError(str(e))
+        finally:
+            if not options["keep"]:
+                delete_loadtest_draft(session)
+
+        report = build_report(load_test)
+        report.update(teams=options["teams"], rounds=options["rounds"])
+        self._print(report, baseline)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['json_path']}.")
+
+    def _print(self, report, baseline):
+        self.stdout.write(
+            f"{report['database']}, picks via {report['via']}: "
+            f"{report['spectators']} spectators, {report['captains']} captains, "
+            f"{report['teams']} teams x {report['rounds']} rounds "
+            f"({report['picks']} picks in {report['submissions']} submissions)"
+        )
+        for label, path, unit in _REPORT_LINES:
+            value = _lookup(report, path)
+            line = f"  {label + ':':30} {value:>10}{unit}"
+            before = _lookup(baseline, path) if baseline else None
+            if before is not None:
+                change = (value - before) / before * 100 if before else 0
+                line += f"   (was {before}{unit}, {change:+.1f}%)"
+            self.stdout.write(line)
+
+
+def _lookup(report, path):
+    for key in path:
+        if not isinstance(report, dict) or key not in report:
+            return None
+        report = report[key]
+    return report
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from leagues.models import Player
+from leagues.name_matching import PlayerIdentityIndex
+from leagues.player_merge import (
+    PlayerMergeError,
+    merge_players,
+    pick_survivor,
+    reference_counts,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge duplicate Player records: repoint every roster, stat, ref, "
+        "goalie assignment, draft signup and pending photo to the player to "
+        "keep, then delete the duplicates.  Either give the player ids, or "
+        "--exact-matches to merge every group find_duplicate_players reports "
+        "as an EXACT MATCH into its player with the most roster entries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("keep", nargs="?", type=int, help="Player id to keep")
+        parser.add_argument(
+            "duplicates", nargs="*", type=int, help="Player ids to merge into it"
+        )
+        parser.add_argument(
+            "--exact-matches",
+            action="store_true",
+            help="Merge every EXACT MATCH duplicate group",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be merged without making changes",
+        )
+
+    def handle(self, *args, **options):
+        if options["exact_matches"]:
+            if options["keep"] is not None:
+                raise CommandError("Give either player ids or --exact-matches.")
+            merges = self._exact_match_merges()
+        elif options["keep"] is not None and options["duplicates"]:
+            merges = [self._load(options["keep"], options["duplicates"])]
+        else:
+            raise CommandError(
+                "Give the player id to keep and the duplicate ids, or --exact-matches."
+            )
+
+        if not merges:
+            self.stdout.write(self.style.SUCCESS("No duplicates to merge."))
+            return
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING("DRY RUN - no changes will be made"))
+
+        for keep, duplicates in merges:
+            names = ", ".join(
+                f"{p.first_name} {p.last_name} ({p.pk})" for p in duplicates
+            )
+            self.stdout.write(
+                f"\n{keep.first_name} {keep.last_name} ({keep.pk}) ← {names}"
+            )
+            if options["dry_run"]:
+                moved = reference_counts([p.pk for p in duplicates])
+            else:
+                try:
+                    moved = merge_players(keep, duplicates).moved
+                except PlayerMergeError as e:
+                    raise CommandError(str(e))
+            for label, count in moved.items():
+                if count:
+                    self.stdout.write(f"  {label}: {count}")
+
+        verb = "Would merge" if options["dry_run"] else "Merged"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n{verb} {sum(len(d) for _, d in merges)} duplicate players "
+                f"into {len(merges)}."
+            )
+        )
+
+    def _load(self, keep_id, duplicate_ids):
+        players = Player.objects.in_bulk([keep_id, *duplicate_ids])
+        missing = [pk for pk in [keep_id, *duplicate_ids] if pk not in players]
+        if missing:
+            raise CommandError(f"Player {', '.join(map(str, missing))} not found.")
+        if keep_id in duplicate_ids:
+            raise CommandError(f"Player {keep_id} can't be merged into itself.")
+        return players[keep_id], [players[pk] for pk in duplicate_ids]
+
+    def _exact_match_merges(self):
+        players = Player.objects.annotate(roster_count=Count("roster")).order_by("pk")
+        merges = []
+        for kind, _, group in PlayerIdentityIndex(players).duplicate_groups():
+            if kind != "EXACT MATCH":
+                continue
+            keep = pick_survivor(group)
+            merges.append((keep, [p for p in group if p is not keep]))
+        return merges
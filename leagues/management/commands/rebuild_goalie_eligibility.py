@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from leagues.goalie_eligibility import refresh_goalie_eligibility
+from leagues.models import GoalieEligibility
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the goalie eligibility index from rosters and player flags. "
+        "Only needed after bulk changes that bypass model save() "
+        "(queryset.update(), raw SQL, season year edits)."
+    )
+
+    def handle(self, *args, **options):
+        refresh_goalie_eligibility()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Goalie eligibility rebuilt: {GoalieEligibility.objects.count()} players."
+            )
+        )
@@ -25,6 +25,7 @@ from leagues.models import (
     Stat,
     Team,
 )
+from leagues.pick_order import simulate_draft
 
 
 # ---------------------------------------------------------------------------
@@ -570,72 +571,45 @@ class Command(BaseCommand):
         for team, pos in zip(teams, positions):
             team.draft_position = pos
             team.save(update_fields=["draft_position"])
-        teams.sort(key=lambda t: t.draft_position)
+        session.rebuild_pick_order()
 
-        # Round order types
-        round_types = {r.round_number: r.order_type for r in session.rounds.all()}
-
-        # Separate signups: captains are auto-picked, others fill the pool
-        captain_ids = {t.captain_id for t in teams}
-        pool = [s for s in signups if s.pk not in captain_ids]
+        # Captains are auto-picked, others fill the pool
+        captains = {t.pk: t.captain for t in teams}
+        pool = list(signups)
         random.shuffle(pool)
+        team_has_goalie = {
+            t.pk: t.captain.is_goalie and t.captain_draft_round is not None
+            for t in teams
+        }
 
-        drafted = set()  # signup PKs already picked
-        team_has_goalie = {t.pk: False for t in teams}
-        pick_count = 0
-
-        for r in range(1, session.num_rounds + 1):
-            if round_types.get(r) == DraftRound.ORDER_RANDOMIZED:
-                round_order = random.sample(teams, len(teams))
-            elif r % 2 == 0:  # snake: even rounds reverse
-                round_order = list(reversed(teams))
-            else:
-                round_order = list(teams)
-
-            for pick_idx, team in enumerate(round_order):
-                # Captain auto-pick: insert captain onto their own team
-                if team.captain_draft_round == r and team.captain_id not in drafted:
-                    DraftPick.objects.create(
-                        session=session,
-                        team=team,
-                        signup_id=team.captain_id,
-                        round_number=r,
-                        pick_number=pick_idx,
-                        is_auto_captain=True,
-                    )
-                    drafted.add(team.captain_id)
-                    if team.captain.is_goalie:
-                        team_has_goalie[team.pk] = True
-                    pick_count += 1
-                    continue
-
-                # Regular pick — respect one-goalie-per-team rule
-                remaining = [s for s in pool if s.pk not in drafted]
-                if not remaining:
-                    continue
-
-                signup = None
-                for candidate in remaining:
-                    if candidate.is_goalie and team_has_goalie[team.pk]:
-                        continue  # skip second goalie for this team
-                    signup = candidate
+        def choose(team_pk, available):
+            # Respect the one-goalie-per-team rule where the pool allows it
+            for candidate in available:
+                if not (candidate.is_goalie and team_has_goalie[team_pk]):
                     break
-                if signup is None:
-                    signup = remaining[
-                        0
-                    ]  # fallback (shouldn't happen with 1 goalie/team)
-
-                DraftPick.objects.create(
-                    session=session,
-                    team=team,
-                    signup=signup,
-                    round_number=r,
-                    pick_number=pick_idx,
-                )
-                drafted.add(signup.pk)
-                if signup.is_goalie:
-                    team_has_goalie[team.pk] = True
-                pick_count += 1
+            else:
+                candidate = available[0]
+            if candidate.is_goalie:
+                team_has_goalie[team_pk] = True
+            return candidate
+
+        picks = simulate_draft(
+            session.pick_order,
+            captains,
+            {t.pk: t.captain_draft_round for t in teams},
+            pool,
+            choose,
+        )
+        for pick in picks:
+            DraftPick.objects.create(
+                session=session,
+                team_id=pick.team_pk,
+                signup=pick.player,
+                round_number=pick.round_number,
+                pick_number=pick.pick_number,
+                is_auto_captain=pick.is_auto_captain,
+            )
+        pick_count = len(picks)
 
         session.state = DraftSession.STATE_COMPLETE
         session.signups_open = False
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:43
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalize(value):
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(
+        ch
+        for ch in decomposed.lower()
+        if ch.isalnum() and not unicodedata.combining(ch)
+    )[:60]
+
+
+def populate_name_keys(apps, schema_editor):
+    """Backfill the normalized search keys for existing players."""
+    Player = apps.get_model("leagues", "Player")
+    players = list(Player.objects.only("id", "first_name", "last_name"))
+    for player in players:
+        player.first_name_key = _normalize(player.first_name)
+        player.last_name_key = _normalize(player.last_name)
+    Player.objects.bulk_update(
+        players, ["first_name_key", "last_name_key"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0101_alter_division_id_alter_draftchatmessage_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="player",
+            name="first_name_key",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=60
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="last_name_key",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=60
+            ),
+        ),
+        migrations.RunPython(populate_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:46
+
+from django.db import migrations, models
+from django.db.models import Max, Q
+import django.db.models.deletion
+
+
+def populate_goalie_eligibility(apps, schema_editor):
+    """Build the goalie eligibility index for existing players."""
+    Player = apps.get_model("leagues", "Player")
+    GoalieEligibility = apps.get_model("leagues", "GoalieEligibility")
+    goalie_roster = Q(roster__position1=4) | Q(roster__position2=4)
+    rows = Player.objects.annotate(
+        goalie_rosters=Max("roster__position1", filter=goalie_roster),
+        last_goalie_year=Max("roster__team__season__year", filter=goalie_roster),
+        last_played_year=Max("roster__team__season__year"),
+    ).filter(Q(can_play_goalie=True) | Q(goalie_rosters__isnull=False))
+    GoalieEligibility.objects.bulk_create(
+        [
+            GoalieEligibility(
+                player_id=player.pk,
+                is_active=player.is_active,
+                last_goalie_year=player.last_goalie_year,
+                last_played_year=player.last_played_year,
+            )
+            for player in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0102_player_name_search_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GoalieEligibility",
+            fields=[
+                (
+                    "player",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="goalie_eligibility",
+                        serialize=False,
+                        to="leagues.player",
+                    ),
+                ),
+                (
+                    "last_goalie_year",
+                    models.IntegerField(
+                        help_text="Most recent season year rostered at goalie",
+                        null=True,
+                    ),
+                ),
+                (
+                    "last_played_year",
+                    models.IntegerField(
+                        db_index=True,
+                        help_text="Most recent season year on any roster",
+                        null=True,
+                    ),
+                ),
+                ("is_active", models.BooleanField(db_index=True, default=True)),
+            ],
+            options={
+                "verbose_name_plural": "goalie eligibility",
+            },
+        ),
+        migrations.RunPython(populate_goalie_eligibility, migrations.RunPython.noop),
+    ]
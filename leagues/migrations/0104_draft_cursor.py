@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:59
+
+import random
+
+from django.db import migrations, models
+
+
+def populate_draft_cursor(apps, schema_editor):
+    """Set the pick cursor and pick order table for existing draft sessions."""
+    DraftSession = apps.get_model("leagues", "DraftSession")
+    for session in DraftSession.objects.all():
+        teams = list(
+            session.teams.exclude(draft_position__isnull=True)
+            .order_by("draft_position")
+            .values_list("pk", flat=True)
+        )
+        pick_order = []
+        if teams:
+            randomized_rounds = set(
+                session.rounds.filter(order_type="randomized").values_list(
+                    "round_number", flat=True
+                )
+            )
+            randomized_before = 0
+            for round_number in range(1, session.num_rounds + 1):
+                if round_number in randomized_rounds:
+                    order = list(teams)
+                    random.Random(f"{session.pk}-{round_number}").shuffle(order)
+                    randomized_before += 1
+                elif (round_number - randomized_before) % 2 == 0:
+                    order = teams[::-1]
+                else:
+                    order = list(teams)
+                pick_order.append(order)
+        DraftSession.objects.filter(pk=session.pk).update(
+            next_pick_index=session.picks.count(), pick_order=pick_order
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0103_goalie_eligibility"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftsession",
+            name="next_pick_index",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="draftsession",
+            name="pick_order",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(populate_draft_cursor, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0104_draft_cursor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftsession",
+            name="broadcast_seq",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0105_draft_broadcast_seq"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftsession",
+            name="player_stats",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0106_draft_player_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftpick",
+            name="idempotency_key",
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+    ]
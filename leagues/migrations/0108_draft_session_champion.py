@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0107_draft_pick_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftsession",
+            name="champion",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:52
+
+from django.db import migrations, models
+
+
+def populate_pick_plan(apps, schema_editor):
+    """Mark captain slots and randomized rounds for already-built pick orders."""
+    DraftSession = apps.get_model("leagues", "DraftSession")
+    for session in DraftSession.objects.exclude(pick_order=[]):
+        captain_rounds = dict(session.teams.values_list("pk", "captain_draft_round"))
+        captain_slots = []
+        index = 0
+        for round_number, order in enumerate(session.pick_order, start=1):
+            for team_pk in order:
+                if captain_rounds.get(team_pk) == round_number:
+                    captain_slots.append(index)
+                index += 1
+        randomized_rounds = session.rounds.filter(order_type="randomized")
+        DraftSession.objects.filter(pk=session.pk).update(
+            pick_plan={
+                "captain_slots": captain_slots,
+                "randomized_rounds": sorted(
+                    randomized_rounds.values_list("round_number", flat=True)
+                ),
+            }
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0108_draft_session_champion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftsession",
+            name="pick_plan",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_pick_plan, migrations.RunPython.noop),
+    ]
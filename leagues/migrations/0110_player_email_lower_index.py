@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:05
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0109_draft_session_pick_plan"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="player",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="leagues_player_email_lower",
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:37
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _normalize(value):
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(
+        ch
+        for ch in decomposed.lower()
+        if ch.isalnum() and not unicodedata.combining(ch)
+    )
+
+
+def _word_keys(value):
+    words = [w for w in map(_normalize, re.split(r"[\W_]+", value or "")) if w]
+    return ["".join(words[i:])[:60] for i in range(1, len(words))]
+
+
+def populate_name_tokens(apps, schema_editor):
+    """Index the inner words of existing players' multi-word names."""
+    Player = apps.get_model("leagues", "Player")
+    PlayerNameToken = apps.get_model("leagues", "PlayerNameToken")
+    tokens = []
+    for pk, first_name, last_name in Player.objects.values_list(
+        "id", "first_name", "last_name"
+    ).iterator():
+        for token in sorted(set(_word_keys(first_name) + _word_keys(last_name))):
+            tokens.append(PlayerNameToken(player_id=pk, token=token))
+    PlayerNameToken.objects.bulk_create(tokens, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0110_player_email_lower_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerNameToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(db_index=True, max_length=60)),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="name_tokens",
+                        to="leagues.player",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("player", "token")},
+            },
+        ),
+        migrations.RunPython(populate_name_tokens, migrations.RunPython.noop),
+    ]
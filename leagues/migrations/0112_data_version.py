@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0111_player_name_tokens"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,99 @@
+from django.db import migrations
+from django.db.models import Q, Sum
+
+DRAFT_DIVISION = 3
+STATE_COMPLETE = "complete"
+RECORD_FIELDS = ("win", "otw", "loss", "otl", "tie")
+
+
+def _goals(Stat, matchup_ids):
+    rows = (
+        Stat.objects.filter(matchup_id__in=matchup_ids)
+        .values("matchup_id", "team_id")
+        .annotate(goals=Sum("goals"))
+    )
+    return {(r["matchup_id"], r["team_id"]): r["goals"] for r in rows}
+
+
+def populate_champions(apps, schema_editor):
+    """
+    Store the champion of already-completed draft sessions, as
+    leagues.draft_champions.refresh_draft_champions() would.
+    """
+    DraftSession = apps.get_model("leagues", "DraftSession")
+    DraftTeam = apps.get_model("leagues", "DraftTeam")
+    MatchUp = apps.get_model("leagues", "MatchUp")
+    Stat = apps.get_model("leagues", "Stat")
+    Team_Stat = apps.get_model("leagues", "Team_Stat")
+
+    for session in DraftSession.objects.filter(state=STATE_COMPLETE):
+        finals = list(
+            MatchUp.objects.filter(
+                is_championship=True,
+                hometeam__division__division=DRAFT_DIVISION,
+                hometeam__season_id=session.season_id,
+            ).select_related("hometeam", "awayteam")
+        )
+        goals = _goals(Stat, [m.pk for m in finals])
+        champion = None
+        for m in finals:
+            home = goals.get((m.pk, m.hometeam_id), 0)
+            away = goals.get((m.pk, m.awayteam_id), 0)
+            if home != away:
+                champion = m.hometeam if home > away else m.awayteam
+        if champion is None:
+            continue
+
+        draft_team = (
+            DraftTeam.objects.filter(league_team=champion)
+            .select_related("captain")
+            .last()
+        )
+        team_stat = Team_Stat.objects.filter(team=champion).last()
+        playoffs = list(
+            MatchUp.objects.filter(
+                Q(hometeam=champion) | Q(awayteam=champion), is_postseason=True
+            ).values_list("pk", "hometeam_id", "awayteam_id")
+        )
+        playoff_goals = _goals(Stat, [pk for pk, _, _ in playoffs])
+        wins = losses = 0
+        for pk, home_id, away_id in playoffs:
+            opponent = away_id if home_id == champion.pk else home_id
+            mine = playoff_goals.get((pk, champion.pk), 0)
+            theirs = playoff_goals.get((pk, opponent), 0)
+            wins += mine > theirs
+            losses += theirs > mine
+
+        captain = draft_team.captain if draft_team is not None else None
+        DraftSession.objects.filter(pk=session.pk).update(
+            champion={
+                "team": {"id": champion.pk, "team_name": champion.team_name},
+                "draft_team": (
+                    {
+                        "id": draft_team.pk,
+                        "captain": {
+                            "full_name": f"{captain.first_name} {captain.last_name}"
+                        },
+                    }
+                    if draft_team is not None
+                    else None
+                ),
+                "team_stat": (
+                    {field: getattr(team_stat, field) for field in RECORD_FIELDS}
+                    if team_stat is not None
+                    else None
+                ),
+                "playoff_wins": wins,
+                "playoff_losses": losses,
+            }
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("leagues", "0112_data_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_champions, migrations.RunPython.noop),
+    ]
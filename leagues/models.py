@@ -5,7 +5,9 @@ import datetime
 import uuid
 
 from django.db.models import indexes
+from django.db.models.functions import Lower
 
+from .name_matching import normalize_name, player_name_tokens
 
 YEAR_CHOICES = []
 for r in range(2000, (datetime.datetime.now().year + 2)):
@@ -88,6 +90,14 @@ class Player(models.Model):
         default=False,
         help_text="If checked, this player won't be auto-deactivated by the cleanup command (e.g., available subs not on a roster)",
     )
+    # Normalized copies of the name for indexed prefix search (see
+    # leagues.name_matching). Maintained by save(); never edited directly.
+    first_name_key = models.CharField(
+        max_length=60, db_index=True, editable=False, default=""
+    )
+    last_name_key = models.CharField(
+        max_length=60, db_index=True, editable=False, default=""
+    )
 
     class Meta:
         ordering = ("last_name",)
@@ -97,8 +107,29 @@ class Player(models.Model):
         )
         indexes = [
             models.Index(fields=["last_name", "first_name"]),
+            # Case-insensitive email matching (PlayerIdentityIndex.load).
+            models.Index(Lower("email"), name="leagues_player_email_lower"),
         ]
 
+    def save(self, *args, **kwargs):
+        self.first_name_key = normalize_name(self.first_name)[:60]
+        self.last_name_key = normalize_name(self.last_name)[:60]
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"first_name", "last_name"} & set(
+            update_fields
+        ):
+            kwargs["update_fields"] = {
+                *update_fields,
+                "first_name_key",
+                "last_name_key",
+            }
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if update_fields is None or {"first_name", "last_name"} & set(update_fields):
+            if not adding:
+                self.name_tokens.all().delete()
+            PlayerNameToken.objects.bulk_create(player_name_tokens([self]))
+
     def __unicode__(self):
         return "%s, %s" % (self.last_name, self.first_name)
 
@@ -106,6 +137,25 @@ class Player(models.Model):
         return self.__unicode__()
 
 
+class PlayerNameToken(models.Model):
+    """
+    The key of a later word of a player's first or last name on ("Van
+    Buren" -> "buren"), so search_players() can prefix-match inner words.
+    Written by Player.save(); bulk-created players need player_name_tokens().
+    """
+
+    player = models.ForeignKey(
+        Player, on_delete=models.CASCADE, related_name="name_tokens"
+    )
+    token = models.CharField(max_length=60, db_index=True)
+
+    class Meta:
+        unique_together = ("player", "token")
+
+    def __str__(self):
+        return f"{self.player}: {self.token}"
+
+
 class Season(models.Model):
     SEASON_TYPE = ((1, "Spring"), (2, "Summer"), (3, "Fall"), (4, "Winter"))
     season_type = models.PositiveIntegerField(
@@ -287,6 +337,47 @@ class Roster(models.Model):
         return self.__unicode__()
 
 
+class DataVersion(models.Model):
+    """
+    A named version counter shared by every worker process, e.g. the stats
+    data version that derived-view cache keys embed (leagues.signals).
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.name}: {self.version}"
+
+
+class GoalieEligibility(models.Model):
+    """
+    Materialized "who can play goalie" set: one row per player who has been
+    rostered at goalie or is flagged can_play_goalie.  Maintained by
+    leagues.goalie_eligibility on Roster / Player save; never edited directly.
+    """
+
+    player = models.OneToOneField(
+        Player,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="goalie_eligibility",
+    )
+    last_goalie_year = models.IntegerField(
+        null=True, help_text="Most recent season year rostered at goalie"
+    )
+    last_played_year = models.IntegerField(
+        null=True, db_index=True, help_text="Most recent season year on any roster"
+    )
+    is_active = models.BooleanField(default=True, db_index=True)
+
+    class Meta:
+        verbose_name_plural = "goalie eligibility"
+
+    def __str__(self):
+        return f"Goalie eligibility: {self.player}"
+
+
 class Week(models.Model):
     division = models.ForeignKey(Division, null=True, on_delete=models.PROTECT)
     season = models.ForeignKey(Season, on_delete=models.PROTECT)
@@ -573,6 +664,8 @@ class DraftSession(models.Model):
         (STATE_PAUSED, "Paused"),
         (STATE_COMPLETE, "Complete"),
     )
+    # Board states in which every change goes out as a sequenced broadcast.
+    LIVE_STATES = (STATE_DRAW, STATE_ACTIVE, STATE_PAUSED)
 
     season = models.OneToOneField(
         Season, on_delete=models.PROTECT, related_name="draft_session"
@@ -590,6 +683,35 @@ class DraftSession(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     # Set when commissioner triggers "Finalize Draft" to create real Team/Roster records
     finalized_at = models.DateTimeField(null=True, blank=True)
+    # Draft cursor: index of the next overall pick (the number of picks made)
+    # and the full pick order table, one list of DraftTeam PKs per round,
+    # built when positions are drawn.  next_pick_index is kept in step with
+    # DraftPick inserts/deletes by leagues.signals.
+    next_pick_index = models.PositiveIntegerField(default=0, editable=False)
+    pick_order = models.JSONField(default=list, blank=True, editable=False)
+    # Built with pick_order: overall indexes of captain auto-pick slots and
+    # the randomized round numbers (see leagues.pick_order).
+    pick_plan = models.JSONField(null=True, blank=True, editable=False)
+    # Sequence number of the last live-board broadcast.  Every delta and
+    # snapshot carries the next value so clients can spot a missed message.
+    broadcast_seq = models.PositiveIntegerField(default=0, editable=False)
+    # Historical Wednesday stats and ADP for every linked signup, keyed by
+    # player id.  Snapshotted when the draft enters the draw or active phase
+    # (they can't change mid-draft); None until then.
+    player_stats = models.JSONField(null=True, blank=True, editable=False)
+    # The league champion and its records, kept by leagues.draft_champions
+    # whenever the season's playoff results change; None until decided.
+    champion = models.JSONField(null=True, blank=True, editable=False)
+
+    # Fields written only by targeted updates while the draft runs.
+    MANAGED_FIELDS = (
+        "next_pick_index",
+        "pick_order",
+        "pick_plan",
+        "broadcast_seq",
+        "player_stats",
+        "champion",
+    )
 
     def __str__(self):
         return f"Draft – {self.season} ({self.get_state_display()})"
@@ -597,48 +719,110 @@ class DraftSession(models.Model):
     @property
     def current_pick(self):
         """Return (round_number, pick_index) of the next pick to be made."""
-        picks = self.picks.order_by("round_number", "pick_number")
-        total_picks = picks.count()
         expected = self.num_rounds * self.num_teams
-        if total_picks >= expected:
+        if self.next_pick_index >= expected:
             return None  # draft complete
-        pick_in_round = total_picks % self.num_teams
-        round_number = (total_picks // self.num_teams) + 1
+        pick_in_round = self.next_pick_index % self.num_teams
+        round_number = (self.next_pick_index // self.num_teams) + 1
         return round_number, pick_in_round
 
-    def pick_order_for_round(self, round_number):
+    @property
+    def active_team_pk(self):
+        """DraftTeam pk on the clock, or None when the draft is complete."""
+        current = self.current_pick
+        if not current:
+            return None
+        round_number, pick_in_round = current
+        order = self.pick_order_for_round(round_number)
+        return order[pick_in_round] if pick_in_round < len(order) else None
+
+    def save(self, *args, **kwargs):
+        # The managed fields are written only through explicit update_fields
+        # or queryset updates, so saving a stale in-memory session can never
+        # rewind the draft or drop the stats snapshot.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.MANAGED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def next_broadcast_seq(self):
+        """Atomically claim the next broadcast sequence number."""
+        DraftSession.objects.filter(pk=self.pk).update(
+            broadcast_seq=models.F("broadcast_seq") + 1
+        )
+        self.refresh_from_db(fields=["broadcast_seq"])
+        return self.broadcast_seq
+
+    def compute_pick_order(self, num_rounds=None):
         """
-        Return ordered list of DraftTeam PKs for a given round.
-        Randomized: teams are shuffled deterministically using a seeded RNG.
-        Snake: direction alternates, but randomized rounds are excluded from
-        the parity count so the snake continues uninterrupted after them.
+        Return the pick order for rounds 1..num_rounds as a list of lists of
+        DraftTeam PKs (index 0 is round 1); see leagues.pick_order.
         """
-        import random as _random
+        from .pick_order import plan_pick_order
 
-        teams = list(
-            self.teams.exclude(draft_position__isnull=True).order_by("draft_position")
+        return plan_pick_order(
+            self._drawn_teams().values_list("pk", flat=True),
+            self.num_rounds if num_rounds is None else num_rounds,
+            self._randomized_rounds(),
+            seed=self.pk,
         )
-        try:
-            round_obj = self.rounds.get(round_number=round_number)
-        except DraftRound.DoesNotExist:
-            round_obj = None
 
-        if round_obj and round_obj.order_type == DraftRound.ORDER_RANDOMIZED:
-            rng = _random.Random(f"{self.pk}-{round_number}")
-            rng.shuffle(teams)
-            return [t.pk for t in teams]
+    def rebuild_pick_order(self):
+        """
+        Recompute and persist the pick order table and its plan (captain
+        auto-pick slots, randomized rounds) after a draw or config change.
+        """
+        from .pick_order import plan_details, plan_pick_order
 
-        # Snake parity: count only non-randomized rounds before this one so
-        # a randomized round doesn't break the snake direction.
-        randomized_before = self.rounds.filter(
-            round_number__lt=round_number,
-            order_type=DraftRound.ORDER_RANDOMIZED,
-        ).count()
-        effective_round = round_number - randomized_before
+        teams = list(self._drawn_teams().values_list("pk", "captain_draft_round"))
+        randomized_rounds = self._randomized_rounds()
+        self.pick_order = plan_pick_order(
+            [pk for pk, _ in teams], self.num_rounds, randomized_rounds, seed=self.pk
+        )
+        self.pick_plan = plan_details(self.pick_order, dict(teams), randomized_rounds)
+        DraftSession.objects.filter(pk=self.pk).update(
+            pick_order=self.pick_order, pick_plan=self.pick_plan
+        )
 
-        if effective_round % 2 == 0:
-            return [t.pk for t in reversed(teams)]
-        return [t.pk for t in teams]
+    def _drawn_teams(self):
+        return self.teams.exclude(draft_position__isnull=True).order_by(
+            "draft_position"
+        )
+
+    def _randomized_rounds(self):
+        return set(
+            self.rounds.filter(order_type=DraftRound.ORDER_RANDOMIZED).values_list(
+                "round_number", flat=True
+            )
+        )
+
+    def pick_order_for_round(self, round_number):
+        """
+        Return ordered list of DraftTeam PKs for a given round, read from the
+        precomputed pick order table when it has been built.
+        """
+        if 1 <= round_number <= len(self.pick_order):
+            return list(self.pick_order[round_number - 1])
+        return self.compute_pick_order(round_number)[round_number - 1]
+
+    def is_captain_slot(self, pick_index):
+        """
+        Whether the pick at ``pick_index`` is a captain auto-pick, from the
+        stored plan; None when no plan has been built.
+        """
+        if self.pick_plan is None:
+            return None
+        return pick_index in self.pick_plan["captain_slots"]
+
+    def is_randomized_round(self, round_number):
+        if self.pick_plan is not None:
+            return round_number in self.pick_plan["randomized_rounds"]
+        return self.rounds.filter(
+            round_number=round_number, order_type=DraftRound.ORDER_RANDOMIZED
+        ).exists()
 
 
 class DraftRound(models.Model):
@@ -756,6 +940,11 @@ class DraftPick(models.Model):
         default="",
         help_text="Optional note describing the trade (e.g. 'Swapped with Smith from Team B').",
     )
+    # Client-generated key sent with the pick request; a retried request with
+    # the same key is answered from the existing pick instead of drafting again.
+    idempotency_key = models.UUIDField(
+        null=True, blank=True, unique=True, editable=False
+    )
 
     class Meta:
         ordering = ("round_number", "pick_number")
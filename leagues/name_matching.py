@@ -0,0 +1,347 @@
+"""
+Player name normalization, nickname variants and indexed name search.
+
+``Player.first_name_key`` / ``Player.last_name_key`` hold a normalized copy of
+the name (lowercase, accents and punctuation stripped).  Both are indexed
+CharFields, and on PostgreSQL Django adds a ``varchar_pattern_ops`` index for
+them, so a ``__startswith`` lookup is an index range scan there.  That
+replaces the old ``first_name__icontains | last_name__icontains`` filter, a
+leading-wildcard scan of the whole Player table on every keystroke.  (SQLite
+compiles ``__startswith`` to a LIKE, which is case-insensitive and so can't
+use these indexes: the test database still scans.)
+
+The keys drop spaces, so the inner words of a multi-word name ("Van Buren"
+is ``vanburen``) are indexed separately as PlayerNameToken rows
+(``name_word_keys``: ``buren``), which search_players() also prefix-matches.
+
+``PlayerIdentityIndex`` is the matching engine shared by the signup form,
+late signups, finalize, the importers and the duplicate finder: players are
+indexed once by lowercased email (backed by a ``Lower("email")`` index on
+Player), by name key and by nickname variant of the first name key, so each
+lookup is a dict hit rather than a query or a scan of a last-name group.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+
+from django.db.models import Exists, OuterRef, Q
+
+# Common nickname mappings
+NICKNAME_MAP = {
+    "richard": ["rich", "rick", "ricky", "dick"],
+    "michael": ["mike", "mikey", "mick"],
+    "william": ["will", "bill", "billy", "willy"],
+    "robert": ["rob", "bob", "bobby", "robbie"],
+    "james": ["jim", "jimmy", "jamie"],
+    "joseph": ["joe", "joey"],
+    "thomas": ["tom", "tommy"],
+    "christopher": ["chris", "cj"],
+    "matthew": ["matt", "matty"],
+    "anthony": ["tony", "ant"],
+    "daniel": ["dan", "danny"],
+    "david": ["dave", "davey"],
+    "edward": ["ed", "eddie", "ted", "teddy"],
+    "patrick": ["pat", "patty", "paddy"],
+    "stephen": ["steve", "stevie"],
+    "steven": ["steve", "stevie"],
+    "andrew": ["andy", "drew"],
+    "jonathan": ["jon", "jonny", "john"],
+    "john": ["jon", "johnny", "jack"],
+    "benjamin": ["ben", "benny"],
+    "alexander": ["alex", "al"],
+    "timothy": ["tim", "timmy"],
+    "charles": ["charlie", "chuck", "chas"],
+    "kenneth": ["ken", "kenny"],
+    "gregory": ["greg", "gregg"],
+    "jeffrey": ["jeff", "geoff"],
+    "ronald": ["ron", "ronnie"],
+    "donald": ["don", "donnie"],
+    "raymond": ["ray"],
+    "lawrence": ["larry", "lars"],
+    "gerald": ["gerry", "jerry"],
+    "samuel": ["sam", "sammy"],
+    "peter": ["pete", "petey"],
+    "henry": ["hank", "harry"],
+    "douglas": ["doug", "dougie"],
+    "dennis": ["denny"],
+    "harold": ["hal", "harry"],
+    "eugene": ["gene"],
+    "phillip": ["phil"],
+    "vincent": ["vince", "vinny"],
+    "walter": ["walt", "wally"],
+    "frederick": ["fred", "freddy", "freddie"],
+    "albert": ["al", "bert", "bertie"],
+    "arthur": ["art", "artie"],
+    "nathan": ["nate", "nat"],
+    "zachary": ["zach", "zack"],
+    "jacob": ["jake"],
+    "joshua": ["josh"],
+    "brian": ["bri"],
+    "kevin": ["kev"],
+    "jason": ["jay"],
+    "justin": ["just"],
+    "brandon": ["brand"],
+    "jessica": ["jess", "jessie"],
+    "jennifer": ["jen", "jenny"],
+    "elizabeth": ["liz", "lizzy", "beth", "betty", "eliza"],
+    "katherine": ["kate", "kathy", "katie", "kat"],
+    "catherine": ["kate", "cathy", "katie", "cat"],
+    "margaret": ["maggie", "meg", "peggy", "marge"],
+    "patricia": ["pat", "patty", "trish"],
+    "rebecca": ["becky", "becca"],
+    "christine": ["chris", "chrissy", "tina"],
+    "christina": ["chris", "chrissy", "tina"],
+    "stephanie": ["steph", "stephie"],
+    "samantha": ["sam", "sammy"],
+    "alexandra": ["alex", "lexi"],
+    "victoria": ["vicky", "tori"],
+    "natalie": ["nat"],
+    "nicholas": ["nick", "nicky", "nico"],
+}
+
+
+def _build_variant_index(nickname_map):
+    """Map every full name and nickname to all names it can stand for."""
+    index = defaultdict(set)
+    for full_name, nicknames in nickname_map.items():
+        group = {full_name, *nicknames}
+        index[full_name] |= group
+        for nickname in nicknames:
+            index[nickname] |= group
+    return dict(index)
+
+
+# Built once at import so lookups are O(1) instead of a scan of NICKNAME_MAP.
+NAME_VARIANTS = _build_variant_index(NICKNAME_MAP)
+
+
+def get_name_variants(first_name):
+    """Get all possible variants of a first name."""
+    name_lower = first_name.lower().strip()
+    return {name_lower} | NAME_VARIANTS.get(name_lower, set())
+
+
+def normalize_name(value):
+    """Lowercase, strip accents and drop everything but letters and digits."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(
+        ch
+        for ch in decomposed.lower()
+        if ch.isalnum() and not unicodedata.combining(ch)
+    )
+
+
+_WORD_BREAK = re.compile(r"[\W_]+")
+
+
+def name_word_keys(value):
+    """
+    The keys of ``value`` from each word after the first on: "Van Buren"
+    gives ["buren"], "de la Cruz" gives ["lacruz", "cruz"].
+    """
+    words = [
+        w for w in (normalize_name(w) for w in _WORD_BREAK.split(value or "")) if w
+    ]
+    return ["".join(words[i:])[:60] for i in range(1, len(words))]
+
+
+def player_name_tokens(players):
+    """Unsaved PlayerNameToken rows for the multi-word names of ``players``."""
+    from .models import PlayerNameToken
+
+    return [
+        PlayerNameToken(player=player, token=token)
+        for player in players
+        for token in sorted(
+            set(name_word_keys(player.first_name) + name_word_keys(player.last_name))
+        )
+    ]
+
+
+def search_players(queryset, q):
+    """
+    Filter ``queryset`` to players whose names start with every word of ``q``.
+
+    Each word must prefix-match the last name, a later word of either name
+    ("buren" finds Van Buren), or the first name or one of its nickname
+    variants -- so "bob smi" finds Robert Smith.
+    """
+    from .models import PlayerNameToken
+
+    for word in (q or "").split():
+        key = normalize_name(word)
+        if not key:
+            continue
+        match = Q(last_name_key__startswith=key) | Exists(
+            PlayerNameToken.objects.filter(player=OuterRef("pk"), token__startswith=key)
+        )
+        for variant in NAME_VARIANTS.get(key, ()):
+            match |= Q(first_name_key__startswith=variant)
+        queryset = queryset.filter(match | Q(first_name_key__startswith=key))
+    return queryset
+
+
+def email_key(email):
+    """Lowercased, trimmed email for matching ("" when there is none)."""
+    return (email or "").strip().lower()
+
+
+def name_keys(first_name, last_name):
+    """(first, last) name keys, as stored on Player.first/last_name_key."""
+    return normalize_name(first_name)[:60], normalize_name(last_name)[:60]
+
+
+# A lookup result: the player when exactly one matched, how it matched
+# ("email", "name", "nickname", "first_name"; "ambiguous" or "new" when no
+# single player did) and every candidate found by the first step with any.
+Match = namedtuple("Match", "player how candidates")
+
+
+class PlayerIdentityIndex:
+    """
+    Players indexed for identity matching.
+
+    Built from any iterable of Players, or with ``load`` from just the
+    players that could match a batch of (first, last, email) identities.
+    """
+
+    def __init__(self, players=()):
+        self.players = []
+        self._by_email = defaultdict(list)
+        self._by_name = defaultdict(list)
+        self._by_variant = defaultdict(list)
+        self._by_first = defaultdict(list)
+        for player in players:
+            self.add(player)
+
+    @classmethod
+    def load(cls, identities, first_names=(), queryset=None):
+        """
+        Index the players sharing an email or a last name key with any of
+        ``identities`` ((first_name, last_name, email) tuples), plus any
+        whose first name key matches one of ``first_names`` -- one query on
+        the email and name key indexes.
+        """
+        from django.db.models.functions import Lower
+
+        from .models import Player
+
+        emails, last_keys = set(), set()
+        for first_name, last_name, email in identities:
+            if email_key(email):
+                emails.add(email_key(email))
+            last_keys.add(name_keys(first_name, last_name)[1])
+        first_keys = {normalize_name(name)[:60] for name in first_names}
+        if not emails and not last_keys and not first_keys:
+            return cls()
+        if queryset is None:
+            queryset = Player.objects.all()
+        return cls(
+            queryset.annotate(email_lower=Lower("email"))
+            .filter(
+                Q(email_lower__in=emails)
+                | Q(last_name_key__in=last_keys)
+                | Q(first_name_key__in=first_keys)
+            )
+            .order_by("pk")
+        )
+
+    def add(self, player):
+        """Index one more player (e.g. one just created)."""
+        self.players.append(player)
+        if email_key(player.email):
+            self._by_email[email_key(player.email)].append(player)
+        first, last = self._keys(player)
+        self._by_name[first, last].append(player)
+        self._by_first[first].append(player)
+        for variant in get_name_variants(first):
+            self._by_variant[variant, last].append(player)
+
+    @staticmethod
+    def _keys(player):
+        if player.first_name_key or player.last_name_key:
+            return player.first_name_key, player.last_name_key
+        return name_keys(player.first_name, player.last_name)
+
+    def lookup(self, how, first_name="", last_name="", email=None):
+        """Players matching one way: "email", "name", "nickname" or "first_name"."""
+        first, last = name_keys(first_name, last_name)
+        if how == "email":
+            return list(self._by_email.get(email_key(email), ())) if email else []
+        if how == "name":
+            return list(self._by_name.get((first, last), ()))
+        if how == "first_name":
+            return list(self._by_first.get(first, ()))
+        if how == "nickname":
+            found = {}
+            for variant in get_name_variants(first):
+                for player in self._by_variant.get((variant, last), ()):
+                    found.setdefault(id(player), player)
+            return list(found.values())
+        raise ValueError(f"Unknown match type {how!r}")
+
+    def match(self, first_name, last_name, email=None, order=("email", "name")):
+        """
+        Try each way in ``order`` and return a Match for the first that finds
+        exactly one player.
+        """
+        candidates = []
+        for how in order:
+            found = self.lookup(how, first_name, last_name, email)
+            if len(found) == 1:
+                return Match(found[0], how, found)
+            if found and not candidates:
+                candidates = found
+        return Match(None, "ambiguous" if candidates else "new", candidates)
+
+    def duplicate_groups(self):
+        """
+        Candidate duplicates, blocked by last name key, as (kind, last name
+        key, players): "EXACT MATCH" for players sharing a first name key,
+        "NICKNAME MATCH" for first names linked through nickname variants.
+        """
+        blocks = defaultdict(lambda: defaultdict(list))
+        for player in self.players:
+            first, last = self._keys(player)
+            blocks[last][first].append(player)
+
+        groups = []
+        for last in sorted(blocks):
+            by_first = blocks[last]
+            if sum(len(players) for players in by_first.values()) < 2:
+                continue
+            for first in sorted(by_first):
+                if len(by_first[first]) > 1:
+                    groups.append(("EXACT MATCH", last, by_first[first]))
+            for firsts in _variant_components(by_first):
+                players = [p for first in firsts for p in by_first[first]]
+                groups.append(("NICKNAME MATCH", last, players))
+        return groups
+
+
+def _variant_components(by_first):
+    """
+    Groups of two or more first name keys connected by shared nickname
+    variants (union-find over the variants each key stands for).
+    """
+    parent = {first: first for first in by_first}
+
+    def find(first):
+        while parent[first] != first:
+            parent[first] = parent[parent[first]]
+            first = parent[first]
+        return first
+
+    owner = {}
+    for first in sorted(by_first):
+        for variant in get_name_variants(first):
+            if variant in owner:
+                parent[find(first)] = find(owner[variant])
+            else:
+                owner[variant] = first
+
+    components = defaultdict(list)
+    for first in sorted(by_first):
+        components[find(first)].append(first)
+    return [firsts for firsts in components.values() if len(firsts) > 1]
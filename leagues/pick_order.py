@@ -0,0 +1,100 @@
+"""
+Pick order planning for draft sessions.
+
+The order of a draft is fixed once positions are drawn: snake rounds
+alternate direction (randomized rounds don't count towards the parity, so
+the snake continues uninterrupted after them) and randomized rounds shuffle
+the teams with an RNG seeded by session and round.  ``plan_pick_order``
+builds the whole (round, slot) -> team table from plain values, and
+``plan_details`` marks the overall pick indexes where a captain is
+auto-drafted and which rounds are randomized.  DraftSession stores both
+(``pick_order`` and ``pick_plan``) so nothing recomputes them per pick.
+
+Nothing here touches the database, so ``simulate_draft`` can run a whole
+draft in memory for tests and benchmarks.
+"""
+
+import random
+from collections import namedtuple
+
+SimulatedPick = namedtuple(
+    "SimulatedPick",
+    "index round_number pick_number team_pk player is_auto_captain",
+)
+
+
+def plan_pick_order(team_pks, num_rounds, randomized_rounds=(), seed=""):
+    """
+    Return the pick order for rounds 1..num_rounds as a list of lists of
+    team PKs (index 0 is round 1), with ``team_pks`` in draft position order.
+    """
+    teams = list(team_pks)
+    randomized_rounds = set(randomized_rounds)
+
+    table = []
+    randomized_before = 0
+    for round_number in range(1, num_rounds + 1):
+        if round_number in randomized_rounds:
+            order = list(teams)
+            random.Random(f"{seed}-{round_number}").shuffle(order)
+            randomized_before += 1
+        elif (round_number - randomized_before) % 2 == 0:
+            order = teams[::-1]
+        else:
+            order = list(teams)
+        table.append(order)
+    return table
+
+
+def captain_slots(table, captain_rounds):
+    """
+    Overall pick indexes at which a team's captain is auto-drafted, given
+    ``captain_rounds`` as {team_pk: captain_draft_round}.
+    """
+    slots = []
+    index = 0
+    for round_number, order in enumerate(table, start=1):
+        for team_pk in order:
+            if captain_rounds.get(team_pk) == round_number:
+                slots.append(index)
+            index += 1
+    return slots
+
+
+def plan_details(table, captain_rounds, randomized_rounds):
+    """The compact companion of a pick order table stored as pick_plan."""
+    return {
+        "captain_slots": captain_slots(table, captain_rounds),
+        "randomized_rounds": sorted(randomized_rounds),
+    }
+
+
+def simulate_draft(table, captains, captain_rounds, pool, choose=None):
+    """
+    Run a draft over ``table`` in memory and return its SimulatedPicks.
+
+    ``captains`` maps team PK to that team's captain and ``captain_rounds``
+    to their auto-draft round; captains never enter the open ``pool``.
+    ``choose(team_pk, available)`` returns the player a team takes from the
+    remaining pool (in order); by default the first one.  The draft ends
+    early if the pool runs out.
+    """
+    captain_players = set(captains.values())
+    available = [player for player in pool if player not in captain_players]
+    picks = []
+    for round_number, order in enumerate(table, start=1):
+        for pick_number, team_pk in enumerate(order):
+            if captain_rounds.get(team_pk) == round_number and team_pk in captains:
+                player, auto = captains[team_pk], True
+            elif not available:
+                return picks
+            else:
+                player = choose(team_pk, available) if choose else available[0]
+                available.remove(player)
+                auto = False
+            picks.append(
+                SimulatedPick(
+                    len(picks), round_number, pick_number, team_pk, player, auto
+                )
+            )
+    return picks
@@ -0,0 +1,188 @@
+"""
+Merging duplicate Player records.
+
+A player entered twice ("Bob"/"Robert", "ONeill"/"O'Neill") has their
+history split between the records, so the stats pages show two half
+careers.  ``find_duplicate_players`` lists the candidates, grouped in one
+pass blocked by normalized last name (PlayerIdentityIndex.duplicate_groups),
+and ``merge_players`` folds duplicates into the record to keep:
+
+  - every foreign key to Player (PLAYER_REFERENCES) is repointed with one
+    UPDATE per column, all in one transaction;
+  - roster rows that would put the kept player on a team twice and extra
+    Ref rows are dropped (their matchups move to the kept Ref);
+  - the kept record inherits an email, photo and the active/goalie/
+    protected flags it lacks, and the duplicates are deleted;
+  - derived data is refreshed: goalie eligibility and the stats version
+    (batched_roster_changes) and the Wednesday stats snapshots of draft
+    sessions, which recompute the merged player's entry on next read.
+
+The champion stored on a draft session doesn't refer to players, so it is
+unaffected.
+"""
+
+from collections import namedtuple
+
+from django.db import transaction
+
+from .models import (
+    DraftSession,
+    MatchUp,
+    PendingPlayerPhoto,
+    Player,
+    Ref,
+    Roster,
+    SeasonSignup,
+    Stat,
+)
+from .signals import batched_roster_changes
+
+# Every (model, field) that references a Player, except the goalie
+# eligibility index, which is derived and refreshed instead, and the name
+# tokens, which are deleted with the duplicates.
+PLAYER_REFERENCES = (
+    (Roster, "player"),
+    (Stat, "player"),
+    (Ref, "player"),
+    (MatchUp, "away_goalie"),
+    (MatchUp, "home_goalie"),
+    (SeasonSignup, "linked_player"),
+    (PendingPlayerPhoto, "player"),
+)
+
+# Flags the kept player takes on when any duplicate has them set.
+_MERGED_FLAGS = ("is_active", "can_play_goalie", "exclude_from_auto_deactivation")
+
+# The outcome of a merge: the kept player, the pks merged into it and the
+# rows moved, as {"Model.field": count}, plus "Roster (dropped)" and
+# "Ref (dropped)" for duplicate rows removed.
+MergeResult = namedtuple("MergeResult", "player merged moved")
+
+
+class PlayerMergeError(Exception):
+    """A merge that can't be done; the message says why."""
+
+
+def _label(model, field):
+    return f"{model.__name__}.{field}"
+
+
+def reference_counts(player_ids):
+    """Rows referencing any of ``player_ids``, as {"Model.field": count}."""
+    return {
+        _label(model, field): model.objects.filter(
+            **{f"{field}__in": player_ids}
+        ).count()
+        for model, field in PLAYER_REFERENCES
+    }
+
+
+def merge_players(keep, duplicates):
+    """
+    Merge ``duplicates`` into ``keep`` (Players) and delete them; returns a
+    MergeResult.  Everything happens in one transaction.
+    """
+    dup_ids = sorted({p.pk for p in duplicates} - {keep.pk})
+    if not dup_ids:
+        raise PlayerMergeError(f"Nothing to merge into player {keep.pk}.")
+    duplicates = list(Player.objects.filter(pk__in=dup_ids).order_by("pk"))
+    if len(duplicates) != len(dup_ids):
+        raise PlayerMergeError("Some of the players to merge no longer exist.")
+
+    moved = {}
+    with transaction.atomic(), batched_roster_changes() as player_ids:
+        moved["Roster (dropped)"] = _drop_repeated_rosters(keep, dup_ids)
+        moved["Ref (dropped)"] = _merge_refs(keep, dup_ids)
+        for model, field in PLAYER_REFERENCES:
+            moved[_label(model, field)] = model.objects.filter(
+                **{f"{field}__in": dup_ids}
+            ).update(**{field: keep})
+
+        changed = _inherit_fields(keep, duplicates)
+        if changed:
+            keep.save(update_fields=changed)
+        Player.objects.filter(pk__in=dup_ids).delete()
+        _forget_session_stats([keep.pk, *dup_ids])
+        player_ids.add(keep.pk)
+    return MergeResult(keep, dup_ids, moved)
+
+
+def _drop_repeated_rosters(keep, dup_ids):
+    """Delete duplicates' rosters on teams the merged player is already on."""
+    teams = set()
+    repeated = []
+    rosters = Roster.objects.filter(player_id__in=[keep.pk, *dup_ids]).values_list(
+        "pk", "player_id", "team_id"
+    )
+    # The kept player's own rows first, then the duplicates' in pk order.
+    for pk, player_id, team_id in sorted(
+        rosters, key=lambda row: (row[1] != keep.pk, row[0])
+    ):
+        if team_id is not None and team_id in teams and player_id != keep.pk:
+            repeated.append(pk)
+        teams.add(team_id)
+    if repeated:
+        Roster.objects.filter(pk__in=repeated).delete()
+    return len(repeated)
+
+
+def _merge_refs(keep, dup_ids):
+    """
+    Leave one Ref row for the merged player (the kept player's, else the
+    first duplicate's): matchups reffed by the others move to it.
+    """
+    refs = list(
+        Ref.objects.filter(player_id__in=[keep.pk, *dup_ids])
+        .order_by("pk")
+        .values_list("pk", "player_id")
+    )
+    if len(refs) < 2:
+        return 0
+    target = next((pk for pk, player_id in refs if player_id == keep.pk), refs[0][0])
+    others = [pk for pk, _ in refs if pk != target]
+    MatchUp.objects.filter(ref1_id__in=others).update(ref1_id=target)
+    MatchUp.objects.filter(ref2_id__in=others).update(ref2_id=target)
+    Ref.objects.filter(pk__in=others).delete()
+    return len(others)
+
+
+def _inherit_fields(keep, duplicates):
+    """Fill in what the kept player lacks; returns the changed field names."""
+    changed = []
+    for dup in duplicates:
+        if not keep.email and dup.email:
+            keep.email = dup.email
+            changed.append("email")
+        if keep.player_photo_id is None and dup.player_photo_id is not None:
+            keep.player_photo_id = dup.player_photo_id
+            changed.append("player_photo")
+        for flag in _MERGED_FLAGS:
+            if getattr(dup, flag) and not getattr(keep, flag):
+                setattr(keep, flag, True)
+                changed.append(flag)
+    return list(dict.fromkeys(changed))
+
+
+def _forget_session_stats(player_ids):
+    """
+    Drop the merged players from draft sessions' stats snapshots; the
+    kept player's combined entry is computed and stored on next read.
+    """
+    keys = [str(pk) for pk in player_ids]
+    sessions = list(
+        DraftSession.objects.filter(player_stats__has_any_keys=keys).only(
+            "pk", "player_stats"
+        )
+    )
+    for session in sessions:
+        for key in keys:
+            session.player_stats.pop(key, None)
+    DraftSession.objects.bulk_update(sessions, ["player_stats"])
+
+
+def pick_survivor(players):
+    """
+    The player of a duplicate group to keep: the one with the most roster
+    entries (``roster_count`` annotation), then the oldest record.
+    """
+    return min(players, key=lambda p: (-p.roster_count, p.pk))
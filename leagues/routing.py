@@ -4,4 +4,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r"ws/draft/(?P<session_pk>\d+)/$", consumers.DraftConsumer.as_asgi()),
+    re_path(r"ws/goalie-status/$", consumers.GoalieStatusConsumer.as_asgi()),
 ]
@@ -0,0 +1,377 @@
+"""
+Cache invalidation for data derived from stats and rosters.
+
+Derived views (league leaders, trends, ...) cache their results under a key
+that embeds a single "stats data version".  Any delete on a model that feeds
+those views, and any save that adds a row or changes one of the fields those
+views read (STATS_SOURCE_FIELDS), bumps the version, so stale entries are
+simply never read again and age out of the cache on their own TTL.  The
+version lives in the database (DataVersion) so every worker process sees a
+bump; each process keeps its copy in the local cache for a few seconds.
+
+Roster and Player changes also refresh the affected player's row in the
+goalie eligibility index (see leagues.goalie_eligibility), and DraftPick /
+DraftRound changes keep each DraftSession's draft cursor in step; draft team
+and signup edits move a live board's broadcast seq.  Playoff results, team
+records and draft-team links refresh the stored champion of completed draft
+sessions (see leagues.draft_champions).
+
+Bulk paths wrap their work in ``batched_roster_changes()`` so those per-row
+refreshes and version bumps happen once at the end instead.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .draft_champions import refresh_draft_champions
+from .goalie_eligibility import refresh_goalie_eligibility
+from .models import (
+    DataVersion,
+    Division,
+    DraftPick,
+    DraftRound,
+    DraftSession,
+    DraftTeam,
+    MatchUp,
+    Player,
+    Roster,
+    Season,
+    SeasonSignup,
+    Stat,
+    Team,
+    Team_Stat,
+)
+
+STATS_VERSION_NAME = "stats"
+STATS_VERSION_CACHE_KEY = "stats_data_version"
+# Seconds a process reuses the version it read; a bump in another worker
+# shows up here within this long.
+STATS_VERSION_CACHE_TTL = 5
+
+# Models whose rows change what the stats pages show, with the fields those
+# pages read (None: all of them).  Saves touching none of the fields, like a
+# captain setting a goalie status, leave the cached pages alone.
+STATS_SOURCE_FIELDS = {
+    Stat: None,
+    Roster: None,
+    MatchUp: {"week", "awayteam", "hometeam", "is_postseason", "is_championship"},
+    Team: {"team_name", "division", "season", "is_active"},
+    Player: {"first_name", "last_name", "is_active"},
+    Season: {"year", "season_type", "is_current_season"},
+    Division: {"division"},
+}
+
+
+def get_stats_version():
+    """Return the current stats data version, seeding it if missing."""
+    version = cache.get(STATS_VERSION_CACHE_KEY)
+    if version is None:
+        # Seed from the clock rather than 0 so a reset version can never
+        # collide with cache entries built before the reset.
+        version = DataVersion.objects.get_or_create(
+            name=STATS_VERSION_NAME, defaults={"version": time.time_ns()}
+        )[0].version
+        cache.set(STATS_VERSION_CACHE_KEY, version, STATS_VERSION_CACHE_TTL)
+    return version
+
+
+def bump_stats_version(**kwargs):
+    """Invalidate every cache entry keyed on the stats data version."""
+    if getattr(_batch, "player_ids", None) is not None:
+        return  # batched_roster_changes() bumps once on exit.
+    if not DataVersion.objects.filter(name=STATS_VERSION_NAME).update(
+        version=F("version") + 1
+    ):
+        DataVersion.objects.get_or_create(
+            name=STATS_VERSION_NAME, defaults={"version": time.time_ns()}
+        )
+    cache.delete(STATS_VERSION_CACHE_KEY)
+
+
+def note_stats_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Before a save, record whether it changes anything the stats pages read."""
+    fields = STATS_SOURCE_FIELDS[sender]
+    if raw or fields is None or instance._state.adding:
+        instance._stats_changed = True
+    elif update_fields is not None:
+        instance._stats_changed = any(
+            sender._meta.get_field(name).name in fields for name in update_fields
+        )
+    else:
+        attnames = [sender._meta.get_field(name).attname for name in fields]
+        saved = sender.objects.filter(pk=instance.pk).values(*attnames).first()
+        instance._stats_changed = saved is None or any(
+            saved[attname] != getattr(instance, attname) for attname in attnames
+        )
+
+
+def bump_stats_version_on_change(instance, **kwargs):
+    if instance.__dict__.pop("_stats_changed", True):
+        bump_stats_version()
+
+
+for _model in STATS_SOURCE_FIELDS:
+    pre_save.connect(
+        note_stats_change,
+        sender=_model,
+        dispatch_uid=f"note_stats_change_{_model.__name__}",
+    )
+    post_save.connect(
+        bump_stats_version_on_change,
+        sender=_model,
+        dispatch_uid=f"bump_stats_version_save_{_model.__name__}",
+    )
+    post_delete.connect(
+        bump_stats_version,
+        sender=_model,
+        dispatch_uid=f"bump_stats_version_delete_{_model.__name__}",
+    )
+
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_roster_changes():
+    """
+    Defer goalie eligibility refreshes and stats version bumps to the end
+    of the block, then do each once.
+
+    Yields the set of player ids to refresh.  Signals add to it on their
+    own; bulk_create/update send no signals, so callers add the player ids
+    they touched that way (and the version is bumped on exit regardless).
+    Nested blocks share the outer batch.
+    """
+    if getattr(_batch, "player_ids", None) is not None:
+        yield _batch.player_ids
+        return
+
+    _batch.player_ids = player_ids = set()
+    try:
+        yield player_ids
+    finally:
+        _batch.player_ids = None
+    refresh_goalie_eligibility(player_ids)
+    bump_stats_version()
+
+
+def _refresh_goalie_eligibility(player_id):
+    if getattr(_batch, "player_ids", None) is not None:
+        _batch.player_ids.add(player_id)
+    else:
+        refresh_goalie_eligibility([player_id])
+
+
+# Player fields that feed the goalie eligibility index.
+_GOALIE_ELIGIBILITY_PLAYER_FIELDS = {"is_active", "can_play_goalie"}
+
+
+def refresh_roster_goalie_eligibility(instance, **kwargs):
+    _refresh_goalie_eligibility(instance.player_id)
+
+
+def refresh_player_goalie_eligibility(instance, update_fields=None, **kwargs):
+    if update_fields is not None and not (
+        _GOALIE_ELIGIBILITY_PLAYER_FIELDS & set(update_fields)
+    ):
+        return
+    _refresh_goalie_eligibility(instance.pk)
+
+
+post_save.connect(
+    refresh_roster_goalie_eligibility,
+    sender=Roster,
+    dispatch_uid="refresh_goalie_eligibility_save_Roster",
+)
+post_delete.connect(
+    refresh_roster_goalie_eligibility,
+    sender=Roster,
+    dispatch_uid="refresh_goalie_eligibility_delete_Roster",
+)
+post_save.connect(
+    refresh_player_goalie_eligibility,
+    sender=Player,
+    dispatch_uid="refresh_goalie_eligibility_save_Player",
+)
+
+
+def _move_draft_cursor(pick, step):
+    """Shift the session's next-pick pointer by ``step`` in a single UPDATE."""
+    DraftSession.objects.filter(pk=pick.session_id).update(
+        next_pick_index=F("next_pick_index") + step
+    )
+    # Keep the caller's in-memory session (e.g. DraftPick.objects.create(
+    # session=session, ...)) current without trusting its possibly stale value.
+    session_field = DraftPick._meta.get_field("session")
+    if session_field.is_cached(pick):
+        session_field.get_cached_value(pick).refresh_from_db(fields=["next_pick_index"])
+
+
+def advance_draft_cursor(instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        _move_draft_cursor(instance, 1)
+
+
+def rewind_draft_cursor(instance, **kwargs):
+    _move_draft_cursor(instance, -1)
+
+
+def rebuild_draft_pick_order(instance, raw=False, **kwargs):
+    """Round order changed: refresh the session's table if it was built."""
+    if raw:
+        return
+    session = DraftSession.objects.filter(pk=instance.session_id).first()
+    if session and session.pick_order:
+        session.rebuild_pick_order()
+
+
+def rebuild_draft_plan_for_team(instance, raw=False, update_fields=None, **kwargs):
+    """A captain round changed: re-mark the captain slots of a built plan."""
+    if raw or (
+        update_fields is not None and "captain_draft_round" not in update_fields
+    ):
+        return
+    rebuild_draft_pick_order(instance)
+
+
+post_save.connect(
+    advance_draft_cursor,
+    sender=DraftPick,
+    dispatch_uid="advance_draft_cursor_save_DraftPick",
+)
+post_delete.connect(
+    rewind_draft_cursor,
+    sender=DraftPick,
+    dispatch_uid="rewind_draft_cursor_delete_DraftPick",
+)
+post_save.connect(
+    rebuild_draft_pick_order,
+    sender=DraftRound,
+    dispatch_uid="rebuild_draft_pick_order_save_DraftRound",
+)
+post_delete.connect(
+    rebuild_draft_pick_order,
+    sender=DraftRound,
+    dispatch_uid="rebuild_draft_pick_order_delete_DraftRound",
+)
+post_save.connect(
+    rebuild_draft_plan_for_team,
+    sender=DraftTeam,
+    dispatch_uid="rebuild_draft_plan_save_DraftTeam",
+)
+
+
+def bump_live_board_seq(sender, instance, raw=False, **kwargs):
+    """
+    Draft team and signup edits made outside the board (the admin) send no
+    broadcast: move a live session's seq on so its cached state.json, keyed
+    by seq, is rebuilt.  Board views broadcast right after their own edits.
+    """
+    if raw:
+        return
+    if sender is DraftTeam:
+        sessions = DraftSession.objects.filter(pk=instance.session_id)
+    else:
+        sessions = DraftSession.objects.filter(season_id=instance.season_id)
+    sessions.filter(state__in=DraftSession.LIVE_STATES).update(
+        broadcast_seq=F("broadcast_seq") + 1
+    )
+
+
+for _model in (DraftTeam, SeasonSignup):
+    post_save.connect(
+        bump_live_board_seq,
+        sender=_model,
+        dispatch_uid=f"bump_live_board_seq_save_{_model.__name__}",
+    )
+    post_delete.connect(
+        bump_live_board_seq,
+        sender=_model,
+        dispatch_uid=f"bump_live_board_seq_delete_{_model.__name__}",
+    )
+
+
+def refresh_champion_for_stat(instance, raw=False, **kwargs):
+    """Goals in a playoff game can change the champion or its playoff record."""
+    if raw or instance.matchup_id is None:
+        return
+    season_ids = MatchUp.objects.filter(
+        pk=instance.matchup_id, is_postseason=True
+    ).values_list("hometeam__season_id", flat=True)
+    refresh_draft_champions(list(season_ids))
+
+
+# MatchUp flags that move a game in or out of the playoffs.
+_PLAYOFF_FLAGS = ("is_postseason", "is_championship")
+
+
+def note_playoff_flags_change(instance, raw=False, update_fields=None, **kwargs):
+    """Before a regular-season MatchUp save, record if a playoff flag changes."""
+    if raw or instance.is_postseason or instance._state.adding:
+        return
+    if update_fields is not None and not set(_PLAYOFF_FLAGS) & set(update_fields):
+        return
+    saved = MatchUp.objects.filter(pk=instance.pk).values(*_PLAYOFF_FLAGS).first()
+    instance._playoff_flags_changed = saved is not None and any(
+        saved[flag] != getattr(instance, flag) for flag in _PLAYOFF_FLAGS
+    )
+
+
+def refresh_champion_for_matchup(instance, raw=False, **kwargs):
+    """Playoff games, and games that just left the playoffs, can decide it."""
+    changed = instance.__dict__.pop("_playoff_flags_changed", False)
+    if raw or not (instance.is_postseason or changed):
+        return
+    season_ids = Team.objects.filter(pk=instance.hometeam_id).values_list(
+        "season_id", flat=True
+    )
+    refresh_draft_champions(list(season_ids))
+
+
+def refresh_champion_for_team_stat(instance, raw=False, **kwargs):
+    if not raw:
+        refresh_draft_champions([instance.season_id], decided_only=True)
+
+
+def refresh_champion_for_team(instance, raw=False, **kwargs):
+    if not raw:
+        refresh_draft_champions([instance.season_id], decided_only=True)
+
+
+def refresh_champion_for_draft_team(instance, raw=False, **kwargs):
+    """The champion's captain comes from the draft team linked to it."""
+    if raw:
+        return
+    season_ids = DraftSession.objects.filter(pk=instance.session_id).values_list(
+        "season_id", flat=True
+    )
+    refresh_draft_champions(list(season_ids), decided_only=True)
+
+
+pre_save.connect(
+    note_playoff_flags_change,
+    sender=MatchUp,
+    dispatch_uid="note_playoff_flags_change_MatchUp",
+)
+for _model, _receiver in (
+    (Stat, refresh_champion_for_stat),
+    (MatchUp, refresh_champion_for_matchup),
+    (Team_Stat, refresh_champion_for_team_stat),
+    (Team, refresh_champion_for_team),
+    (DraftTeam, refresh_champion_for_draft_team),
+):
+    post_save.connect(
+        _receiver,
+        sender=_model,
+        dispatch_uid=f"refresh_draft_champion_save_{_model.__name__}",
+    )
+    post_delete.connect(
+        _receiver,
+        sender=_model,
+        dispatch_uid=f"refresh_draft_champion_delete_{_model.__name__}",
+    )
@@ -0,0 +1,100 @@
+"""
+Tests for leagues/channel_layers.py.
+
+Covers:
+  - SQLite fallback — plain in-memory delivery, nothing relayed
+  - relay between two layer instances standing in for two workers
+    (NOTIFY is simulated by handing encoded payloads across)
+  - large messages split into several NOTIFY payloads and reassembled
+  - a worker that can't reach PostgreSQL still delivers locally
+"""
+
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase
+
+from leagues.channel_layers import MAX_PIECE, PostgresChannelLayer
+
+
+def _relaying_layer():
+    layer = PostgresChannelLayer()
+    layer.relay_enabled = True  # As if the database were PostgreSQL.
+    layer._ensure_listener = lambda: None
+    return layer
+
+
+def _wire(sender, receiver):
+    """Route sender's NOTIFYs straight into receiver's listener."""
+
+    async def publish(envelope):
+        for payload in sender.encode(envelope):
+            await sender.receive_notify(payload)  # Our own echo is ignored.
+            await receiver.receive_notify(payload)
+
+    sender._publish = publish
+
+
+class FallbackTests(SimpleTestCase):
+    async def test_sqlite_delivers_in_memory_only(self):
+        layer = PostgresChannelLayer()
+        self.assertFalse(layer.relay_enabled)
+        channel = await layer.new_channel()
+        await layer.group_add("draft_1", channel)
+        with patch.object(layer, "_publish") as publish:
+            await layer.group_send("draft_1", {"type": "draft.delta", "seq": 1})
+        publish.assert_not_called()
+        self.assertEqual((await layer.receive(channel))["seq"], 1)
+
+
+class RelayTests(SimpleTestCase):
+    def setUp(self):
+        self.worker_a = _relaying_layer()
+        self.worker_b = _relaying_layer()
+        _wire(self.worker_a, self.worker_b)
+
+    async def test_group_send_reaches_members_on_both_workers_once(self):
+        local = await self.worker_a.new_channel()
+        remote = await self.worker_b.new_channel()
+        await self.worker_a.group_add("draft_1", local)
+        await self.worker_b.group_add("draft_1", remote)
+
+        await self.worker_a.group_send("draft_1", {"type": "draft.delta", "seq": 4})
+
+        self.assertEqual((await self.worker_a.receive(local))["seq"], 4)
+        self.assertEqual((await self.worker_b.receive(remote))["seq"], 4)
+        self.assertNotIn(local, self.worker_a.channels)  # No duplicate queued.
+
+    async def test_group_discard_is_respected_remotely(self):
+        remote = await self.worker_b.new_channel()
+        await self.worker_b.group_add("draft_1", remote)
+        await self.worker_b.group_discard("draft_1", remote)
+        await self.worker_a.group_send("draft_1", {"type": "draft.delta"})
+        self.assertNotIn(remote, self.worker_b.channels)
+
+    async def test_send_to_another_workers_channel(self):
+        remote = await self.worker_b.new_channel()
+        await self.worker_a.send(remote, {"type": "state.update"})
+        self.assertEqual(await self.worker_b.receive(remote), {"type": "state.update"})
+
+    async def test_large_message_reassembled_in_any_order(self):
+        message = {"type": "state.update", "state": "x" * (MAX_PIECE * 2)}
+        payloads = self.worker_a.encode({"g": "draft_1", "m": message})
+        self.assertEqual(len(payloads), 3)
+
+        remote = await self.worker_b.new_channel()
+        await self.worker_b.group_add("draft_1", remote)
+        for payload in reversed(payloads):
+            await self.worker_b.receive_notify(payload)
+        self.assertEqual(await self.worker_b.receive(remote), message)
+        self.assertEqual(self.worker_b._partial, {})
+
+
+class UnreachableDatabaseTests(SimpleTestCase):
+    async def test_local_delivery_survives_relay_failure(self):
+        layer = _relaying_layer()
+        layer._connect = AsyncMock(side_effect=OSError("no server"))
+        channel = await layer.new_channel()
+        await layer.group_add("draft_1", channel)
+        with self.assertLogs("leagues.channel_layers", "ERROR"):
+            await layer.group_send("draft_1", {"type": "draft.delta", "seq": 2})
+        self.assertEqual((await layer.receive(channel))["seq"], 2)
@@ -0,0 +1,97 @@
+"""
+Tests for the deactivate_inactive_players command.
+
+Covers:
+  - lapsed goalies deactivated; current, excluded and (by default)
+    non-goalie players kept
+  - --report counts the reasons in one query and changes nothing
+  - one UPDATE, and the goalie eligibility index follows it
+"""
+
+import datetime
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from leagues.models import Division, GoalieEligibility, Player, Roster, Season, Team
+
+
+class DeactivateInactivePlayersCommandTest(TestCase):
+    def setUp(self):
+        this_year = datetime.date.today().year
+        division = Division.objects.create(division=1)
+        old_team = Team.objects.create(
+            team_name="Old",
+            division=division,
+            season=Season.objects.create(year=this_year - 6, season_type=1),
+            is_active=False,
+        )
+        current_team = Team.objects.create(
+            team_name="Current",
+            division=division,
+            season=Season.objects.create(
+                year=this_year, season_type=1, is_current_season=True
+            ),
+            is_active=True,
+        )
+        self.lapsed = Player.objects.create(first_name="Lapsed", last_name="Goalie")
+        Roster.objects.create(player=self.lapsed, team=old_team, position1=4)
+        self.current = Player.objects.create(first_name="Current", last_name="Goalie")
+        Roster.objects.create(player=self.current, team=old_team, position1=4)
+        Roster.objects.create(player=self.current, team=current_team, position1=1)
+        self.excluded = Player.objects.create(
+            first_name="Excluded",
+            last_name="Goalie",
+            exclude_from_auto_deactivation=True,
+        )
+        Roster.objects.create(player=self.excluded, team=old_team, position1=4)
+        self.wing = Player.objects.create(first_name="Old", last_name="Wing")
+        Roster.objects.create(player=self.wing, team=old_team, position1=2)
+        self.never = Player.objects.create(first_name="Never", last_name="Rostered")
+
+    def _run(self, *args):
+        out = io.StringIO()
+        call_command("deactivate_inactive_players", *args, stdout=out)
+        return out.getvalue()
+
+    def _active(self):
+        return set(Player.objects.filter(is_active=True))
+
+    def test_deactivates_lapsed_goalies_only(self):
+        output = self._run()
+        self.assertEqual(
+            self._active(), {self.current, self.excluded, self.wing, self.never}
+        )
+        self.assertIn("Deactivated: Goalie, Lapsed", output)
+        self.assertIn("Deactivated 1 players. Skipped 4 active players.", output)
+        # The eligibility index follows the queryset update.
+        self.assertFalse(GoalieEligibility.objects.get(player=self.lapsed).is_active)
+
+    def test_include_non_goalies(self):
+        self._run("--include-non-goalies")
+        self.assertEqual(self._active(), {self.current, self.excluded})
+
+    def test_report_counts_reasons_without_changes(self):
+        with self.assertNumQueries(1):
+            output = self._run("--report", "--include-non-goalies")
+        self.assertEqual(len(self._active()), 5)
+        self.assertRegex(output, r"deactivate +no roster since the cutoff: +2")
+        self.assertRegex(output, r"deactivate +never rostered: +1")
+        self.assertRegex(output, r"keep +on a current season roster: +1")
+        self.assertIn("Classified 5 active players", output)
+
+    def test_single_update(self):
+        with self.assertNumQueries(1):
+            self._run("--dry-run")
+        Player.objects.filter(pk=self.never.pk).update(is_active=False)
+        with CaptureQueriesContext(connection) as context:
+            self._run()
+        updates = [
+            q
+            for q in context.captured_queries
+            if q["sql"].startswith('UPDATE "leagues_player"')
+        ]
+        self.assertEqual(len(updates), 1)
@@ -3,19 +3,34 @@ Unit and integration tests for the Wednesday Draft League draft functionality.
 
 Coverage:
   Models     – DraftTeam.save, DraftSession.current_pick,
-               DraftSession.pick_order_for_round (snake, randomized, continuity)
-  Views      – draft_signup, board views, draw_positions, advance_state,
-               make_pick, undo_last_pick, swap_pick, reset_draft
-  Logic      – _process_auto_captain_picks, _session_state_payload
+               DraftSession.pick_order_for_round (snake, randomized, continuity),
+               persisted pick cursor and pick order table
+  Views      – draft_signup, board views, state.json (cached snapshot,
+               ETag / 304, gzip, ?v= caching), draw_positions, advance_state,
+               make_pick, undo_last_pick, swap_pick, reset_draft,
+               finalize_draft (bulk player resolution and rosters),
+               draft_results_download (streamed CSV, write-only XLSX,
+               every draft in one file)
+  Logic      – _process_auto_captain_picks, _session_state_payload,
+               live board deltas (pick_added / pick_removed / turn, seq),
+               per-session stats snapshot, stored draft champion
   Validation – captain cross-team guard, goalie-per-team limit,
                already-drafted, wrong-turn, state guards, token auth
 """
 
 import datetime
+import gzip
+import importlib
+import io
 import json
+import warnings
 from unittest.mock import patch
 
-from django.test import TestCase, Client
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, TransactionTestCase
 from django.urls import reverse
 
 from leagues.models import (
@@ -24,6 +39,7 @@ from leagues.models import (
     DraftRound,
     DraftSession,
     DraftTeam,
+    GoalieEligibility,
     MatchUp,
     Player,
     Roster,
@@ -34,13 +50,17 @@ from leagues.models import (
     Team_Stat,
     Week,
 )
+from leagues.draft_champions import (
+    compute_champions,
+    refresh_draft_champions,
+    session_champion,
+)
 from leagues.draft_views import (
     _batch_wednesday_stats,
     _draft_advisory,
     _draft_completion_warnings,
-    _get_champion_data_for_sessions,
-    _get_session_champion,
     _get_wednesday_stats,
+    _cache_state_snapshot,
     _process_auto_captain_picks,
     _session_state_payload,
 )
@@ -162,9 +182,12 @@ class DraftTestBase(TestCase):
         # new event loop thread per call, which makes the suite very slow.
         self._broadcast_patcher = patch("leagues.draft_views._broadcast_state_change")
         self._broadcast_patcher.start()
+        self._delta_patcher = patch("leagues.draft_views._broadcast_delta")
+        self._delta_patcher.start()
 
     def tearDown(self):
         self._broadcast_patcher.stop()
+        self._delta_patcher.stop()
         super().tearDown()
 
     # ------------------------------------------------------------------
@@ -351,6 +374,77 @@ class DraftPickOrderTests(DraftTestBase):
         self.assertEqual(order, [self.team1.pk, self.team2.pk, self.team3.pk])
 
 
+# ---------------------------------------------------------------------------
+# Model: persisted draft cursor and pick order table
+# ---------------------------------------------------------------------------
+
+
+class DraftCursorTests(DraftTestBase):
+    def setUp(self):
+        super().setUp()
+        self._activate()
+        DraftRound.objects.create(
+            session=self.session,
+            round_number=2,
+            order_type=DraftRound.ORDER_RANDOMIZED,
+        )
+        self.session.rebuild_pick_order()
+
+    def test_table_matches_computed_order(self):
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.pick_order, self.session.compute_pick_order())
+        self.assertEqual(
+            self.session.pick_order[2],
+            [self.team3.pk, self.team2.pk, self.team1.pk],
+        )
+
+    def test_turn_lookups_make_no_queries(self):
+        self._make_pick(self.team1, self.players[0], 1, 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.session.current_pick, (1, 1))
+            self.assertEqual(self.session.active_team_pk, self.team2.pk)
+            self.session.pick_order_for_round(2)
+
+    def test_cursor_follows_picks_and_undo(self):
+        pick = self._make_pick(self.team1, self.players[0], 1, 0)
+        self._make_pick(self.team2, self.players[1], 1, 1)
+        self.assertEqual(self.session.next_pick_index, 2)
+        DraftPick.objects.filter(pk=pick.pk).delete()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.next_pick_index, 1)
+
+    def test_stale_session_save_does_not_rewind_cursor(self):
+        stale = DraftSession.objects.get(pk=self.session.pk)
+        self._make_pick(self.team1, self.players[0], 1, 0)
+        stale.signups_open = False
+        stale.save()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.current_pick, (1, 1))
+
+    def test_round_config_change_rebuilds_table(self):
+        DraftRound.objects.filter(session=self.session).delete()
+        self.session.refresh_from_db()
+        self.assertEqual(
+            self.session.pick_order[1],
+            [self.team3.pk, self.team2.pk, self.team1.pk],
+        )
+
+    def test_draw_builds_table(self):
+        DraftSession.objects.filter(pk=self.session.pk).update(
+            state=DraftSession.STATE_SETUP, pick_order=[]
+        )
+        self.session.teams.update(draft_position=None)
+        self.client.post(
+            reverse(
+                "draft_draw_positions",
+                args=[self.session.pk, self.session.commissioner_token],
+            )
+        )
+        self.session.refresh_from_db()
+        self.assertEqual(len(self.session.pick_order), self.session.num_rounds)
+        self.assertEqual(self.session.pick_order, self.session.compute_pick_order())
+
+
 # ---------------------------------------------------------------------------
 # View: draft_signup
 # ---------------------------------------------------------------------------
@@ -525,6 +619,114 @@ class BoardViewTests(DraftTestBase):
         self.assertEqual(response.status_code, 200)
 
 
+# ---------------------------------------------------------------------------
+# View: draft_state_json (state.json)
+# ---------------------------------------------------------------------------
+
+
+class DraftStateJsonTests(DraftTestBase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self._activate()
+        self.session.rebuild_pick_order()
+        self.url = reverse("draft_state_json", args=[self.session.pk])
+
+    def test_spectator_shell_carries_no_board(self):
+        response = self.client.get(
+            reverse("draft_board_spectator", args=[self.session.pk])
+        )
+        state = json.loads(response.context["initial_state"])
+        self.assertEqual(state["seq"], -1)
+        self.assertEqual(state["teams"], [])
+        self.assertEqual(state["available_players"], [])
+        self.assertContains(response, self.url)
+        self.assertIn("max-age=60", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_serves_the_board_payload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(response.content), _session_state_payload(self.session)
+        )
+        self.assertTrue(response["ETag"].startswith('W/"0-'))
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_repeat_requests_skip_the_payload(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_pick_changes_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self._post_pick(
+            self.players[0].pk, commissioner_token=self.session.commissioner_token
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        state = json.loads(response.content)
+        self.assertEqual(state["seq"], 1)
+        self.assertIn("1", state["teams"][0]["picks"])
+        self.assertTrue(response["ETag"].startswith('W/"1-'))
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            json.loads(gzip.decompress(response.content)),
+            _session_state_payload(self.session),
+        )
+
+    def test_current_version_is_cacheable_while_live(self):
+        response = self.client.get(self.url, {"v": "0"})
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=3600", response["Cache-Control"])
+        # Any other version gets the current board, revalidated every time.
+        response = self.client.get(self.url, {"v": "7"})
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_idle_board_is_never_cached_by_version(self):
+        self._complete()
+        response = self.client.get(self.url, {"v": "0"})
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_broadcast_snapshot_is_reused(self):
+        self.session.next_broadcast_seq()
+        _cache_state_snapshot(self.session, _session_state_payload(self.session))
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(json.loads(response.content)["seq"], 1)
+
+    def test_admin_edits_move_the_seq(self):
+        etag = self.client.get(self.url)["ETag"]
+        team = self.session.teams.first()
+        team.team_name = "Renamed"
+        team.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(json.loads(response.content)["seq"], 1)
+        self.assertContains(response, "Renamed")
+
+        signup = self.players[0]
+        signup.last_name = "Edited"
+        signup.save()
+        response = self.client.get(self.url)
+        self.assertEqual(json.loads(response.content)["seq"], 2)
+        self.assertContains(response, "Edited")
+
+    def test_unknown_session_404(self):
+        response = self.client.get(reverse("draft_state_json", args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+
 # ---------------------------------------------------------------------------
 # View: draw_positions
 # ---------------------------------------------------------------------------
@@ -1061,6 +1263,14 @@ class ResetDraftViewTests(DraftTestBase):
         self.session.refresh_from_db()
         self.assertEqual(self.session.state, DraftSession.STATE_SETUP)
 
+    def test_reset_discards_pick_plan(self):
+        self.session.rebuild_pick_order()
+        self.assertIsNotNone(self.session.pick_plan)
+        self.client.post(self._reset_url())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.pick_order, [])
+        self.assertIsNone(self.session.pick_plan)
+
     def test_reset_reopens_signups(self):
         self.session.signups_open = False
         self.session.save(update_fields=["signups_open"])
@@ -1622,6 +1832,181 @@ class EarlyManualCaptainPickTests(DraftTestBase):
         self.assertEqual(len(auto_picks), 0)
 
 
+# ---------------------------------------------------------------------------
+# Live board deltas: make_pick / undo_last_pick / advance_state
+# ---------------------------------------------------------------------------
+
+
+class DraftDeltaTests(DraftTestBase):
+    def setUp(self):
+        super().setUp()
+        self._activate()
+        self.session.rebuild_pick_order()
+
+    def _commissioner_pick(self, signup):
+        return self._post_pick(
+            signup.pk, commissioner_token=self.session.commissioner_token
+        ).json()
+
+    def test_pick_returns_sequenced_delta_not_snapshot(self):
+        data = self._commissioner_pick(self.players[0])
+        self.assertNotIn("state", data)
+        self.assertEqual(data["seq"], 1)
+        added, turn = data["events"]
+        self.assertEqual(added["op"], "pick_added")
+        self.assertEqual(added["team_id"], self.team1.pk)
+        self.assertEqual(added["round"], 1)
+        self.assertEqual(added["player"]["id"], self.players[0].pk)
+        self.assertFalse(added["player"]["is_captain_pick"])
+        self.assertEqual(turn["op"], "turn")
+        self.assertEqual(turn["current_pick_index"], 1)
+        self.assertEqual(turn["active_team_pk"], self.team2.pk)
+
+        data = self._commissioner_pick(self.players[1])
+        self.assertEqual(data["seq"], 2)
+
+    def test_auto_captain_picks_ride_along_in_the_same_delta(self):
+        self.team2.captain_draft_round = 1
+        self.team2.save(update_fields=["captain_draft_round"])
+        data = self._commissioner_pick(self.players[0])
+        ops = [(e["op"], e.get("team_id")) for e in data["events"]]
+        self.assertEqual(
+            ops,
+            [
+                ("pick_added", self.team1.pk),
+                ("pick_added", self.team2.pk),
+                ("turn", None),
+            ],
+        )
+        self.assertTrue(data["events"][1]["player"]["is_captain_pick"])
+
+    def test_undo_emits_pick_removed(self):
+        self._commissioner_pick(self.goalie1)
+        data = self.client.post(
+            reverse(
+                "draft_undo_pick",
+                args=[self.session.pk, self.session.commissioner_token],
+            )
+        ).json()
+        removed, turn = data["events"]
+        self.assertEqual(removed["op"], "pick_removed")
+        self.assertEqual(removed["player"]["id"], self.goalie1.pk)
+        self.assertTrue(removed["return_to_pool"])
+        self.assertFalse(removed["team_has_goalie"])
+        self.assertEqual(turn["current_pick_index"], 0)
+        self.assertEqual(data["seq"], 2)
+
+    def test_pause_is_a_turn_only_delta(self):
+        data = self.client.post(
+            reverse(
+                "draft_advance_state",
+                args=[self.session.pk, self.session.commissioner_token],
+            )
+        ).json()
+        self.assertEqual([e["op"] for e in data["events"]], ["turn"])
+        self.assertEqual(data["events"][0]["state"], DraftSession.STATE_PAUSED)
+
+    def test_snapshot_carries_current_seq(self):
+        self._commissioner_pick(self.players[0])
+        self.session.refresh_from_db()
+        self.assertEqual(_session_state_payload(self.session)["seq"], 1)
+
+    def test_pick_query_count_flat_in_signups(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as few:
+            self._commissioner_pick(self.players[0])
+        for i in range(30):
+            SeasonSignup.objects.create(
+                season=self.season,
+                first_name=f"Extra{i}",
+                last_name="Signup",
+                email=f"extra{i}@test.com",
+                primary_position=SeasonSignup.POSITION_WING,
+                secondary_position=SeasonSignup.POSITION_ONE_THING,
+                captain_interest=SeasonSignup.CAPTAIN_NO,
+            )
+        with CaptureQueriesContext(connection) as many:
+            self._commissioner_pick(self.players[1])
+        self.assertEqual(len(many), len(few))
+
+
+# ---------------------------------------------------------------------------
+# Per-session stats snapshot
+# ---------------------------------------------------------------------------
+
+
+class DraftStatsSnapshotTests(DraftTestBase):
+    def setUp(self):
+        super().setUp()
+        self.veteran = Player.objects.create(first_name="Vera", last_name="Veteran")
+        self.players[0].linked_player = self.veteran
+        self.players[0].save(update_fields=["linked_player"])
+
+    def _draw(self):
+        self.session.teams.update(draft_position=None)
+        self.client.post(
+            reverse(
+                "draft_draw_positions",
+                args=[self.session.pk, self.session.commissioner_token],
+            )
+        )
+        self.session.refresh_from_db()
+
+    def test_draw_snapshots_stats(self):
+        self.assertIsNone(self.session.player_stats)
+        self._draw()
+        self.assertTrue(self.session.player_stats[str(self.veteran.pk)]["is_new"])
+
+    def test_board_payload_reuses_snapshot(self):
+        self._draw()
+        with patch("leagues.draft_views._batch_wednesday_stats") as batch:
+            payload = _session_state_payload(self.session)
+        batch.assert_not_called()
+        pool = {p["id"]: p for p in payload["available_players"]}
+        self.assertTrue(pool[self.players[0].pk]["stats"]["is_new"])
+
+    def test_player_linked_after_snapshot_is_added(self):
+        self._draw()
+        newcomer = Player.objects.create(first_name="Nia", last_name="New")
+        self.players[1].linked_player = newcomer
+        self.players[1].save(update_fields=["linked_player"])
+        _session_state_payload(self.session)
+        self.session.refresh_from_db()
+        self.assertIn(str(newcomer.pk), self.session.player_stats)
+
+    def test_late_signup_refreshes_snapshot(self):
+        self._draw()
+        late = Player.objects.create(first_name="Lou", last_name="Late")
+        self.client.post(
+            reverse(
+                "draft_add_late_signup",
+                args=[self.session.pk, self.session.commissioner_token],
+            ),
+            {
+                "first_name": "Lou",
+                "last_name": "Late",
+                "email": "lou@test.com",
+                "primary_position": SeasonSignup.POSITION_CENTER,
+                "secondary_position": SeasonSignup.POSITION_ONE_THING,
+            },
+        )
+        self.session.refresh_from_db()
+        self.assertIn(str(late.pk), self.session.player_stats)
+
+    def test_reset_discards_snapshot(self):
+        self._draw()
+        self.client.post(
+            reverse(
+                "draft_reset",
+                args=[self.session.pk, self.session.commissioner_token],
+            )
+        )
+        self.session.refresh_from_db()
+        self.assertIsNone(self.session.player_stats)
+
+
 # ---------------------------------------------------------------------------
 # Edge: undo at round boundary and undo all picks
 # ---------------------------------------------------------------------------
@@ -1651,6 +2036,7 @@ class UndoEdgeCaseTests(DraftTestBase):
         response = self.client.post(self._undo_url())
         self.assertEqual(response.status_code, 200)
         # current_pick should revert to (2, 0) — first slot of round 2
+        self.session.refresh_from_db()
         self.assertEqual(self.session.current_pick, (2, 0))
         self.assertFalse(
             DraftPick.objects.filter(
@@ -1668,6 +2054,7 @@ class UndoEdgeCaseTests(DraftTestBase):
             self.assertEqual(response.status_code, 200)
 
         self.assertEqual(DraftPick.objects.filter(session=self.session).count(), 0)
+        self.session.refresh_from_db()
         self.assertEqual(self.session.current_pick, (1, 0))
 
     def test_undo_after_emptying_returns_400(self):
@@ -2075,6 +2462,15 @@ class EmailTeamDataViewTests(DraftTestBase):
 # ---------------------------------------------------------------------------
 
 
+def _streamed_body(response):
+    """A download's body, read from its async iterator as the ASGI server does."""
+
+    async def read():
+        return b"".join([chunk async for chunk in response])
+
+    return async_to_sync(read)()
+
+
 class DraftResultsDownloadTests(DraftTestBase):
     """Tests for the public CSV/XLSX draft results download endpoint."""
 
@@ -2102,6 +2498,11 @@ class DraftResultsDownloadTests(DraftTestBase):
         self.assertIn("draft_results_", resp["Content-Disposition"])
         self.assertIn(".csv", resp["Content-Disposition"])
 
+    def test_csv_is_streamed(self):
+        self._setup_picks()
+        resp = self.client.get(self._url("csv"))
+        self.assertTrue(resp.streaming)
+
     def test_csv_explicit_format_param(self):
         self._setup_picks()
         resp = self.client.get(self._url("csv"))
@@ -2111,7 +2512,7 @@ class DraftResultsDownloadTests(DraftTestBase):
     def test_csv_contains_headers(self):
         self._setup_picks()
         resp = self.client.get(self._url("csv"))
-        content = resp.content.decode()
+        content = _streamed_body(resp).decode()
         self.assertIn("Round", content)
         self.assertIn("Team", content)
         self.assertIn("Player", content)
@@ -2120,7 +2521,7 @@ class DraftResultsDownloadTests(DraftTestBase):
     def test_csv_contains_pick_data(self):
         self._setup_picks()
         resp = self.client.get(self._url("csv"))
-        content = resp.content.decode()
+        content = _streamed_body(resp).decode()
         self.assertIn(self.players[0].full_name, content)
         self.assertIn(self.players[1].full_name, content)
         self.assertIn(self.players[2].full_name, content)
@@ -2128,7 +2529,7 @@ class DraftResultsDownloadTests(DraftTestBase):
     def test_csv_row_count_matches_picks(self):
         self._setup_picks()
         resp = self.client.get(self._url("csv"))
-        lines = [l for l in resp.content.decode().splitlines() if l.strip()]
+        lines = [l for l in _streamed_body(resp).decode().splitlines() if l.strip()]
         # 1 header + 3 picks
         self.assertEqual(len(lines), 4)
 
@@ -2148,7 +2549,7 @@ class DraftResultsDownloadTests(DraftTestBase):
 
         self._setup_picks()
         resp = self.client.get(self._url("xlsx"))
-        wb = load_workbook(io.BytesIO(resp.content))
+        wb = load_workbook(io.BytesIO(_streamed_body(resp)))
         ws = wb.active
         # Header row
         headers = [cell.value for cell in ws[1]]
@@ -2157,6 +2558,18 @@ class DraftResultsDownloadTests(DraftTestBase):
         # 3 data rows + 1 header
         self.assertEqual(ws.max_row, 4)
 
+    def test_xlsx_header_styled(self):
+        from openpyxl import load_workbook
+        import io
+
+        self._setup_picks()
+        resp = self.client.get(self._url("xlsx"))
+        ws = load_workbook(io.BytesIO(_streamed_body(resp))).active
+        self.assertTrue(ws["A1"].font.b)
+        self.assertEqual(ws["A1"].fill.fgColor.rgb, "002B6CB0")
+        self.assertEqual(ws["A2"].fill.fgColor.rgb, "00EBF4FF")
+        self.assertEqual(ws["A3"].fill.fgColor.rgb, "00FFFFFF")
+
     def test_unknown_format_falls_back_to_csv(self):
         self._setup_picks()
         resp = self.client.get(self._url("json"))
@@ -2173,6 +2586,139 @@ class DraftResultsDownloadTests(DraftTestBase):
         resp = self.client.get(reverse("draft_results_download", args=[99999]))
         self.assertEqual(resp.status_code, 404)
 
+    # ---------------------------------------------------------------------------
+
+    # --- Every draft in one file ---
+
+    def test_all_drafts_csv_has_season_column(self):
+        self._setup_picks()
+        resp = self.client.get(reverse("draft_results_download_all"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("draft_results_all.csv", resp["Content-Disposition"])
+        lines = _streamed_body(resp).decode().splitlines()
+        self.assertTrue(lines[0].startswith("Season,Round,"))
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith(f"{self.season},1,"))
+
+    def test_all_drafts_xlsx(self):
+        from openpyxl import load_workbook
+        import io
+
+        self._setup_picks()
+        resp = self.client.get(reverse("draft_results_download_all") + "?format=xlsx")
+        ws = load_workbook(io.BytesIO(_streamed_body(resp))).active
+        self.assertEqual(ws["A1"].value, "Season")
+        self.assertEqual(ws.max_row, 4)
+
+    def test_all_drafts_skips_sessions_without_picks(self):
+        resp = self.client.get(reverse("draft_results_download_all"))
+        self.assertEqual(resp.status_code, 404)
+
+
+class DraftResultsAsgiTests(TransactionTestCase):
+    """
+    The downloads served through the ASGI handler, as in production: sent
+    in chunks from async iterators, never collected into a list first.
+    """
+
+    # The ASGI handler runs the view in a thread of its own, which only
+    # sees committed rows.
+
+    def setUp(self):
+        season = Season.objects.create(
+            year=datetime.date.today().year, season_type=4, is_current_season=False
+        )
+        self.session = DraftSession.objects.create(
+            season=season, num_teams=1, num_rounds=3
+        )
+        signups = [
+            SeasonSignup.objects.create(
+                season=season,
+                first_name=f"Player{i}",
+                last_name="Test",
+                email=f"player{i}@test.com",
+                primary_position=SeasonSignup.POSITION_WING,
+                secondary_position=SeasonSignup.POSITION_ONE_THING,
+            )
+            for i in range(3)
+        ]
+        team = DraftTeam.objects.create(
+            session=self.session, captain=signups[0], draft_position=1
+        )
+        for round_number, signup in enumerate(signups, start=1):
+            DraftPick.objects.create(
+                session=self.session,
+                team=team,
+                signup=signup,
+                round_number=round_number,
+                pick_number=0,
+            )
+
+    def _get(self, url):
+        """(status, body messages) of a GET through the ASGI application."""
+        from asgiref.testing import ApplicationCommunicator
+
+        from dcstreethockey.asgi import application
+
+        path, _, query = url.partition("?")
+
+        async def request():
+            comm = ApplicationCommunicator(
+                application,
+                {
+                    "type": "http",
+                    "http_version": "1.1",
+                    "method": "GET",
+                    "scheme": "http",
+                    "path": path,
+                    "raw_path": path.encode(),
+                    "query_string": query.encode(),
+                    "headers": [(b"host", b"testserver")],
+                    "server": ("testserver", 80),
+                },
+            )
+            await comm.send_input({"type": "http.request", "body": b""})
+            start = await comm.receive_output(30)
+            bodies = []
+            while True:
+                message = await comm.receive_output(30)
+                bodies.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    return start["status"], bodies
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            status, bodies = async_to_sync(request)()
+        # Django warns when it has to collect a sync iterator for ASGI.
+        self.assertEqual(
+            [w for w in caught if "StreamingHttpResponse" in str(w.message)], []
+        )
+        return status, bodies
+
+    def test_csv_sent_line_by_line(self):
+        status, bodies = self._get(
+            reverse("draft_results_download", args=[self.session.pk])
+        )
+        self.assertEqual(status, 200)
+        lines = [body for body in bodies if body]
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith(b"1,0,"))
+
+    def test_all_drafts_csv_sent_line_by_line(self):
+        status, bodies = self._get(reverse("draft_results_download_all"))
+        self.assertEqual(status, 200)
+        self.assertEqual(len([body for body in bodies if body]), 4)
+
+    def test_xlsx_sent_in_chunks(self):
+        from openpyxl import load_workbook
+
+        status, bodies = self._get(
+            reverse("draft_results_download", args=[self.session.pk]) + "?format=xlsx"
+        )
+        self.assertEqual(status, 200)
+        ws = load_workbook(io.BytesIO(b"".join(bodies))).active
+        self.assertEqual(ws.max_row, 4)
+
 
 # ---------------------------------------------------------------------------
 # draft_sessions_list
@@ -2253,14 +2799,14 @@ class DraftSessionsListTests(DraftTestBase):
 
 
 # ---------------------------------------------------------------------------
-# _get_champion_data_for_sessions + archive champion display
+# compute_champions, stored champion + archive champion display
 # ---------------------------------------------------------------------------
 
 
 class DraftChampionDataTests(TestCase):
     """
-    Tests for _get_champion_data_for_sessions and the champion section
-    rendered on the draft archive page.
+    Tests for compute_champions, the champion stored on DraftSession and the
+    champion section rendered on the draft archive page.
     """
 
     def _make_player_stat(self, team, matchup, goals):
@@ -2367,50 +2913,119 @@ class DraftChampionDataTests(TestCase):
             goals_against=15,
         )
 
-    # --- _get_champion_data_for_sessions unit tests ---
+    # --- compute_champions unit tests ---
 
     def test_champion_identified(self):
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         self.assertIn(self.session.pk, result)
         self.assertEqual(result[self.session.pk]["team"], self.team1)
 
     def test_champion_draft_team_linked(self):
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         self.assertEqual(result[self.session.pk]["draft_team"], self.dt1)
 
     def test_champion_team_stat_present(self):
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         ts = result[self.session.pk]["team_stat"]
         self.assertIsNotNone(ts)
         self.assertEqual(ts.win, 8)
         self.assertEqual(ts.loss, 2)
 
     def test_playoff_wins_and_losses_counted(self):
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         self.assertEqual(result[self.session.pk]["playoff_wins"], 1)
         self.assertEqual(result[self.session.pk]["playoff_losses"], 0)
 
     def test_non_complete_session_excluded(self):
         self.session.state = DraftSession.STATE_ACTIVE
         self.session.save()
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         self.assertEqual(result, {})
 
     def test_no_championship_matchup_returns_empty(self):
         self.champ_matchup.is_championship = False
         self.champ_matchup.save()
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         self.assertEqual(result, {})
 
     def test_tied_championship_excluded(self):
         """A tied championship game should not produce a champion."""
         # Reset goals to 2-2 tie
         Stat.objects.filter(matchup=self.champ_matchup).update(goals=2)
-        result = _get_champion_data_for_sessions([self.session])
+        result = compute_champions([self.session])
         self.assertEqual(result, {})
 
     def test_empty_sessions_list(self):
-        self.assertEqual(_get_champion_data_for_sessions([]), {})
+        self.assertEqual(compute_champions([]), {})
+
+    # --- Stored champion ---
+
+    def test_champion_stored_when_results_saved(self):
+        self.session.refresh_from_db()
+        self.assertEqual(
+            self.session.champion,
+            {
+                "team": {"id": self.team1.id, "team_name": "Alpha Team"},
+                "draft_team": {
+                    "id": self.dt1.pk,
+                    "captain": {"full_name": "Alice Smith"},
+                },
+                "team_stat": {"win": 8, "otw": 0, "loss": 2, "otl": 0, "tie": 0},
+                "playoff_wins": 1,
+                "playoff_losses": 0,
+            },
+        )
+
+    def test_stored_champion_follows_playoff_goals(self):
+        sub = Player.objects.create(first_name="Sub", last_name="Test")
+        Stat.objects.create(
+            player=sub, team=self.team2, matchup=self.champ_matchup, goals=4
+        )
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.champion["team"]["id"], self.team2.id)
+        self.assertIsNone(self.session.champion["team_stat"])
+
+    def test_refresh_clears_champion_after_bulk_edit(self):
+        Stat.objects.filter(matchup=self.champ_matchup).update(goals=2)
+        self.assertEqual(refresh_draft_champions([self.season.id]), 1)
+        self.session.refresh_from_db()
+        self.assertIsNone(self.session.champion)
+
+    def test_backfill_command_restores_champion(self):
+        DraftSession.objects.filter(pk=self.session.pk).update(champion=None)
+        call_command("backfill_draft_champions", stdout=io.StringIO())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.champion["team"]["team_name"], "Alpha Team")
+
+    def test_migration_backfills_champion(self):
+        migration = importlib.import_module(
+            "leagues.migrations.0113_backfill_draft_champions"
+        )
+        self.session.refresh_from_db()
+        stored = self.session.champion
+        DraftSession.objects.filter(pk=self.session.pk).update(champion=None)
+        migration.populate_champions(django_apps, None)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.champion, stored)
+
+    def test_champion_cleared_when_final_leaves_the_playoffs(self):
+        self.champ_matchup.is_postseason = False
+        self.champ_matchup.is_championship = False
+        self.champ_matchup.save()
+        self.session.refresh_from_db()
+        self.assertIsNone(self.session.champion)
+
+        MatchUp.objects.filter(pk=self.champ_matchup.pk).update(is_postseason=True)
+        self.champ_matchup.is_championship = True
+        self.champ_matchup.save(update_fields=["is_championship"])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.champion["team"]["id"], self.team1.id)
+
+    def test_archive_does_not_recompute_champions(self):
+        with patch("leagues.draft_champions.compute_champions") as compute:
+            resp = self.client.get(reverse("draft_sessions_list"))
+        compute.assert_not_called()
+        self.assertContains(resp, "Alpha Team")
 
     # --- Archive page rendering tests ---
 
@@ -2466,9 +3081,17 @@ class DraftBoardChampionTests(DraftChampionDataTests):
     session with a clear championship winner (Alpha Team / Alice Smith).
     """
 
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
     def _spectator_url(self):
         return reverse("draft_board_spectator", args=[self.session.pk])
 
+    def _spectator_state(self):
+        resp = self.client.get(reverse("draft_state_json", args=[self.session.pk]))
+        return json.loads(resp.content)
+
     def _commissioner_url(self):
         return reverse(
             "draft_board_commissioner",
@@ -2485,7 +3108,7 @@ class DraftBoardChampionTests(DraftChampionDataTests):
         resp = self.client.get(self._spectator_url())
         self.assertEqual(resp.status_code, 200)
         self.assertIsNotNone(resp.context["champion"])
-        self.assertEqual(resp.context["champion"]["team"], self.team1)
+        self.assertEqual(resp.context["champion"]["team"]["id"], self.team1.id)
 
     def test_spectator_champion_league_team_id_in_context(self):
         resp = self.client.get(self._spectator_url())
@@ -2498,10 +3121,7 @@ class DraftBoardChampionTests(DraftChampionDataTests):
 
     def test_spectator_team_name_from_league_team(self):
         """display_name uses the real league team name, not the draft team name."""
-        resp = self.client.get(self._spectator_url())
-        import json
-
-        state = json.loads(resp.context["initial_state"])
+        state = self._spectator_state()
         team_names = [t["display_name"] for t in state["teams"]]
         self.assertIn("Alpha Team", team_names)
         self.assertIn("Beta Team", team_names)
@@ -2510,10 +3130,7 @@ class DraftBoardChampionTests(DraftChampionDataTests):
 
     def test_spectator_record_in_state(self):
         """Regular-season record is included in the state payload per team."""
-        resp = self.client.get(self._spectator_url())
-        import json
-
-        state = json.loads(resp.context["initial_state"])
+        state = self._spectator_state()
         champ_team = next(
             t for t in state["teams"] if t["display_name"] == "Alpha Team"
         )
@@ -2547,23 +3164,21 @@ class DraftBoardChampionTests(DraftChampionDataTests):
         self.assertIsNone(resp.context["champion_league_team_id"])
         self.assertContains(resp, "CHAMPION_LEAGUE_TEAM_ID = null")
 
-    def test_get_session_champion_wrapper(self):
-        """_get_session_champion returns the same data as the batch helper."""
-        champ = _get_session_champion(self.session)
+    def test_session_champion_reads_stored_data(self):
+        """session_champion returns what the batch helper computed."""
+        self.session.refresh_from_db()
+        champ = session_champion(self.session)
         self.assertIsNotNone(champ)
-        self.assertEqual(champ["team"], self.team1)
+        self.assertEqual(champ["team"]["id"], self.team1.id)
 
-    def test_get_session_champion_none_for_non_complete(self):
+    def test_session_champion_none_for_non_complete(self):
         self.session.state = DraftSession.STATE_ACTIVE
         self.session.save()
-        self.assertIsNone(_get_session_champion(self.session))
+        self.assertIsNone(session_champion(self.session))
 
     def test_league_team_id_in_state_payload(self):
         """Each team in the state payload includes its league_team_id."""
-        resp = self.client.get(self._spectator_url())
-        import json
-
-        state = json.loads(resp.context["initial_state"])
+        state = self._spectator_state()
         for t in state["teams"]:
             self.assertIn("league_team_id", t)
 
@@ -2571,10 +3186,7 @@ class DraftBoardChampionTests(DraftChampionDataTests):
         """When league_team is not set, display_name falls back to DraftTeam.team_name."""
         self.dt1.league_team = None
         self.dt1.save()
-        resp = self.client.get(self._spectator_url())
-        import json
-
-        state = json.loads(resp.context["initial_state"])
+        state = self._spectator_state()
         t1_data = next(t for t in state["teams"] if t["id"] == self.dt1.pk)
         self.assertEqual(t1_data["display_name"], self.dt1.team_name)
 
@@ -3310,6 +3922,106 @@ class FinalizeDraftWarningsTests(DraftTestBase):
         self.assertIsInstance(data["warnings"], list)
 
 
+# ---------------------------------------------------------------------------
+# Finalize draft: set-based player resolution and bulk rosters
+# ---------------------------------------------------------------------------
+
+
+class FinalizeDraftBulkTests(DraftTestBase):
+    def _finalize(self):
+        return self.client.post(
+            reverse(
+                "draft_finalize",
+                args=[self.session.pk, self.session.commissioner_token],
+            )
+        )
+
+    def _draft_everyone(self):
+        """Three full rounds plus a fourth for the two goalies."""
+        teams = [self.team1, self.team2, self.team3]
+        signups = [self.cap1, self.cap2, self.cap3] + self.players
+        for i, signup in enumerate(signups):
+            self._make_pick(teams[i % 3], signup, i // 3 + 1, i % 3)
+        self._make_pick(self.team1, self.goalie1, 4, 0)
+        self._make_pick(self.team2, self.goalie2, 4, 1)
+        self._complete()
+
+    def test_players_resolved_by_email_then_name(self):
+        by_email = Player.objects.create(
+            first_name="Mike", last_name="Other", email="PLAYER1@test.com"
+        )
+        by_name = Player.objects.create(first_name="Player2", last_name="Test2")
+        self._draft_everyone()
+
+        resp = self._finalize()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["created_teams"], 3)
+        self.assertEqual(resp.json()["created_rosters"], 11)
+
+        self.players[0].refresh_from_db()
+        self.players[1].refresh_from_db()
+        self.assertEqual(self.players[0].linked_player, by_email)
+        self.assertEqual(self.players[1].linked_player, by_name)
+        # Everyone else got a new Player, searchable by the name keys.
+        self.assertEqual(Player.objects.count(), 11)
+        self.assertTrue(Player.objects.filter(last_name_key="goalie").exists())
+
+        captain = Roster.objects.get(player__first_name="Alice")
+        self.assertTrue(captain.is_captain)
+        goalie = Roster.objects.get(player__first_name="Gary")
+        self.assertTrue(goalie.is_primary_goalie)
+        self.assertTrue(
+            GoalieEligibility.objects.filter(player=goalie.player_id).exists()
+        )
+
+    def _count_finalize_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        # Leave out the response's state payload and warnings.
+        with (
+            patch("leagues.draft_views._draft_completion_warnings", return_value=[]),
+            patch("leagues.draft_views._session_state_payload", return_value={}),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            self.assertEqual(self._finalize().status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_picks(self):
+        Division.objects.create(division=3)
+        for i, signup in enumerate([self.cap1, self.cap2, self.cap3]):
+            self._make_pick([self.team1, self.team2, self.team3][i], signup, 1, i)
+        self._make_pick(self.team1, self.goalie1, 2, 0)
+        self._complete()
+        few = self._count_finalize_queries()
+
+        # Start over with the whole pool drafted.
+        DraftPick.objects.all().delete()
+        DraftTeam.objects.update(league_team=None)
+        Team.objects.all().delete()
+        SeasonSignup.objects.update(linked_player=None)
+        Player.objects.all().delete()
+        self._draft_everyone()
+        self.assertEqual(self._count_finalize_queries(), few)
+
+    def test_refinalize_rebuilds_rosters_without_new_teams(self):
+        self._draft_everyone()
+        self._finalize()
+        resp = self._finalize()
+        self.assertEqual(resp.json()["created_teams"], 0)
+        self.assertEqual(Team.objects.filter(season=self.season).count(), 3)
+        self.assertEqual(Roster.objects.count(), 11)
+
+    def test_two_primary_goalies_on_one_team_rejected(self):
+        self._make_pick(self.team1, self.goalie1, 1, 0)
+        self._make_pick(self.team1, self.goalie2, 2, 0)
+        self._complete()
+        resp = self._finalize()
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("more than one goalie", resp.json()["error"])
+        self.assertFalse(Team.objects.filter(season=self.season).exists())
+
+
 # ---------------------------------------------------------------------------
 # SeasonSignup admin duplicate banner
 # ---------------------------------------------------------------------------
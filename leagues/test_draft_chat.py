@@ -6,11 +6,16 @@ Covers:
   - DraftConsumer handler methods (chat_message, chat_reaction, delete_message)
   - Identity resolution helpers (_resolve_commissioner, _resolve_captain)
   - Rate limiting
-  - System messages broadcast on picks
+  - Chat history: latest page from the per-worker buffer, "load older",
+    reaction maps and deletions kept current in place
+  - System messages broadcast on picks, batched with auto-captain lines
+  - Board sync: sequenced deltas and snapshot requests
+  - Picks, undos and pauses submitted over the socket
   - Chat cleared on draft reset
 """
 
 import datetime
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from django.test import TestCase
@@ -40,7 +45,6 @@ def _make_session():
         season=season,
         num_teams=2,
         num_rounds=2,
-        state=DraftSession.STATE_ACTIVE,
         signups_open=False,
     )
     cap1 = SeasonSignup.objects.create(
@@ -67,6 +71,9 @@ def _make_session():
     team2 = DraftTeam.objects.create(
         session=session, captain=cap2, draft_position=2, team_name="Betas"
     )
+    # Started once set up, so building it didn't move the board's seq.
+    session.state = DraftSession.STATE_ACTIVE
+    session.save(update_fields=["state"])
     return session, team1, team2
 
 
@@ -352,6 +359,116 @@ class ConsumerChatHandlerTests(TestCase):
         consumer.channel_layer.group_send.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# Chat history buffer
+# ---------------------------------------------------------------------------
+
+
+class ChatHistoryBufferTests(TestCase):
+    def setUp(self):
+        from leagues import chat_buffer
+
+        self.session, _, _ = _make_session()
+        self.messages = DraftChatMessage.objects.bulk_create(
+            DraftChatMessage(
+                session=self.session,
+                sender_name="Fan",
+                sender_type="spectator",
+                body=f"message {i}",
+            )
+            for i in range(60)
+        )
+        self.addCleanup(chat_buffer.invalidate, self.session.pk)
+
+    def _sent(self, consumer):
+        return json.loads(consumer.send.call_args.kwargs["text_data"])
+
+    async def test_history_is_latest_page_and_reconnects_skip_the_db(self):
+        first = _make_consumer(self.session.pk)
+        await first._send_chat_history()
+        sent = self._sent(first)
+        self.assertEqual(
+            [m["body"] for m in sent["messages"]],
+            [f"message {i}" for i in range(10, 60)],
+        )
+        self.assertTrue(sent["has_more"])
+
+        second = _make_consumer(self.session.pk)
+        with patch("leagues.chat_buffer.load_messages") as load:
+            await second._send_chat_history()
+        load.assert_not_called()
+        self.assertEqual(self._sent(second), sent)
+
+    async def test_load_older_pages_back(self):
+        consumer = _make_consumer(self.session.pk)
+        consumer._last_snapshot_at = 0.0
+        await consumer._send_chat_history()
+        oldest = self._sent(consumer)["messages"][0]["id"]
+
+        await consumer.receive(
+            text_data=json.dumps({"type": "load_older", "before_id": oldest})
+        )
+        sent = self._sent(consumer)
+        self.assertEqual(sent["before_id"], oldest)
+        self.assertEqual(len(sent["messages"]), 10)
+        self.assertFalse(sent["has_more"])
+
+    async def test_reactions_and_deletes_update_the_buffer(self):
+        consumer = _make_consumer(self.session.pk, sender_name="Tester")
+        await consumer._send_chat_history()
+        target = self.messages[-1].pk
+
+        await consumer._handle_reaction({"message_id": target, "emoji": "👍"})
+        event = consumer.channel_layer.group_send.call_args.args[1]
+        self.assertEqual(event["reactions"], {"👍": ["Tester"]})
+        self.assertTrue(
+            await DraftChatReaction.objects.filter(message_id=target).aexists()
+        )
+
+        await consumer.draft_chat_delete({"message_id": self.messages[-2].pk})
+        await consumer._send_chat_history()
+        latest = self._sent(consumer)["messages"]
+        self.assertEqual(latest[-1]["reactions"], {"👍": ["Tester"]})
+        self.assertNotIn(self.messages[-2].pk, [m["id"] for m in latest])
+
+    async def test_events_during_the_load_are_replayed(self):
+        from leagues import chat_buffer
+
+        consumer = _make_consumer(self.session.pk)
+        late = chat_buffer.serialize_message(
+            await DraftChatMessage.objects.acreate(
+                session=self.session,
+                sender_name="Fan",
+                sender_type="spectator",
+                body="late",
+            )
+        )
+        load = chat_buffer.load_messages
+
+        def load_then_receive_events(*args):
+            page = load(*args)
+            # Group events that arrive after the query, before the fill.
+            consumer._buffer_message(late)
+            chat_buffer.cached_buffer(self.session.pk).remove(self.messages[-1].pk)
+            return page
+
+        with patch(
+            "leagues.chat_buffer.load_messages", side_effect=load_then_receive_events
+        ):
+            await consumer._send_chat_history()
+        ids = [m["id"] for m in self._sent(consumer)["messages"]]
+        self.assertEqual(ids[-1], late["id"])
+        self.assertNotIn(self.messages[-1].pk, ids)
+
+    async def test_state_update_invalidates_buffer(self):
+        from leagues import chat_buffer
+
+        consumer = _make_consumer(self.session.pk)
+        await consumer._send_chat_history()
+        await consumer.draft_state_update({"type": "draft.state_update", "state": {}})
+        self.assertIsNone(chat_buffer.cached_buffer(self.session.pk))
+
+
 # ---------------------------------------------------------------------------
 # System message on pick
 # ---------------------------------------------------------------------------
@@ -395,6 +512,161 @@ class SystemChatMessageOnPickTest(TestCase):
         self.assertIn("Round 1", msg.body)
 
 
+# ---------------------------------------------------------------------------
+# Board sync: deltas and snapshot requests
+# ---------------------------------------------------------------------------
+
+
+class BoardSyncTest(TestCase):
+    def setUp(self):
+        self.session, self.team1, _ = _make_session()
+        self.session.rebuild_pick_order()
+
+    async def test_snapshot_request_sends_state_to_requester_only(self):
+        consumer = _make_consumer(self.session.pk)
+        consumer._last_snapshot_at = 0.0
+        await consumer.receive(text_data=json.dumps({"type": "request_snapshot"}))
+
+        consumer.send.assert_called_once()
+        sent = json.loads(consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(sent["type"], "state_update")
+        self.assertEqual(sent["state"]["seq"], 0)
+        consumer.channel_layer.group_send.assert_not_called()
+
+    async def test_snapshot_requests_rate_limited(self):
+        consumer = _make_consumer(self.session.pk)
+        consumer._last_snapshot_at = 0.0
+        await consumer._handle_snapshot_request()
+        await consumer._handle_snapshot_request()
+        self.assertEqual(consumer.send.call_count, 1)
+
+    async def test_delta_forwarded_to_client(self):
+        consumer = _make_consumer(self.session.pk)
+        await consumer.draft_delta(
+            {"type": "draft.delta", "seq": 3, "events": [{"op": "turn"}]}
+        )
+        sent = json.loads(consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(sent, {"type": "delta", "seq": 3, "events": [{"op": "turn"}]})
+
+    def test_broadcast_delta_reaches_board_group(self):
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        from leagues.draft_views import _broadcast_delta, _draft_delta, _turn_event
+
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f"draft_{self.session.pk}", channel)
+
+        delta = _draft_delta(self.session, [_turn_event(self.session)])
+        _broadcast_delta(self.session, delta)
+
+        event = async_to_sync(layer.receive)(channel)
+        self.assertEqual(event["type"], "draft.delta")
+        self.assertEqual(event["seq"], 1)
+        self.assertEqual(event["events"][0]["active_team_pk"], self.team1.pk)
+
+
+# ---------------------------------------------------------------------------
+# Draft actions over the socket
+# ---------------------------------------------------------------------------
+
+
+class ConsumerDraftActionTests(TestCase):
+    def setUp(self):
+        self.session, self.team1, _ = _make_session()
+        self.session.rebuild_pick_order()
+        self.player = SeasonSignup.objects.create(
+            season=self.session.season,
+            first_name="Jordan",
+            last_name="Smith",
+            email="jordan@test.com",
+            primary_position=SeasonSignup.POSITION_WING,
+            secondary_position=SeasonSignup.POSITION_CENTER,
+            captain_interest=SeasonSignup.CAPTAIN_NO,
+        )
+
+    def _commissioner(self):
+        consumer = _make_consumer(
+            self.session.pk, sender_type="commissioner", can_delete=True
+        )
+        consumer.token = str(self.session.commissioner_token)
+        return consumer
+
+    def _result(self, consumer):
+        return json.loads(consumer.send.call_args.kwargs["text_data"])
+
+    async def _pick(self, consumer):
+        await consumer.receive(
+            text_data=json.dumps(
+                {"type": "make_pick", "request_id": 7, "signup_pk": self.player.pk}
+            )
+        )
+
+    async def test_spectator_cannot_pick(self):
+        consumer = _make_consumer(self.session.pk)
+        await self._pick(consumer)
+        result = self._result(consumer)
+        self.assertEqual(result["type"], "action_result")
+        self.assertEqual(result["status"], 403)
+        consumer.channel_layer.group_send.assert_not_called()
+
+    async def test_pick_broadcasts_one_combined_event(self):
+        from leagues.models import DraftPick
+
+        consumer = self._commissioner()
+        await self._pick(consumer)
+
+        self.assertTrue(
+            await DraftPick.objects.filter(
+                session=self.session, signup=self.player
+            ).aexists()
+        )
+        consumer.channel_layer.group_send.assert_called_once()
+        event = consumer.channel_layer.group_send.call_args.args[1]
+        self.assertEqual(event["type"], "draft.delta")
+        self.assertIn("Jordan Smith", event["chat_messages"][0]["body"])
+
+        result = self._result(consumer)
+        self.assertEqual(result["type"], "action_result")
+        self.assertEqual(result["request_id"], 7)
+        self.assertEqual(result["status"], 200)
+        self.assertTrue(result["success"])
+
+    async def test_auto_captain_lines_batched_with_the_pick(self):
+        from leagues.models import DraftTeam
+
+        await DraftTeam.objects.filter(session=self.session, draft_position=2).aupdate(
+            captain_draft_round=1
+        )
+        consumer = self._commissioner()
+        await self._pick(consumer)
+
+        consumer.channel_layer.group_send.assert_called_once()
+        event = consumer.channel_layer.group_send.call_args.args[1]
+        bodies = [m["body"] for m in event["chat_messages"]]
+        self.assertEqual(len(bodies), 2)
+        self.assertIn("drafted Jordan Smith", bodies[0])
+        self.assertIn("auto-drafted captain Beta Cap", bodies[1])
+        self.assertEqual(
+            await DraftChatMessage.objects.filter(session=self.session).acount(), 2
+        )
+
+    async def test_undo_and_advance(self):
+        from leagues.models import DraftPick
+
+        consumer = self._commissioner()
+        await self._pick(consumer)
+        await consumer.receive(text_data=json.dumps({"type": "undo_pick"}))
+        self.assertEqual(self._result(consumer)["status"], 200)
+        self.assertFalse(await DraftPick.objects.filter(session=self.session).aexists())
+
+        await consumer.receive(text_data=json.dumps({"type": "advance_state"}))
+        self.assertEqual(self._result(consumer)["status"], 200)
+        await self.session.arefresh_from_db()
+        self.assertEqual(self.session.state, DraftSession.STATE_PAUSED)
+
+
 # ---------------------------------------------------------------------------
 # Chat cleared on draft reset
 # ---------------------------------------------------------------------------
@@ -0,0 +1,210 @@
+"""
+Tests for concurrent pick submission (leagues/draft_views.py make_pick).
+
+Covers:
+  - idempotency_key — a retried pick is answered from the existing pick
+  - expected_pick — a pick aimed at a slot that has moved on gets a 409
+  - parallel picks from threads against a file-backed SQLite database —
+    one pick per slot, losers get clean 4xx responses, never a 500
+"""
+
+import datetime
+import os
+import sqlite3
+import tempfile
+import threading
+import uuid
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from leagues.models import DraftPick, DraftSession, DraftTeam, Season, SeasonSignup
+
+
+def _make_draft():
+    """An active 2-team, 2-round draft with four undrafted players."""
+    season = Season.objects.create(
+        year=datetime.date.today().year, season_type=4, is_current_season=False
+    )
+    session = DraftSession.objects.create(
+        season=season,
+        num_teams=2,
+        num_rounds=2,
+        state=DraftSession.STATE_ACTIVE,
+        signups_open=False,
+    )
+
+    def signup(first, captain=False):
+        return SeasonSignup.objects.create(
+            season=season,
+            first_name=first,
+            last_name="Test",
+            email=f"{first.lower()}@test.com",
+            primary_position=SeasonSignup.POSITION_WING,
+            secondary_position=SeasonSignup.POSITION_ONE_THING,
+            captain_interest=(
+                SeasonSignup.CAPTAIN_YES if captain else SeasonSignup.CAPTAIN_NO
+            ),
+        )
+
+    team1 = DraftTeam.objects.create(
+        session=session, captain=signup("Cap1", True), draft_position=1
+    )
+    DraftTeam.objects.create(
+        session=session, captain=signup("Cap2", True), draft_position=2
+    )
+    session.rebuild_pick_order()
+    players = [signup(f"Player{i}") for i in range(4)]
+    return session, team1, players
+
+
+class PickRetryTests(TestCase):
+    def setUp(self):
+        self.session, self.team1, self.players = _make_draft()
+        self._patcher = patch("leagues.draft_views._broadcast_delta")
+        self._patcher.start()
+
+    def tearDown(self):
+        self._patcher.stop()
+
+    def _pick(self, signup, **extra):
+        data = {
+            "signup_pk": signup.pk,
+            "commissioner_token": str(self.session.commissioner_token),
+            **extra,
+        }
+        return self.client.post(
+            reverse("draft_make_pick", args=[self.session.pk]), data
+        )
+
+    def test_retry_with_same_key_does_not_draft_twice(self):
+        key = str(uuid.uuid4())
+        first = self._pick(self.players[0], idempotency_key=key)
+        retry = self._pick(self.players[1], idempotency_key=key)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.status_code, 200)
+        self.assertTrue(retry.json()["replayed"])
+        self.assertEqual(retry.json()["state"]["current_pick_index"], 1)
+        self.assertEqual(DraftPick.objects.filter(session=self.session).count(), 1)
+
+    def test_invalid_key_rejected(self):
+        response = self._pick(self.players[0], idempotency_key="not-a-uuid")
+        self.assertEqual(response.status_code, 400)
+
+    def test_stale_expected_pick_is_a_conflict(self):
+        self._pick(self.players[0], expected_pick=0)
+        response = self._pick(self.players[1], expected_pick=0)
+        self.assertEqual(response.status_code, 409)
+        data = response.json()
+        self.assertTrue(data["conflict"])
+        self.assertEqual(data["state"]["current_pick_index"], 1)
+        self.assertEqual(DraftPick.objects.filter(session=self.session).count(), 1)
+
+    def test_matching_expected_pick_accepted(self):
+        self._pick(self.players[0], expected_pick=0)
+        response = self._pick(self.players[1], expected_pick=1)
+        self.assertEqual(response.status_code, 200)
+
+
+@skipUnless(connection.vendor == "sqlite", "file-backed copy is SQLite-specific")
+class ConcurrentPickTests(TransactionTestCase):
+    """
+    Picks fired in parallel threads.  The in-memory test database can't be
+    written from several threads at once, so each test runs against a
+    temporary file copy of its schema.
+    """
+
+    THREADS = 6
+
+    def setUp(self):
+        connection.ensure_connection()
+        fd, self.db_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        target = sqlite3.connect(self.db_path)
+        connection.connection.backup(target)
+        target.close()
+
+        # Park the in-memory connection (closing it would drop the test
+        # database) and let every thread connect to the file instead.
+        self._memory_name = connection.settings_dict["NAME"]
+        self._memory_connection = connection.connection
+        connection.connection = None
+        connection.settings_dict["NAME"] = self.db_path
+
+        self._patcher = patch("leagues.draft_views._broadcast_delta")
+        self._patcher.start()
+        self.session, self.team1, self.players = _make_draft()
+
+    def tearDown(self):
+        self._patcher.stop()
+        connection.close()
+        connection.settings_dict["NAME"] = self._memory_name
+        connection.connection = self._memory_connection
+        os.remove(self.db_path)
+
+    def _race(self, make_data):
+        """POST one pick per thread, all released at once; return statuses."""
+        url = reverse("draft_make_pick", args=[self.session.pk])
+        barrier = threading.Barrier(self.THREADS)
+        statuses = [None] * self.THREADS
+
+        def worker(i):
+            try:
+                client = Client()
+                barrier.wait()
+                statuses[i] = client.post(url, make_data(i)).status_code
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return statuses
+
+    def test_parallel_picks_for_one_slot(self):
+        token = str(self.session.commissioner_token)
+        statuses = self._race(
+            lambda i: {
+                "signup_pk": self.players[i % len(self.players)].pk,
+                "commissioner_token": token,
+                "expected_pick": 0,
+            }
+        )
+        self.assertEqual(statuses.count(200), 1)
+        self.assertEqual(statuses.count(409), self.THREADS - 1)
+        self.assertEqual(DraftPick.objects.filter(session=self.session).count(), 1)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.next_pick_index, 1)
+
+    def test_parallel_captain_picks(self):
+        token = str(self.team1.captain_token)
+        statuses = self._race(
+            lambda i: {
+                "signup_pk": self.players[i % len(self.players)].pk,
+                "captain_token": token,
+            }
+        )
+        # Once the first lands it's no longer team 1's turn.
+        self.assertEqual(statuses.count(200), 1)
+        self.assertEqual(statuses.count(400), self.THREADS - 1)
+        self.assertEqual(DraftPick.objects.filter(session=self.session).count(), 1)
+
+    def test_parallel_retries_share_one_pick(self):
+        token = str(self.session.commissioner_token)
+        key = str(uuid.uuid4())
+        statuses = self._race(
+            lambda i: {
+                "signup_pk": self.players[0].pk,
+                "commissioner_token": token,
+                "idempotency_key": key,
+            }
+        )
+        self.assertEqual(statuses, [200] * self.THREADS)
+        self.assertEqual(DraftPick.objects.filter(session=self.session).count(), 1)
@@ -0,0 +1,302 @@
+"""
+Tests for leagues/draft_import.py and the import commands built on it.
+
+Covers:
+  - parse_board_csv — picks from the grid, metadata rows skipped, repeated
+    captain names rejected
+  - ResultsImport — email then name matching, one created player per new
+    name across seasons, repeat and ambiguous picks skipped, cursor and
+    rows written in a fixed number of queries, seasons with a draft refused
+  - import_draft_results --manifest --dry-run prints a diff, writes nothing
+  - import_draft_signups — bulk signups keep form timestamps and link
+    players, existing emails skipped, captains by interest
+"""
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from leagues.draft_import import (
+    COL_CAPTAIN,
+    COL_EMAIL,
+    COL_FIRST,
+    COL_LAST,
+    COL_NOTES,
+    COL_PRIMARY,
+    COL_SECONDARY,
+    COL_TIMESTAMP,
+    DraftImportError,
+    ResultsImport,
+    ResultsJob,
+    parse_board_csv,
+    parse_results_job,
+)
+from leagues.models import DraftPick, DraftSession, Player, Season, SeasonSignup
+
+BOARD = [
+    ["", "Ann", "Bo"],
+    ["", "meta", "meta"],
+    ["Captain:", "", ""],
+    ["1", "Smith, Joe", "Jones, Kim"],
+    ["2", "Doe, Ann", "Newman, Pat"],
+    ["3", "Jones, Kim", ""],
+    ["Week 1", "Red", "Blue"],
+]
+
+
+class CsvFilesMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def write_csv(self, name, rows):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+        return path
+
+    def write_registration(self, name, people):
+        header = [
+            COL_TIMESTAMP,
+            COL_EMAIL,
+            COL_FIRST,
+            COL_LAST,
+            COL_PRIMARY,
+            COL_SECONDARY,
+            COL_CAPTAIN,
+            COL_NOTES,
+        ]
+        return self.write_csv(name, [header, *people])
+
+
+class ParseBoardTests(CsvFilesMixin, SimpleTestCase):
+    def test_parses_picks(self):
+        captains, num_rounds, picks = parse_board_csv(self.write_csv("b.csv", BOARD))
+        self.assertEqual(captains, ["Ann", "Bo"])
+        self.assertEqual(num_rounds, 3)
+        self.assertEqual(
+            picks,
+            [
+                (1, "Ann", "Joe", "Smith"),
+                (1, "Bo", "Kim", "Jones"),
+                (2, "Ann", "Ann", "Doe"),
+                (2, "Bo", "Pat", "Newman"),
+                (3, "Ann", "Kim", "Jones"),
+            ],
+        )
+
+    def test_repeated_captain_names_rejected(self):
+        path = self.write_csv("b.csv", [["", "Ann", "Ann"], ["1", "A, B", "C, D"]])
+        with self.assertRaises(DraftImportError):
+            parse_board_csv(path)
+
+
+class ResultsImportTests(CsvFilesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.fall = Season.objects.create(year=2024, season_type=3)
+        self.spring = Season.objects.create(year=2025, season_type=1)
+        self.ann = Player.objects.create(first_name="Ann", last_name="Doe")
+        # Matched through the registration email despite the other name.
+        self.joe = Player.objects.create(
+            first_name="Joseph", last_name="Smythe", email="joe@example.com"
+        )
+        self.kim = Player.objects.create(first_name="Kim", last_name="Jones")
+        self.board = self.write_csv("board.csv", BOARD)
+        self.roster = self.write_registration(
+            "roster.csv",
+            [["", "Joe@Example.com", "Joe", "Smith", "", "", "", ""]],
+        )
+
+    def _exports(self, *season_ids):
+        return [
+            parse_results_job(ResultsJob(pk, self.board, self.roster, 2))
+            for pk in season_ids
+        ]
+
+    def test_imports_boards(self):
+        plan = ResultsImport(
+            self._exports(self.fall.pk, self.spring.pk), create_players=True
+        )
+        sessions = plan.apply()
+
+        # One Pat Newman for both seasons.
+        self.assertEqual(Player.objects.filter(last_name="Newman").count(), 1)
+        for session in sessions:
+            session.refresh_from_db()
+            self.assertEqual(session.state, DraftSession.STATE_COMPLETE)
+            self.assertEqual(session.next_pick_index, 4)
+            picks = {
+                p.signup.linked_player.last_name: p
+                for p in DraftPick.objects.filter(session=session).select_related(
+                    "signup__linked_player"
+                )
+            }
+            self.assertEqual(sorted(picks), ["Doe", "Jones", "Newman", "Smythe"])
+            # Kim Jones is picked twice; the second pick is skipped.
+            self.assertEqual(picks["Jones"].round_number, 1)
+            # Ann is the captain of "Ann's Team" and drafted onto it.
+            self.assertTrue(picks["Doe"].is_auto_captain)
+            self.assertEqual(picks["Doe"].signup, picks["Doe"].team.captain)
+            self.assertEqual(picks["Smythe"].signup.email, "joe@example.com")
+            self.assertEqual(
+                session.rounds.get(round_number=2).order_type, "randomized"
+            )
+
+    def test_writes_in_fixed_queries(self):
+        plan = ResultsImport(self._exports(self.fall.pk), create_players=True)
+        with CaptureQueriesContext(connection) as one:
+            plan.apply()
+        DraftSession.objects.all().delete()
+        SeasonSignup.objects.all().delete()
+        Player.objects.filter(last_name="Newman").delete()
+        plan = ResultsImport(
+            self._exports(self.fall.pk, self.spring.pk), create_players=True
+        )
+        with CaptureQueriesContext(connection) as two:
+            plan.apply()
+        self.assertEqual(len(one), len(two))
+
+    def test_unmatched_and_ambiguous_skipped(self):
+        Player.objects.create(first_name="Kim", last_name="Jones ")
+        plan = ResultsImport(self._exports(self.fall.pk))
+        draft = plan.drafts[0]
+        self.assertEqual(
+            sorted(reason for *_, reason in draft.skipped),
+            ["ambiguous", "ambiguous", "new"],
+        )
+        self.assertEqual(plan.new_players, [])
+
+    def test_season_with_draft_refused(self):
+        DraftSession.objects.create(season=self.fall)
+        with self.assertRaises(DraftImportError):
+            ResultsImport(self._exports(self.fall.pk))
+
+    def test_manifest_dry_run_prints_diff(self):
+        manifest = self.write_csv(
+            "manifest.csv",
+            [
+                ["season_id", "board_csv", "roster_csv", "random_round"],
+                [self.fall.pk, self.board, self.roster, ""],
+                [self.spring.pk, self.board, "", "5"],
+            ],
+        )
+        out = io.StringIO()
+        call_command(
+            "import_draft_results",
+            manifest=manifest,
+            create_players=True,
+            dry_run=True,
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertEqual(output.count("+ player Pat Newman"), 1)
+        self.assertIn("+ 1 picks matched by email", output)
+        self.assertIn("- R3 / Ann: Kim Jones (player already picked", output)
+        self.assertFalse(DraftSession.objects.exists())
+        self.assertFalse(Player.objects.filter(last_name="Newman").exists())
+
+
+class ImportDraftSignupsTests(CsvFilesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = Season.objects.create(year=2026, season_type=1)
+        self.player = Player.objects.create(first_name="Dave", last_name="Gerber")
+        SeasonSignup.objects.create(
+            season=self.season,
+            first_name="Old",
+            last_name="Timer",
+            email="old@example.com",
+            primary_position=SeasonSignup.POSITION_WING,
+            secondary_position=SeasonSignup.POSITION_ONE_THING,
+            captain_interest=SeasonSignup.CAPTAIN_NO,
+        )
+        yes = "Yes for sure please so I control who I play with"
+        overdue = "I can as I'm overdue to captain/help out"
+        self.csv = self.write_registration(
+            "signups.csv",
+            [
+                [
+                    "1/2/2026 10:00:00",
+                    "A@x.com",
+                    "Amy",
+                    "Ray",
+                    "Wing",
+                    "Center",
+                    overdue,
+                    "",
+                ],
+                [
+                    "1/3/2026 10:00:00",
+                    "d@x.com",
+                    "Dave Gerber",
+                    "Gerber",
+                    "Defense",
+                    "Wing",
+                    yes,
+                    "",
+                ],
+                [
+                    "1/4/2026 10:00:00",
+                    "old@example.com",
+                    "Old",
+                    "Timer",
+                    "Wing",
+                    "Wing",
+                    "",
+                    "",
+                ],
+                ["", "", "", "", "", "", "", ""],
+            ],
+        )
+
+    def test_imports_signups_and_session(self):
+        call_command(
+            "import_draft_signups",
+            csv_path=self.csv,
+            season_id=self.season.pk,
+            num_teams=2,
+            num_rounds=3,
+            random_round=2,
+            stdout=io.StringIO(),
+        )
+        signups = {s.email: s for s in SeasonSignup.objects.filter(season=self.season)}
+        self.assertEqual(len(signups), 3)
+        dave = signups["d@x.com"]
+        self.assertEqual(dave.first_name, "Dave")
+        self.assertEqual(dave.linked_player, self.player)
+        self.assertEqual(
+            timezone.localtime(signups["a@x.com"].submitted_at).replace(tzinfo=None),
+            datetime(2026, 1, 2, 10, 0),
+        )
+        session = self.season.draft_session
+        self.assertEqual(session.rounds.count(), 3)
+        self.assertEqual(
+            [team.captain.email for team in session.teams.order_by("pk")],
+            ["d@x.com", "a@x.com"],
+        )
+
+    def test_dry_run_writes_nothing(self):
+        out = io.StringIO()
+        call_command(
+            "import_draft_signups",
+            csv_path=self.csv,
+            season_id=self.season.pk,
+            dry_run=True,
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn("+ signup Dave Gerber <d@x.com> → player", output)
+        self.assertIn("= signup Old Timer <old@example.com>", output)
+        self.assertEqual(SeasonSignup.objects.filter(season=self.season).count(), 1)
+        self.assertFalse(DraftSession.objects.exists())
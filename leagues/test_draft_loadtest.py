@@ -0,0 +1,65 @@
+"""
+Tests for leagues/draft_loadtest.py.
+
+Covers:
+  - create_loadtest_draft — one signup per pick, delete_loadtest_draft
+    removes the season again
+  - DraftLoadTest — a small draft run to completion over the sockets and
+    through HTTP make_pick, with a sample per submission
+  - build_report — totals and per-pick numbers
+"""
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, TransactionTestCase
+
+from dcstreethockey.asgi import application
+from leagues.draft_loadtest import (
+    LOADTEST_YEAR,
+    DraftLoadTest,
+    build_report,
+    create_loadtest_draft,
+    delete_loadtest_draft,
+)
+from leagues.models import DraftPick, DraftSession, Season
+
+
+class CreateLoadtestDraftTests(TestCase):
+    def test_creates_and_deletes(self):
+        session = create_loadtest_draft(num_teams=2, num_rounds=3)
+        self.assertEqual(session.state, DraftSession.STATE_ACTIVE)
+        self.assertEqual(session.teams.count(), 2)
+        # One signup per pick: 2 teams x 3 rounds, captains included.
+        self.assertEqual(session.season.signups.count(), 2 * 3)
+        delete_loadtest_draft(session)
+        self.assertFalse(Season.objects.filter(year=LOADTEST_YEAR).exists())
+
+
+class DraftLoadTestTests(TransactionTestCase):
+    # The ASGI handler runs HTTP views in a thread of their own, which only
+    # sees committed rows.
+    def _run(self, via):
+        session = create_loadtest_draft(num_teams=2, num_rounds=3)
+        load_test = DraftLoadTest(
+            application, session, spectators=3, captains=1, via=via
+        )
+        async_to_sync(load_test.run)()
+        session.refresh_from_db()
+        self.assertEqual(session.state, DraftSession.STATE_COMPLETE)
+        self.assertEqual(DraftPick.objects.filter(session=session).count(), 6)
+        return load_test
+
+    def test_ws_draft_runs_to_completion(self):
+        load_test = self._run("ws")
+        report = build_report(load_test)
+        self.assertEqual(report["via"], "ws")
+        self.assertEqual(report["submissions"], len(load_test.samples))
+        for sample in load_test.samples:
+            self.assertEqual(len(sample["latencies_ms"]), 3)
+            self.assertGreater(sample["queries"], 0)
+        self.assertGreater(report["spectator_bytes"]["per_pick"], 0)
+
+    def test_http_draft_runs_to_completion(self):
+        report = build_report(self._run("http"))
+        self.assertEqual(report["via"], "http")
+        self.assertGreater(report["queries_per_submission"]["max"], 0)
+        self.assertEqual(report["spectators"], 3)
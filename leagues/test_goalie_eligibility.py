@@ -0,0 +1,136 @@
+"""
+Tests for leagues/goalie_eligibility.py.
+
+Covers:
+  - refresh on Roster save/delete and Player save — rows appear, update and vanish
+  - eligible_goalies() — active players, recently rostered inactive players
+  - the three dropdowns (captain page, goalie autocomplete, goalie-status admin)
+    all read the same index
+  - rebuild_goalie_eligibility command
+"""
+
+import datetime
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from leagues.admin import MatchUpGoalieStatusAdmin
+from leagues.goalie_eligibility import eligible_goalies, refresh_goalie_eligibility
+from leagues.models import (
+    Division,
+    GoalieEligibility,
+    MatchUpGoalieStatus,
+    Player,
+    Roster,
+    Season,
+    Team,
+)
+
+
+class GoalieEligibilityTest(TestCase):
+    def setUp(self):
+        this_year = datetime.date.today().year
+        division = Division.objects.create(division=1)
+        self.old_team = Team.objects.create(
+            team_name="Old",
+            division=division,
+            season=Season.objects.create(year=this_year - 6, season_type=1),
+            is_active=False,
+        )
+        self.team = Team.objects.create(
+            team_name="Current",
+            division=division,
+            season=Season.objects.create(year=this_year, season_type=1),
+            is_active=True,
+        )
+        self.this_year = this_year
+
+    def _roster(self, player, team, position1=4, position2=None):
+        return Roster.objects.create(
+            player=player, team=team, position1=position1, position2=position2
+        )
+
+    def test_goalie_roster_creates_row(self):
+        goalie = Player.objects.create(first_name="Gil", last_name="Goal")
+        self.assertFalse(GoalieEligibility.objects.filter(player=goalie).exists())
+        self._roster(goalie, self.old_team)
+        self._roster(goalie, self.team, position1=1)
+        row = GoalieEligibility.objects.get(player=goalie)
+        self.assertEqual(row.last_goalie_year, self.this_year - 6)
+        self.assertEqual(row.last_played_year, self.this_year)
+        self.assertTrue(row.is_active)
+
+    def test_position2_counts(self):
+        player = Player.objects.create(first_name="Two", last_name="Way")
+        self._roster(player, self.team, position1=1, position2=4)
+        self.assertIn(player, eligible_goalies())
+
+    def test_row_removed_when_goalie_roster_deleted(self):
+        goalie = Player.objects.create(first_name="Gil", last_name="Goal")
+        roster = self._roster(goalie, self.team)
+        roster.delete()
+        self.assertFalse(GoalieEligibility.objects.filter(player=goalie).exists())
+
+    def test_player_flags_follow_save(self):
+        flex = Player.objects.create(first_name="Flex", last_name="Player")
+        self.assertNotIn(flex, eligible_goalies())
+        flex.can_play_goalie = True
+        flex.save()
+        self.assertIn(flex, eligible_goalies())
+        flex.is_active = False
+        flex.save(update_fields=["is_active"])
+        self.assertFalse(GoalieEligibility.objects.get(player=flex).is_active)
+
+    def test_recent_inactive_goalies_only_with_include_recent(self):
+        recent = Player.objects.create(
+            first_name="Recent", last_name="Goalie", is_active=False
+        )
+        self._roster(recent, self.team)
+        retired = Player.objects.create(
+            first_name="Retired", last_name="Goalie", is_active=False
+        )
+        self._roster(retired, self.old_team)
+        self.assertEqual(list(eligible_goalies()), [recent])
+        self.assertEqual(list(eligible_goalies(include_recent=False)), [])
+
+    def test_dropdowns_share_the_index(self):
+        goalie = Player.objects.create(first_name="Gil", last_name="Goal")
+        self._roster(goalie, self.team)
+        flex = Player.objects.create(
+            first_name="Flex", last_name="Player", can_play_goalie=True
+        )
+
+        admin_qs = MatchUpGoalieStatusAdmin(
+            MatchUpGoalieStatus, None
+        )._get_goalie_queryset()
+        self.assertEqual(list(admin_qs), [goalie, flex])
+
+        user = User.objects.create_superuser("admin", "admin@test.com", "pw")
+        self.client.force_login(user)
+        response = self.client.get(reverse("goalie-autocomplete"), {"q": "fle"})
+        names = [r["text"] for r in json.loads(response.content)["results"]]
+        self.assertEqual(names, [str(flex)])
+
+    def test_dropdown_is_a_single_query(self):
+        for i in range(3):
+            self._roster(
+                Player.objects.create(first_name=f"G{i}", last_name="Goal"), self.team
+            )
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(eligible_goalies())), 3)
+
+    def test_rebuild_command_repairs_index(self):
+        goalie = Player.objects.create(first_name="Gil", last_name="Goal")
+        self._roster(goalie, self.team)
+        GoalieEligibility.objects.all().delete()
+        Player.objects.filter(pk=goalie.pk).update(is_active=False)
+        call_command("rebuild_goalie_eligibility", stdout=io.StringIO())
+        self.assertFalse(GoalieEligibility.objects.get(player=goalie).is_active)
+
+    def test_refresh_ignores_missing_player(self):
+        refresh_goalie_eligibility([None])
+        self.assertEqual(GoalieEligibility.objects.count(), 0)
@@ -3,20 +3,46 @@ Tests for goalie status views and helper functions in leagues/views.py.
 
 Covers:
   - get_roster_goalie()  — primary goalie, fallback, no goalie, position2, substitute exclusion
+  - get_roster_goalies() — batch resolution for many teams in one query
   - get_goalie_display_info() — sub-needed, explicit sub, no explicit goalie
   - goalie_status_board view — HTTP 200, sub_needed_count, past games excluded
   - captain_goalie_update view — valid/invalid access code, past matchups excluded
   - update_goalie_status endpoint — confirmed, sub-needed, unauthorized, invalid inputs
+  - bulk_update_goalie_status endpoint — all-or-nothing validation, bulk write
+  - live goalie status push — delta payload, captain/admin broadcasts, consumer
 """
+
 import datetime
+import json
 import uuid
+from unittest.mock import AsyncMock, MagicMock
 
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.admin.sites import AdminSite
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from leagues.models import Division, MatchUp, Player, Roster, Season, Team, Week
-from leagues.views import get_goalie_display_info, get_roster_goalie
-
+from leagues.admin import MatchUpGoalieStatusAdmin
+from leagues.consumers import GOALIE_STATUS_GROUP, GoalieStatusConsumer
+from leagues.models import (
+    Division,
+    MatchUp,
+    MatchUpGoalieStatus,
+    Player,
+    Roster,
+    Season,
+    Team,
+    Week,
+)
+from leagues.views import (
+    get_goalie_display_info,
+    get_roster_goalie,
+    get_roster_goalies,
+    goalie_status_delta,
+)
 
 # ---------------------------------------------------------------------------
 # Shared fixture helper
@@ -109,6 +135,19 @@ class GetRosterGoalieTest(TestCase):
     def test_returns_none_for_empty_roster(self):
         self.assertIsNone(get_roster_goalie(self.team))
 
+    def test_batch_resolves_many_teams_in_one_query(self):
+        primary = self._goalie("Primary", "Goalie", is_primary_goalie=True)
+        self._goalie("Backup", "Aaa")
+        other = make_team("Other", self.team.division, self.team.season)
+        fallback = Player.objects.create(first_name="Fall", last_name="Back")
+        Roster.objects.create(player=fallback, team=other, position1=4)
+        empty = make_team("Empty", self.team.division, self.team.season)
+        with self.assertNumQueries(1):
+            goalies = get_roster_goalies([self.team.id, other.id, empty.id])
+        self.assertEqual(
+            goalies, {self.team.id: primary, other.id: fallback, empty.id: None}
+        )
+
 
 # ---------------------------------------------------------------------------
 # get_goalie_display_info
@@ -544,3 +583,193 @@ class CanPlayGoalieTest(TestCase):
         """The existing logic still works — goalie position on roster is sufficient."""
         response = self.client.get(self._url())
         self.assertIn(self.roster_goalie, response.context["all_goalies"])
+
+
+# ---------------------------------------------------------------------------
+# Live goalie status push
+# ---------------------------------------------------------------------------
+
+
+class GoalieStatusPushTest(TestCase):
+    def setUp(self):
+        season = make_season()
+        division = make_division()
+        self.team = make_team("Pushers", division, season)
+        self.opponent = make_team("Opponent", division, season, color="Blue")
+        week = make_week(division, season, offset_days=3)
+        self.matchup = make_matchup(week, self.team, self.opponent)
+        self.roster_goalie = Player.objects.create(first_name="Reg", last_name="Ular")
+        Roster.objects.create(
+            player=self.roster_goalie, team=self.team, position1=4, is_captain=False
+        )
+        self.sub = Player.objects.create(first_name="Sub", last_name="Stitute")
+
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(GOALIE_STATUS_GROUP, self.channel)
+
+    def tearDown(self):
+        async_to_sync(self.layer.group_discard)(GOALIE_STATUS_GROUP, self.channel)
+
+    def _receive(self):
+        return async_to_sync(self.layer.receive)(self.channel)
+
+    def test_delta_covers_both_sides(self):
+        self.matchup.away_goalie_status = 2
+        delta = goalie_status_delta(self.matchup)
+        self.assertEqual(delta["matchup_id"], self.matchup.id)
+        self.assertEqual(delta["home"]["goalie_name"], "Reg Ular")
+        self.assertFalse(delta["home"]["is_sub"])
+        self.assertEqual(delta["away"]["goalie_name"], "")
+        self.assertEqual(delta["away"]["status"], 2)
+
+    def test_captain_update_pushes_delta_after_commit(self):
+        url = reverse(
+            "update_goalie_status",
+            args=[str(self.team.captain_access_code), self.matchup.id],
+        )
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.post(url, {"goalie_id": self.sub.id, "status": 1})
+        self.assertEqual(len(callbacks), 1)
+
+        event = self._receive()
+        self.assertEqual(event["type"], "goalie.status")
+        self.assertEqual(event["matchup"]["home"]["goalie_name"], "Sub Stitute")
+        self.assertTrue(event["matchup"]["home"]["is_sub"])
+        self.assertEqual(event["matchup"]["home"]["status_display"], "Confirmed")
+
+    def test_admin_pushes_only_goalie_changes(self):
+        model_admin = MatchUpGoalieStatusAdmin(MatchUpGoalieStatus, AdminSite())
+        form = MagicMock(changed_data=["home_goalie_status"])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            model_admin.save_model(None, self.matchup, form, change=True)
+            form.changed_data = []
+            model_admin.save_model(None, self.matchup, form, change=True)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self._receive()["matchup"]["matchup_id"], self.matchup.id)
+
+    def test_consumer_forwards_deltas(self):
+        consumer = GoalieStatusConsumer()
+        consumer.send = AsyncMock()
+        async_to_sync(consumer.goalie_status)(
+            {"type": "goalie.status", "matchup": {"matchup_id": 7}}
+        )
+        sent = json.loads(consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(sent, {"type": "goalie_status", "matchup": {"matchup_id": 7}})
+
+
+# ---------------------------------------------------------------------------
+# bulk_update_goalie_status endpoint
+# ---------------------------------------------------------------------------
+
+
+class BulkUpdateGoalieStatusTest(TestCase):
+    def setUp(self):
+        season = make_season()
+        self.division = make_division()
+        self.team = make_team("Bulkers", self.division, season)
+        self.opponent = make_team("Opponent", self.division, season, color="Blue")
+        self.matchups = [
+            make_matchup(
+                make_week(self.division, season, offset_days=days),
+                self.team if days % 2 else self.opponent,
+                self.opponent if days % 2 else self.team,
+            )
+            for days in (3, 10, 17)
+        ]
+        self.goalie = Player.objects.create(first_name="Reg", last_name="Ular")
+        Roster.objects.create(
+            player=self.goalie, team=self.team, position1=4, is_primary_goalie=True
+        )
+        self.sub = Player.objects.create(first_name="Sub", last_name="Stitute")
+
+    def _post(self, updates, code=None):
+        return self.client.post(
+            reverse(
+                "bulk_update_goalie_status",
+                args=[str(code or self.team.captain_access_code)],
+            ),
+            data=json.dumps({"updates": updates}),
+            content_type="application/json",
+        )
+
+    def test_updates_home_and_away_sides(self):
+        home, away, _ = self.matchups
+        response = self._post(
+            [
+                {"matchup_id": home.id, "goalie_id": "roster", "status": 1},
+                {"matchup_id": away.id, "goalie_id": self.sub.id, "status": 1},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        rows = {row["matchup_id"]: row for row in response.json()["matchups"]}
+        self.assertEqual(rows[home.id]["goalie_name"], "Reg Ular")
+        self.assertTrue(rows[away.id]["is_sub"])
+
+        home.refresh_from_db()
+        away.refresh_from_db()
+        self.assertEqual(home.home_goalie_status, 1)
+        self.assertIsNone(home.home_goalie)
+        self.assertEqual(away.away_goalie, self.sub)
+        self.assertEqual(away.away_goalie_status, 1)
+        # The opponent's side is untouched.
+        self.assertEqual(away.home_goalie_status, 3)
+
+    def test_sub_needed_clears_goalie(self):
+        response = self._post(
+            [{"matchup_id": self.matchups[0].id, "goalie_id": self.sub.id, "status": 2}]
+        )
+        self.assertEqual(response.json()["matchups"][0]["goalie_name"], "")
+        self.matchups[0].refresh_from_db()
+        self.assertIsNone(self.matchups[0].home_goalie)
+
+    def test_one_invalid_row_rejects_the_whole_batch(self):
+        response = self._post(
+            [
+                {"matchup_id": self.matchups[0].id, "status": 1},
+                {"matchup_id": self.matchups[1].id, "status": 9},
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(self.matchups[1].id), response.json()["errors"])
+        self.matchups[0].refresh_from_db()
+        self.assertEqual(self.matchups[0].home_goalie_status, 3)
+
+    def test_rejects_matchups_of_other_teams_and_past_games(self):
+        other = make_team("Other", self.division, self.team.season, color="Green")
+        foreign = make_matchup(
+            make_week(self.division, self.team.season, offset_days=5),
+            other,
+            self.opponent,
+        )
+        past = make_matchup(
+            make_week(self.division, self.team.season, offset_days=-7),
+            self.team,
+            self.opponent,
+        )
+        response = self._post(
+            [
+                {"matchup_id": foreign.id, "status": 1},
+                {"matchup_id": past.id, "status": 1},
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(response.json()["errors"]), {str(foreign.id), str(past.id)}
+        )
+
+    def test_rejects_unknown_goalie_and_empty_payload(self):
+        response = self._post(
+            [{"matchup_id": self.matchups[0].id, "goalie_id": 99999, "status": 1}]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._post([]).status_code, 400)
+
+    def test_query_count_independent_of_batch_size(self):
+        def queries_for(matchups):
+            updates = [{"matchup_id": m.id, "status": 1} for m in matchups]
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self._post(updates).status_code, 200)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_for(self.matchups[:1]), queries_for(self.matchups))
@@ -0,0 +1,203 @@
+"""
+Tests for leagues/name_matching.py and the autocompletes built on it.
+
+Covers:
+  - normalize_name() — case, accents, punctuation
+  - get_name_variants() — full name <-> nickname in both directions
+  - Player.save() — keeps the normalized search keys in sync
+  - search_players() — prefix match, nickname match, multi-word queries,
+    inner words of multi-word names
+  - player-autocomplete endpoint — uses the indexed search
+  - PlayerIdentityIndex — email / name / nickname / first-name lookups,
+    match order and ambiguity, load() in one query, duplicate groups
+    blocked by last name
+  - find_duplicate_players command output
+"""
+
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from leagues.models import Player
+from leagues.name_matching import (
+    PlayerIdentityIndex,
+    get_name_variants,
+    normalize_name,
+    search_players,
+)
+
+
+class NormalizeNameTest(SimpleTestCase):
+    def test_strips_case_accents_and_punctuation(self):
+        self.assertEqual(normalize_name("  O'Brien-Núñez "), "obriennunez")
+
+    def test_none_is_empty(self):
+        self.assertEqual(normalize_name(None), "")
+
+
+class NameVariantsTest(SimpleTestCase):
+    def test_full_name_includes_nicknames(self):
+        self.assertTrue({"robert", "bob", "rob"} <= get_name_variants("Robert"))
+
+    def test_nickname_includes_full_name(self):
+        self.assertIn("robert", get_name_variants("Bob"))
+
+    def test_name_listed_as_both_full_and_nickname(self):
+        # "john" is a full name and also a nickname of "jonathan".
+        self.assertTrue({"jack", "jonathan"} <= get_name_variants("john"))
+
+    def test_unknown_name_is_its_own_variant(self):
+        self.assertEqual(get_name_variants("Zebediah"), {"zebediah"})
+
+
+class SearchPlayersTest(TestCase):
+    def setUp(self):
+        self.robert = Player.objects.create(first_name="Robert", last_name="Smith")
+        self.sean = Player.objects.create(first_name="Seán", last_name="O'Neil")
+        self.smitty = Player.objects.create(first_name="Ann", last_name="Smithers")
+
+    def _search(self, q):
+        return set(search_players(Player.objects.all(), q))
+
+    def test_keys_populated_on_save(self):
+        self.assertEqual(self.sean.first_name_key, "sean")
+        self.assertEqual(self.sean.last_name_key, "oneil")
+
+    def test_keys_follow_name_changes_with_update_fields(self):
+        self.robert.last_name = "Jones"
+        self.robert.save(update_fields=["last_name"])
+        self.robert.refresh_from_db()
+        self.assertEqual(self.robert.last_name_key, "jones")
+
+    def test_prefix_match_on_either_name(self):
+        self.assertEqual(self._search("smi"), {self.robert, self.smitty})
+        self.assertEqual(self._search("rob"), {self.robert})
+
+    def test_not_a_substring_scan(self):
+        self.assertEqual(self._search("mith"), set())
+
+    def test_nickname_matches_full_first_name(self):
+        self.assertEqual(self._search("bob"), {self.robert})
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self._search("bob smith"), {self.robert})
+        self.assertEqual(self._search("ann smith"), {self.smitty})
+
+    def test_inner_words_of_multi_word_names(self):
+        van_buren = Player.objects.create(first_name="Mary Ann", last_name="Van Buren")
+        for q in ("buren", "van buren", "vanbu", "mary buren", "ann"):
+            self.assertIn(van_buren, self._search(q), q)
+        self.assertEqual(self._search("uren"), set())
+
+    def test_inner_words_follow_renames(self):
+        player = Player.objects.create(first_name="Jo", last_name="De La Cruz")
+        self.assertEqual(self._search("cruz"), {player})
+        player.last_name = "Cruz Diaz"
+        player.save(update_fields=["last_name"])
+        self.assertEqual(self._search("la"), set())
+        self.assertEqual(self._search("diaz"), {player})
+
+    def test_punctuation_and_accents_ignored(self):
+        self.assertEqual(self._search("o'ne"), {self.sean})
+        self.assertEqual(self._search("sean"), {self.sean})
+
+    def test_blank_query_returns_everything(self):
+        self.assertEqual(len(self._search("  ")), 3)
+
+
+class PlayerAutocompleteTest(TestCase):
+    def setUp(self):
+        Player.objects.create(first_name="Robert", last_name="Smith")
+        Player.objects.create(first_name="Dana", last_name="Bobson")
+        user = User.objects.create_superuser("admin", "admin@test.com", "pw")
+        self.client.force_login(user)
+
+    def test_autocomplete_uses_nickname_aware_prefix_search(self):
+        response = self.client.get(reverse("player-autocomplete"), {"q": "bob"})
+        self.assertEqual(response.status_code, 200)
+        names = {r["text"] for r in json.loads(response.content)["results"]}
+        self.assertEqual(names, {"Smith, Robert", "Bobson, Dana"})
+
+
+class PlayerIdentityIndexTest(TestCase):
+    def setUp(self):
+        self.michael = Player.objects.create(
+            first_name="Michael", last_name="O'Brien", email="MB@Example.com"
+        )
+        self.mike = Player.objects.create(first_name="Mike", last_name="Obrien")
+        self.ann = Player.objects.create(
+            first_name="Ann", last_name="Lee", email="ann@example.com"
+        )
+        self.other_ann = Player.objects.create(first_name="Ann", last_name="Park")
+
+    def _index(self):
+        return PlayerIdentityIndex(Player.objects.order_by("pk"))
+
+    def test_lookups(self):
+        index = self._index()
+        self.assertEqual(index.lookup("email", email=" mb@example.COM"), [self.michael])
+        self.assertEqual(index.lookup("name", "mike", "O'Brien"), [self.mike])
+        self.assertEqual(
+            index.lookup("nickname", "Mikey", "OBRIEN"), [self.michael, self.mike]
+        )
+        self.assertEqual(index.lookup("first_name", "ann"), [self.ann, self.other_ann])
+
+    def test_match_follows_order(self):
+        index = self._index()
+        match = index.match("Mike", "O'Brien", "mb@example.com")
+        self.assertEqual((match.player, match.how), (self.michael, "email"))
+        match = index.match(
+            "Mike", "O'Brien", "mb@example.com", order=("name", "email")
+        )
+        self.assertEqual((match.player, match.how), (self.mike, "name"))
+
+    def test_ambiguous_and_new(self):
+        index = self._index()
+        match = index.match("Mick", "Obrien", order=("nickname",))
+        self.assertEqual(match.how, "ambiguous")
+        self.assertIsNone(match.player)
+        self.assertEqual(match.candidates, [self.michael, self.mike])
+        self.assertEqual(index.match("Zed", "Nobody").how, "new")
+
+    def test_load_indexes_candidates_in_one_query(self):
+        with self.assertNumQueries(1):
+            index = PlayerIdentityIndex.load(
+                [("Michael", "Obrien", None), ("Someone", "Else", "ANN@example.com")]
+            )
+        self.assertCountEqual(index.players, [self.michael, self.mike, self.ann])
+        self.assertEqual(index.match("X", "Y", "ann@example.com").player, self.ann)
+
+    def test_added_players_are_found(self):
+        index = PlayerIdentityIndex()
+        player = Player(first_name="Zoë", last_name="Quinn")
+        index.add(player)
+        self.assertEqual(index.match("Zoe", "Quinn").player, player)
+
+    def test_duplicate_groups(self):
+        ann_again = Player.objects.create(first_name="Ann", last_name="LEE")
+        groups = self._index().duplicate_groups()
+        self.assertEqual(
+            [(kind, last, {p.pk for p in players}) for kind, last, players in groups],
+            [
+                ("EXACT MATCH", "lee", {self.ann.pk, ann_again.pk}),
+                ("NICKNAME MATCH", "obrien", {self.michael.pk, self.mike.pk}),
+            ],
+        )
+
+
+class FindDuplicatePlayersCommandTest(TestCase):
+    def test_reports_groups_with_roster_counts(self):
+        Player.objects.create(first_name="Robert", last_name="Smith")
+        Player.objects.create(first_name="Bob", last_name="Smith")
+        Player.objects.create(first_name="Ann", last_name="Smith")
+        out = io.StringIO()
+        call_command("find_duplicate_players", stdout=out)
+        output = out.getvalue()
+        self.assertIn("Found 1 potential duplicate groups", output)
+        self.assertIn("[NICKNAME MATCH] Smith:", output)
+        self.assertIn("Bob Smith (0 roster entries, ACTIVE)", output)
+        self.assertNotIn("Ann Smith", output)
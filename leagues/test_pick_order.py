@@ -0,0 +1,151 @@
+"""
+Tests for leagues/pick_order.py and the pick plan stored on DraftSession.
+
+Covers:
+  - plan_pick_order — snake, randomized rounds (seeded, parity skips them)
+  - captain_slots — overall indexes of captain auto-pick slots
+  - simulate_draft — whole draft in memory, captains auto-drafted in their
+    round, custom chooser, early end when the pool runs out
+  - DraftSession.rebuild_pick_order stores the plan; a captain round change
+    re-marks it; auto-picks follow the teams and rebuild a stale plan
+"""
+
+import datetime
+
+from django.test import SimpleTestCase, TestCase
+
+from leagues.draft_views import _process_auto_captain_picks
+from leagues.models import DraftRound, DraftSession, DraftTeam, Season, SeasonSignup
+from leagues.pick_order import captain_slots, plan_pick_order, simulate_draft
+
+
+class PlanPickOrderTests(SimpleTestCase):
+    def test_snake(self):
+        self.assertEqual(
+            plan_pick_order([1, 2, 3], 3),
+            [[1, 2, 3], [3, 2, 1], [1, 2, 3]],
+        )
+
+    def test_randomized_round_is_seeded_and_skipped_by_parity(self):
+        table = plan_pick_order([1, 2, 3, 4], 4, randomized_rounds={2}, seed=9)
+        self.assertEqual(table, plan_pick_order([1, 2, 3, 4], 4, {2}, seed=9))
+        self.assertCountEqual(table[1], [1, 2, 3, 4])
+        # Round 3 continues the snake from round 1.
+        self.assertEqual(table[2], [4, 3, 2, 1])
+        self.assertEqual(table[3], [1, 2, 3, 4])
+
+    def test_captain_slots(self):
+        table = [[1, 2], [2, 1], [1, 2]]
+        self.assertEqual(captain_slots(table, {1: 2, 2: 1, 3: 1}), [1, 3])
+
+
+class SimulateDraftTests(SimpleTestCase):
+    table = [[1, 2], [2, 1], [1, 2]]
+    captains = {1: "cap1", 2: "cap2"}
+
+    def test_full_draft(self):
+        picks = simulate_draft(
+            self.table, self.captains, {1: 2, 2: 3}, ["cap1", "a", "b", "c", "d"]
+        )
+        self.assertEqual(
+            [(p.team_pk, p.player, p.is_auto_captain) for p in picks],
+            [
+                (1, "a", False),
+                (2, "b", False),
+                (2, "c", False),
+                (1, "cap1", True),
+                (1, "d", False),
+                (2, "cap2", True),
+            ],
+        )
+        self.assertEqual([p.index for p in picks], list(range(6)))
+        self.assertEqual(picks[3].round_number, 2)
+        self.assertEqual(picks[3].pick_number, 1)
+
+    def test_chooser_decides_manual_picks(self):
+        picks = simulate_draft(
+            self.table,
+            self.captains,
+            {1: 1, 2: 1},
+            ["a", "b", "c", "d"],
+            choose=lambda team_pk, available: available[-1],
+        )
+        self.assertEqual([p.player for p in picks[2:4]], ["d", "c"])
+
+    def test_ends_when_pool_runs_out(self):
+        picks = simulate_draft(self.table, self.captains, {1: 3, 2: 3}, ["a"])
+        self.assertEqual([p.player for p in picks], ["a"])
+
+
+class StoredPickPlanTests(TestCase):
+    def setUp(self):
+        season = Season.objects.create(
+            year=datetime.date.today().year, season_type=4, is_current_season=False
+        )
+        self.session = DraftSession.objects.create(
+            season=season,
+            num_teams=2,
+            num_rounds=3,
+            state=DraftSession.STATE_ACTIVE,
+            signups_open=False,
+        )
+        DraftRound.objects.create(
+            session=self.session,
+            round_number=2,
+            order_type=DraftRound.ORDER_RANDOMIZED,
+        )
+        self.teams = []
+        for position in (1, 2):
+            captain = SeasonSignup.objects.create(
+                season=season,
+                first_name=f"Cap{position}",
+                last_name="Test",
+                email=f"cap{position}@test.com",
+                primary_position=SeasonSignup.POSITION_WING,
+                secondary_position=SeasonSignup.POSITION_ONE_THING,
+                captain_interest=SeasonSignup.CAPTAIN_YES,
+            )
+            self.teams.append(
+                DraftTeam.objects.create(
+                    session=self.session,
+                    captain=captain,
+                    draft_position=position,
+                    captain_draft_round=3,
+                )
+            )
+        self.session.rebuild_pick_order()
+
+    def test_plan_stored_with_order(self):
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.pick_plan["randomized_rounds"], [2])
+        self.assertEqual(self.session.pick_plan["captain_slots"], [4, 5])
+        self.assertTrue(self.session.is_randomized_round(2))
+        self.assertFalse(self.session.is_captain_slot(0))
+
+    def test_captain_round_change_remarks_plan(self):
+        team = self.teams[0]
+        team.captain_draft_round = 1
+        team.save(update_fields=["captain_draft_round"])
+        self.session.refresh_from_db()
+        # Round 3 runs [2, 1], so team 2's captain is still pick 4.
+        self.assertEqual(self.session.pick_plan["captain_slots"], [0, 4])
+
+    def test_no_auto_pick_outside_captain_slots(self):
+        self.assertEqual(_process_auto_captain_picks(self.session), [])
+
+    def test_stale_plan_rebuilt_from_teams(self):
+        # A queryset update sends no signal, so the stored plan is stale.
+        team = self.teams[0]
+        DraftTeam.objects.filter(pk=team.pk).update(captain_draft_round=1)
+        picks = _process_auto_captain_picks(self.session)
+        self.assertEqual([p.signup_id for p in picks], [team.captain_id])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.pick_plan["captain_slots"], [0, 4])
+
+    def test_plan_drives_auto_pick(self):
+        team = self.teams[0]
+        team.captain_draft_round = 1
+        team.save(update_fields=["captain_draft_round"])
+        self.session.refresh_from_db()
+        picks = _process_auto_captain_picks(self.session)
+        self.assertEqual([p.signup_id for p in picks], [team.captain_id])
@@ -0,0 +1,171 @@
+"""
+Tests for leagues/player_merge.py and the merge_players command.
+
+Covers:
+  - PLAYER_REFERENCES lists every foreign key to Player
+  - merge_players — rosters, stats, refs, matchup goalies, signups and
+    pending photos move; repeated rosters and refs are dropped; the kept
+    player inherits missing fields; goalie eligibility and draft stats
+    snapshots follow
+  - merge_players command — explicit ids, --exact-matches, --dry-run
+  - find_duplicate_players --show-rosters in one roster query
+"""
+
+import datetime
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from leagues.models import (
+    Division,
+    DraftSession,
+    GoalieEligibility,
+    MatchUp,
+    PendingPlayerPhoto,
+    Player,
+    PlayerNameToken,
+    Ref,
+    Roster,
+    Season,
+    SeasonSignup,
+    Stat,
+    Team,
+    Week,
+)
+from leagues.player_merge import (
+    PLAYER_REFERENCES,
+    PlayerMergeError,
+    merge_players,
+)
+
+
+class PlayerReferencesTest(TestCase):
+    def test_every_foreign_key_is_listed(self):
+        listed = {(model, field) for model, field in PLAYER_REFERENCES}
+        for relation in Player._meta.related_objects:
+            model = relation.related_model._meta.concrete_model
+            if model in (GoalieEligibility, PlayerNameToken):
+                continue  # derived from the player
+            self.assertIn((model, relation.field.name), listed)
+
+
+class MergePlayersTest(TestCase):
+    def setUp(self):
+        this_year = datetime.date.today().year
+        division = Division.objects.create(division=1)
+        self.season = Season.objects.create(year=this_year, season_type=1)
+        self.team = Team.objects.create(
+            team_name="Red", division=division, season=self.season, is_active=True
+        )
+        self.other_team = Team.objects.create(
+            team_name="Blue", division=division, season=self.season, is_active=True
+        )
+        week = Week.objects.create(
+            division=division, season=self.season, date=datetime.date.today()
+        )
+        self.keep = Player.objects.create(first_name="Robert", last_name="Smith")
+        self.dup = Player.objects.create(
+            first_name="Bob",
+            last_name="Smith",
+            email="bob@example.com",
+            can_play_goalie=True,
+        )
+        Roster.objects.create(player=self.keep, team=self.team, position1=1)
+        Roster.objects.create(player=self.dup, team=self.team, position1=1)
+        Roster.objects.create(player=self.dup, team=self.other_team, position1=4)
+        self.matchup = MatchUp.objects.create(
+            week=week,
+            time=datetime.time(20, 0),
+            awayteam=self.other_team,
+            hometeam=self.team,
+            away_goalie=self.dup,
+            ref1=Ref.objects.create(player=self.keep),
+            ref2=Ref.objects.create(player=self.dup),
+        )
+        Stat.objects.create(
+            player=self.dup, team=self.team, matchup=self.matchup, goals=2
+        )
+        self.signup = SeasonSignup.objects.create(
+            season=self.season,
+            first_name="Bob",
+            last_name="Smith",
+            email="bob@example.com",
+            primary_position=SeasonSignup.POSITION_WING,
+            secondary_position=SeasonSignup.POSITION_ONE_THING,
+            linked_player=self.dup,
+        )
+        PendingPlayerPhoto.objects.create(player=self.dup, photo="p.jpg")
+        self.session = DraftSession.objects.create(season=self.season)
+        DraftSession.objects.filter(pk=self.session.pk).update(
+            player_stats={str(self.keep.pk): {}, str(self.dup.pk): {}, "999": {}}
+        )
+
+    def test_merge_moves_every_reference(self):
+        result = merge_players(self.keep, [self.dup])
+
+        self.assertFalse(Player.objects.filter(pk=self.dup.pk).exists())
+        self.assertEqual(result.merged, [self.dup.pk])
+        self.assertEqual(result.moved["Roster (dropped)"], 1)
+        self.assertEqual(result.moved["Stat.player"], 1)
+        rosters = Roster.objects.filter(player=self.keep)
+        self.assertCountEqual(
+            rosters.values_list("team", flat=True), [self.team.pk, self.other_team.pk]
+        )
+        self.assertEqual(Stat.objects.get().player, self.keep)
+        self.matchup.refresh_from_db()
+        self.assertEqual(self.matchup.away_goalie, self.keep)
+        self.assertEqual(self.matchup.ref1, self.matchup.ref2)
+        self.assertEqual(Ref.objects.get().player, self.keep)
+        self.signup.refresh_from_db()
+        self.assertEqual(self.signup.linked_player, self.keep)
+        self.assertEqual(PendingPlayerPhoto.objects.get().player, self.keep)
+
+        self.keep.refresh_from_db()
+        self.assertEqual(self.keep.email, "bob@example.com")
+        self.assertTrue(self.keep.can_play_goalie)
+        # The kept player is now a goalie through the duplicate's roster.
+        self.assertTrue(GoalieEligibility.objects.filter(player=self.keep).exists())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.player_stats, {"999": {}})
+
+    def test_merge_into_itself_refused(self):
+        with self.assertRaises(PlayerMergeError):
+            merge_players(self.keep, [self.keep])
+
+    def test_command_dry_run(self):
+        out = io.StringIO()
+        call_command(
+            "merge_players",
+            str(self.keep.pk),
+            str(self.dup.pk),
+            "--dry-run",
+            stdout=out,
+        )
+        self.assertIn("Roster.player: 2", out.getvalue())
+        self.assertIn("Would merge 1 duplicate players into 1.", out.getvalue())
+        self.assertTrue(Player.objects.filter(pk=self.dup.pk).exists())
+
+    def test_command_exact_matches(self):
+        # Same normalized name; the player with more rosters is kept.
+        oneill = Player.objects.create(first_name="Pat", last_name="O'Neill")
+        Roster.objects.create(player=oneill, team=self.team, position1=2)
+        spelled = Player.objects.create(first_name="Pat", last_name="ONeill")
+        call_command("merge_players", "--exact-matches", stdout=io.StringIO())
+        self.assertTrue(Player.objects.filter(pk=oneill.pk).exists())
+        self.assertFalse(Player.objects.filter(pk=spelled.pk).exists())
+        # Nickname matches are left for a person to decide.
+        self.assertTrue(Player.objects.filter(pk=self.dup.pk).exists())
+
+    def test_command_needs_ids(self):
+        with self.assertRaises(CommandError):
+            call_command("merge_players", stdout=io.StringIO())
+
+    def test_find_duplicates_show_rosters_query_count(self):
+        # Players, then every listed player's rosters at once.
+        with self.assertNumQueries(2):
+            out = io.StringIO()
+            call_command("find_duplicate_players", "--show-rosters", stdout=out)
+        self.assertIn("Red", out.getvalue())
+        self.assertIn("merge_players", out.getvalue())
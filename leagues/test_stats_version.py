@@ -0,0 +1,60 @@
+"""
+Tests for the stats data version in leagues/signals.py.
+
+Covers:
+  - stored in the database, so a bump is seen by every process
+  - bumped by new rows, deletes and edits of fields the stats pages read
+  - left alone by other edits (goalie status, with and without update_fields)
+"""
+
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from leagues.models import DataVersion, Division, MatchUp, Season, Team, Week
+from leagues.signals import STATS_VERSION_NAME, get_stats_version
+
+
+class StatsVersionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        division = Division.objects.create(division=1)
+        season = Season.objects.create(year=2025, season_type=1)
+        home, away = (
+            Team.objects.create(
+                team_name=name, division=division, season=season, is_active=True
+            )
+            for name in ("Red", "Blue")
+        )
+        week = Week.objects.create(
+            division=division, season=season, date=datetime.date(2025, 5, 1)
+        )
+        self.matchup = MatchUp.objects.create(
+            week=week, time=datetime.time(20, 0), hometeam=home, awayteam=away
+        )
+
+    def test_bump_reaches_other_processes(self):
+        version = get_stats_version()
+        # Another worker bumps the shared row; this process's copy expires.
+        DataVersion.objects.filter(name=STATS_VERSION_NAME).update(version=version + 1)
+        cache.clear()
+        self.assertEqual(get_stats_version(), version + 1)
+
+    def test_stats_fields_bump(self):
+        version = get_stats_version()
+        self.matchup.is_postseason = True
+        self.matchup.save()
+        self.assertNotEqual(get_stats_version(), version)
+
+        version = get_stats_version()
+        self.matchup.delete()
+        self.assertNotEqual(get_stats_version(), version)
+
+    def test_goalie_status_does_not_bump(self):
+        version = get_stats_version()
+        self.matchup.home_goalie_status = 2
+        self.matchup.save(update_fields=["home_goalie_status"])
+        self.matchup.away_goalie_status = 2
+        self.matchup.save()
+        self.assertEqual(get_stats_version(), version)
@@ -3,6 +3,7 @@ from .views import (
     goalie_status_board,
     captain_goalie_update,
     update_goalie_status,
+    bulk_update_goalie_status,
     captain_urls_list,
     upload_player_photo,
     upload_team_photo,
@@ -10,6 +11,7 @@ from .views import (
 from .draft_views import (
     draft_signup,
     draft_board_spectator,
+    draft_state_json,
     draft_board_commissioner,
     draft_board_captain,
     draft_captain_portal,
@@ -23,6 +25,7 @@ from .draft_views import (
     set_captain_rounds,
     email_team_data,
     draft_results_download,
+    draft_results_download_all,
     draft_sessions_list,
     add_late_signup,
 )
@@ -58,6 +61,11 @@ urlpatterns = [
         update_goalie_status,
         name="update_goalie_status",
     ),
+    path(
+        "goalie-status/captain/<uuid:access_code>/update/",
+        bulk_update_goalie_status,
+        name="bulk_update_goalie_status",
+    ),
     path("captain-urls/", captain_urls_list, name="captain_urls_list"),
     # -----------------------------------------------------------------------
     # Wednesday Draft League – Signup
@@ -75,6 +83,11 @@ urlpatterns = [
         draft_board_spectator,
         name="draft_board_spectator",
     ),
+    path(
+        "draft/<int:session_pk>/state.json",
+        draft_state_json,
+        name="draft_state_json",
+    ),
     path(
         "draft/<int:session_pk>/commissioner/<uuid:token>/",
         draft_board_commissioner,
@@ -156,4 +169,9 @@ urlpatterns = [
         draft_sessions_list,
         name="draft_sessions_list",
     ),
+    path(
+        "draft/download/",
+        draft_results_download_all,
+        name="draft_results_download_all",
+    ),
 ]
@@ -1,8 +1,11 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import HttpResponse, Http404, JsonResponse
 from django.views.decorators.http import require_POST
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
+from collections import defaultdict
+import json
 from datetime import timedelta
 
 from .models import (
@@ -15,6 +18,35 @@ from .models import (
     PendingTeamPhoto,
 )
 from .forms import PlayerPhotoUploadForm, TeamPhotoUploadForm
+from .goalie_eligibility import eligible_goalies
+
+
+def get_roster_goalies(team_ids):
+    """
+    Resolve the roster goalie for many teams in one query.
+    Returns {team_id: Player or None} with the same priority as
+    get_roster_goalie(): the primary goalie, else the first non-substitute goalie.
+    """
+    team_ids = set(team_ids)
+    goalies = dict.fromkeys(team_ids)
+    if not team_ids:
+        return goalies
+
+    primary_found = set()
+    entries = (
+        Roster.objects.filter(team_id__in=team_ids, is_substitute=False)
+        .filter(Q(position1=4) | Q(position2=4))
+        .select_related("player")
+    )
+    for entry in entries:
+        if entry.team_id in primary_found:
+            continue
+        if entry.is_primary_goalie:
+            goalies[entry.team_id] = entry.player
+            primary_found.add(entry.team_id)
+        elif goalies[entry.team_id] is None:
+            goalies[entry.team_id] = entry.player
+    return goalies
 
 
 def get_roster_goalie(team):
@@ -24,40 +56,23 @@ def get_roster_goalie(team):
               2) First non-substitute goalie (fallback)
     Checks both position1 and position2 for goalie position (4).
     """
-    from django.db.models import Q
-
-    # First try to find the designated primary goalie
-    primary_entry = (
-        Roster.objects.filter(
-            team=team,
-            is_substitute=False,
-            is_primary_goalie=True,
-        )
-        .filter(Q(position1=4) | Q(position2=4))
-        .select_related("player")
-        .first()
-    )
-    if primary_entry:
-        return primary_entry.player
+    return get_roster_goalies([team.id])[team.id]
 
-    # Fallback: first non-substitute goalie (original behavior)
-    roster_entry = (
-        Roster.objects.filter(team=team, is_substitute=False)
-        .filter(Q(position1=4) | Q(position2=4))
-        .select_related("player")
-        .first()
-    )
-    return roster_entry.player if roster_entry else None
 
-
-def get_goalie_display_info(matchup, team, goalie_field, status_field):
+def get_goalie_display_info(
+    matchup, team, goalie_field, status_field, roster_goalies=None
+):
     """
     Get the goalie display info for a team in a matchup.
     Returns dict with goalie name, status, and whether it's the roster goalie.
+    Pass roster_goalies (from get_roster_goalies) to skip the per-team lookup.
     """
     goalie = getattr(matchup, goalie_field)
     status = getattr(matchup, status_field)
-    roster_goalie = get_roster_goalie(team)
+    if roster_goalies is not None:
+        roster_goalie = roster_goalies.get(team.id)
+    else:
+        roster_goalie = get_roster_goalie(team)
 
     # If status is 2 (Sub Needed), goalie name should be blank
     if status == 2:
@@ -100,6 +115,52 @@ def get_goalie_display_info(matchup, team, goalie_field, status_field):
         }
 
 
+# Live goalie board: clients join GOALIE_STATUS_GROUP (GoalieStatusConsumer) and
+# get a small per-matchup delta whenever one of these fields changes.
+GOALIE_STATUS_FIELDS = (
+    "away_goalie",
+    "away_goalie_status",
+    "home_goalie",
+    "home_goalie_status",
+)
+
+
+def goalie_status_delta(matchup, roster_goalies=None):
+    """Compact goalie display info for both sides of a matchup."""
+    if roster_goalies is None:
+        roster_goalies = get_roster_goalies([matchup.awayteam_id, matchup.hometeam_id])
+    delta = {"matchup_id": matchup.pk}
+    for side, team in (("away", matchup.awayteam), ("home", matchup.hometeam)):
+        info = get_goalie_display_info(
+            matchup, team, f"{side}_goalie", f"{side}_goalie_status", roster_goalies
+        )
+        delta[side] = {
+            "goalie_name": info["goalie_name"],
+            "status": info["status"],
+            "status_display": info["status_display"],
+            "is_sub": bool(info["is_sub"]),
+        }
+    return delta
+
+
+def broadcast_goalie_status(matchup, roster_goalies=None):
+    """Push a matchup's goalie status to live board clients once it commits."""
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    from .consumers import GOALIE_STATUS_GROUP
+
+    payload = {
+        "type": "goalie.status",
+        "matchup": goalie_status_delta(matchup, roster_goalies),
+    }
+
+    def send():
+        async_to_sync(get_channel_layer().group_send)(GOALIE_STATUS_GROUP, payload)
+
+    transaction.on_commit(send)
+
+
 def goalie_status_board(request):
     """
     Public view showing goalie status for all upcoming matchups.
@@ -114,7 +175,7 @@ def goalie_status_board(request):
         .values_list("date", flat=True)
         .distinct()[:4]
     )
-    upcoming_weeks = (
+    upcoming_weeks = list(
         Week.objects.filter(date__in=upcoming_dates)
         .select_related("division", "season")
         .order_by(
@@ -125,53 +186,55 @@ def goalie_status_board(request):
         )
     )
 
-    weeks_data = []
-    for week in upcoming_weeks:
-        matchups = (
-            MatchUp.objects.filter(week=week)
-            .select_related(
-                "awayteam",
-                "hometeam",
-                "away_goalie",
-                "home_goalie",
-                "awayteam__division",
-                "hometeam__division",
-            )
-            .order_by("time")
+    # Every matchup on the board in one query, then every roster goalie for
+    # the teams involved in one more, so the page costs the same number of
+    # queries however many games are scheduled.
+    matchups = list(
+        MatchUp.objects.filter(week__in=[week.id for week in upcoming_weeks])
+        .select_related(
+            "awayteam",
+            "hometeam",
+            "away_goalie",
+            "home_goalie",
+            "awayteam__division",
+            "hometeam__division",
         )
+        .order_by("time")
+    )
+    roster_goalies = get_roster_goalies(
+        {m.awayteam_id for m in matchups} | {m.hometeam_id for m in matchups}
+    )
 
-        matchups_data = []
-        for matchup in matchups:
-            away_info = get_goalie_display_info(
-                matchup, matchup.awayteam, "away_goalie", "away_goalie_status"
-            )
-            home_info = get_goalie_display_info(
-                matchup, matchup.hometeam, "home_goalie", "home_goalie_status"
-            )
-
-            matchups_data.append(
-                {
-                    "matchup": matchup,
-                    "away_goalie_info": away_info,
-                    "home_goalie_info": home_info,
-                }
-            )
-
-        weeks_data.append(
+    matchups_by_week = defaultdict(list)
+    for matchup in matchups:
+        matchups_by_week[matchup.week_id].append(
             {
-                "week": week,
-                "matchups": matchups_data,
+                "matchup": matchup,
+                "away_goalie_info": get_goalie_display_info(
+                    matchup,
+                    matchup.awayteam,
+                    "away_goalie",
+                    "away_goalie_status",
+                    roster_goalies,
+                ),
+                "home_goalie_info": get_goalie_display_info(
+                    matchup,
+                    matchup.hometeam,
+                    "home_goalie",
+                    "home_goalie_status",
+                    roster_goalies,
+                ),
             }
         )
 
+    weeks_data = [
+        {"week": week, "matchups": matchups_by_week[week.id]} for week in upcoming_weeks
+    ]
+
     # Count games needing subs for the same date window shown on this page.
-    sub_needed_count = 0
-    if upcoming_dates:
-        sub_needed_count = (
-            MatchUp.objects.filter(week__date__in=upcoming_dates)
-            .filter(Q(away_goalie_status=2) | Q(home_goalie_status=2))
-            .count()
-        )
+    sub_needed_count = sum(
+        1 for m in matchups if m.away_goalie_status == 2 or m.home_goalie_status == 2
+    )
 
     context = {
         "weeks_data": weeks_data,
@@ -202,20 +265,13 @@ def captain_goalie_update(request, access_code):
         .order_by("week__date", "time")
     )
 
-    # Get all goalies for the dropdown: players rostered as goalie on any team,
-    # plus any player flagged can_play_goalie (e.g. a multi-position player who
-    # occasionally fills in at goal but isn't officially rostered there).
-    all_goalies = (
-        Player.objects.filter(
-            Q(roster__position1=4) | Q(roster__position2=4) | Q(can_play_goalie=True),
-            is_active=True,
-        )
-        .distinct()
-        .order_by("last_name", "first_name")
-    )
+    # Get all goalies for the dropdown: active players rostered as goalie on any
+    # team, plus any player flagged can_play_goalie (e.g. a multi-position player
+    # who occasionally fills in at goal but isn't officially rostered there).
+    all_goalies = eligible_goalies(include_recent=False)
 
     # Get team's roster goalie
-    roster_goalie = get_roster_goalie(team)
+    roster_goalie = get_request_roster_goalie(request, team)
 
     matchups_data = []
     for matchup in upcoming_matchups:
@@ -253,6 +309,59 @@ def captain_goalie_update(request, access_code):
     return render(request, "leagues/captain_goalie_update.html", context)
 
 
+def get_request_roster_goalie(request, team):
+    """get_roster_goalie(team), cached on the request for repeated lookups."""
+    if not hasattr(request, "_roster_goalie_cache"):
+        request._roster_goalie_cache = {}
+    if team.id not in request._roster_goalie_cache:
+        request._roster_goalie_cache[team.id] = get_roster_goalie(team)
+    return request._roster_goalie_cache[team.id]
+
+
+def _parse_goalie_status(raw):
+    """Return a valid goalie status int, or raise ValueError."""
+    try:
+        status = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid status value")
+    if status not in dict(MatchUp.GOALIE_STATUS_CHOICES):
+        raise ValueError("Invalid status value")
+    return status
+
+
+def _apply_captain_goalie_update(matchup, team, goalie, status):
+    """Set the captain's side of a matchup; Sub Needed always clears the goalie."""
+    if status == 2:
+        goalie = None
+    side = "home" if matchup.hometeam_id == team.id else "away"
+    setattr(matchup, f"{side}_goalie", goalie)
+    setattr(matchup, f"{side}_goalie_status", status)
+    return side
+
+
+def _captain_goalie_result(goalie, status, roster_goalie):
+    """Display row returned to the captain page after an update."""
+    display_goalie = goalie or roster_goalie
+
+    # If status is 2, goalie_name should be blank
+    goalie_name = ""
+    is_sub = False
+    if status != 2:
+        goalie_name = (
+            f"{display_goalie.first_name} {display_goalie.last_name}"
+            if display_goalie
+            else "No goalie"
+        )
+        is_sub = goalie is not None and roster_goalie and goalie.id != roster_goalie.id
+
+    return {
+        "goalie_name": goalie_name,
+        "status": status,
+        "status_display": dict(MatchUp.GOALIE_STATUS_CHOICES).get(status, "Unknown"),
+        "is_sub": is_sub,
+    }
+
+
 @require_POST
 def update_goalie_status(request, access_code, matchup_id):
     """
@@ -262,22 +371,15 @@ def update_goalie_status(request, access_code, matchup_id):
     matchup = get_object_or_404(MatchUp, id=matchup_id)
 
     # Verify this team is part of the matchup
-    is_home = matchup.hometeam_id == team.id
-    is_away = matchup.awayteam_id == team.id
-
-    if not (is_home or is_away):
+    if team.id not in (matchup.hometeam_id, matchup.awayteam_id):
         return JsonResponse({"error": "Not authorized for this matchup"}, status=403)
 
     # Get the new values from the request
     goalie_id = request.POST.get("goalie_id")
-    status = request.POST.get("status")
-
     try:
-        status = int(status)
-        if status not in [1, 2, 3]:
-            raise ValueError("Invalid status")
-    except (TypeError, ValueError):
-        return JsonResponse({"error": "Invalid status value"}, status=400)
+        status = _parse_goalie_status(request.POST.get("status"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
     # Get the goalie (or None if using roster goalie)
     goalie = None
@@ -287,46 +389,104 @@ def update_goalie_status(request, access_code, matchup_id):
         except (Player.DoesNotExist, ValueError):
             return JsonResponse({"error": "Invalid goalie"}, status=400)
 
-    # If status is 2 (Sub Needed), goalie should be None
-    if status == 2:
-        goalie = None
+    side = _apply_captain_goalie_update(matchup, team, goalie, status)
+    matchup.save(update_fields=[f"{side}_goalie", f"{side}_goalie_status"])
+    broadcast_goalie_status(matchup)
 
-    # Update the appropriate fields based on home/away
-    if is_home:
-        matchup.home_goalie = goalie
-        matchup.home_goalie_status = status
-    else:
-        matchup.away_goalie = goalie
-        matchup.away_goalie_status = status
+    result = _captain_goalie_result(
+        goalie if status != 2 else None,
+        status,
+        get_request_roster_goalie(request, team),
+    )
+    return JsonResponse({"success": True, **result})
 
-    matchup.save()
 
-    # Get updated display info
-    roster_goalie = get_roster_goalie(team)
-    display_goalie = goalie or roster_goalie
+@require_POST
+def bulk_update_goalie_status(request, access_code):
+    """
+    AJAX endpoint for captains to update several upcoming matchups at once.
 
-    # If status is 2, goalie_name should be blank
-    goalie_name = ""
-    is_sub = False
-    if status != 2:
-        goalie_name = (
-            f"{display_goalie.first_name} {display_goalie.last_name}"
-            if display_goalie
-            else "No goalie"
-        )
-        is_sub = goalie is not None and roster_goalie and goalie.id != roster_goalie.id
+    Expects a JSON body ``{"updates": [{"matchup_id", "goalie_id", "status"}]}``.
+    Every row is validated before anything is written; the changes are then
+    applied with a single bulk_update inside a transaction.
+    """
+    team = get_object_or_404(Team, captain_access_code=access_code, is_active=True)
 
-    return JsonResponse(
-        {
-            "success": True,
-            "goalie_name": goalie_name,
-            "status": status,
-            "status_display": dict(MatchUp.GOALIE_STATUS_CHOICES).get(
-                status, "Unknown"
-            ),
-            "is_sub": is_sub,
-        }
+    try:
+        updates = json.loads(request.body or b"{}").get("updates")
+    except (ValueError, AttributeError):
+        updates = None
+    if not isinstance(updates, list) or not updates:
+        return JsonResponse({"error": "No updates supplied"}, status=400)
+
+    upcoming = MatchUp.objects.filter(
+        Q(awayteam=team) | Q(hometeam=team),
+        week__date__gte=timezone.now().date(),
+    ).select_related("awayteam", "hometeam")
+
+    rows = []
+    errors = {}
+    for update in updates:
+        update = update if isinstance(update, dict) else {}
+        matchup_id = update.get("matchup_id")
+        goalie_id = update.get("goalie_id")
+        try:
+            matchup_id = int(matchup_id)
+            goalie_id = None if goalie_id in (None, "", "roster") else int(goalie_id)
+        except (TypeError, ValueError):
+            errors[str(matchup_id)] = "Invalid update"
+            continue
+        try:
+            status = _parse_goalie_status(update.get("status"))
+        except ValueError as e:
+            errors[str(matchup_id)] = str(e)
+            continue
+        rows.append((matchup_id, goalie_id, status))
+
+    matchups = upcoming.in_bulk([matchup_id for matchup_id, _, _ in rows])
+    goalies = Player.objects.in_bulk(
+        {goalie_id for _, goalie_id, _ in rows if goalie_id is not None}
     )
+    seen = set()
+    for matchup_id, goalie_id, status in rows:
+        if matchup_id not in matchups:
+            errors[str(matchup_id)] = "Not an upcoming matchup for this team"
+        elif matchup_id in seen:
+            errors[str(matchup_id)] = "Duplicate matchup"
+        elif goalie_id is not None and goalie_id not in goalies:
+            errors[str(matchup_id)] = "Invalid goalie"
+        seen.add(matchup_id)
+    if errors:
+        return JsonResponse({"error": "Invalid updates", "errors": errors}, status=400)
+
+    # Board deltas need both teams' roster goalies; resolve them all at once.
+    roster_goalies = get_roster_goalies(
+        {m.awayteam_id for m in matchups.values()}
+        | {m.hometeam_id for m in matchups.values()}
+    )
+    roster_goalie = roster_goalies[team.id]
+    changed = []
+    results = []
+    fields = set()
+    for matchup_id, goalie_id, status in rows:
+        matchup = matchups[matchup_id]
+        goalie = goalies.get(goalie_id) if status != 2 else None
+        side = _apply_captain_goalie_update(matchup, team, goalie, status)
+        fields |= {f"{side}_goalie", f"{side}_goalie_status"}
+        changed.append(matchup)
+        results.append(
+            {
+                "matchup_id": matchup_id,
+                **_captain_goalie_result(goalie, status, roster_goalie),
+            }
+        )
+
+    with transaction.atomic():
+        MatchUp.objects.bulk_update(changed, sorted(fields))
+        for matchup in changed:
+            broadcast_goalie_status(matchup, roster_goalies)
+
+    return JsonResponse({"success": True, "matchups": results})
 
 
 def captain_urls_list(request):